@@ -0,0 +1,149 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Provides functions to fuse many shapes, like the copies of an array.
+
+A single boolean operation on thousands of shapes is slow and uses a lot
+of memory. The shapes are first split into groups whose bounding boxes
+don't overlap, since shapes of different groups can't touch and don't
+need to be fused. The shapes of a group are then fused in tiles
+of neighbouring shapes, and the results of the tiles are fused again,
+until a single shape is left.
+"""
+## @package fusion
+# \ingroup draftgeoutils
+# \brief Provides functions to fuse many shapes, like the copies of an array.
+
+import lazy_loader.lazy_loader as lz
+
+# Delay import of module until first use because it is heavy
+Part = lz.LazyLoader("Part", globals(), "Part")
+np = lz.LazyLoader("numpy", globals(), "numpy")
+
+## \addtogroup draftgeoutils
+# @{
+
+# number of shapes fused by a single boolean operation
+TILE_SIZE = 16
+
+# bounding boxes closer than this are considered to overlap
+TOLERANCE = 1e-7
+
+
+def bound_boxes(shapes):
+    """Return the bounding boxes of shapes as a NumPy array.
+
+    Each row is (xmin, ymin, zmin, xmax, ymax, zmax).
+    """
+    boxes = np.empty((len(shapes), 6))
+    for i, shape in enumerate(shapes):
+        bb = shape.BoundBox
+        boxes[i] = (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)
+    return boxes
+
+
+def _split(boxes, indexes, axis):
+    # sweep the boxes along an axis, and start a new part
+    # where a box begins after the end of all boxes before it
+    order = indexes[np.argsort(boxes[indexes, axis], kind="stable")]
+    ends = np.maximum.accumulate(boxes[order, axis + 3])
+    gaps = np.nonzero(boxes[order[1:], axis] > ends[:-1] + TOLERANCE)[0]
+    return np.split(order, gaps + 1)
+
+
+def overlapping_groups(boxes):
+    """Return groups of boxes which don't overlap the boxes of other groups.
+
+    The boxes are split along each axis in turn, until no group
+    can be split along any axis. The boxes of a group may still not
+    overlap each other, for example boxes scattered along a diagonal.
+
+    Parameters
+    ----------
+    boxes: numpy.ndarray
+        The bounding boxes, as returned by `bound_boxes`.
+
+    Returns
+    -------
+    list of lists of int
+        The indexes of the boxes of each group, in increasing order.
+        The groups are sorted by their first index.
+    """
+    groups = []
+    # the indexes of a group, the next axis and the number of axes
+    # which didn't split the group
+    pending = [(np.arange(len(boxes)), 0, 0)]
+    while pending:
+        indexes, axis, tried = pending.pop()
+        parts = _split(boxes, indexes, axis)
+        if len(parts) > 1:
+            pending.extend((p, (axis + 1) % 3, 1) for p in parts)
+        elif tried < 2:
+            pending.append((indexes, (axis + 1) % 3, tried + 1))
+        else:
+            groups.append(sorted(indexes.tolist()))
+    groups.sort()
+    return groups
+
+
+def fuse_tiled(shapes, tile_size=TILE_SIZE):
+    """Return the union of shapes, fused in tiles of tile_size shapes.
+
+    The shapes should be sorted so that neighbouring shapes are close
+    to each other, like the copies of an array in the order
+    they are created.
+    """
+    while len(shapes) > 1:
+        tiles = [shapes[i:i + tile_size]
+                 for i in range(0, len(shapes), tile_size)]
+        shapes = [t[0].multiFuse(t[1:]) if len(t) > 1 else t[0]
+                  for t in tiles]
+    return shapes[0]
+
+
+def fuse_shapes(shapes, tile_size=TILE_SIZE):
+    """Return the union of many shapes.
+
+    Only the shapes with overlapping bounding boxes are fused together,
+    each group of them with `fuse_tiled`, and the splitter is removed from
+    the fused groups. The other shapes are left as they are.
+
+    Returns
+    -------
+    Part::TopoShape
+        The fused shape if there is only one group of shapes,
+        otherwise a compound of the fused groups and the other shapes.
+    """
+    if len(shapes) < 2:
+        return Part.makeCompound(shapes)
+    result = []
+    for group in overlapping_groups(bound_boxes(shapes)):
+        if len(group) == 1:
+            result.append(shapes[group[0]])
+        else:
+            fused = fuse_tiled([shapes[i] for i in group], tile_size)
+            result.append(fused.removeSplitter())
+    if len(result) == 1:
+        return result[0]
+    return Part.makeCompound(result)
+
+## @}
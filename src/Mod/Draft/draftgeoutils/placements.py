@@ -0,0 +1,162 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Provides functions to work with many placements at once.
+
+The placements of the copies of an array are kept in a placement buffer,
+a NumPy array with one row `[x, y, z, qx, qy, qz, qw]` per placement:
+the position followed by the quaternion of the rotation, in the order
+of `App.Rotation.Q`. The placements of big arrays are computed
+on the whole buffer instead of one `App.Placement` at a time.
+
+The quaternions are multiplied like `App.Rotation`,
+`multiply(a, b)` is the rotation `b` followed by the rotation `a`.
+"""
+## @package placements
+# \ingroup draftgeoutils
+# \brief Provides functions to work with many placements at once.
+
+import lazy_loader.lazy_loader as lz
+
+import FreeCAD as App
+
+# Delay import of module until first use because it is heavy
+np = lz.LazyLoader("numpy", globals(), "numpy")
+
+## \addtogroup draftgeoutils
+# @{
+
+
+def is_buffer(placements):
+    """Return True if placements is a placement buffer."""
+    return isinstance(placements, np.ndarray)
+
+
+def vector(vec):
+    """Return a FreeCAD vector as NumPy array."""
+    return np.array((vec.x, vec.y, vec.z), dtype=float)
+
+
+def quaternion(rotation):
+    """Return the quaternion of a FreeCAD rotation as NumPy array."""
+    return np.array(rotation.Q, dtype=float)
+
+
+def from_placement(placement, count=1):
+    """Return a buffer of count copies of a placement."""
+    row = np.concatenate((vector(placement.Base), quaternion(placement.Rotation)))
+    return np.tile(row, (count, 1))
+
+
+def from_placements(placements):
+    """Return the buffer of a list of placements."""
+    buffer = np.empty((len(placements), 7))
+    for i, pla in enumerate(placements):
+        buffer[i, :3] = (pla.Base.x, pla.Base.y, pla.Base.z)
+        buffer[i, 3:] = pla.Rotation.Q
+    return buffer
+
+
+def to_placements(buffer):
+    """Return the list of placements of a buffer."""
+    return [App.Placement(App.Vector(r[0], r[1], r[2]),
+                          App.Rotation(r[3], r[4], r[5], r[6]))
+            for r in buffer.tolist()]
+
+
+def to_matrices(buffer):
+    """Return the list of transformation matrices of a buffer."""
+    x, y, z, w = (buffer[:, 3 + i] for i in range(4))
+    m = np.empty((len(buffer), 16))
+    m[:, 0] = 1 - 2 * (y * y + z * z)
+    m[:, 1] = 2 * (x * y - z * w)
+    m[:, 2] = 2 * (x * z + y * w)
+    m[:, 3] = buffer[:, 0]
+    m[:, 4] = 2 * (x * y + z * w)
+    m[:, 5] = 1 - 2 * (x * x + z * z)
+    m[:, 6] = 2 * (y * z - x * w)
+    m[:, 7] = buffer[:, 1]
+    m[:, 8] = 2 * (x * z - y * w)
+    m[:, 9] = 2 * (y * z + x * w)
+    m[:, 10] = 1 - 2 * (x * x + y * y)
+    m[:, 11] = buffer[:, 2]
+    m[:, 12:15] = 0
+    m[:, 15] = 1
+    return [App.Matrix(*row) for row in m.tolist()]
+
+
+def as_placements(placements):
+    """Return a list of placements, converting a buffer if needed."""
+    if is_buffer(placements):
+        return to_placements(placements)
+    return placements
+
+
+def as_matrices(placements):
+    """Return the matrices of a list of placements or of a buffer."""
+    if is_buffer(placements):
+        return to_matrices(placements)
+    return [pla.toMatrix() for pla in placements]
+
+
+def axis_quaternions(axis, angles):
+    """Return the quaternions of the rotations about an axis.
+
+    The angles are in degrees, a null axis gives no rotation.
+    """
+    axis = vector(axis)
+    length = np.linalg.norm(axis)
+    half = np.radians(np.asarray(angles, dtype=float)) / 2
+    q = np.zeros((len(half), 4))
+    if length > 0:
+        q[:, :3] = np.outer(np.sin(half), axis / length)
+        q[:, 3] = np.cos(half)
+    else:
+        q[:, 3] = 1
+    return q
+
+
+def multiply(a, b):
+    """Return the products of the quaternions a and b, row by row."""
+    x0, y0, z0, w0 = np.moveaxis(np.asarray(a), -1, 0)
+    x1, y1, z1, w1 = np.moveaxis(np.asarray(b), -1, 0)
+    return np.stack((w0 * x1 + x0 * w1 + y0 * z1 - z0 * y1,
+                     w0 * y1 - x0 * z1 + y0 * w1 + z0 * x1,
+                     w0 * z1 + x0 * y1 - y0 * x1 + z0 * w1,
+                     w0 * w1 - x0 * x1 - y0 * y1 - z0 * z1), axis=-1)
+
+
+def conjugate(q):
+    """Return the inverse rotations of unit quaternions."""
+    q = np.array(q, dtype=float)
+    q[..., :3] *= -1
+    return q
+
+
+def rotate(q, v):
+    """Return the vectors v rotated by the quaternions q, row by row."""
+    q = np.asarray(q)
+    u = q[..., :3]
+    t = 2 * np.cross(u, v)
+    return v + q[..., 3:] * t + np.cross(u, t)
+
+## @}
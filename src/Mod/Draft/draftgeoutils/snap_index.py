@@ -0,0 +1,276 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Provides a spatial index of the snap locations of shapes.
+
+The snapper looks for snap locations near the cursor on every mouse move.
+Walking all edges of a big shape, like a site plan with many thousand
+edges, for every move is too slow. Instead the edges are put once
+into a uniform grid of cells in working plane coordinates,
+and only the edges in the cells near the cursor are looked at.
+
+The endpoints, midpoints and intersections of these edges are computed
+when they are first needed and then kept in the index.
+The indexes of the last snapped objects are cached, an index is rebuilt
+when the shape of its object is recomputed or the working plane changes.
+"""
+## @package snap_index
+# \ingroup draftgeoutils
+# \brief Provides a spatial index of the snap locations of shapes.
+
+import collections
+import math
+
+import FreeCAD as App
+
+from draftgeoutils.general import geomType
+from draftgeoutils.edges import findMidpoint
+from draftgeoutils.intersections import findIntersection
+
+## \addtogroup draftgeoutils
+# @{
+
+# number of cached indexes, one per object
+CACHE_SIZE = 8
+
+# edges covering more cells are looked at for every query instead
+MAX_EDGE_CELLS = 64
+
+_cache = collections.OrderedDict()
+
+
+def plane_frame(plane=None):
+    """Return the origin and the u and v axes of the working plane.
+
+    If `plane` is `None` the current working plane is used,
+    or the global XY plane if there is none.
+    """
+    if plane is None:
+        plane = getattr(App, "DraftWorkingPlane", None)
+    if plane is None:
+        return (App.Vector(0, 0, 0), App.Vector(1, 0, 0), App.Vector(0, 1, 0))
+    return (App.Vector(plane.position), App.Vector(plane.u), App.Vector(plane.v))
+
+
+def _frame_key(frame):
+    return tuple(round(c, 9) for vec in frame for c in (vec.x, vec.y, vec.z))
+
+
+class SnapIndex(object):
+    """Uniform grid of the edges of a shape in working plane coordinates.
+
+    Parameters
+    ----------
+    shape: Part::TopoShape
+        The shape whose edges are indexed.
+    frame: tuple of three Base::Vector3, optional
+        The origin and the u and v axes of the plane the edges are
+        projected on. It defaults to the current working plane.
+    """
+
+    def __init__(self, shape, frame=None):
+        self.frame = frame or plane_frame()
+        self.edges = shape.Edges
+        self.boxes = [self._box(e.BoundBox) for e in self.edges]
+        self.cell = self._cell_size()
+        self._cells = collections.defaultdict(list)
+        self._big = []
+        for i, box in enumerate(self.boxes):
+            x0, y0, x1, y1 = self._cell_range(box)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > MAX_EDGE_CELLS:
+                self._big.append(i)
+                continue
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self._cells[(x, y)].append(i)
+        self._points = {}
+        self._crossings = {}
+
+    def project(self, point):
+        """Return the (u, v) coordinates of a point on the plane."""
+        origin, u, v = self.frame
+        d = point.sub(origin)
+        return (d.dot(u), d.dot(v))
+
+    def _box(self, bb):
+        # the extremes of the projected corners of the box, axis by axis
+        origin, u, v = self.frame
+        lows = (bb.XMin, bb.YMin, bb.ZMin)
+        highs = (bb.XMax, bb.YMax, bb.ZMax)
+        box = []
+        for axis in (u, v):
+            o = origin.dot(axis)
+            lo = hi = -o
+            for k, c in enumerate((axis.x, axis.y, axis.z)):
+                a = c * lows[k]
+                b = c * highs[k]
+                lo += min(a, b)
+                hi += max(a, b)
+            box.append((lo, hi))
+        return (box[0][0], box[1][0], box[0][1], box[1][1])
+
+    def _cell_size(self):
+        if not self.boxes:
+            return 1.0
+        umin = min(b[0] for b in self.boxes)
+        vmin = min(b[1] for b in self.boxes)
+        umax = max(b[2] for b in self.boxes)
+        vmax = max(b[3] for b in self.boxes)
+        sizes = sorted(max(b[2] - b[0], b[3] - b[1]) for b in self.boxes)
+        extent = max(umax - umin, vmax - vmin) / math.sqrt(len(self.boxes))
+        size = max(sizes[len(sizes) // 2], extent)
+        return size if size > 0 else 1.0
+
+    def _cell_range(self, box):
+        c = self.cell
+        return (int(math.floor(box[0] / c)), int(math.floor(box[1] / c)),
+                int(math.floor(box[2] / c)), int(math.floor(box[3] / c)))
+
+    def edges_in(self, box):
+        """Return the indexes of the edges whose bounding box overlaps box.
+
+        The box is (umin, vmin, umax, vmax) in plane coordinates.
+        """
+        x0, y0, x1, y1 = self._cell_range(box)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            candidates = range(len(self.edges))
+        else:
+            found = set(self._big)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    found.update(self._cells.get((x, y), ()))
+            candidates = sorted(found)
+        return [i for i in candidates if _overlap(self.boxes[i], box)]
+
+    def edges_near(self, point, radius):
+        """Return the indexes of the edges with a bounding box near point."""
+        pu, pv = self.project(point)
+        return self.edges_in((pu - radius, pv - radius,
+                              pu + radius, pv + radius))
+
+    def points(self, i):
+        """Return the endpoints and the midpoint of edge i.
+
+        The points are a list of [point, kind] with the kinds
+        'endpoint' and 'midpoint'.
+        """
+        points = self._points.get(i)
+        if points is None:
+            edge = self.edges[i]
+            points = [[v.Point, 'endpoint'] for v in edge.Vertexes]
+            mp = findMidpoint(edge)
+            if mp:
+                points.append([mp, 'midpoint'])
+            self._points[i] = points
+        return points
+
+    def points_near(self, point, radius):
+        """Return the endpoints and midpoints within radius of point."""
+        pu, pv = self.project(point)
+        found = []
+        for i in self.edges_near(point, radius):
+            for p in self.points(i):
+                du, dv = self.project(p[0])
+                if math.hypot(du - pu, dv - pv) <= radius:
+                    found.append(p)
+        return found
+
+    def intersections(self, edge, point=None, radius=0, project=None):
+        """Return the intersections of an edge with the indexed edges.
+
+        Only the indexed edges near the given point, or near the whole edge
+        if `point` is `None` or `radius` is 0, are intersected.
+        The edge itself is skipped if it is one of the indexed edges.
+
+        If `project` is given, lines are intersected after their endpoints
+        are projected with it, giving the apparent intersection of lines
+        which don't lie in the same plane.
+        """
+        box = self._box(edge.BoundBox)
+        if point is not None and radius:
+            pu, pv = self.project(point)
+            box = (max(box[0], pu - radius), max(box[1], pv - radius),
+                   min(box[2], pu + radius), min(box[3], pv + radius))
+            if box[0] > box[2] or box[1] > box[3]:
+                return []
+        key = edge.hashCode()
+        line = geomType(edge) == "Line"
+        found = []
+        for i in self.edges_in(box):
+            pts = self._crossings.get((key, i, project is not None))
+            if pts is None:
+                pts = self._intersect(edge, i, line, project)
+                self._crossings[(key, i, project is not None)] = pts
+            found.extend(pts)
+        return found
+
+    def _intersect(self, edge, i, line, project):
+        e = self.edges[i]
+        if e.isSame(edge):
+            return []
+        try:
+            if project and line and geomType(e) == "Line":
+                pts = findIntersection(project(e.Vertexes[0].Point),
+                                       project(e.Vertexes[-1].Point),
+                                       project(edge.Vertexes[0].Point),
+                                       project(edge.Vertexes[-1].Point),
+                                       True, True)
+            else:
+                pts = findIntersection(e, edge)
+        except Exception:
+            # some curve types yield an error
+            # when trying to read their types
+            return []
+        return list(pts or [])
+
+
+def _overlap(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def get_index(obj, frame=None):
+    """Return the snap index of the shape of an object.
+
+    The index is cached, it is built again if the shape of the object
+    has changed, for example by a recompute, or if the plane is different.
+    """
+    frame = frame or plane_frame()
+    shape = obj.Shape
+    key = (obj.Document.Name, obj.Name)
+    stamp = (shape.hashCode(), _frame_key(frame))
+    entry = _cache.pop(key, None)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, SnapIndex(shape, frame))
+    _cache[key] = entry
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return entry[1]
+
+
+def clear_cache(obj=None):
+    """Remove the index of an object, or of all objects, from the cache."""
+    if obj is None:
+        _cache.clear()
+    else:
+        _cache.pop((obj.Document.Name, obj.Name), None)
+
+## @}
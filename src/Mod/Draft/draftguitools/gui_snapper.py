@@ -49,6 +49,7 @@ import Draft
 import DraftVecUtils
 import DraftGeomUtils
 import draftguitools.gui_trackers as trackers
+import draftgeoutils.snap_index as snap_index
 
 from draftutils.init_tools import get_draft_snap_commands
 from draftutils.messages import _msg, _wrn
@@ -366,6 +367,9 @@ class Snapper:
 
         snaps = []
         self.lastSnappedObject = obj
+        origin = App.Vector(self.snapInfo['x'],
+                            self.snapInfo['y'],
+                            self.snapInfo['z'])
 
         if hasattr(obj.ViewObject, "Selectable"):
             if not obj.ViewObject.Selectable:
@@ -408,10 +412,14 @@ class Snapper:
                             if len(shape.Edges) > en:
                                 edge = shape.Edges[en]
                         if edge:
+                            # only plain objects have their edges indexed,
+                            # the shapes of linked objects are transformed
+                            indexed = obj if parent is obj else None
                             snaps.extend(self.snapToEndpoints(edge))
                             snaps.extend(self.snapToMidpoint(edge))
                             snaps.extend(self.snapToPerpendicular(edge, lastpoint))
-                            snaps.extend(self.snapToIntersection(edge))
+                            snaps.extend(self.snapToIntersection(edge, origin, indexed))
+                            snaps.extend(self.snapToNearby(indexed, origin))
                             snaps.extend(self.snapToElines(edge, eline))
 
                             et = DraftGeomUtils.geomType(edge)
@@ -480,9 +488,6 @@ class Snapper:
 
         # calculating the nearest snap point
         shortest = 1000000000000000000
-        origin = App.Vector(self.snapInfo['x'],
-                            self.snapInfo['y'],
-                            self.snapInfo['z'])
         winner = None
         fp = point
         for snap in snaps:
@@ -981,36 +986,61 @@ class Snapper:
         return snaps
 
 
-    def snapToIntersection(self, shape):
-        """Return a list of intersection snap locations."""
+    def snapToIntersection(self, shape, point=None, obj=None):
+        """Return a list of intersection snap locations.
+
+        The edge is intersected with the edges of the last object,
+        and with the other edges of the given object, if any.
+        Only the edges within the snap radius of the given point
+        are looked up in the snap index of the objects.
+        """
         snaps = []
         if self.isEnabled("Intersection"):
+            objs = []
             # get the stored objects to calculate intersections
             if self.lastObj[0]:
-                obj = App.ActiveDocument.getObject(self.lastObj[0])
-                if obj:
-                    if obj.isDerivedFrom("Part::Feature") or (Draft.getType(obj) == "Axis"):
-                        if (not self.maxEdges) or (len(obj.Shape.Edges) <= self.maxEdges):
-                            import Part
-                            for e in obj.Shape.Edges:
-                                # get the intersection points
-                                try:
-                                    if self.isEnabled("WorkingPlane") and hasattr(e,"Curve") and isinstance(e.Curve,(Part.Line,Part.LineSegment)) and hasattr(shape,"Curve") and isinstance(shape.Curve,(Part.Line,Part.LineSegment)):
-                                        # get apparent intersection (lines projected on WP)
-                                        p1 = self.toWP(e.Vertexes[0].Point)
-                                        p2 = self.toWP(e.Vertexes[-1].Point)
-                                        p3 = self.toWP(shape.Vertexes[0].Point)
-                                        p4 = self.toWP(shape.Vertexes[-1].Point)
-                                        pt = DraftGeomUtils.findIntersection(p1, p2, p3, p4, True, True)
-                                    else:
-                                        pt = DraftGeomUtils.findIntersection(e, shape)
-                                    if pt:
-                                        for p in pt:
-                                            snaps.append([p, 'intersection', self.toWP(p)])
-                                except:
-                                    pass
-                                    # some curve types yield an error
-                                    # when trying to read their types
+                last = App.ActiveDocument.getObject(self.lastObj[0])
+                if last and (last.isDerivedFrom("Part::Feature")
+                             or (Draft.getType(last) == "Axis")):
+                    objs.append(last)
+            if obj and obj not in objs and obj.isDerivedFrom("Part::Feature"):
+                objs.append(obj)
+            project = None
+            if self.isEnabled("WorkingPlane"):
+                # get apparent intersection (lines projected on WP)
+                project = self.toWP
+            for o in objs:
+                if (not self.maxEdges) or (len(o.Shape.Edges) <= self.maxEdges):
+                    index = snap_index.get_index(o)
+                    for p in index.intersections(shape, point, self.radius,
+                                                 project):
+                        snaps.append([p, 'intersection', self.toWP(p)])
+        return snaps
+
+
+    def snapToNearby(self, obj, point):
+        """Return the endpoints and midpoints of the edges near the point.
+
+        The edges of the object within the snap radius of the point
+        are looked up in the snap index of the object, so that short
+        edges next to the snapped edge can be snapped to as well.
+        """
+        snaps = []
+        if not obj or not self.radius:
+            return snaps
+        if not obj.isDerivedFrom("Part::Feature"):
+            return snaps
+        kinds = []
+        if self.isEnabled("Endpoint"):
+            kinds.append('endpoint')
+        if self.isEnabled("Midpoint"):
+            kinds.append('midpoint')
+        if kinds and ((not self.maxEdges)
+                      or (len(obj.Shape.Edges) <= self.maxEdges)):
+            index = snap_index.get_index(obj)
+            for p, kind in index.points_near(point, self.radius):
+                if kind in kinds:
+                    snaps.append([p, kind, self.toWP(p)])
         return snaps
 
 
@@ -34,13 +34,18 @@ split in separate classes so that they are easier to manage.
 ## \addtogroup draftobjects
 # @{
 import math
+import lazy_loader.lazy_loader as lz
 from PySide.QtCore import QT_TRANSLATE_NOOP
 
 import FreeCAD as App
 import DraftVecUtils
+import draftgeoutils.placements as placements
 
 from draftobjects.draftlink import DraftLink
 
+# Delay import of module until first use because it is heavy
+np = lz.LazyLoader("numpy", globals(), "numpy")
+
 
 class Array(DraftLink):
     """The Draft Array object.
@@ -400,24 +405,24 @@ class Array(DraftLink):
                 raise TypeError(_info)
 
         if obj.ArrayType == "ortho":
-            pls = rect_placements(obj.Base.Placement,
-                                  obj.IntervalX,
-                                  obj.IntervalY,
-                                  obj.IntervalZ,
-                                  obj.NumberX,
-                                  obj.NumberY,
-                                  obj.NumberZ)
+            pls = rect_placement_buffer(obj.Base.Placement,
+                                        obj.IntervalX,
+                                        obj.IntervalY,
+                                        obj.IntervalZ,
+                                        obj.NumberX,
+                                        obj.NumberY,
+                                        obj.NumberZ)
         elif obj.ArrayType == "polar":
             av = obj.IntervalAxis if hasattr(obj, "IntervalAxis") else None
-            pls = polar_placements(obj.Base.Placement,
-                                   center, obj.Angle.Value,
-                                   obj.NumberPolar, axis, av)
+            pls = polar_placement_buffer(obj.Base.Placement,
+                                         center, obj.Angle.Value,
+                                         obj.NumberPolar, axis, av)
         elif obj.ArrayType == "circular":
-            pls = circ_placements(obj.Base.Placement,
-                                  obj.RadialDistance,
-                                  obj.TangentialDistance,
-                                  axis, center,
-                                  obj.NumberCircles, obj.Symmetry)
+            pls = circ_placement_buffer(obj.Base.Placement,
+                                        obj.RadialDistance,
+                                        obj.TangentialDistance,
+                                        axis, center,
+                                        obj.NumberCircles, obj.Symmetry)
 
         return super(Array, self).buildShape(obj, pl, pls)
 
@@ -430,70 +435,73 @@ def rect_placements(base_placement,
                     xvector, yvector, zvector,
                     xnum, ynum, znum):
     """Determine the placements where the rectangular copies will be."""
-    pl = base_placement
-    placements = [pl.copy()]
-
-    for xcount in range(xnum):
-        currentxvector = App.Vector(xvector).multiply(xcount)
-        if xcount != 0:
-            npl = pl.copy()
-            npl.translate(currentxvector)
-            placements.append(npl)
-
-        for ycount in range(ynum):
-            currentyvector = App.Vector(currentxvector)
-            _y_shift = App.Vector(yvector).multiply(ycount)
-            currentyvector = currentyvector.add(_y_shift)
-            if ycount != 0:
-                npl = pl.copy()
-                npl.translate(currentyvector)
-                placements.append(npl)
-
-            for zcount in range(znum):
-                currentzvector = App.Vector(currentyvector)
-                _z_shift = App.Vector(zvector).multiply(zcount)
-                currentzvector = currentzvector.add(_z_shift)
-                if zcount != 0:
-                    npl = pl.copy()
-                    npl.translate(currentzvector)
-                    placements.append(npl)
-
-    return placements
+    return placements.to_placements(
+        rect_placement_buffer(base_placement,
+                              xvector, yvector, zvector,
+                              xnum, ynum, znum))
+
+
+def rect_placement_buffer(base_placement,
+                          xvector, yvector, zvector,
+                          xnum, ynum, znum):
+    """Return the placement buffer of the rectangular copies.
+
+    The copies are ordered by X, then Y, then Z,
+    see `draftgeoutils.placements`.
+    """
+    # like nested loops, no copies along an axis means none along the next
+    counts = [1, 1, 1]
+    for i, num in enumerate((xnum, ynum, znum)):
+        if num < 1:
+            break
+        counts[i] = num
+    index = np.indices(counts).reshape(3, -1).T
+    shifts = np.array([placements.vector(xvector),
+                       placements.vector(yvector),
+                       placements.vector(zvector)])
+    buffer = placements.from_placement(base_placement, len(index))
+    buffer[:, :3] += index.dot(shifts)
+    return buffer
 
 
 def polar_placements(base_placement,
                      center, angle,
                      number, axis, axisvector):
     """Determine the placements where the polar copies will be."""
-    # print("angle ",angle," num ",num)
-    placements = [base_placement.copy()]
+    return placements.to_placements(
+        polar_placement_buffer(base_placement,
+                               center, angle,
+                               number, axis, axisvector))
+
 
-    if number == 0:
-        return placements
+def polar_placement_buffer(base_placement,
+                           center, angle,
+                           number, axis, axisvector):
+    """Return the placement buffer of the polar copies.
 
-    spin = App.Placement(App.Vector(), base_placement.Rotation)
-    pl = App.Placement(base_placement.Base, App.Rotation())
-    center = center.sub(base_placement.Base)
+    See `draftgeoutils.placements`.
+    """
+    buffer = placements.from_placement(base_placement)
+    if number < 2:
+        return buffer
 
     if angle == 360:
         fraction = float(angle)/number
     else:
         fraction = float(angle)/(number - 1)
 
-    center_tuple = DraftVecUtils.tup(center)
-    axis_tuple = DraftVecUtils.tup(axis)
+    # each copy turns the base about the center, then adds the base rotation
+    steps = np.arange(1, number)
+    turns = placements.axis_quaternions(axis, fraction * steps)
+    base = placements.vector(base_placement.Base)
+    center = placements.vector(center) - base
 
-    for i in range(number - 1):
-        currangle = fraction + (i*fraction)
-        npl = pl.copy()
-        npl.rotate(center_tuple, axis_tuple, currangle)
-        npl = npl.multiply(spin)
-        if axisvector:
-            if not DraftVecUtils.isNull(axisvector):
-                npl.translate(App.Vector(axisvector).multiply(i+1))
-        placements.append(npl)
-
-    return placements
+    copies = np.empty((number - 1, 7))
+    copies[:, :3] = base + center - placements.rotate(turns, center)
+    if axisvector and not DraftVecUtils.isNull(axisvector):
+        copies[:, :3] += np.outer(steps, placements.vector(axisvector))
+    copies[:, 3:] = placements.multiply(turns, buffer[0, 3:])
+    return np.vstack((buffer, copies))
 
 
 def circ_placements(base_placement,
@@ -501,6 +509,21 @@ def circ_placements(base_placement,
                     axis, center,
                     circle_number, symmetry):
     """Determine the placements where the circular copies will be."""
+    return placements.to_placements(
+        circ_placement_buffer(base_placement,
+                              r_distance, tan_distance,
+                              axis, center,
+                              circle_number, symmetry))
+
+
+def circ_placement_buffer(base_placement,
+                          r_distance, tan_distance,
+                          axis, center,
+                          circle_number, symmetry):
+    """Return the placement buffer of the circular copies.
+
+    See `draftgeoutils.placements`.
+    """
     symmetry = max(1, symmetry)
     lead = (0, 1, 0)
 
@@ -508,8 +531,10 @@ def circ_placements(base_placement,
         lead = (1, 0, 0)
 
     direction = axis.cross(App.Vector(lead)).normalize()
-    placements = [base_placement.copy()]
+    buffer = placements.from_placement(base_placement)
 
+    radii = []
+    angles = []
     for xcount in range(1, circle_number):
         rc = xcount * r_distance
         c = 2 * rc * math.pi
@@ -517,17 +542,26 @@ def circ_placements(base_placement,
         n = int(math.floor(n / symmetry) * symmetry)
         if n == 0:
             continue
-
-        angle = 360.0/n
-        for ycount in range(0, n):
-            npl = base_placement.copy()
-            trans = App.Vector(direction).multiply(rc)
-            npl.translate(trans)
-            npl.rotate(npl.Rotation.inverted().multVec(center-trans),
-                       axis,
-                       ycount * angle)
-            placements.append(npl)
-
-    return placements
+        radii.append(np.full(n, rc))
+        angles.append(np.arange(n) * (360.0/n))
+    if not radii:
+        return buffer
+
+    # each copy is moved out along the direction, then turned about
+    # the axis in the coordinate system of the base placement
+    shifts = np.outer(np.concatenate(radii), placements.vector(direction))
+    base_rotation = buffer[0, 3:]
+    rotations = placements.multiply(
+        base_rotation,
+        placements.axis_quaternions(axis, np.concatenate(angles)))
+    turns = placements.multiply(rotations,
+                                placements.conjugate(base_rotation))
+    center = placements.vector(center)
+
+    copies = np.empty((len(shifts), 7))
+    copies[:, :3] = (buffer[0, :3] + center
+                     - placements.rotate(turns, center - shifts))
+    copies[:, 3:] = rotations
+    return np.vstack((buffer, copies))
 
 ## @}
@@ -38,6 +38,8 @@ import lazy_loader.lazy_loader as lz
 from PySide.QtCore import QT_TRANSLATE_NOOP
 
 import FreeCAD as App
+import draftgeoutils.fusion as fusion
+import draftgeoutils.placements as placements
 
 from draftutils.messages import _wrn
 from draftobjects.base import DraftObject
@@ -168,11 +170,15 @@ class DraftLink(DraftObject):
                 self.execute(obj)
 
     def buildShape(self, obj, pl, pls):
-        """Build the shape of the link object."""
+        """Build the shape of the link object.
+
+        The placements of the copies `pls` are a list of placements,
+        or a placement buffer of `draftgeoutils.placements`.
+        """
         if self.use_link:
             if not getattr(obj, 'ExpandArray', True) or obj.Count != len(pls):
                 obj.setPropertyStatus('PlacementList', '-Immutable')
-                obj.PlacementList = pls
+                obj.PlacementList = placements.as_placements(pls)
                 obj.setPropertyStatus('PlacementList', 'Immutable')
                 obj.Count = len(pls)
 
@@ -185,21 +191,29 @@ class DraftLink(DraftObject):
                             "from '{}'\n".format(obj.Label, obj.Base.Label))
                 raise RuntimeError(_err_msg)
             else:
-                shape = shape.copy()
+                # The copies are located references to the geometry
+                # of the base shape, which isn't copied
+                fuse = getattr(obj, 'Fuse', False)
+                shape = Part.Shape(shape)
                 shape.Placement = App.Placement()
+                if fuse:
+                    # the copies which don't touch others aren't fused
+                    shape = shape.removeSplitter()
                 base = []
-                for i, pla in enumerate(pls):
-                    vis = getattr(obj, 'VisibilityList', [])
+                vis = getattr(obj, 'VisibilityList', [])
+                for i, mat in enumerate(placements.as_matrices(pls)):
                     if len(vis) > i and not vis[i]:
                         continue
 
-                    # 'I' is a prefix for disambiguation
-                    # when mapping element names
-                    base.append(shape.transformed(pla.toMatrix(),
-                                                  op='I{}'.format(i)))
+                    if fuse:
+                        # 'I' is a prefix for disambiguation
+                        # when mapping element names
+                        base.append(shape.transformed(mat, op='I{}'.format(i)))
+                    else:
+                        base.append(shape.transformed(mat))
 
-                if getattr(obj, 'Fuse', False) and len(base) > 1:
-                    obj.Shape = base[0].multiFuse(base[1:]).removeSplitter()
+                if fuse and len(base) > 1:
+                    obj.Shape = fusion.fuse_shapes(base)
                 else:
                     obj.Shape = Part.makeCompound(base)
 
@@ -63,6 +63,9 @@ a single property of type `App::PropertyLinkSub`.
 # \ingroup draftobjects
 # \brief Provides the object code for the PathArray object.
 
+import bisect
+import itertools
+
 import FreeCAD as App
 import DraftVecUtils
 import lazy_loader.lazy_loader as lz
@@ -453,12 +456,10 @@ def placements_on_path(shapeRotation, pathwire, count, xlate, align,
         normal = normalOverride
 
     path = Part.__sortEdges__(pathwire.Edges)
-    ends = []
-    cdist = 0
-
-    for e in path:  # find cumulative edge end distance
-        cdist += e.Length
-        ends.append(cdist)
+    # find cumulative edge end distance
+    ends = list(itertools.accumulate(e.Length for e in path))
+    cdist = ends[-1]
+    flipped = [None] * len(path)
 
     placements = []
 
@@ -488,27 +489,25 @@ def placements_on_path(shapeRotation, pathwire, count, xlate, align,
     else:
         stop = count - 1
     step = float(cdist) / stop
-    remains = 0
     travel = step
     for i in range(1, stop):
         # which edge in path should contain this shape?
         # avoids problems with float math travel > ends[-1]
-        iend = len(ends) - 1
-
-        for j in range(0, len(ends)):
-            if travel <= ends[j]:
-                iend = j
-                break
+        iend = min(bisect.bisect_left(ends, travel), len(ends) - 1)
+        edge = path[iend]
+        if flipped[iend] is None:
+            flipped[iend] = is_flipped(edge)
 
         # place shape at proper spot on proper edge
         remains = ends[iend] - travel
-        offset = path[iend].Length - remains
-        pt = path[iend].valueAt(get_parameter_from_v0(path[iend], offset))
-
-        _place = calculate_placement(shapeRotation,
-                                     path[iend], offset,
-                                     pt, xlate, align, normal,
-                                     mode, forceNormal)
+        offset = edge.Length - remains
+        param = parameter_at(edge, offset, flipped[iend])
+        pt = edge.valueAt(param)
+
+        _place = placement_at(shapeRotation,
+                              edge, param,
+                              pt, xlate, align, normal,
+                              mode, forceNormal)
         placements.append(_place)
 
         travel += step
@@ -529,6 +528,26 @@ def calculate_placement(globalRotation,
     http://en.wikipedia.org/wiki/Euler_angles (previous version)
     http://en.wikipedia.org/wiki/Quaternions
     """
+    if not align:
+        param = None
+    else:
+        param = get_parameter_from_v0(edge, offset)
+    return placement_at(globalRotation,
+                        edge, param, RefPt, xlate, align, normal,
+                        mode, overrideNormal)
+
+
+calculatePlacement = calculate_placement
+
+
+def placement_at(globalRotation,
+                 edge, param, RefPt, xlate, align, normal=None,
+                 mode='Original', overrideNormal=False):
+    """Orient shape to the local coordinate system at a parameter of edge.
+
+    Like `calculate_placement`, but with the parameter of the edge
+    already known, so that it is computed only once for each copy.
+    """
     # Start with a null Placement so the translation goes to the right place.
     # Then apply the global orientation.
     placement = App.Placement()
@@ -544,7 +563,7 @@ def calculate_placement(globalRotation,
         defNormal = normal
 
     try:
-        t = edge.tangentAt(get_parameter_from_v0(edge, offset))
+        t = edge.tangentAt(param)
         t.normalize()
     except:
         _wrn(_tr("Cannot calculate path tangent. Copy not aligned."))
@@ -576,7 +595,7 @@ def calculate_placement(globalRotation,
 
     elif mode == 'Frenet':
         try:
-            n = edge.normalAt(get_parameter_from_v0(edge, offset))
+            n = edge.normalAt(param)
             n.normalize()
         except App.Base.FreeCADError:  # no/infinite normals here
             n = defNormal
@@ -603,18 +622,27 @@ def calculate_placement(globalRotation,
     return placement
 
 
-calculatePlacement = calculate_placement
-
-
 def get_parameter_from_v0(edge, offset):
     """Return parameter at distance offset from edge.Vertexes[0].
 
     sb method in Part.TopoShapeEdge???
     """
+    return parameter_at(edge, offset, is_flipped(edge))
+
+
+def is_flipped(edge):
+    """Return True if the parametrization of edge starts at its last vertex."""
     lpt = edge.valueAt(edge.getParameterByLength(0))
     vpt = edge.Vertexes[0].Point
+    return not DraftVecUtils.equals(vpt, lpt)
+
 
-    if not DraftVecUtils.equals(vpt, lpt):
+def parameter_at(edge, offset, flipped):
+    """Return parameter at distance offset from edge.Vertexes[0].
+
+    `flipped` is the result of `is_flipped(edge)`.
+    """
+    if flipped:
         # this edge is flipped
         length = edge.Length - offset
     else:
@@ -42,6 +42,7 @@ from PySide.QtCore import QT_TRANSLATE_NOOP
 
 import FreeCAD as App
 import draftutils.utils as utils
+import draftgeoutils.placements as placements
 
 from draftutils.messages import _wrn, _err
 from draftutils.translate import translate, _tr
@@ -131,7 +132,7 @@ class PointArray(DraftLink):
         """Run when the object is created or recomputed."""
 
         pt_list, count = get_point_list(obj.PointObject)
-        pls = build_placements(obj.Base, pt_list, obj.ExtraPlacement)
+        pls = build_placement_buffer(obj.Base, pt_list, obj.ExtraPlacement)
 
         return super(PointArray, self).buildShape(obj, obj.Placement, pls)
 
@@ -251,24 +252,35 @@ def build_placements(base_object, pt_list=None, placement=App.Placement()):
     -------
     list(App.Placement)
     """
+    buffer = build_placement_buffer(base_object, pt_list, placement)
+    return placements.to_placements(buffer)
+
+
+def build_placement_buffer(base_object, pt_list=None,
+                           placement=App.Placement()):
+    """Build the placement buffer from the base object and list of points.
+
+    Returns
+    -------
+    numpy.ndarray
+        The placement buffer of the copies, see `draftgeoutils.placements`.
+    """
     if not pt_list:
         _err(translate("Draft",
                        "Point object doesn't have a discrete point, "
                        "it cannot be used for an array."))
-        return []
+        return placements.from_placements([])
 
-    pls = list()
+    # Reset the position of the copies, and combine the original rotation
+    # with the provided rotation. Two rotations (quaternions)
+    # are combined by multiplying them.
+    # The rotation is the same for all copies.
+    new_pla = base_object.Placement.copy()
+    new_pla.Base = placement.Base
+    new_pla.Rotation = new_pla.Rotation * placement.Rotation
 
+    shifts = []
     for point in pt_list:
-        new_pla = base_object.Placement.copy()
-        original_rotation = new_pla.Rotation
-
-        # Reset the position of the copy, and combine the original rotation
-        # with the provided rotation. Two rotations (quaternions)
-        # are combined by multiplying them.
-        new_pla.Base = placement.Base
-        new_pla.Rotation = original_rotation * placement.Rotation
-
         if point.TypeId == "Part::Vertex":
             # For this object the final position is the value of the Placement
             # plus the value of the X, Y, Z properties
@@ -298,11 +310,12 @@ def build_placements(base_object, pt_list=None, placement=App.Placement()):
             # translate by the X, Y, Z coordinates
             place = App.Vector(point.X, point.Y, point.Z)
 
-        new_pla.translate(place)
+        shifts.append((place.x, place.y, place.z))
 
-        pls.append(new_pla)
+    buffer = placements.from_placement(new_pla, len(shifts))
+    buffer[:, :3] += shifts
+    return buffer
 
-    return pls
 
 def build_copies(base_object, pt_list=None, placement=App.Placement()):
     """Build a compound of copies from the base object and list of points.
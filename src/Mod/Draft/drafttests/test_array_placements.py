@@ -0,0 +1,377 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Unit tests for the Draft Workbench, array placement tests."""
+## @package test_array_placements
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, array placement tests.
+
+## \addtogroup drafttests
+# @{
+import math
+import os
+import time
+import unittest
+
+import FreeCAD as App
+import DraftGeomUtils
+import Part
+import drafttests.auxiliary as aux
+import draftgeoutils.placements as placements
+import draftobjects.array as array
+import draftobjects.patharray as patharray
+import draftobjects.pointarray as pointarray
+
+from FreeCAD import Vector
+from draftutils.messages import _msg
+
+# the timings of big arrays are only run if this environment variable is set
+BENCHMARK = "FREECAD_BENCHMARKS"
+
+
+def loop_rect_placements(base, xvector, yvector, zvector, xnum, ynum, znum):
+    """Rectangular placements, one placement at a time as before the buffer."""
+    placements = [base.copy()]
+    for xcount in range(xnum):
+        currentxvector = Vector(xvector).multiply(xcount)
+        if xcount != 0:
+            npl = base.copy()
+            npl.translate(currentxvector)
+            placements.append(npl)
+        for ycount in range(ynum):
+            currentyvector = currentxvector.add(Vector(yvector).multiply(ycount))
+            if ycount != 0:
+                npl = base.copy()
+                npl.translate(currentyvector)
+                placements.append(npl)
+            for zcount in range(znum):
+                currentzvector = currentyvector.add(Vector(zvector).multiply(zcount))
+                if zcount != 0:
+                    npl = base.copy()
+                    npl.translate(currentzvector)
+                    placements.append(npl)
+    return placements
+
+
+def loop_polar_placements(base, center, angle, number, axis, axisvector):
+    """Polar placements, one placement at a time as before the buffer."""
+    placements = [base.copy()]
+    spin = App.Placement(Vector(), base.Rotation)
+    pl = App.Placement(base.Base, App.Rotation())
+    center = center.sub(base.Base)
+    if angle == 360:
+        fraction = float(angle)/number
+    else:
+        fraction = float(angle)/(number - 1)
+    for i in range(number - 1):
+        npl = pl.copy()
+        npl.rotate(center, axis, fraction + i*fraction)
+        npl = npl.multiply(spin)
+        if axisvector:
+            npl.translate(Vector(axisvector).multiply(i + 1))
+        placements.append(npl)
+    return placements
+
+
+def loop_circ_placements(base, r_distance, tan_distance, axis, center,
+                         circle_number, symmetry):
+    """Circular placements, one placement at a time as before the buffer."""
+    lead = (0, 1, 0)
+    if axis.x == 0 and axis.z == 0:
+        lead = (1, 0, 0)
+    direction = axis.cross(Vector(lead)).normalize()
+    placements = [base.copy()]
+    for xcount in range(1, circle_number):
+        rc = xcount * r_distance
+        n = math.floor(2 * rc * math.pi / tan_distance)
+        n = int(math.floor(n / symmetry) * symmetry)
+        for ycount in range(n):
+            npl = base.copy()
+            trans = Vector(direction).multiply(rc)
+            npl.translate(trans)
+            npl.rotate(npl.Rotation.inverted().multVec(center - trans),
+                       axis, ycount * 360.0 / n)
+            placements.append(npl)
+    return placements
+
+
+def loop_placements_on_path(rotation, pathwire, count, xlate, align):
+    """Placements along a closed path, searching the edge of every copy
+    and computing its parameter for the point and again for the tangent,
+    as before."""
+    normal = DraftGeomUtils.get_normal(pathwire)
+    if normal is None:
+        normal = Vector(0, 0, 1)
+    path = Part.__sortEdges__(pathwire.Edges)
+    ends = []
+    cdist = 0
+    for e in path:
+        cdist += e.Length
+        ends.append(cdist)
+    placements = [patharray.calculate_placement(
+        rotation, path[0], 0, path[0].Vertexes[0].Point, xlate, align,
+        normal)]
+    step = float(cdist) / count
+    travel = step
+    for i in range(1, count):
+        iend = len(ends) - 1
+        for j in range(0, len(ends)):
+            if travel <= ends[j]:
+                iend = j
+                break
+        offset = path[iend].Length - (ends[iend] - travel)
+        pt = path[iend].valueAt(
+            patharray.get_parameter_from_v0(path[iend], offset))
+        placements.append(patharray.calculate_placement(
+            rotation, path[iend], offset, pt, xlate, align, normal))
+        travel += step
+    return placements
+
+
+def loop_build_placements(base_object, pt_list, placement):
+    """Placements on Part::Vertex points, one placement at a time
+    as before the buffer."""
+    pls = []
+    for point in pt_list:
+        new_pla = base_object.Placement.copy()
+        new_pla.Base = placement.Base
+        new_pla.Rotation = new_pla.Rotation * placement.Rotation
+        new_pla.translate(Vector(point.X, point.Y, point.Z)
+                          + point.Placement.Base)
+        pls.append(new_pla)
+    return pls
+
+
+class DraftArrayPlacements(unittest.TestCase):
+    """Test the placements of the copies of the arrays."""
+
+    def setUp(self):
+        """Set up a new document to hold the tests."""
+        aux.draw_header()
+        self.doc_name = self.__class__.__name__
+        if App.ActiveDocument:
+            if App.ActiveDocument.Name != self.doc_name:
+                App.newDocument(self.doc_name)
+        else:
+            App.newDocument(self.doc_name)
+        App.setActiveDocument(self.doc_name)
+        self.doc = App.ActiveDocument
+        self.base = App.Placement(Vector(1, 2, 3),
+                                  App.Rotation(Vector(1, 2, 0.5), 33))
+        _msg("  Temporary document '{}'".format(self.doc_name))
+
+    def assert_placements(self, expected, placements):
+        self.assertEqual(len(expected), len(placements))
+        for a, b in zip(expected, placements):
+            self.assertTrue(a.isSame(b, 1e-9), "{} != {}".format(a, b))
+
+    def test_buffer(self):
+        """Convert placements to a buffer and back."""
+        _msg("  Test 'placements' buffer")
+        pls = [self.base, App.Placement(), App.Placement(Vector(5, 0, 0),
+                                                         App.Rotation(0, 0, 90))]
+        buffer = placements.from_placements(pls)
+        self.assertTrue(placements.is_buffer(buffer))
+        self.assert_placements(pls, placements.to_placements(buffer))
+        for pla, mat in zip(pls, placements.to_matrices(buffer)):
+            self.assertTrue(pla.isSame(App.Placement(mat), 1e-9))
+
+    def test_rect(self):
+        """Compare the rectangular placements with a loop of placements."""
+        _msg("  Test 'rect_placements'")
+        x, y, z = Vector(10, 0, 1), Vector(0, 5, 0), Vector(1, 1, 7)
+        expected = [self.base.copy()]
+        for i in range(3):
+            for j in range(4):
+                for k in range(2):
+                    if i or j or k:
+                        pla = self.base.copy()
+                        pla.translate(x * i + y * j + z * k)
+                        expected.append(pla)
+        self.assert_placements(expected,
+                               array.rect_placements(self.base, x, y, z,
+                                                     3, 4, 2))
+
+    def test_polar(self):
+        """Compare the polar placements with a loop of placements."""
+        _msg("  Test 'polar_placements'")
+        center = Vector(4, -3, 1)
+        axis = Vector(0.2, 0.1, 1)
+        shift = Vector(0, 0, 2)
+        spin = App.Placement(Vector(), self.base.Rotation)
+        expected = [self.base.copy()]
+        for i in range(1, 5):
+            pla = App.Placement(self.base.Base, App.Rotation())
+            pla.rotate(center - self.base.Base, axis, 45 * i)
+            pla = pla.multiply(spin)
+            pla.translate(shift * i)
+            expected.append(pla)
+        self.assert_placements(expected,
+                               array.polar_placements(self.base, center, 180,
+                                                      5, axis, shift))
+
+    def test_circular(self):
+        """Compare the circular placements with a loop of placements."""
+        _msg("  Test 'circ_placements'")
+        cases = [(5.0, 3.0, Vector(0, 0, 1), Vector(0, 0, 0), 3, 1),
+                 (4.0, 2.5, Vector(0, 1, 0), Vector(2, 1, -3), 4, 4),
+                 (6.0, 2.0, Vector(1, 0.5, 2), Vector(1, 0, 0), 3, 3),
+                 (1.0, 10.0, Vector(0, 0, 1), Vector(0, 0, 0), 2, 1)]
+        for r_distance, tan_distance, axis, center, number, symmetry in cases:
+            lead = (0, 1, 0)
+            if axis.x == 0 and axis.z == 0:
+                lead = (1, 0, 0)
+            direction = axis.cross(Vector(lead)).normalize()
+            expected = [self.base.copy()]
+            for i in range(1, number):
+                radius = i * r_distance
+                n = math.floor(2 * radius * math.pi / tan_distance)
+                n = int(math.floor(n / symmetry) * symmetry)
+                for j in range(n):
+                    pla = self.base.copy()
+                    trans = Vector(direction).multiply(radius)
+                    pla.translate(trans)
+                    pla.rotate(pla.Rotation.inverted().multVec(center - trans),
+                               axis, j * 360.0 / n)
+                    expected.append(pla)
+            self.assert_placements(expected,
+                                   array.circ_placements(self.base,
+                                                         r_distance,
+                                                         tan_distance,
+                                                         axis, center,
+                                                         number, symmetry))
+
+    def test_path(self):
+        """Place copies at even distances along a closed path."""
+        _msg("  Test 'placements_on_path'")
+        square = Part.makePolygon([Vector(0, 0, 0), Vector(10, 0, 0),
+                                   Vector(10, 10, 0), Vector(0, 10, 0),
+                                   Vector(0, 0, 0)])
+        pls = patharray.placements_on_path(App.Rotation(), square, 8,
+                                           Vector(0, 0, 0), True)
+        points = [(round(p.Base.x, 6), round(p.Base.y, 6)) for p in pls]
+        self.assertEqual(points, [(0, 0), (5, 0), (10, 0), (10, 5),
+                                  (10, 10), (5, 10), (0, 10), (0, 5)])
+        # the copies on the same edge have the same orientation
+        self.assertTrue(pls[0].Rotation.isSame(pls[1].Rotation, 1e-9))
+        self.assertFalse(pls[1].Rotation.isSame(pls[3].Rotation, 1e-9))
+
+    def test_point(self):
+        """Place copies on the points of a compound of vertices."""
+        _msg("  Test 'build_placements'")
+        extra = App.Placement(Vector(5, 0, 1), App.Rotation(Vector(0, 0, 1), 20))
+        points = []
+        for p in (Vector(1, 2, 3), Vector(7, 8, 9)):
+            points.append(self.doc.addObject("Part::Vertex", "Point"))
+            points[-1].Placement = App.Placement(p, App.Rotation())
+        base = self.doc.addObject("Part::Box", "Box")
+        base.Placement = self.base
+        pls = pointarray.build_placements(base, points, extra)
+        self.assertEqual(len(pls), 2)
+        self.assertTrue(pls[0].Base.isEqual(Vector(6, 2, 4), 1e-9))
+        self.assertTrue(pls[1].Base.isEqual(Vector(12, 8, 10), 1e-9))
+        rotation = self.base.Rotation.multiply(extra.Rotation)
+        for pla in pls:
+            self.assertTrue(pla.Rotation.isSame(rotation, 1e-9))
+
+    def test_big_arrays(self):
+        """Check the number and the last placements of big arrays."""
+        _msg("  Test placements of big arrays")
+        pls = array.rect_placements(self.base, Vector(10, 0, 0),
+                                    Vector(0, 10, 0), Vector(0, 0, 10),
+                                    100, 100, 2)
+        self.assertEqual(len(pls), 20000)
+        self.assertTrue(pls[-1].Base.isEqual(self.base.Base
+                                             + Vector(990, 990, 10), 1e-9))
+        self.assertTrue(pls[-1].Rotation.isSame(self.base.Rotation, 1e-9))
+
+        pls = array.polar_placements(self.base, Vector(0, 0, 0), 360, 20000,
+                                     Vector(0, 0, 1), None)
+        self.assertEqual(len(pls), 20000)
+        last = App.Placement(self.base.Base, App.Rotation())
+        last.rotate(Vector(0, 0, 0) - self.base.Base, Vector(0, 0, 1),
+                    360 * 19999 / 20000.0)
+        last = last.multiply(App.Placement(Vector(), self.base.Rotation))
+        self.assertTrue(pls[-1].isSame(last, 1e-9))
+
+        circle = Part.Wire(Part.makeCircle(100))
+        pls = patharray.placements_on_path(App.Rotation(), circle, 2000,
+                                           Vector(0, 0, 0), True)
+        self.assertEqual(len(pls), 2000)
+        for pla in pls[::100]:
+            self.assertAlmostEqual(pla.Base.Length, 100)
+
+        points = []
+        for i in range(20):
+            points.append(self.doc.addObject("Part::Vertex", "Point"))
+            points[-1].X = i
+        base = self.doc.addObject("Part::Box", "Box")
+        pls = pointarray.build_placements(base, points, App.Placement())
+        self.assertEqual([pla.Base.x for pla in pls], list(range(20)))
+
+    @unittest.skipUnless(os.environ.get(BENCHMARK),
+                         "set {} to time big arrays".format(BENCHMARK))
+    def test_timings(self):
+        """Print the time taken by big arrays, before and with the buffer."""
+        _msg("  Test timings of big arrays")
+        circle = Part.Wire(Part.makeCircle(100))
+        points = []
+        for i in range(500):
+            points.append(self.doc.addObject("Part::Vertex", "Point"))
+            points[-1].X = i
+        base = self.doc.addObject("Part::Box", "Box")
+        cases = [("rect", loop_rect_placements, array.rect_placement_buffer,
+                  (self.base, Vector(10, 0, 0), Vector(0, 10, 0),
+                   Vector(0, 0, 10), 100, 100, 2)),
+                 ("polar", loop_polar_placements,
+                  array.polar_placement_buffer,
+                  (self.base, Vector(0, 0, 0), 360, 20000,
+                   Vector(0, 0, 1), None)),
+                 ("circular", loop_circ_placements,
+                  array.circ_placement_buffer,
+                  (self.base, 10.0, 1.0, Vector(0, 0, 1),
+                   Vector(0, 0, 0), 60, 1)),
+                 ("path", loop_placements_on_path,
+                  patharray.placements_on_path,
+                  (App.Rotation(), circle, 2000, Vector(0, 0, 0), True)),
+                 ("point", loop_build_placements,
+                  pointarray.build_placement_buffer,
+                  (base, points, App.Placement()))]
+        for name, loop, func, args in cases:
+            start = time.time()
+            expected = loop(*args)
+            middle = time.time()
+            pls = func(*args)
+            end = time.time()
+            self.assertEqual(len(pls), len(expected))
+            _msg("  {0}: {1} placements, loop {2:.3f} s, "
+                 "buffer {3:.3f} s".format(name, len(pls), middle - start,
+                                           end - middle))
+
+    def tearDown(self):
+        """Finish the test.
+
+        This is executed after each test, so we close the document.
+        """
+        App.closeDocument(self.doc_name)
+
+## @}
@@ -0,0 +1,105 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Unit tests for the Draft Workbench, fusion tests."""
+## @package test_fusion
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, fusion tests.
+
+## \addtogroup drafttests
+# @{
+import unittest
+
+import FreeCAD as App
+import Part
+import drafttests.auxiliary as aux
+import draftgeoutils.fusion as fusion
+
+from FreeCAD import Vector
+from draftutils.messages import _msg
+
+
+def row_of_boxes(count, step, gap_every=0, gap=0):
+    """Return a row of unit boxes, with a gap after every gap_every boxes."""
+    boxes = []
+    x = 0
+    for i in range(count):
+        if gap_every and i and i % gap_every == 0:
+            x += gap
+        boxes.append(Part.makeBox(1, 1, 1, Vector(x, 0, 0)))
+        x += step
+    return boxes
+
+
+class DraftFusion(unittest.TestCase):
+    """Test the fusion of many shapes."""
+
+    def setUp(self):
+        """Set up a new document to hold the tests."""
+        aux.draw_header()
+        self.doc_name = self.__class__.__name__
+        if App.ActiveDocument:
+            if App.ActiveDocument.Name != self.doc_name:
+                App.newDocument(self.doc_name)
+        else:
+            App.newDocument(self.doc_name)
+        App.setActiveDocument(self.doc_name)
+        self.doc = App.ActiveDocument
+        _msg("  Temporary document '{}'".format(self.doc_name))
+
+    def test_overlapping_groups(self):
+        """Split boxes into groups which don't overlap."""
+        _msg("  Test 'overlapping_groups'")
+        # touching boxes in three rows of four, the rows apart
+        shapes = row_of_boxes(12, 1, 4, 0.5)
+        groups = fusion.overlapping_groups(fusion.bound_boxes(shapes))
+        self.assertEqual(groups, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]])
+
+        # boxes apart along Y in a single row along X
+        shapes = [Part.makeBox(1, 1, 1, Vector(i % 2, 2 * (i % 2), 0))
+                  for i in range(4)]
+        groups = fusion.overlapping_groups(fusion.bound_boxes(shapes))
+        self.assertEqual(groups, [[0, 2], [1, 3]])
+
+    def test_fuse_shapes(self):
+        """Fuse overlapping boxes in tiles."""
+        _msg("  Test 'fuse_shapes'")
+        shapes = row_of_boxes(40, 0.5)
+        fused = fusion.fuse_shapes(shapes, tile_size=4)
+        self.assertEqual(len(fused.Solids), 1)
+        self.assertAlmostEqual(fused.Volume, 20.5)
+        # the splitter is removed
+        self.assertEqual(len(fused.Faces), 6)
+
+        shapes = row_of_boxes(8, 0.5, 4, 1)
+        fused = fusion.fuse_shapes(shapes, tile_size=3)
+        self.assertEqual(len(fused.Solids), 2)
+        self.assertAlmostEqual(fused.Volume, 5)
+
+    def tearDown(self):
+        """Finish the test.
+
+        This is executed after each test, so we close the document.
+        """
+        App.closeDocument(self.doc_name)
+
+## @}
@@ -0,0 +1,119 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   FreeCAD is distributed in the hope that it will be useful,            *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with FreeCAD; if not, write to the Free Software        *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+"""Unit tests for the Draft Workbench, snap index tests."""
+## @package test_snap_index
+# \ingroup drafttests
+# \brief Unit tests for the Draft Workbench, snap index tests.
+
+## \addtogroup drafttests
+# @{
+import unittest
+
+import FreeCAD as App
+import Part
+import drafttests.auxiliary as aux
+import draftgeoutils.snap_index as snap_index
+
+from FreeCAD import Vector
+from draftutils.messages import _msg
+
+
+def grid_of_lines(count, length):
+    """Return a compound of count horizontal and count vertical lines."""
+    edges = []
+    for i in range(count):
+        edges.append(Part.makeLine(Vector(0, i, 0), Vector(length, i, 0)))
+        edges.append(Part.makeLine(Vector(i, 0, 0), Vector(i, length, 0)))
+    return Part.makeCompound(edges)
+
+
+class DraftSnapIndex(unittest.TestCase):
+    """Test the spatial index of the snap locations."""
+
+    def setUp(self):
+        """Set up a new document to hold the tests."""
+        aux.draw_header()
+        self.doc_name = self.__class__.__name__
+        if App.ActiveDocument:
+            if App.ActiveDocument.Name != self.doc_name:
+                App.newDocument(self.doc_name)
+        else:
+            App.newDocument(self.doc_name)
+        App.setActiveDocument(self.doc_name)
+        self.doc = App.ActiveDocument
+        _msg("  Temporary document '{}'".format(self.doc_name))
+
+    def test_points_near(self):
+        """Find the endpoints and midpoints near a point."""
+        _msg("  Test 'points_near'")
+        shape = Part.makeCompound([Part.makeLine(Vector(0, 0, 0), Vector(10, 0, 0)),
+                                   Part.makeLine(Vector(10, 0, 0), Vector(10, 1, 0)),
+                                   Part.makeLine(Vector(50, 50, 0), Vector(60, 50, 0))])
+        index = snap_index.SnapIndex(shape)
+        found = index.points_near(Vector(9.8, 0.2, 0), 1)
+        kinds = sorted(kind for p, kind in found)
+        self.assertEqual(kinds, ['endpoint', 'endpoint', 'midpoint'])
+        self.assertEqual(index.edges_near(Vector(55, 50, 0), 1), [2])
+        self.assertEqual(index.points_near(Vector(30, 30, 0), 1), [])
+
+    def test_intersections(self):
+        """Intersect an edge with the indexed edges near a point."""
+        _msg("  Test 'intersections'")
+        index = snap_index.SnapIndex(grid_of_lines(20, 20))
+        edge = Part.makeLine(Vector(-1, 0.5, 0), Vector(21, 0.5, 0))
+        # the vertical lines through x = 0 and 1 are near the point
+        found = index.intersections(edge, Vector(0.5, 0.5, 0), 1)
+        self.assertEqual(sorted(round(p.x, 6) for p in found), [0, 1])
+        # the whole edge crosses all vertical lines
+        self.assertEqual(len(index.intersections(edge)), 20)
+
+        # an indexed edge doesn't intersect itself
+        edge = index.edges[2]
+        found = index.intersections(edge, Vector(0.5, 1, 0), 1)
+        self.assertEqual(sorted(round(p.x, 6) for p in found), [0, 1])
+
+    def test_cache(self):
+        """Rebuild the index of an object after its shape changed."""
+        _msg("  Test 'get_index'")
+        obj = self.doc.addObject("Part::Feature", "Lines")
+        obj.Shape = grid_of_lines(3, 3)
+        index = snap_index.get_index(obj)
+        self.assertTrue(snap_index.get_index(obj) is index)
+        self.assertEqual(len(index.edges), 6)
+
+        obj.Shape = grid_of_lines(4, 4)
+        index = snap_index.get_index(obj)
+        self.assertEqual(len(index.edges), 8)
+
+        snap_index.clear_cache(obj)
+        self.assertFalse(snap_index.get_index(obj) is index)
+
+    def tearDown(self):
+        """Finish the test.
+
+        This is executed after each test, so we close the document.
+        """
+        snap_index.clear_cache()
+        App.closeDocument(self.doc_name)
+
+## @}
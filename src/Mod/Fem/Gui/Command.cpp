@@ -1639,6 +1639,10 @@ void CmdFemPostPipelineFromResult::activated(int)
         std::string FeatName = getUniqueObjectName("ResultPipeline");
         openCommand("Create pipeline from result");
         doCommand(Doc,"App.activeDocument().addObject('Fem::FemPostPipeline','%s')",FeatName.c_str());
+        // the pipeline reads the result properties, load them from the result cache
+        doCommand(Doc,"from femresult import resultcache");
+        doCommand(Doc,"resultcache.load_all_properties("
+                      "App.activeDocument().getObject(\"%s\"))", results[0]->getNameInDocument());
         doCommand(Doc,"App.activeDocument().ActiveObject.load("
                       "App.activeDocument().getObject(\"%s\"))", results[0]->getNameInDocument());
         commitCommand();
@@ -658,6 +658,9 @@ def makePostVtkResult(
     """makePostVtkResult(document, base_result, [name]):
     creates an FEM post processing result object (vtk based) to hold FEM results"""
     obj = doc.addObject("Fem::FemPostPipeline", name)
+    # the pipeline reads the result properties, load them from the result cache
+    from femresult import resultcache
+    resultcache.load_all_properties(base_result)
     obj.load(base_result)
     return obj
 
@@ -477,7 +477,7 @@ class _FEMMesh2Mesh(CommandManager):
             FreeCADGui.addModule("femmesh.femmesh2mesh")
             FreeCADGui.doCommand(
                 "out_mesh = femmesh.femmesh2mesh.femmesh_2_mesh("
-                "FreeCAD.ActiveDocument.{}.FemMesh)"
+                "FreeCAD.ActiveDocument.{})"
                 .format(self.selobj.Name)
             )
             FreeCADGui.addModule("Mesh")
@@ -491,7 +491,7 @@ class _FEMMesh2Mesh(CommandManager):
             FreeCADGui.addModule("femmesh.femmesh2mesh")
             FreeCADGui.doCommand(
                 "out_mesh = femmesh.femmesh2mesh.femmesh_2_mesh("
-                "FreeCAD.ActiveDocument.{}.FemMesh, FreeCAD.ActiveDocument.{})"
+                "FreeCAD.ActiveDocument.{}, FreeCAD.ActiveDocument.{})"
                 .format(femmesh.Name, res.Name)
             )
             FreeCADGui.addModule("Mesh")
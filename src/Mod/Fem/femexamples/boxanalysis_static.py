@@ -31,7 +31,6 @@ setup()
 
 import FreeCAD
 
-import Fem
 import ObjectsFem
 
 mesh_name = "Mesh"  # needs to be Mesh to work with unit tests
@@ -85,15 +84,8 @@ def setup_base(doc=None, solvertype="ccxtools"):
     material_object.Material = mat
 
     # mesh
-    from .meshes.mesh_boxanalysis_tetra10 import create_nodes, create_elements
-
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_boxanalysis_tetra10")
     femmesh_obj = analysis.addObject(ObjectsFem.makeMeshGmsh(doc, mesh_name))[0]
     femmesh_obj.FemMesh = fem_mesh
     femmesh_obj.Part = geom_obj
@@ -133,6 +125,7 @@ def setup(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
         solver_object.AnalysisType = "static"
         solver_object.GeometricalNonlinearity = "linear"
         solver_object.ThermoMechSteadyState = False
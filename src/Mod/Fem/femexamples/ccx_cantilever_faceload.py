@@ -31,7 +31,6 @@ setup()
 
 import FreeCAD
 
-import Fem
 import ObjectsFem
 
 mesh_name = "Mesh"  # needs to be Mesh to work with unit tests
@@ -99,6 +98,7 @@ def setup_cantileverbase(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
         solver_object.AnalysisType = "static"
         solver_object.GeometricalNonlinearity = "linear"
         solver_object.ThermoMechSteadyState = False
@@ -123,14 +123,8 @@ def setup_cantileverbase(doc=None, solvertype="ccxtools"):
     fixed_constraint.References = [(geom_obj, "Face1")]
 
     # mesh
-    from .meshes.mesh_canticcx_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_canticcx_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
@@ -31,7 +31,6 @@ setup()
 
 import FreeCAD
 
-import Fem
 
 from . import ccx_cantilever_faceload as faceload
 
@@ -60,14 +59,8 @@ def setup(doc=None, solvertype="ccxtools"):
     doc = faceload.setup(doc, solvertype)
 
     # load the hexa20 mesh
-    from .meshes.mesh_canticcx_hexa20 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_canticcx_hexa20")
 
     # overwrite mesh with the hexa20 mesh
     doc.getObject(mesh_name).FemMesh = fem_mesh
@@ -35,7 +35,6 @@ setup()
 
 import FreeCAD
 
-import Fem
 import ObjectsFem
 import Part
 from BOPTools import SplitFeatures
@@ -152,6 +151,7 @@ def setup(doc=None, solvertype="ccxtools"):
         solver_object.MatrixSolverType = "default"
         solver_object.IterationsControlParameterTimeUse = False
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
 
     # shell thickness
     analysis.addObject(ObjectsFem.makeElementGeometry2D(doc, 0.5, 'ShellThickness'))
@@ -199,14 +199,8 @@ def setup(doc=None, solvertype="ccxtools"):
     contact_constraint.Slope = 1000000.0  # should be 1000000.0 kg/(mm*s^2)
 
     # mesh
-    from .meshes.mesh_contact_tube_tube_tria3 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_contact_tube_tube_tria3")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
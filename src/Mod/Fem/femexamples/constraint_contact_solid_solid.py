@@ -36,7 +36,6 @@ import FreeCAD
 from FreeCAD import Rotation
 from FreeCAD import Vector
 
-import Fem
 import ObjectsFem
 import Part
 
@@ -131,6 +130,7 @@ def setup(doc=None, solvertype="ccxtools"):
         solver_object.MatrixSolverType = "default"
         solver_object.IterationsControlParameterTimeUse = False
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
 
         """
         # solver parameter from fandaL, but they are not needed (see forum topic)
@@ -185,14 +185,8 @@ def setup(doc=None, solvertype="ccxtools"):
     con_contact.Slope = 1000000.0  # contact stiffness 1000000.0 kg/(mm*s^2)
 
     # mesh
-    from .meshes.mesh_contact_box_halfcylinder_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_contact_box_halfcylinder_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
@@ -38,7 +38,6 @@ import FreeCAD
 from FreeCAD import Rotation
 from FreeCAD import Vector
 
-import Fem
 import ObjectsFem
 import Part
 import Sketcher
@@ -230,6 +229,7 @@ def setup(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
         solver_object.AnalysisType = "static"
         solver_object.GeometricalNonlinearity = "linear"
         solver_object.ThermoMechSteadyState = False
@@ -267,14 +267,8 @@ def setup(doc=None, solvertype="ccxtools"):
     section_constraint.References = [(geom_obj, "Face6")]
 
     # mesh
-    from .meshes.mesh_section_print_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_section_print_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
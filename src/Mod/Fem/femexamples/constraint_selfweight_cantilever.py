@@ -35,7 +35,6 @@ setup()
 
 import FreeCAD
 
-import Fem
 import ObjectsFem
 
 
@@ -104,6 +103,7 @@ def setup(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
         solver_object.AnalysisType = "static"
         solver_object.GeometricalNonlinearity = "linear"
         solver_object.ThermoMechSteadyState = False
@@ -134,14 +134,8 @@ def setup(doc=None, solvertype="ccxtools"):
     selfweight.Gravity_z = -1.00
 
     # mesh
-    from .meshes.mesh_selfweight_cantilever_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_selfweight_cantilever_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
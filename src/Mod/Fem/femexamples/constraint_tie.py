@@ -35,7 +35,6 @@ setup()
 import FreeCAD
 from FreeCAD import Vector
 
-import Fem
 import ObjectsFem
 import Part
 from BOPTools import SplitFeatures
@@ -120,6 +119,7 @@ def setup(doc=None, solvertype="ccxtools"):
         solver_object.MatrixSolverType = "default"
         solver_object.IterationsControlParameterTimeUse = False
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
 
     # material
     material_obj = analysis.addObject(
@@ -158,14 +158,8 @@ def setup(doc=None, solvertype="ccxtools"):
     con_tie.Tolerance = 25.0
 
     # mesh
-    from .meshes.mesh_constraint_tie_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_constraint_tie_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
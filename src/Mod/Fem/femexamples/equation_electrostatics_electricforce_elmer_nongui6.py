@@ -34,7 +34,6 @@ from FreeCAD import Rotation
 from FreeCAD import Vector
 from FreeCAD import Units
 
-import Fem
 import Part
 import ObjectsFem
 import Sketcher
@@ -200,14 +199,8 @@ def setup(doc=None, solvertype="elmer"):
     constraint_elect_pot1.ElectricForcecalculation = True
 
     # mesh
-    from .meshes.mesh_electricforce_elmer_nongui6_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_electricforce_elmer_nongui6_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
@@ -47,7 +47,6 @@ setup()
 import FreeCAD
 from FreeCAD import Vector as vec
 
-import Fem
 import ObjectsFem
 import Part
 from Part import makeCircle as ci
@@ -120,6 +119,7 @@ def setup(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver.SplitInputWriter = False
+        solver.IncrementalInputWriter = False
         solver.AnalysisType = "static"
         solver.GeometricalNonlinearity = "linear"
         solver.ThermoMechSteadyState = False
@@ -162,14 +162,8 @@ def setup(doc=None, solvertype="ccxtools"):
     pressure_constraint.Reversed = True
 
     # mesh
-    from .meshes.mesh_platewithhole_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_platewithhole_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
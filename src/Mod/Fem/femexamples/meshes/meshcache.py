@@ -0,0 +1,236 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Binary cache of the FEM example meshes"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## @package meshcache
+#  \ingroup FEM
+#  \brief binary NumPy cache of the Python example meshes
+
+import glob
+import hashlib
+import importlib
+import os
+
+import numpy as np
+
+import FreeCAD
+
+from femmesh import meshtools
+
+
+"""
+The Python mesh modules mesh_*.py are the source of truth. They are converted
+into a .npz file with the node and element arrays the first time they are used.
+The .npz file holds the hash of the Python module and is rebuilt if the module
+has changed. The FemMesh is created from the arrays, the Python module is
+not imported anymore.
+
+from femexamples.meshes.meshcache import create_femmesh
+fem_mesh = create_femmesh("mesh_canticcx_tetra10")
+
+build or update the cache of all example meshes:
+from femexamples.meshes.meshcache import build_mesh_caches
+build_mesh_caches()
+
+"""
+
+# version of the cache file format, older cache files are rebuilt
+CACHE_VERSION = 1
+
+
+class MeshRecorder(object):
+    """records the nodes and elements of the create_nodes and create_elements
+    functions of a Python mesh module, it has the add methods of a FemMesh
+
+    Consecutive elements of the same type and node count are recorded in
+    one element block, thus the order of the Python module is kept.
+    """
+
+    def __init__(self):
+        self.node_ids = []
+        self.node_coords = []
+        # [[element type, element ids, element nodes], ...]
+        self.element_blocks = []
+
+    def addNode(self, x, y, z, node_id):
+        self.node_ids.append(node_id)
+        self.node_coords.append((x, y, z))
+
+    def addEdge(self, nodes, element_id):
+        self._add_element("Edge", nodes, element_id)
+
+    def addFace(self, nodes, element_id):
+        self._add_element("Face", nodes, element_id)
+
+    def addVolume(self, nodes, element_id):
+        self._add_element("Volume", nodes, element_id)
+
+    def _add_element(self, element_type, nodes, element_id):
+        if (
+            not self.element_blocks
+            or self.element_blocks[-1][0] != element_type
+            or len(self.element_blocks[-1][2][-1]) != len(nodes)
+        ):
+            self.element_blocks.append([element_type, [], []])
+        self.element_blocks[-1][1].append(element_id)
+        self.element_blocks[-1][2].append(list(nodes))
+
+    def get_arrays(self):
+        node_ids = np.array(self.node_ids, dtype=np.int64)
+        node_coords = np.array(self.node_coords, dtype=np.float64).reshape(-1, 3)
+        element_blocks = [
+            (
+                element_type,
+                np.array(element_ids, dtype=np.int64),
+                np.array(element_nodes, dtype=np.int64)
+            )
+            for element_type, element_ids, element_nodes in self.element_blocks
+        ]
+        return node_ids, node_coords, element_blocks
+
+
+def get_mesh_source_file(mesh_name):
+    return os.path.join(os.path.dirname(__file__), mesh_name + ".py")
+
+
+def get_mesh_source_hash(mesh_name):
+    with open(get_mesh_source_file(mesh_name), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def get_cache_dir():
+    return os.path.join(FreeCAD.getUserAppDataDir(), "FemMeshCache")
+
+
+def get_cache_file(mesh_name, cache_dir=None):
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    return os.path.join(cache_dir, mesh_name + ".npz")
+
+
+def read_mesh_module(mesh_name):
+    """runs create_nodes and create_elements of the Python mesh module
+    returns node_ids, node_coords, element_blocks
+    """
+    mesh_module = importlib.import_module("femexamples.meshes." + mesh_name)
+    recorder = MeshRecorder()
+    if not mesh_module.create_nodes(recorder):
+        FreeCAD.Console.PrintError("Error on creating nodes.\n")
+    if not mesh_module.create_elements(recorder):
+        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    return recorder.get_arrays()
+
+
+def write_mesh_cache(mesh_name, cache_dir=None):
+    """converts the Python mesh module into the .npz cache file
+    returns node_ids, node_coords, element_blocks
+    """
+    node_ids, node_coords, element_blocks = read_mesh_module(mesh_name)
+    cache_file = get_cache_file(mesh_name, cache_dir)
+    if not os.path.isdir(os.path.dirname(cache_file)):
+        os.makedirs(os.path.dirname(cache_file))
+    arrays = {
+        "version": np.array(CACHE_VERSION),
+        "source_hash": np.array(get_mesh_source_hash(mesh_name)),
+        "node_ids": node_ids,
+        "node_coords": node_coords,
+        "element_types": np.array([block[0] for block in element_blocks]),
+    }
+    for i, (element_type, element_ids, element_nodes) in enumerate(element_blocks):
+        arrays["element_ids_{}".format(i)] = element_ids
+        arrays["element_nodes_{}".format(i)] = element_nodes
+    # write to a temporary file first, a broken cache file is never read
+    tmp_file = cache_file + ".tmp.npz"
+    np.savez(tmp_file, **arrays)
+    if os.path.isfile(cache_file):
+        os.remove(cache_file)
+    os.rename(tmp_file, cache_file)
+    FreeCAD.Console.PrintLog("Mesh cache written: {}\n".format(cache_file))
+    return node_ids, node_coords, element_blocks
+
+
+def read_mesh_cache(mesh_name, cache_dir=None):
+    """returns node_ids, node_coords, element_blocks of the .npz cache file
+    returns None if there is no valid cache file for the Python mesh module
+    """
+    cache_file = get_cache_file(mesh_name, cache_dir)
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with np.load(cache_file) as data:
+            if (
+                int(data["version"]) != CACHE_VERSION
+                or str(data["source_hash"]) != get_mesh_source_hash(mesh_name)
+            ):
+                return None
+            element_blocks = [
+                (
+                    str(element_type),
+                    data["element_ids_{}".format(i)],
+                    data["element_nodes_{}".format(i)]
+                )
+                for i, element_type in enumerate(data["element_types"])
+            ]
+            return data["node_ids"], data["node_coords"], element_blocks
+    except (IOError, KeyError, ValueError):
+        FreeCAD.Console.PrintWarning(
+            "Mesh cache file {} could not be read.\n".format(cache_file)
+        )
+        return None
+
+
+def get_mesh_arrays(mesh_name, cache_dir=None):
+    """returns node_ids, node_coords, element_blocks of the mesh
+    the cache file is written if it does not exist or if it is outdated
+    """
+    mesh_arrays = read_mesh_cache(mesh_name, cache_dir)
+    if mesh_arrays is not None:
+        return mesh_arrays
+    try:
+        return write_mesh_cache(mesh_name, cache_dir)
+    except (IOError, OSError) as e:
+        FreeCAD.Console.PrintWarning(
+            "Mesh cache of {} could not be written: {}\n".format(mesh_name, e)
+        )
+        return read_mesh_module(mesh_name)
+
+
+def create_femmesh(mesh_name, cache_dir=None):
+    """returns a new FemMesh of the example mesh module mesh_name
+    the FemMesh is created from the cached arrays, see get_mesh_arrays()
+    """
+    node_ids, node_coords, element_blocks = get_mesh_arrays(mesh_name, cache_dir)
+    return meshtools.create_femmesh_from_arrays(node_ids, node_coords, element_blocks)
+
+
+def build_mesh_caches(cache_dir=None):
+    """writes the cache files of all example mesh modules which are missing or outdated"""
+    mesh_files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "mesh_*.py")))
+    for mesh_file in mesh_files:
+        mesh_name = os.path.splitext(os.path.basename(mesh_file))[0]
+        if read_mesh_cache(mesh_name, cache_dir) is None:
+            FreeCAD.Console.PrintMessage("Build mesh cache of {}\n".format(mesh_name))
+            write_mesh_cache(mesh_name, cache_dir)
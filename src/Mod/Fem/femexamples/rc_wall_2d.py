@@ -35,7 +35,6 @@ setup()
 import FreeCAD
 from FreeCAD import Vector as vec
 
-import Fem
 import ObjectsFem
 import Part
 from Part import makeLine as ln
@@ -113,6 +112,7 @@ def setup(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver.SplitInputWriter = False
+        solver.IncrementalInputWriter = False
         solver.AnalysisType = "static"
         solver.GeometricalNonlinearity = "linear"
         solver.ThermoMechSteadyState = False
@@ -168,14 +168,8 @@ def setup(doc=None, solvertype="ccxtools"):
     displacement_constraint.zFix = True
 
     # mesh
-    from .meshes.mesh_rc_wall_2d_tria6 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_rc_wall_2d_tria6")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
@@ -38,7 +38,6 @@ import FreeCAD
 from FreeCAD import Rotation
 from FreeCAD import Vector
 
-import Fem
 import ObjectsFem
 from BOPTools import SplitFeatures
 
@@ -136,6 +135,7 @@ def setup(doc=None, solvertype="ccxtools"):
         # solver_object.MatrixSolverType = "default"
         solver_object.MatrixSolverType = "spooles"  # thomas
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
         solver_object.IterationsThermoMechMaximum = 2000
         # solver_object.IterationsControlParameterTimeUse = True  # thermomech spine
 
@@ -205,14 +205,8 @@ def setup(doc=None, solvertype="ccxtools"):
     constraint_temperature.CFlux = 0.0
 
     # mesh
-    from .meshes.mesh_thermomech_bimetall_tetra10 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_thermomech_bimetall_tetra10")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
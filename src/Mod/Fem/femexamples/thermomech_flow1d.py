@@ -35,7 +35,6 @@ setup()
 import FreeCAD
 from FreeCAD import Vector as vec
 
-import Fem
 import ObjectsFem
 from Draft import makeWire
 
@@ -131,6 +130,7 @@ def setup(doc=None, solvertype="ccxtools"):
         )
     if solvertype == "calculix" or solvertype == "ccxtools":
         solver_object.SplitInputWriter = False
+        solver_object.IncrementalInputWriter = False
         solver_object.AnalysisType = "thermomech"
         solver_object.GeometricalNonlinearity = "linear"
         solver_object.ThermoMechSteadyState = True
@@ -262,14 +262,8 @@ def setup(doc=None, solvertype="ccxtools"):
     self_weight.Gravity_z = -1.0
 
     # mesh
-    from .meshes.mesh_thermomech_flow1d_seg3 import create_nodes, create_elements
-    fem_mesh = Fem.FemMesh()
-    control = create_nodes(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating nodes.\n")
-    control = create_elements(fem_mesh)
-    if not control:
-        FreeCAD.Console.PrintError("Error on creating elements.\n")
+    from .meshes.meshcache import create_femmesh
+    fem_mesh = create_femmesh("mesh_thermomech_flow1d_seg3")
     femmesh_obj = analysis.addObject(
         ObjectsFem.makeMeshGmsh(doc, mesh_name)
     )[0]
@@ -73,13 +73,18 @@ def importFrd(
 ):
     import ObjectsFem
     from . import importToolsFem
+    from femresult import resultcache
 
     if analysis:
         doc = analysis.Document
     else:
         doc = FreeCAD.ActiveDocument
 
-    m = read_frd_result(filename)
+    use_cache = resultcache.use_result_cache(analysis)
+    if use_cache:
+        m = read_frd_result_cache(filename)
+    else:
+        m = read_frd_result(filename)
     result_mesh_object = None
     res_obj = None
 
@@ -123,7 +128,12 @@ def importFrd(
 
                 res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
                 res_obj.Mesh = result_mesh_object
-                res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                if use_cache:
+                    res_obj = resultcache.set_result_cache(
+                        res_obj, m["ResultCache"], m["ResultCacheIndex"], result_set["index"]
+                    )
+                else:
+                    res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
                 if analysis:
                     # need to be here, becasause later on, the analysis objs are needed
                     # see fill of principal stresses
@@ -132,7 +142,7 @@ def importFrd(
                 # more result object calculations
                 from femresult import resulttools
                 from femtools import femutils
-                if not res_obj.MassFlowRate:
+                if not resultcache.has_property(res_obj, "MassFlowRate"):
                     # information 1:
                     # only compact result if not Flow 1D results
                     # compact result object, workaround for bug 2873
@@ -153,6 +163,10 @@ def importFrd(
                         # all other result sets, do not compact FemMesh, only set NodeNumbers
                         res_obj.NodeNumbers = nodenumbers_for_compacted_mesh
 
+                if use_cache:
+                    # derived results and Stats are calculated on writing the cache
+                    continue
+
                 # fill DisplacementLengths
                 res_obj = resulttools.add_disp_apps(res_obj)
                 # fill vonMises
@@ -230,6 +244,45 @@ def importFrd(
     return res_obj
 
 
+def read_frd_result_cache(
+    frd_input
+):
+    """ reads the mesh of a frd file and writes its results into the result cache
+    the cache is only written if it does not exist or if the frd file has changed
+
+    returns the mesh data with arrays, see importToolsFem.make_femmesh_from_arrays,
+    the key "Results" holds the result steps with the keys "index", "number" and "time"
+    """
+    from femresult import resultcache
+    from . import readCcxFrdResults
+
+    Console.PrintMessage(
+        "Read ccx results from frd file into the result cache: {}\n"
+        .format(frd_input)
+    )
+    frd_mesh = readCcxFrdResults.read_frd_mesh(frd_input)
+    cache_dir = resultcache.get_cache_dir(frd_input)
+    index = resultcache.read_result_cache_index(cache_dir, frd_input)
+    if index is None:
+        index = resultcache.write_result_cache(
+            cache_dir,
+            readCcxFrdResults.iter_frd_results(frd_input),
+            frd_input
+        )
+    m = dict(frd_mesh["Elements"])
+    if len(frd_mesh["NodeIds"]) > 0:
+        m["Nodes"] = (frd_mesh["NodeIds"], frd_mesh["NodeCoords"])
+    else:
+        m["Nodes"] = {}
+    m["Results"] = [
+        {"index": i, "number": step["Number"], "time": step["Time"]}
+        for i, step in enumerate(index["Steps"])
+    ]
+    m["ResultCache"] = cache_dir
+    m["ResultCacheIndex"] = index
+    return m
+
+
 # read a calculix result file and extract the nodes
 # displacement vectors and stress values.
 def read_frd_result(
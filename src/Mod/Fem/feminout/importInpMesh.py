@@ -33,6 +33,8 @@ __date__ = "04/08/2016"
 
 import os
 
+import numpy as np
+
 import FreeCAD
 from FreeCAD import Console
 
@@ -67,7 +69,7 @@ def read(filename):
     """read a FemMesh from a inp mesh file and return the FemMesh
     """
     # no document object is created, just the FemMesh is returned
-    mesh_data = read_inp(filename)
+    mesh_data = read_inp_arrays(filename)
     from . import importToolsFem
     return importToolsFem.make_femmesh(mesh_data)
 
@@ -82,191 +84,208 @@ def import_inp(filename):
         mesh_object.FemMesh = femmesh
 
 
+# inp element types
+# {inp element type: (mesh data key, number of nodes)}
+INP_ELEMENT_TYPES = {
+    "S3": ("Tria3Elem", 3),
+    "CPS3": ("Tria3Elem", 3),
+    "CPE3": ("Tria3Elem", 3),
+    "CAX3": ("Tria3Elem", 3),
+    "S6": ("Tria6Elem", 6),
+    "CPS6": ("Tria6Elem", 6),
+    "CPE6": ("Tria6Elem", 6),
+    "CAX6": ("Tria6Elem", 6),
+    "S4": ("Quad4Elem", 4),
+    "S4R": ("Quad4Elem", 4),
+    "CPS4": ("Quad4Elem", 4),
+    "CPS4R": ("Quad4Elem", 4),
+    "CPE4": ("Quad4Elem", 4),
+    "CPE4R": ("Quad4Elem", 4),
+    "CAX4": ("Quad4Elem", 4),
+    "CAX4R": ("Quad4Elem", 4),
+    "S8": ("Quad8Elem", 8),
+    "S8R": ("Quad8Elem", 8),
+    "CPS8": ("Quad8Elem", 8),
+    "CPS8R": ("Quad8Elem", 8),
+    "CPE8": ("Quad8Elem", 8),
+    "CPE8R": ("Quad8Elem", 8),
+    "CAX8": ("Quad8Elem", 8),
+    "CAX8R": ("Quad8Elem", 8),
+    "C3D4": ("Tetra4Elem", 4),
+    "C3D10": ("Tetra10Elem", 10),
+    "C3D8": ("Hexa8Elem", 8),
+    "C3D8R": ("Hexa8Elem", 8),
+    "C3D8I": ("Hexa8Elem", 8),
+    "C3D20": ("Hexa20Elem", 20),
+    "C3D20R": ("Hexa20Elem", 20),
+    "C3D20RI": ("Hexa20Elem", 20),
+    "C3D6": ("Penta6Elem", 6),
+    "C3D15": ("Penta15Elem", 15),
+    "B31": ("Seg2Elem", 2),
+    "B31R": ("Seg2Elem", 2),
+    "T3D2": ("Seg2Elem", 2),
+    "B32": ("Seg3Elem", 3),
+    "B32R": ("Seg3Elem", 3),
+    "T3D3": ("Seg3Elem", 3),
+}
+
+# switch from the CalculiX node numbering to the FreeCAD node numbering
+# numbering do not change: tria3, tria6, quad4, quad8, seg2
+INP_NODE_ORDER = {
+    "Tetra4Elem": [1, 0, 2, 3],
+    "Tetra10Elem": [1, 0, 2, 3, 4, 6, 5, 8, 7, 9],
+    "Hexa8Elem": [5, 6, 7, 4, 1, 2, 3, 0],
+    "Hexa20Elem": [5, 6, 7, 4, 1, 2, 3, 0, 13, 14, 15, 12, 9, 10, 11, 8, 17, 18, 19, 16],
+    "Penta6Elem": [4, 5, 3, 1, 2, 0],
+    "Penta15Elem": [4, 5, 3, 1, 2, 0, 10, 11, 9, 7, 8, 6, 13, 14, 12],
+    "Seg3Elem": [0, 2, 1],
+}
+
+# {mesh data key: number of nodes}
+ELEMENT_NUMBER_OF_NODES = dict(INP_ELEMENT_TYPES.values())
+
+
 def read_inp(file_name):
-    """read .inp file """
-    # ATM only mesh reading is supported (no boundary conditions)
+    """read .inp file
+    returns the mesh data with dicts {id: [values]}, see read_inp_arrays
+    """
+    mesh_arrays = read_inp_arrays(file_name)
+    node_ids, node_coords = mesh_arrays["Nodes"]
+    mesh_data = {"Nodes": dict(zip(node_ids.tolist(), node_coords.tolist()))}
+    for elm_key in ELEMENT_NUMBER_OF_NODES:
+        elm_ids, elm_nodes = mesh_arrays[elm_key]
+        mesh_data[elm_key] = dict(zip(elm_ids.tolist(), elm_nodes.tolist()))
+    return mesh_data
+
 
-    class elements():
-
-        tria3 = {}
-        tria6 = {}
-        quad4 = {}
-        quad8 = {}
-        tetra4 = {}
-        tetra10 = {}
-        hexa8 = {}
-        hexa20 = {}
-        penta6 = {}
-        penta15 = {}
-        seg2 = {}
-        seg3 = {}
+def read_inp_arrays(file_name):
+    """read .inp file
+    returns the mesh data with the arrays of nodes and elements
+    {"Nodes": (node ids, (n, 3) coordinates), "Tetra10Elem": (element ids, (m, 10) nodes), ...}
+    which can be used by importToolsFem.make_femmesh
+    """
+    # ATM only mesh reading is supported (no boundary conditions)
+    # the data lines of a *NODE or *ELEMENT keyword are collected
+    # and parsed at once by NumPy, *INCLUDE files are read when found
+    nodes = []
+    elements = {elm_key: [] for elm_key in ELEMENT_NUMBER_OF_NODES}
     error_seg3 = False  # to print "not supported"
-    nodes = {}
-    model_definition = True
-
-    f = pyopen(file_name, "r")
-    line = "\n"
-    include = ""
-    f_include = None
-    while line != "":
-        if include:
-            line = f_include.readline()
-            if line == "":
-                f_include.close()
-                include = ""
-                line = f.readline()
-        else:
-            line = f.readline()
-        if line.strip() == "":
-            continue
-        elif line[0] == "*":  # start/end of a reading set
-            if line[0:2] == "**":  # comments
+    not_supported_elemtypes = set()
+
+    block_lines = []
+    block = None
+    inp_lines = iter_inp_lines(file_name)
+    for line in inp_lines:
+        if line[0] == "*":  # start/end of a reading set
+            if block is not None:
+                add_inp_block(block, block_lines, nodes, elements)
+            block = None
+            block_lines = []
+            keyword = line.split(",")[0].strip().upper()
+            if keyword == "*NODE":
+                block = ("Nodes", 3)
+            elif keyword == "*ELEMENT":
+                elm_type = ""
+                for line_part in line.upper().split(",")[1:]:
+                    if line_part.lstrip()[:4] == "TYPE":
+                        elm_type = line_part.split("=")[1].strip()
+                if elm_type in INP_ELEMENT_TYPES:
+                    block = INP_ELEMENT_TYPES[elm_type]
+                    if block[0] == "Seg3Elem":
+                        error_seg3 = True
+                else:
+                    not_supported_elemtypes.add(elm_type)
+            elif keyword == "*STEP":
+                # no mesh data in the steps
+                break
+        elif block is not None:
+            block_lines.append(line)
+    inp_lines.close()
+    if block is not None:
+        add_inp_block(block, block_lines, nodes, elements)
+
+    if error_seg3 is True:  # to print "not supported"
+        Console.PrintError("Error: seg3 (3-node beam element type) not supported, yet.\n")
+    for elm_type in sorted(not_supported_elemtypes):
+        Console.PrintError("Error: {} not supported.\n".format(elm_type))
+
+    mesh_arrays = {"Nodes": concatenate_inp_blocks(nodes, 3, np.float64)}
+    for elm_key, number_of_nodes in ELEMENT_NUMBER_OF_NODES.items():
+        elm_ids, elm_nodes = concatenate_inp_blocks(elements[elm_key], number_of_nodes, np.int64)
+        if elm_key in INP_NODE_ORDER:
+            elm_nodes = elm_nodes[:, INP_NODE_ORDER[elm_key]]
+        mesh_arrays[elm_key] = (elm_ids, elm_nodes)
+    return mesh_arrays
+
+
+def iter_inp_lines(file_name):
+    """yields the lines of an inp file without empty lines and comments
+    the lines of *INCLUDE files are yielded at the position of the *INCLUDE
+    """
+    with pyopen(file_name, "r") as f:
+        for line in f:
+            if line[:2] == "**" or line.strip() == "":
                 continue
             if line[:8].upper() == "*INCLUDE":
                 start = 1 + line.index("=")
                 include = line[start:].strip().strip('"')
                 include_path = os.path.normpath(include)
-                if os.path.isfile(include_path) is True:
-                    f_include = pyopen(include_path, "r")
-                else:
+                if os.path.isfile(include_path) is False:
                     path_start = os.path.split(file_name)[0]
-                    include_full_path = os.path.join(path_start, include_path)
-                    f_include = pyopen(include_full_path, "r")
+                    include_path = os.path.join(path_start, include_path)
+                for include_line in iter_inp_lines(include_path):
+                    yield include_line
                 continue
-            read_node = False
-            elm_category = []
-            number_of_nodes = 0
-            elm_type = ""
-            elm_2nd_line = False
-            error_seg3 = False
-            error_not_supported_elemtype = False
-
-        # reading nodes
-        if (line[:5].upper() == "*NODE") and (model_definition is True):
-            read_node = True
-        elif read_node is True:
-            line_list = line.split(",")
-            number = int(line_list[0])
-            x = float(line_list[1])
-            y = float(line_list[2])
-            z = float(line_list[3])
-            nodes[number] = [x, y, z]
-
-        # reading elements
-        elif line[:8].upper() == "*ELEMENT":
-            line_list = line[8:].upper().split(",")
-            for line_part in line_list:
-                if line_part.lstrip()[:4] == "TYPE":
-                    elm_type = line_part.split("=")[1].strip()
-
-            if elm_type in ["S3", "CPS3", "CPE3", "CAX3"]:
-                elm_category = elements.tria3
-                number_of_nodes = 3
-            elif elm_type in ["S6", "CPS6", "CPE6", "CAX6"]:
-                elm_category = elements.tria6
-                number_of_nodes = 6
-            elif elm_type in ["S4", "S4R", "CPS4", "CPS4R", "CPE4", "CPE4R",
-                              "CAX4", "CAX4R"]:
-                elm_category = elements.quad4
-                number_of_nodes = 4
-            elif elm_type in ["S8", "S8R", "CPS8", "CPS8R", "CPE8", "CPE8R",
-                              "CAX8", "CAX8R"]:
-                elm_category = elements.quad8
-                number_of_nodes = 8
-            elif elm_type == "C3D4":
-                elm_category = elements.tetra4
-                number_of_nodes = 4
-            elif elm_type == "C3D10":
-                elm_category = elements.tetra10
-                number_of_nodes = 10
-            elif elm_type in ["C3D8", "C3D8R", "C3D8I"]:
-                elm_category = elements.hexa8
-                number_of_nodes = 8
-            elif elm_type in ["C3D20", "C3D20R", "C3D20RI"]:
-                elm_category = elements.hexa20
-                number_of_nodes = 20
-            elif elm_type == "C3D6":
-                elm_category = elements.penta6
-                number_of_nodes = 6
-            elif elm_type == "C3D15":
-                elm_category = elements.penta15
-                number_of_nodes = 15
-            elif elm_type in ["B31", "B31R", "T3D2"]:
-                elm_category = elements.seg2
-                number_of_nodes = 2
-            elif elm_type in ["B32", "B32R", "T3D3"]:
-                elm_category = elements.seg3
-                number_of_nodes = 3
-                error_seg3 = True  # to print "not supported"
-            else:
-                error_not_supported_elemtype = True
-
-        elif elm_category != [] and number_of_nodes > 0:
-            line_list = line.split(",")
-            if elm_2nd_line is False:
-                number = int(line_list[0])
-                elm_category[number] = []
-                pos = 1
-            else:
-                pos = 0
-                elm_2nd_line = False
-            for en in range(pos, pos + number_of_nodes - len(elm_category[number])):
-                try:
-                    enode = int(line_list[en])
-                    elm_category[number].append(enode)
-                except:
-                    elm_2nd_line = True
-                    break
-
-        elif line[:5].upper() == "*STEP":
-            model_definition = False
-    if error_seg3 is True:  # to print "not supported"
-        Console.PrintError("Error: seg3 (3-node beam element type) not supported, yet.\n")
-    elif error_not_supported_elemtype is True:
-        Console.PrintError("Error: {} not supported.\n".format(elm_type))
-    f.close()
-
-    # switch from the CalculiX node numbering to the FreeCAD node numbering
-    # numbering do not change: tria3, tria6, quad4, quad8, seg2
-    for en in elements.tetra4:
-        n = elements.tetra4[en]
-        elements.tetra4[en] = [n[1], n[0], n[2], n[3]]
-    for en in elements.tetra10:
-        n = elements.tetra10[en]
-        elements.tetra10[en] = [n[1], n[0], n[2], n[3], n[4], n[6], n[5],
-                                n[8], n[7], n[9]]
-    for en in elements.hexa8:
-        n = elements.hexa8[en]
-        elements.hexa8[en] = [n[5], n[6], n[7], n[4], n[1], n[2], n[3], n[0]]
-    for en in elements.hexa20:
-        n = elements.hexa20[en]
-        elements.hexa20[en] = [n[5], n[6], n[7], n[4], n[1], n[2], n[3], n[0],
-                               n[13], n[14], n[15], n[12], n[9], n[10], n[11],
-                               n[8], n[17], n[18], n[19], n[16]]
-    for en in elements.penta6:
-        n = elements.penta6[en]
-        elements.penta6[en] = [n[4], n[5], n[3], n[1], n[2], n[0]]
-    for en in elements.penta15:
-        n = elements.penta15[en]
-        elements.penta15[en] = [n[4], n[5], n[3], n[1], n[2], n[0],
-                                n[10], n[11], n[9], n[7], n[8], n[6], n[13],
-                                n[14], n[12]]
-    for en in elements.seg3:
-        n = elements.seg3[en]
-        elements.seg3[en] = [n[0], n[2], n[1]]
-
-    return {
-        "Nodes": nodes,
-        "Seg2Elem": elements.seg2,
-        "Seg3Elem": elements.seg3,
-        "Tria3Elem": elements.tria3,
-        "Tria6Elem": elements.tria6,
-        "Quad4Elem": elements.quad4,
-        "Quad8Elem": elements.quad8,
-        "Tetra4Elem": elements.tetra4,
-        "Tetra10Elem": elements.tetra10,
-        "Hexa8Elem": elements.hexa8,
-        "Hexa20Elem": elements.hexa20,
-        "Penta6Elem": elements.penta6,
-        "Penta15Elem": elements.penta15
-    }
+            yield line
+
+
+def add_inp_block(block, block_lines, nodes, elements):
+    # parse the data lines of a *NODE or *ELEMENT keyword
+    if not block_lines:
+        return
+    block_key, number_of_values = block
+    # an element might be continued on the next line, thus all values are joined
+    values = ",".join(line.strip().rstrip(",") for line in block_lines)
+    if block_key == "Nodes":
+        data = np.fromstring(values, dtype=np.float64, sep=",")
+        if len(data) != 4 * len(block_lines):
+            # nodes without z coordinate or with empty values
+            data = parse_inp_node_lines(block_lines)
+        data = data.reshape(-1, 4)
+        nodes.append((data[:, 0].astype(np.int64), data[:, 1:]))
+    else:
+        data = np.fromstring(values, dtype=np.int64, sep=",")
+        if len(data) % (number_of_values + 1) != 0:
+            Console.PrintError(
+                "Error: {} element block with {} values is skipped, "
+                "the node number is not {}.\n"
+                .format(block_key, len(data), number_of_values)
+            )
+            return
+        data = data.reshape(-1, number_of_values + 1)
+        elements[block_key].append((data[:, 0], data[:, 1:]))
+
+
+def parse_inp_node_lines(block_lines):
+    data = np.zeros((len(block_lines), 4), dtype=np.float64)
+    for i, line in enumerate(block_lines):
+        line_list = [v for v in line.split(",") if v.strip()]
+        data[i, :len(line_list)] = [float(v) for v in line_list[:4]]
+    return data
+
+
+def concatenate_inp_blocks(blocks, number_of_values, dtype):
+    # ids and data of all blocks, if an id is used twice the last one is used
+    if not blocks:
+        return (
+            np.empty(0, dtype=np.int64),
+            np.empty((0, number_of_values), dtype=dtype)
+        )
+    ids = np.concatenate([block[0] for block in blocks])
+    data = np.concatenate([block[1] for block in blocks])
+    reversed_unique_ids, reversed_index = np.unique(ids[::-1], return_index=True)
+    if len(reversed_unique_ids) != len(ids):
+        keep = np.sort(len(ids) - 1 - reversed_index)
+        ids = ids[keep]
+        data = data[keep]
+    return ids, data
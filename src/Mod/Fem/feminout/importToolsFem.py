@@ -136,7 +136,10 @@ def make_femmesh(
     mesh_data
 ):
     """ makes an FreeCAD FEM Mesh object from FEM Mesh data
+    the data is either given as dicts {id: [values]} or as arrays (ids, values)
     """
+    if isinstance(mesh_data.get("Nodes"), tuple):
+        return make_femmesh_from_arrays(mesh_data)
     import Fem
     mesh = Fem.FemMesh()
     m = mesh_data
@@ -245,6 +248,56 @@ def make_femmesh(
     return mesh
 
 
+# the element types in the order they are added to the FemMesh
+# (mesh data key, FemMesh element type)
+MESH_DATA_ELEMENT_TYPES = (
+    ("Hexa8Elem", "Volume"),
+    ("Penta6Elem", "Volume"),
+    ("Tetra4Elem", "Volume"),
+    ("Tetra10Elem", "Volume"),
+    ("Penta15Elem", "Volume"),
+    ("Hexa20Elem", "Volume"),
+    ("Tria3Elem", "Face"),
+    ("Tria6Elem", "Face"),
+    ("Quad4Elem", "Face"),
+    ("Quad8Elem", "Face"),
+    ("Seg2Elem", "Edge"),
+    ("Seg3Elem", "Edge"),
+)
+
+
+def make_femmesh_from_arrays(
+    mesh_data
+):
+    """ makes an FreeCAD FEM Mesh object from FEM Mesh data with arrays
+    {"Nodes": (node ids, (n, 3) coordinates), "Tetra10Elem": (element ids, (m, 10) nodes), ...}
+    all nodes and elements are added in bulk, see meshtools.create_femmesh_from_arrays
+    """
+    import Fem
+    from femmesh import meshtools
+    m = mesh_data
+    node_ids, node_coords = m["Nodes"]
+    if len(node_ids) == 0:
+        Console.PrintError("No Nodes found!\n")
+        return Fem.FemMesh()
+    if not any(elm_key in m for elm_key, elm_type in MESH_DATA_ELEMENT_TYPES):
+        Console.PrintError("No Elements found!\n")
+        return Fem.FemMesh()
+    FreeCAD.Console.PrintLog("Found: nodes and elements\n")
+    element_blocks = []
+    element_counts = []
+    for elm_key, elm_type in MESH_DATA_ELEMENT_TYPES:
+        elm_ids, elm_nodes = m.get(elm_key, ((), ()))
+        element_counts.append("{} {}".format(len(elm_ids), elm_key[:-4].upper()))
+        if len(elm_ids) > 0:
+            element_blocks.append((elm_type, elm_ids, elm_nodes))
+    mesh = meshtools.create_femmesh_from_arrays(node_ids, node_coords, element_blocks)
+    Console.PrintLog(
+        "imported mesh: {} nodes, {}\n".format(len(node_ids), ", ".join(element_counts))
+    )
+    return mesh
+
+
 def make_dict_from_femmesh(
     femmesh
 ):
@@ -91,6 +91,9 @@ def export(
         )
         return
     elif obj.isDerivedFrom("Fem::FemResultObject"):
+        # FemVTKTools reads the result properties, load them from the result cache
+        from femresult import resultcache
+        resultcache.load_all_properties(obj)
         Fem.writeResult(filename, obj)
     else:
         Console.PrintError(
@@ -0,0 +1,374 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "Streaming NumPy reader for Calculix frd file format"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## @package readCcxFrdResults
+#  \ingroup FEM
+#  \brief streaming Calculix frd reader returning NumPy arrays
+#
+#  In contrast to importCcxFrdResults.read_frd_result the data is not stored
+#  in dictionaries of FreeCAD.Vector or tuples. Every node or result block of
+#  the fixed width frd format is parsed in chunks into preallocated NumPy arrays.
+#  The result steps are yielded one after the other, steps and fields which are
+#  not requested are skipped without parsing their values.
+
+import os
+
+import numpy as np
+
+from FreeCAD import Console
+
+
+# number of fixed width lines parsed in one NumPy call
+CHUNK_SIZE = 65536
+
+# frd element type number:
+# (FreeCAD mesh data key, number of nodes, node order frd --> FreeCAD)
+# the node order is the same as used in importCcxFrdResults.read_frd_result
+FRD_ELEMENT_TYPES = {
+    1: ("Hexa8Elem", 8, (5, 6, 7, 4, 1, 2, 3, 0)),
+    2: ("Penta6Elem", 6, (4, 5, 3, 1, 2, 0)),
+    3: ("Tetra4Elem", 4, (1, 0, 2, 3)),
+    4: ("Hexa20Elem", 20, (
+        7, 4, 5, 6, 3, 0, 1, 2, 19, 16,
+        17, 18, 11, 8, 9, 10, 15, 12, 13, 14
+    )),
+    5: ("Penta15Elem", 15, (4, 5, 3, 1, 2, 0, 13, 14, 12, 7, 8, 6, 10, 11, 9)),
+    6: ("Tetra10Elem", 10, (1, 0, 2, 3, 4, 6, 5, 8, 7, 9)),
+    7: ("Tria3Elem", 3, (0, 1, 2)),
+    8: ("Tria6Elem", 6, (0, 1, 2, 3, 4, 5)),
+    9: ("Quad4Elem", 4, (0, 1, 2, 3)),
+    10: ("Quad8Elem", 8, (0, 1, 2, 3, 4, 5, 6, 7)),
+    11: ("Seg2Elem", 2, (0, 1)),
+    12: ("Seg3Elem", 3, (0, 1, 2)),
+}
+
+# frd result block name:
+# (result key, number of components, component order frd --> FreeCAD, factor)
+# CalculiX frd files: (Sxx, Syy, Szz, Sxy, Syz, Szx)
+# FreeCAD:            (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+# thus the last two entries of stress and strain are exchanged
+# mass flow is converted from t/s to kg/s
+FRD_RESULT_FIELDS = {
+    "DISP": ("disp", 3, (0, 1, 2), 1.0),
+    "STRESS": ("stress", 6, (0, 1, 2, 3, 5, 4), 1.0),
+    "TOSTRAIN": ("strain", 6, (0, 1, 2, 3, 5, 4), 1.0),
+    "PE": ("peeq", 1, (0,), 1.0),
+    "NDTEMP": ("temp", 1, (0,), 1.0),
+    "MAFLOW": ("mflow", 1, (0,), 1000.0),
+    "STPRES": ("npressure", 1, (0,), 1.0),
+}
+
+
+# ********* fixed width parsing *********
+def _parse_fixed_width(
+    lines,
+    start,
+    width,
+    count,
+    dtype
+):
+    """ parses count fields of the given width beginning at column start
+    of every line in one NumPy call, returns an array of shape (len(lines), count)
+    """
+    end = start + width * count
+    block = "".join([line[start:end].ljust(end - start) for line in lines])
+    raw = np.frombuffer(block.encode("ascii"), dtype="S{}".format(width))
+    return raw.astype(dtype).reshape(len(lines), count)
+
+
+class _ArrayBuilder(object):
+    """ fills a preallocated array chunk by chunk, grows if the size hint was too small
+    """
+
+    def __init__(self, size_hint, ncomp):
+        self.ncomp = ncomp
+        self.ids = np.empty(max(size_hint, 0), dtype=np.int64)
+        self.values = np.empty((max(size_hint, 0), ncomp), dtype=np.float64)
+        self.count = 0
+
+    def add_lines(self, lines):
+        if not lines:
+            return
+        n = len(lines)
+        if self.count + n > len(self.ids):
+            new_size = max(2 * len(self.ids), self.count + n)
+            self.ids = np.resize(self.ids, new_size)
+            self.values = np.resize(self.values, (new_size, self.ncomp))
+        # line layout: " -1", node id (I10), values (E12.5)
+        self.ids[self.count:self.count + n] = _parse_fixed_width(
+            lines, 3, 10, 1, np.int64
+        )[:, 0]
+        self.values[self.count:self.count + n] = _parse_fixed_width(
+            lines, 13, 12, self.ncomp, np.float64
+        )
+        self.count += n
+
+    def get_arrays(self):
+        return self.ids[:self.count], self.values[:self.count]
+
+
+def _header_count(line):
+    # number of entries of a node, element or result block header
+    try:
+        return int(line[24:36])
+    except ValueError:
+        return 0
+
+
+def _read_inout_nodes(frd_input):
+    inout_nodes = []
+    inout_nodes_file = frd_input.rsplit(".", 1)[0] + "_inout_nodes.txt"
+    if os.path.exists(inout_nodes_file):
+        Console.PrintMessage(
+            "Read special 1DFlow nodes data form: {}\n".format(inout_nodes_file)
+        )
+        with open(inout_nodes_file, "r") as f:
+            for line in f:
+                inout_nodes.append(line.split(","))
+    return inout_nodes
+
+
+# ********* mesh *********
+def _read_data_block(frd_file, first_line, ncomp):
+    # reads all " -1" lines up to the end of block line " -3"
+    builder = _ArrayBuilder(_header_count(first_line), ncomp)
+    chunk = []
+    for line in frd_file:
+        key = line[1:3]
+        if key == "-1":
+            chunk.append(line)
+            if len(chunk) == CHUNK_SIZE:
+                builder.add_lines(chunk)
+                chunk = []
+        elif key == "-3":
+            break
+    builder.add_lines(chunk)
+    return builder.get_arrays()
+
+
+def _read_element_block(frd_file, inout_nodes):
+    # every element has a " -1" header line with the element number and type
+    # and one or more " -2" lines with node numbers (I10), ten per line
+    elem_ids = {}
+    elem_rows = {}
+    row = []
+    elem_type = 0
+    for line in frd_file:
+        key = line[1:3]
+        if key == "-1":
+            if row:
+                elem_rows[elem_type].append("".join(row))
+            elem_type = int(line[14:18])
+            if elem_type not in elem_ids:
+                elem_ids[elem_type] = []
+                elem_rows[elem_type] = []
+            elem_ids[elem_type].append(line[3:13])
+            row = []
+        elif key == "-2":
+            row.append(line[3:103].rstrip("\r\n").ljust(100))
+        elif key == "-3":
+            break
+    if row:
+        elem_rows[elem_type].append("".join(row))
+
+    elements = {}
+    for elem_type, ids in elem_ids.items():
+        if elem_type not in FRD_ELEMENT_TYPES:
+            Console.PrintError(
+                "Unknown element type {} in frd file, elements are ignored.\n"
+                .format(elem_type)
+            )
+            continue
+        mesh_key, nodes_count, node_order = FRD_ELEMENT_TYPES[elem_type]
+        ids = np.array(ids, dtype="S10").astype(np.int64)
+        conn = _parse_fixed_width(elem_rows[elem_type], 0, 10, nodes_count, np.int64)
+        conn = conn[:, node_order]
+        if mesh_key == "Seg3Elem" and inout_nodes:
+            ids, conn = _apply_inout_nodes_seg3(ids, conn, inout_nodes)
+        elements[mesh_key] = (ids, conn)
+    return elements
+
+
+def _apply_inout_nodes_seg3(ids, conn, inout_nodes):
+    # same as importCcxFrdResults.read_frd_result, the fluid inlet and outlet
+    # elements get the special node numbering, all other seg3 are not used
+    new_ids = []
+    new_conn = []
+    for eid, (nd1, nd2, nd3) in zip(ids, conn):
+        for inout in inout_nodes:
+            if nd1 == int(inout[1]):
+                new_ids.append(eid)
+                new_conn.append((int(inout[2]), nd3, nd1))
+            elif nd3 == int(inout[1]):
+                new_ids.append(eid)
+                new_conn.append((nd1, int(inout[2]), nd3))
+    return (
+        np.array(new_ids, dtype=np.int64),
+        np.array(new_conn, dtype=np.int64).reshape(len(new_conn), 3)
+    )
+
+
+def _apply_inout_nodes_values(ids, values, inout_nodes):
+    # the value of a inout node is copied to its special node
+    for inout in inout_nodes:
+        source = int(inout[1])
+        target = int(inout[2])
+        found = np.flatnonzero(ids == source)
+        if len(found) == 0:
+            continue
+        existing = np.flatnonzero(ids == target)
+        if len(existing) > 0:
+            values[existing[0]] = values[found[0]]
+        else:
+            pos = found[0] + 1
+            ids = np.insert(ids, pos, target)
+            values = np.insert(values, pos, values[found[0]], axis=0)
+    return ids, values
+
+
+def read_frd_mesh(
+    frd_input
+):
+    """ reads the nodes and elements of a frd file into NumPy arrays
+
+    Returns a dictionary with the keys:
+        "NodeIds": int64 array of shape (N,)
+        "NodeCoords": float64 array of shape (N, 3)
+        "Elements": {mesh data element key: (element ids, node ids (M, nodes per element))}
+    The element keys are the same as in importCcxFrdResults.read_frd_result,
+    for example "Tetra10Elem". Reading stops at the first result block.
+    """
+    inout_nodes = _read_inout_nodes(frd_input)
+    mesh = {
+        "NodeIds": np.empty(0, dtype=np.int64),
+        "NodeCoords": np.empty((0, 3), dtype=np.float64),
+        "Elements": {}
+    }
+    with open(frd_input, "r") as frd_file:
+        for line in frd_file:
+            if line[4:6] == "2C":
+                mesh["NodeIds"], mesh["NodeCoords"] = _read_data_block(frd_file, line, 3)
+            elif line[4:6] == "3C":
+                mesh["Elements"] = _read_element_block(frd_file, inout_nodes)
+            elif line[4:10] == "1PSTEP" or line[1:5] == "9999":
+                break
+    if len(mesh["NodeIds"]) == 0:
+        Console.PrintError("FEM: No nodes found in Frd file.\n")
+    return mesh
+
+
+# ********* results *********
+def iter_frd_results(
+    frd_input,
+    steps=None,
+    fields=None
+):
+    """ generator over the result steps of a frd file
+
+    steps: collection of step indices (starting at 0) to read, None reads all steps
+    fields: collection of result keys ("disp", "stress", "strain", "peeq", "temp",
+        "mflow", "npressure") to read, None reads all fields
+
+    Every yielded step is a dictionary with the keys "index", "number" (eigenmode number
+    or NaN), "time" and for every read field the key of the field with the
+    value (node ids array, values array of shape (N, number of components)).
+    The node ids and values of a field are in frd file order. Stress and strain
+    are in FreeCAD component order. A step is a group of result blocks with the
+    same eigenmode number and time, as in importCcxFrdResults.read_frd_result.
+    The blocks of unwanted steps and fields are skipped without parsing the values.
+    """
+    inout_nodes = _read_inout_nodes(frd_input)
+    if steps is not None:
+        steps = set(steps)
+        if not steps:
+            return
+        last_step = max(steps)
+    if fields is not None:
+        fields = set(fields)
+
+    eigenmode = 0
+    timestep = 0.0
+    step_index = -1
+    step_changed = False
+    step = None
+    step_wanted = False
+    header = ""
+    with open(frd_input, "r") as frd_file:
+        for line in frd_file:
+            if line[5:10] == "PMODE":
+                eigentemp = int(line[30:36])
+                if eigentemp > eigenmode:
+                    eigenmode = eigentemp
+                    step_changed = True
+            elif line[2:7] == "100CL":
+                timetemp = float(line[13:25])
+                if timetemp > timestep:
+                    timestep = timetemp
+                    step_changed = True
+                if step_changed or step is None:
+                    if step_wanted:
+                        yield step
+                    step_index += 1
+                    step_changed = False
+                    if steps is not None and step_index > last_step:
+                        return
+                    step_wanted = steps is None or step_index in steps
+                    step = {
+                        "index": step_index,
+                        "number": eigenmode if eigenmode > 0 else float("NaN"),
+                        "time": timestep,
+                    }
+                header = line
+            elif line[1:3] == "-4":
+                field = FRD_RESULT_FIELDS.get(line[5:13].strip())
+                if (
+                    not step_wanted
+                    or field is None
+                    or (fields is not None and field[0] not in fields)
+                ):
+                    # skip the block without parsing the values
+                    for line in frd_file:
+                        if line[1:3] == "-3":
+                            break
+                    continue
+                key, ncomp, comp_order, factor = field
+                ids, values = _read_data_block(frd_file, header, ncomp)
+                values = values[:, comp_order]
+                if factor != 1.0:
+                    values *= factor
+                if inout_nodes and key in ("mflow", "npressure"):
+                    ids, values = _apply_inout_nodes_values(ids, values, inout_nodes)
+                step[key] = (ids, values)
+            elif line[4:6] in ("2C", "3C"):
+                # mesh blocks, see read_frd_mesh
+                for line in frd_file:
+                    if line[1:3] == "-3":
+                        break
+            elif line[1:5] == "9999":
+                break
+    if step_wanted:
+        yield step
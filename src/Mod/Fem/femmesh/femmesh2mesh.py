@@ -27,16 +27,22 @@ __url__ = "http://www.freecadweb.org"
 ## @package FwmMesh2Mesh
 #  \ingroup FEM
 
+import collections
 import time
 
+import numpy as np
+
 import FreeCAD
 # import Mesh
 
+from femmesh import meshtools
+from femresult import resultcache
+
 
 """
 from femexamples.manager import *
 doc = run_ccx_cantileverfaceload()
-fem_mesh = doc.getObject("Mesh").FemMesh  # do not remove the _
+fem_mesh = doc.getObject("Mesh")  # do not remove the _
 result = doc.getObject("CCX_Results")
 from femmesh import femmesh2mesh
 out_mesh = femmesh2mesh.femmesh_2_mesh(fem_mesh, result)
@@ -85,116 +91,166 @@ face_dicts = {
     15: pentaFaces,
     20: hexaFaces}
 
+# face meshes, every face element is a face of the surface
+triaFace = {1: [0, 1, 2]}   # tria3 or tria6 (ignoring mid-nodes)
+quadFace = {1: [0, 1, 2, 3]}  # quad4 or quad8 (ignoring mid-nodes)
 
-def femmesh_2_mesh(myFemMesh, myResults=None):
-    shiftBits = 20  # allows a million nodes, needs to be higher for more nodes in a FemMesh
+shell_face_dicts = {
+    3: triaFace,
+    4: quadFace,
+    6: triaFace,
+    8: quadFace}
 
-    # This code generates a dict and a faceCode for each face of all elements
-    # All faceCodes are than sorted.
+# the surface of the last used meshes
+# {(document name, object name) or mesh checksum: (mesh checksum, FemMeshSurface)}
+_surface_cache = collections.OrderedDict()
+_SURFACE_CACHE_SIZE = 4
 
-    start_time = time.process_time()
-    faceCodeList = []
-    faceCodeDict = {}
-
-    if myFemMesh.VolumeCount > 0:
-        for ele in myFemMesh.Volumes:
-            element_nodes = myFemMesh.getElementNodes(ele)
-            # print("element_node: ", element_nodes)
-            faceDef = face_dicts[len(element_nodes)]
-
-            for key in faceDef:
-                nodeList = []
-                codeList = []
-                faceCode = 0
-                shifter = 0
-                for nodeIdx in faceDef[key]:
-                    nodeList.append(element_nodes[nodeIdx])
-                    codeList.append(element_nodes[nodeIdx])
-                codeList.sort()
-                for node in codeList:
-                    faceCode += (node << shifter)
-                    # x << n: x shifted left by n bits = Multiplication
-                    shifter += shiftBits
-                # print("codeList: ", codeList)
-                faceCodeDict[faceCode] = nodeList
-                faceCodeList.append(faceCode)
-    elif myFemMesh.FaceCount > 0:
-        for ele in myFemMesh.Faces:
-            element_nodes = myFemMesh.getElementNodes(ele)
-            # print("element_node: ", element_nodes)
-            faceDef = {1: [0, 1, 2]}
-
-            for key in faceDef:
-                nodeList = []
-                codeList = []
-                faceCode = 0
-                shifter = 0
-                for nodeIdx in faceDef[key]:
-                    nodeList.append(element_nodes[nodeIdx])
-                    codeList.append(element_nodes[nodeIdx])
-                codeList.sort()
-                for node in codeList:
-                    faceCode += (node << shifter)
-                    # x << n: x shifted left by n bits = Multiplication
-                    shifter += shiftBits
-                # print("codeList: ", codeList)
-                faceCodeDict[faceCode] = nodeList
-                faceCodeList.append(faceCode)
-
-    faceCodeList.sort()
-    allFaces = len(faceCodeList)
-    actFaceIdx = 0
-    singleFaces = []
-    # Here we search for faces, which do not have a counterpart.
-    # These are the faces on the surface of the mesh.
-    while actFaceIdx < allFaces:
-        if actFaceIdx < (allFaces - 1):
-            if faceCodeList[actFaceIdx] == faceCodeList[actFaceIdx + 1]:
-                actFaceIdx += 2
-            else:
-                # print("found a single Face: ", faceCodeList[actFaceIdx])
-                singleFaces.append(faceCodeList[actFaceIdx])
-                actFaceIdx += 1
+
+class FemMeshSurface(object):
+    """surface of a FemMesh as triangles
+
+    The faces of all volume elements are collected in a NumPy array with
+    one row of sorted node ids per face. The faces found only once by
+    np.unique are the faces on the surface of the mesh. On face meshes all
+    face elements are used. Quad faces are split into two triangles.
+    The triangles are node positions in node_ids, thus the points for
+    any displacement field are found without any search. The surface only
+    depends on the mesh, use get_femmesh_surface() to reuse it for all
+    result objects of a mesh.
+    """
+
+    def __init__(self, femmesh):
+        nodes = femmesh.Nodes
+        node_ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+        node_coords = np.array(
+            [(v.x, v.y, v.z) for v in nodes.values()],
+            dtype=np.float64
+        ).reshape(-1, 3)
+        order = np.argsort(node_ids)
+        self.node_ids = node_ids[order]
+        self.node_coords = node_coords[order]
+
+        if femmesh.VolumeCount > 0:
+            faces = get_element_faces(femmesh, femmesh.Volumes, face_dicts)
+            faces = get_single_faces(faces)
+        elif femmesh.FaceCount > 0:
+            faces = get_element_faces(femmesh, femmesh.Faces, shell_face_dicts)
         else:
-            FreeCAD.Console.PrintMessage("Found a last Face: {}\n".format(faceCodeList[actFaceIdx]))
-            singleFaces.append(faceCodeList[actFaceIdx])
-            actFaceIdx += 1
+            faces = np.empty((0, 4), dtype=np.int64)
+
+        # the fourth node of a triangle is -1
+        quads = faces[faces[:, 3] >= 0]
+        triangles = np.concatenate((faces[:, [0, 1, 2]], quads[:, [2, 3, 0]]))
+        self.triangles = np.searchsorted(self.node_ids, triangles)
+        FreeCAD.Console.PrintLog(
+            "FemMesh surface: {} faces, {} triangles\n".format(len(faces), len(triangles))
+        )
+
+    def get_result_displacements(self, result):
+        """returns the displacements of the result object
+        as an (n, 3) array in the order of node_ids
+        nodes without a result value are not displaced
+        """
+        displacements = np.zeros_like(self.node_coords)
+        result_ids = np.asarray(result.NodeNumbers, dtype=np.int64)
+        if len(result_ids) == 0 or len(self.node_ids) == 0:
+            return displacements
+        # the displacements of a cached result object are read from the cache
+        result_disp = resultcache.get_array(result, "DisplacementVectors")
+        pos = np.minimum(np.searchsorted(self.node_ids, result_ids), len(self.node_ids) - 1)
+        found = self.node_ids[pos] == result_ids
+        displacements[pos[found]] = result_disp[found]
+        return displacements
+
+    def get_points(self, displacements=None):
+        """returns the triangle points as an (3 * number of triangles, 3) array
+        displacements is an optional (n, 3) array in the order of node_ids
+        """
+        coords = self.node_coords
+        if displacements is not None:
+            coords = coords + displacements
+        return coords[self.triangles.ravel()]
+
+
+def get_element_faces(femmesh, elements, element_face_dicts):
+    """returns the faces of the elements as an (n, 4) array of node ids
+    the node order of the face definition is kept, triangles have -1 as fourth node
+    """
+    connectivity = {}
+    for ele in elements:
+        element_nodes = femmesh.getElementNodes(ele)
+        connectivity.setdefault(len(element_nodes), []).append(element_nodes)
+    faces = [np.empty((0, 4), dtype=np.int64)]
+    for node_count, element_nodes in connectivity.items():
+        face_dict = element_face_dicts.get(node_count)
+        if face_dict is None:
+            FreeCAD.Console.PrintWarning(
+                "Elements with {} nodes are not supported, "
+                "their faces are ignored.\n".format(node_count)
+            )
+            continue
+        element_nodes = np.array(element_nodes, dtype=np.int64)
+        for face_nodes in face_dict.values():
+            face = np.full((len(element_nodes), 4), -1, dtype=np.int64)
+            face[:, :len(face_nodes)] = element_nodes[:, face_nodes]
+            faces.append(face)
+    return np.concatenate(faces)
 
-    output_mesh = []
+
+def get_single_faces(faces):
+    """returns the faces which do not have a counterpart
+    these are the faces on the surface of the mesh
+    """
+    if len(faces) == 0:
+        return faces
+    face_keys = np.sort(faces, axis=1)
+    face_keys, first, counts = np.unique(
+        face_keys,
+        axis=0,
+        return_index=True,
+        return_counts=True
+    )
+    return faces[np.sort(first[counts == 1])]
+
+
+def get_femmesh_surface(femmesh, femmesh_obj=None):
+    """returns the FemMeshSurface of the femmesh
+    every access of the FemMesh property of a document object returns a new
+    FemMesh, thus the surface is cached by the femmesh_obj if given, otherwise
+    by the checksum of the femmesh. It is rebuilt if the checksum has changed.
+    """
+    checksum = meshtools.get_femmesh_checksum(femmesh)
+    if femmesh_obj is not None:
+        key = (femmesh_obj.Document.Name, femmesh_obj.Name)
+    else:
+        key = checksum
+    cached = _surface_cache.pop(key, None)
+    if cached is None or cached[0] != checksum:
+        cached = (checksum, FemMeshSurface(femmesh))
+    _surface_cache[key] = cached
+    while len(_surface_cache) > _SURFACE_CACHE_SIZE:
+        _surface_cache.popitem(last=False)
+    return cached[1]
+
+
+def femmesh_2_mesh(myFemMesh, myResults=None):
+    # The surface of the mesh is searched once and cached,
+    # see FemMeshSurface. The result displacements are added by node position.
+    # myFemMesh is a FemMesh or a document object with a FemMesh property,
+    # the surface of a document object is cached by its name.
+
+    start_time = time.process_time()
+    if hasattr(myFemMesh, "FemMesh"):
+        surface = get_femmesh_surface(myFemMesh.FemMesh, myFemMesh)
+    else:
+        surface = get_femmesh_surface(myFemMesh)
     if myResults:
         FreeCAD.Console.PrintMessage("{}\n".format(myResults.Name))
-        for myFace in singleFaces:
-            face_nodes = faceCodeDict[myFace]
-            dispVec0 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[0])]
-            dispVec1 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[1])]
-            dispVec2 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[2])]
-            triangle = [myFemMesh.getNodeById(face_nodes[0]) + dispVec0,
-                        myFemMesh.getNodeById(face_nodes[1]) + dispVec1,
-                        myFemMesh.getNodeById(face_nodes[2]) + dispVec2]
-            output_mesh.extend(triangle)
-            # print("my triangle: ", triangle)
-            if len(face_nodes) == 4:
-                dispVec3 = myResults.DisplacementVectors[myResults.NodeNumbers.index(face_nodes[3])]
-                triangle = [myFemMesh.getNodeById(face_nodes[2]) + dispVec2,
-                            myFemMesh.getNodeById(face_nodes[3]) + dispVec3,
-                            myFemMesh.getNodeById(face_nodes[0]) + dispVec0]
-                output_mesh.extend(triangle)
-                # print("my 2. triangle: ", triangle)
-
+        points = surface.get_points(surface.get_result_displacements(myResults))
     else:
-        for myFace in singleFaces:
-            face_nodes = faceCodeDict[myFace]
-            triangle = [myFemMesh.getNodeById(face_nodes[0]),
-                        myFemMesh.getNodeById(face_nodes[1]),
-                        myFemMesh.getNodeById(face_nodes[2])]
-            output_mesh.extend(triangle)
-            # print("my triangle: ", triangle)
-            if len(face_nodes) == 4:
-                triangle = [myFemMesh.getNodeById(face_nodes[2]),
-                            myFemMesh.getNodeById(face_nodes[3]),
-                            myFemMesh.getNodeById(face_nodes[0])]
-                output_mesh.extend(triangle)
-                # print("my 2. triangle: ", triangle)
+        points = surface.get_points()
+    output_mesh = [FreeCAD.Vector(*point) for point in points.tolist()]
 
     end_time = time.process_time()
     FreeCAD.Console.PrintMessage(
@@ -27,6 +27,11 @@ __url__ = "http://www.freecadweb.org"
 ## \addtogroup FEM
 #  @{
 
+import collections
+import hashlib
+
+import numpy as np
+
 import FreeCAD
 
 from femtools import geomtools
@@ -65,22 +70,24 @@ def get_femelements_by_references(
     femmesh,
     femelement_table,
     references,
-    femnodes_ele_table=None
+    use_topology_index=False
 ):
     """get the femelements for a list of references
+    use_topology_index: search the elements by the node element adjacency
+    of the mesh topology index, works for volumes only
     """
     references_femelements = []
     for ref in references:
         # femnodes for the current ref
         ref_femnodes = get_femnodes_by_refshape(femmesh, ref)
-        if femnodes_ele_table:
-            # blind fast binary search, works for volumes only
+        if use_topology_index:
+            # blind fast search, works for volumes only
             # femelements for all references
-            references_femelements += get_femelements_by_femnodes_bin(
-                femelement_table,
-                femnodes_ele_table,
-                ref_femnodes
-            )
+            # the node element adjacency of the topology index is used
+            references_femelements += get_mesh_topology_index(
+                femmesh,
+                femelement_table
+            ).get_femelements_by_femnodes(ref_femnodes)
         else:
             # standard search
             # femelements for all references
@@ -140,6 +147,44 @@ def get_femnodes_by_refshape(
     return nodes
 
 
+# ************************************************************************************************
+def create_femmesh_from_arrays(
+    node_ids,
+    node_coords,
+    element_blocks,
+    femmesh=None
+):
+    """create_femmesh_from_arrays(node_ids, node_coords, element_blocks, femmesh=None)
+    creates all nodes and elements of a FemMesh from arrays and returns the FemMesh
+    node_ids: (n,) node ids, node_coords: (n, 3) node coordinates
+    element_blocks: [(element type, element ids, element nodes), ...]
+    element type is "Edge", "Face" or "Volume", element nodes an (m, nodes per element) array
+    the nodes and the element blocks are added in the given order
+    """
+    if femmesh is None:
+        import Fem
+        femmesh = Fem.FemMesh()
+    add_node = femmesh.addNode
+    for (x, y, z), node_id in zip(
+        np.asarray(node_coords, dtype=np.float64).tolist(),
+        np.asarray(node_ids, dtype=np.int64).tolist()
+    ):
+        add_node(x, y, z, node_id)
+    add_element_methods = {
+        "Edge": femmesh.addEdge,
+        "Face": femmesh.addFace,
+        "Volume": femmesh.addVolume,
+    }
+    for element_type, element_ids, element_nodes in element_blocks:
+        add_element = add_element_methods[element_type]
+        for nodes, element_id in zip(
+            np.asarray(element_nodes, dtype=np.int64).tolist(),
+            np.asarray(element_ids, dtype=np.int64).tolist()
+        ):
+            add_element(nodes, element_id)
+    return femmesh
+
+
 # ************************************************************************************************
 def get_femelement_table(
     femmesh
@@ -396,11 +441,12 @@ def get_femelements_by_femnodes_std(
     e: elementlist
     nodes: nodelist """
     FreeCAD.Console.PrintMessage("std search: get_femelements_by_femnodes_std\n")
+    node_set = set(node_list)
     e = []  # elementlist
     for elementID in sorted(femelement_table):
         nodecount = 0
         for nodeID in femelement_table[elementID]:
-            if nodeID in node_list:
+            if nodeID in node_set:
                 nodecount = nodecount + 1
         # all nodes of the element are in the node_list!
         if nodecount == len(femelement_table[elementID]):
@@ -425,6 +471,7 @@ def get_femvolumeelements_by_femfacenodes(
         --> if exact 6 or 8 element nodes are in node_list --> add femelement
     e: elementlist
     nodes: nodelist """
+    node_list = set(node_list)
     e = []  # elementlist
     for elementID in sorted(femelement_table):
         nodecount = 0
@@ -475,12 +522,226 @@ def get_femvolumeelements_by_femfacenodes(
     return e
 
 
+# ************************************************************************************************
+# ***** topology index ***************************************************************************
+# bit masks of the CalculiX element faces, see get_ccxelement_faces_from_binary_search
+# {number of element nodes: ((bit mask, ccx face number), ...)}
+CCX_ELEMENT_FACE_MASKS = {
+    4: ((7, 1), (11, 2), (13, 3), (14, 4)),
+    6: ((56, 1), (7, 2), (54, 3), (45, 4), (27, 5)),
+    8: ((240, 1), (15, 2), (102, 3), (204, 4), (153, 5), (51, 6)),
+    10: ((119, 1), (411, 2), (717, 3), (814, 4)),
+    15: ((3640, 1), (455, 2), (25782, 3), (22829, 4), (12891, 5)),
+    20: ((61680, 1), (3855, 2), (402022, 3), (804044, 4), (624793, 5), (201011, 6)),
+}
+
+# the topology index of the last used meshes
+# {element checksum of the femmesh: MeshTopologyIndex}
+_topology_index_cache = collections.OrderedDict()
+_TOPOLOGY_INDEX_CACHE_SIZE = 4
+# number of node sets whose element faces are kept by a topology index
+_FACES_CACHE_SIZE = 64
+
+
+class MeshTopologyIndex(object):
+    """node to element index of a femelement_table
+
+    The index holds a CSR node --> element adjacency with the position bit
+    of the node in the element. It replaces the femnodes_ele_table
+    and the bit_pattern_dict. The bit pattern are only calculated for the
+    elements which have at least one node of the node set. The element faces
+    found for the last _FACES_CACHE_SIZE node sets are cached by the node set.
+    Use get_mesh_topology_index() to get the index of a mesh, it is
+    only built once for a mesh and rebuilt if the mesh has changed.
+    """
+
+    def __init__(self, femelement_table):
+        self.element_ids = np.array(list(femelement_table.keys()), dtype=np.int64)
+        self.element_lengths = np.array(
+            [len(nodes) for nodes in femelement_table.values()],
+            dtype=np.int64
+        )
+        flat_nodes = np.fromiter(
+            (n for nodes in femelement_table.values() for n in nodes),
+            dtype=np.int64,
+            count=int(self.element_lengths.sum())
+        )
+        # element position and node position bit for every entry of flat_nodes
+        starts = np.cumsum(self.element_lengths) - self.element_lengths
+        flat_elements = np.repeat(np.arange(len(self.element_ids)), self.element_lengths)
+        flat_bits = np.left_shift(1, np.arange(len(flat_nodes)) - starts[flat_elements])
+
+        # CSR adjacency sorted by node id
+        order = np.argsort(flat_nodes, kind="stable")
+        sorted_nodes = flat_nodes[order]
+        self.node_ids, node_starts = np.unique(sorted_nodes, return_index=True)
+        self.indptr = np.append(node_starts, len(sorted_nodes))
+        self.adj_elements = flat_elements[order]
+        self.adj_bits = flat_bits[order]
+        self._faces_cache = collections.OrderedDict()
+        FreeCAD.Console.PrintLog(
+            "Mesh topology index: {} elements, {} nodes\n"
+            .format(len(self.element_ids), len(self.node_ids))
+        )
+
+    def _get_adjacency(self, node_set):
+        # element positions and node bits of all elements of the nodes in node_set
+        nodes = np.unique(np.asarray(list(node_set), dtype=np.int64))
+        pos = np.searchsorted(self.node_ids, nodes)
+        # nodes which are not used by any element are ignored
+        valid = pos < len(self.node_ids)
+        valid[valid] = self.node_ids[pos[valid]] == nodes[valid]
+        pos = pos[valid]
+        starts = self.indptr[pos]
+        counts = self.indptr[pos + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        entries = np.repeat(starts - offsets, counts) + np.arange(int(counts.sum()))
+        return self.adj_elements[entries], self.adj_bits[entries]
+
+    def get_bit_patterns(self, node_set):
+        """returns element positions and the bit pattern of the node_set nodes
+        for every element with at least one node in node_set,
+        sorted by the element position in the femelement_table
+        """
+        elements, bits = self._get_adjacency(node_set)
+        touched, inverse = np.unique(elements, return_inverse=True)
+        patterns = np.zeros(len(touched), dtype=np.int64)
+        np.add.at(patterns, inverse, bits)
+        return touched, patterns
+
+    def get_ccxelement_faces(self, node_set):
+        """same as get_ccxelement_faces_from_binary_search(get_bit_pattern_dict(...))
+        [[eleID, ccx face number], ...]
+        """
+        key = frozenset(node_set)
+        if key in self._faces_cache:
+            self._faces_cache.move_to_end(key)
+            return [list(face) for face in self._faces_cache[key]]
+        touched, patterns = self.get_bit_patterns(key)
+        lengths = self.element_lengths[touched]
+        found_pos = []
+        found_face = []
+        for length, masks in CCX_ELEMENT_FACE_MASKS.items():
+            is_length = lengths == length
+            if not is_length.any():
+                continue
+            for mask, face_number in masks:
+                hit = is_length & ((patterns & mask) == mask)
+                found_pos.append(touched[hit])
+                found_face.append(np.full(int(hit.sum()), face_number, dtype=np.int64))
+        if found_pos:
+            found_pos = np.concatenate(found_pos)
+            found_face = np.concatenate(found_face)
+            order = np.lexsort((found_face, found_pos))
+            faces = list(zip(
+                self.element_ids[found_pos[order]].tolist(),
+                found_face[order].tolist()
+            ))
+        else:
+            faces = []
+        self._faces_cache[key] = faces
+        while len(self._faces_cache) > _FACES_CACHE_SIZE:
+            self._faces_cache.popitem(last=False)
+        FreeCAD.Console.PrintLog("found Faces: {}\n".format(len(faces)))
+        return [list(face) for face in faces]
+
+    def get_femelements_by_femnodes(self, node_set):
+        """all elements which have all their nodes in node_set,
+        same as get_femelements_by_femnodes_bin but not only for volumes
+        """
+        elements, bits = self._get_adjacency(node_set)
+        counts = np.bincount(elements, minlength=len(self.element_ids))
+        return self.element_ids[counts == self.element_lengths].tolist()
+
+
+def get_femmesh_checksum(
+    femmesh,
+    with_nodes=True
+):
+    """returns a checksum of the femmesh as hex string
+    the checksum is the sha1 hash of the element counts and the ids
+    of the edges, faces and volumes, and with_nodes of the node ids
+    and the node coordinates. It is much cheaper than writing the mesh
+    or getting the element nodes of all elements. The element nodes are
+    not included, a changed element keeps its id only if it is modified
+    in place, meshers number the elements anew.
+    """
+    sha = hashlib.sha1()
+    sha.update(np.array(
+        (femmesh.NodeCount, femmesh.EdgeCount, femmesh.FaceCount, femmesh.VolumeCount),
+        dtype=np.int64
+    ).tobytes())
+    for element_ids in (femmesh.Edges, femmesh.Faces, femmesh.Volumes):
+        sha.update(np.array(element_ids, dtype=np.int64).tobytes())
+        sha.update(b";")
+    if with_nodes:
+        nodes = femmesh.Nodes
+        sha.update(np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes)).tobytes())
+        sha.update(np.array(
+            [(v.x, v.y, v.z) for v in nodes.values()],
+            dtype=np.float64
+        ).tobytes())
+    return sha.hexdigest()
+
+
+def get_femelement_table_checksum(
+    femelement_table
+):
+    """returns a checksum of the femelement_table as hex string
+    the checksum is the sha1 hash of the element ids and their nodes
+    """
+    lengths = np.fromiter(
+        (len(nodes) for nodes in femelement_table.values()),
+        dtype=np.int64,
+        count=len(femelement_table)
+    )
+    sha = hashlib.sha1()
+    sha.update(np.fromiter(
+        femelement_table.keys(),
+        dtype=np.int64,
+        count=len(femelement_table)
+    ).tobytes())
+    sha.update(lengths.tobytes())
+    sha.update(np.fromiter(
+        (n for nodes in femelement_table.values() for n in nodes),
+        dtype=np.int64,
+        count=int(lengths.sum())
+    ).tobytes())
+    return sha.hexdigest()
+
+
+def get_mesh_topology_index(
+    femmesh,
+    femelement_table=None
+):
+    """returns the MeshTopologyIndex of the femmesh
+    the index is cached by the element checksum of the femmesh and the checksum
+    of the femelement_table, thus a remeshed mesh with the same element ids but
+    other element nodes gets a new index. The index is found for every FemMesh
+    with the same elements. The femelement_table is used if given,
+    otherwise get_femelement_table(femmesh)
+    """
+    if femelement_table is None:
+        femelement_table = get_femelement_table(femmesh)
+    key = (
+        get_femmesh_checksum(femmesh, with_nodes=False),
+        get_femelement_table_checksum(femelement_table)
+    )
+    index = _topology_index_cache.pop(key, None)
+    if index is None:
+        index = MeshTopologyIndex(femelement_table)
+    _topology_index_cache[key] = index
+    while len(_topology_index_cache) > _TOPOLOGY_INDEX_CACHE_SIZE:
+        _topology_index_cache.popitem(last=False)
+    return index
+
+
 # ************************************************************************************************
 def get_femelement_sets(
     femmesh,
     femelement_table,
     fem_objects,
-    femnodes_ele_table=None
+    use_topology_index=False
 ):
     # fem_objects = FreeCAD FEM document objects
     # get femelements for reference shapes of each obj.References
@@ -501,7 +762,7 @@ def get_femelement_sets(
             ref_shape_femelements = get_femelements_by_references(
                 femmesh, femelement_table,
                 obj.References,
-                femnodes_ele_table
+                use_topology_index
             )
             referenced_femelements += ref_shape_femelements
             count_femelements += len(ref_shape_femelements)
@@ -511,6 +772,7 @@ def get_femelement_sets(
     # get remaining femelements for the fem_objects
     if has_remaining_femelements:
         remaining_femelements = []
+        referenced_femelements = set(referenced_femelements)
         for elemid in femelement_table:
             if elemid not in referenced_femelements:
                 remaining_femelements.append(elemid)
@@ -1587,7 +1849,6 @@ def get_ref_shape_node_sum_geom_table(
 def get_pressure_obj_faces(
     femmesh,
     femelement_table,
-    femnodes_ele_table,
     femobj
 ):
     # see get_ccxelement_faces_from_binary_search for more information
@@ -1596,13 +1857,12 @@ def get_pressure_obj_faces(
         # sorted and duplicates removed
         prs_face_node_set = get_femnodes_by_femobj_with_references(femmesh, femobj)
         # FreeCAD.Console.PrintMessage("prs_face_node_set: {}\n".format(prs_face_node_set))
-        # fill the bit_pattern_dict and search for the faces
-        bit_pattern_dict = get_bit_pattern_dict(
-            femelement_table,
-            femnodes_ele_table,
-            prs_face_node_set
-        )
-        pressure_faces = get_ccxelement_faces_from_binary_search(bit_pattern_dict)
+        # search for the faces, the bit pattern are calculated
+        # by the topology index which is only built once for the mesh
+        pressure_faces = get_mesh_topology_index(
+            femmesh,
+            femelement_table
+        ).get_ccxelement_faces(prs_face_node_set)
     elif is_face_femmesh(femmesh):
         pressure_faces = []
         # normally we should call get_femelements_by_references and
@@ -1655,7 +1915,6 @@ def get_pressure_obj_faces_depreciated(
 def get_contact_obj_faces(
     femmesh,
     femelement_table,
-    femnodes_ele_table,
     femobj
 ):
     # see comment on get_pressure_obj_faces_depreciated in the regard of getccxVolumesByFace()
@@ -1711,21 +1970,10 @@ def get_contact_obj_faces(
         FreeCAD.Console.PrintLog("    slaveface_nds: {}\n".format(slaveface_nds))
         FreeCAD.Console.PrintLog("    masterface_nds: {}\n".format(slaveface_nds))
 
-        FreeCAD.Console.PrintLog("    Fill the bit_pattern_dict and search for the faces.\n")
-        slave_bit_pattern_dict = get_bit_pattern_dict(
-            femelement_table,
-            femnodes_ele_table,
-            slaveface_nds
-        )
-        master_bit_pattern_dict = get_bit_pattern_dict(
-            femelement_table,
-            femnodes_ele_table,
-            masterface_nds
-        )
-
-        FreeCAD.Console.PrintLog("    Get the FaceIDs.\n")
-        slave_faces = get_ccxelement_faces_from_binary_search(slave_bit_pattern_dict)
-        master_faces = get_ccxelement_faces_from_binary_search(master_bit_pattern_dict)
+        FreeCAD.Console.PrintLog("    Get the FaceIDs from the topology index.\n")
+        topology_index = get_mesh_topology_index(femmesh, femelement_table)
+        slave_faces = topology_index.get_ccxelement_faces(slaveface_nds)
+        master_faces = topology_index.get_ccxelement_faces(masterface_nds)
 
     elif is_face_femmesh(femmesh):
         slave_ref_shape = slave_ref[0].Shape.getElement(slave_ref[1][0])
@@ -1757,7 +2005,6 @@ def get_contact_obj_faces(
 def get_tie_obj_faces(
     femmesh,
     femelement_table,
-    femnodes_ele_table,
     femobj
 ):
     # see comment get_contact_obj_faces
@@ -1803,21 +2050,10 @@ def get_tie_obj_faces(
         # FreeCAD.Console.PrintLog("slaveface_nds: {}\n".format(slaveface_nds))
         # FreeCAD.Console.PrintLog("masterface_nds: {}\n".format(slaveface_nds))
 
-        # fill the bit_pattern_dict and search for the faces
-        slave_bit_pattern_dict = get_bit_pattern_dict(
-            femelement_table,
-            femnodes_ele_table,
-            slaveface_nds
-        )
-        master_bit_pattern_dict = get_bit_pattern_dict(
-            femelement_table,
-            femnodes_ele_table,
-            masterface_nds
-        )
-
-        # get the faces ids
-        slave_faces = get_ccxelement_faces_from_binary_search(slave_bit_pattern_dict)
-        master_faces = get_ccxelement_faces_from_binary_search(master_bit_pattern_dict)
+        # get the faces ids from the topology index
+        topology_index = get_mesh_topology_index(femmesh, femelement_table)
+        slave_faces = topology_index.get_ccxelement_faces(slaveface_nds)
+        master_faces = topology_index.get_ccxelement_faces(masterface_nds)
 
     elif is_face_femmesh(femmesh):
         FreeCAD.Console.PrintError(
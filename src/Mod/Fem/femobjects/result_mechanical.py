@@ -68,6 +68,23 @@ class ResultMechanical(base_fempythonobject.BaseFemPythonObject):
             True
         )
 
+        # on disk result cache, see module femresult/resultcache.py
+        # the NodeData properties are empty and loaded from the cache on first use
+        obj.addProperty(
+            "App::PropertyString",
+            "ResultCache",
+            "Base",
+            "Directory of the result cache",
+            True
+        )
+        obj.addProperty(
+            "App::PropertyInteger",
+            "ResultCacheStep",
+            "Base",
+            "Result step in the result cache",
+            True
+        )
+
         # node results
         # set read only or hide a property:
         # https://forum.freecadweb.org/viewtopic.php?f=18&t=13460&start=10#p108072
@@ -0,0 +1,382 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+__title__ = "On disk cache of FEM result steps"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## @package resultcache
+#  \ingroup FEM
+#  \brief on disk cache of result steps with lazy loading of result fields
+
+import collections
+import json
+import os
+
+import numpy as np
+
+import FreeCAD
+
+from femtools.femutils import is_of_type
+from . import resulttools
+
+
+"""
+Every result field of every result step is saved as a .npy file in the cache
+directory. The result objects only hold the cache directory and the step
+index, NodeNumbers, Time, Eigenmode and Stats. A result field is loaded from
+the memory mapped .npy file into the result object property on first use:
+
+from femresult import resultcache
+von_mises = resultcache.get_property(res_obj, "vonMises")
+
+or without copying it into the result object:
+
+von_mises = resultcache.get_array(res_obj, "vonMises")
+
+Only the last used result fields stay in the result object properties, see
+get_resident_limit(). Older ones are emptied and loaded again if needed.
+Code which reads the result object properties directly has to use get_array()
+or get_property(), or call load_all_properties() before.
+The cache is used by the frd import if "UseResultCache" is set in the
+FEM general preferences.
+"""
+
+# version of the cache format, older caches are rebuilt
+CACHE_VERSION = 1
+
+INDEX_FILE = "index.json"
+
+# result object properties of the cache, NodeNumbers are always set in the result object
+VECTOR_PROPERTIES = ("DisplacementVectors",)
+FLOAT_PROPERTIES = (
+    "DisplacementLengths",
+    "NodeStressXX",
+    "NodeStressYY",
+    "NodeStressZZ",
+    "NodeStressXY",
+    "NodeStressXZ",
+    "NodeStressYZ",
+    "vonMises",
+    "PrincipalMax",
+    "PrincipalMed",
+    "PrincipalMin",
+    "MaxShear",
+    "NodeStrainXX",
+    "NodeStrainYY",
+    "NodeStrainZZ",
+    "NodeStrainXY",
+    "NodeStrainXZ",
+    "NodeStrainYZ",
+    "Peeq",
+    "Temperature",
+    "MassFlowRate",
+    "NetworkPressure",
+)
+CACHE_PROPERTIES = VECTOR_PROPERTIES + FLOAT_PROPERTIES
+
+# (document name, object name, property) --> result object
+# the order is the order of use, the least recently used first
+_resident = collections.OrderedDict()
+
+
+def get_param_group():
+    return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/General")
+
+
+def get_resident_limit():
+    """ number of cached result fields which stay in the result object properties """
+    return max(1, get_param_group().GetInt("ResultCacheResidentFields", 8))
+
+
+def use_result_cache(analysis=None):
+    """ True if results should be imported into the cache
+
+    The reinforced principal stresses are not cached, thus the cache is not
+    used if the analysis has a reinforced material.
+    """
+    if not get_param_group().GetBool("UseResultCache", False):
+        return False
+    if analysis is not None:
+        for obj in analysis.Group:
+            if is_of_type(obj, "Fem::MaterialReinforced"):
+                return False
+    return True
+
+
+def get_source_signature(source_file):
+    return [os.path.getsize(source_file), os.path.getmtime(source_file)]
+
+
+def get_cache_dir(source_file):
+    return os.path.splitext(source_file)[0] + "_resultcache"
+
+
+def get_field_file(cache_dir, step_index, prop):
+    return os.path.join(cache_dir, "step{}_{}.npy".format(step_index, prop))
+
+
+# ********* cache writing *********
+def get_step_fields(step):
+    """ result object properties of one result step
+
+    step: dictionary as yielded by feminout.readCcxFrdResults.iter_frd_results
+    returns the node numbers and a dictionary {property: array}, the arrays are
+    in node number order, derived results as von Mises stress are added
+    """
+    if "mflow" in step:
+        # same as importToolsFem.fill_femresult_mechanical
+        node_numbers = step["mflow"][0]
+    elif "disp" in step:
+        node_numbers = step["disp"][0]
+    else:
+        return np.empty(0, dtype=np.int64), {}
+
+    def values(key):
+        # values of nodes which are not in the displacements are ignored
+        return step[key][1][:len(step["disp"][0])]
+
+    fields = {}
+    if "disp" in step:
+        disp = step["disp"][1]
+        fields["DisplacementVectors"] = disp
+        fields["DisplacementLengths"] = resulttools.calculate_disp_abs_array(disp)
+        if "stress" in step:
+            stress = values("stress")
+            for i, prop in enumerate((
+                "NodeStressXX", "NodeStressYY", "NodeStressZZ",
+                "NodeStressXY", "NodeStressXZ", "NodeStressYZ"
+            )):
+                fields[prop] = stress[:, i]
+            fields["vonMises"] = resulttools.calculate_von_mises_array(stress)
+            prin, shear = resulttools.calculate_principal_stress_std_array(stress)
+            fields["PrincipalMax"] = prin[:, 0]
+            fields["PrincipalMed"] = prin[:, 1]
+            fields["PrincipalMin"] = prin[:, 2]
+            fields["MaxShear"] = shear
+        if "strain" in step:
+            strain = values("strain")
+            for i, prop in enumerate((
+                "NodeStrainXX", "NodeStrainYY", "NodeStrainZZ",
+                "NodeStrainXY", "NodeStrainXZ", "NodeStrainYZ"
+            )):
+                fields[prop] = strain[:, i]
+        if "peeq" in step:
+            fields["Peeq"] = values("peeq")[:, 0]
+        if "temp" in step:
+            fields["Temperature"] = values("temp")[:, 0]
+    if "mflow" in step:
+        fields["MassFlowRate"] = step["mflow"][1][:, 0]
+    if "npressure" in step:
+        fields["NetworkPressure"] = step["npressure"][1][:, 0]
+    return node_numbers, fields
+
+
+def write_result_cache(cache_dir, steps, source_file):
+    """ writes the result steps into the cache directory
+
+    steps: iterable of result steps, see get_step_fields(), every step is
+        written before the next one is read
+    source_file: the result file, the cache is rebuilt if it changes
+    returns the cache index
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    index_file = os.path.join(cache_dir, INDEX_FILE)
+    # the index is written last, a cache without index is never used
+    if os.path.isfile(index_file):
+        os.remove(index_file)
+    index = {
+        "Version": CACHE_VERSION,
+        "Source": get_source_signature(source_file),
+        "Steps": [],
+    }
+    for step in steps:
+        step_index = len(index["Steps"])
+        node_numbers, fields = get_step_fields(step)
+        np.save(get_field_file(cache_dir, step_index, "NodeNumbers"), node_numbers)
+        for prop, values in fields.items():
+            np.save(
+                get_field_file(cache_dir, step_index, prop),
+                np.ascontiguousarray(values, dtype=np.float64)
+            )
+        number = step.get("number", 0)
+        index["Steps"].append({
+            "Number": int(number) if number == number else 0,  # NaN if no eigenmode
+            "Time": float(step.get("time", 0.0)),
+            "Properties": sorted(fields.keys()),
+            "Stats": resulttools.calculate_stats(fields),
+        })
+    tmp_file = index_file + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(index, f)
+    os.rename(tmp_file, index_file)
+    FreeCAD.Console.PrintLog("Result cache written: {}\n".format(cache_dir))
+    return index
+
+
+def read_result_cache_index(cache_dir, source_file=None):
+    """ returns the cache index, None if there is no valid cache
+    source_file: if given the cache is only valid if it is not changed
+    """
+    index_file = os.path.join(cache_dir, INDEX_FILE)
+    if not os.path.isfile(index_file):
+        return None
+    try:
+        with open(index_file, "r") as f:
+            index = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if index.get("Version") != CACHE_VERSION:
+        return None
+    if source_file is not None and index.get("Source") != get_source_signature(source_file):
+        return None
+    return index
+
+
+# ********* result objects *********
+def set_result_cache(res_obj, cache_dir, index, step_index):
+    """ links the result object to a step of the cache
+    all cached properties are emptied, they are loaded on first use
+    """
+    step = index["Steps"][step_index]
+    unload_properties(res_obj)
+    for prop in CACHE_PROPERTIES:
+        if getattr(res_obj, prop):
+            setattr(res_obj, prop, [])
+    res_obj.ResultCache = cache_dir
+    res_obj.ResultCacheStep = step_index
+    res_obj.NodeNumbers = np.load(
+        get_field_file(cache_dir, step_index, "NodeNumbers")
+    ).tolist()
+    if step["Number"] > 0:
+        res_obj.Eigenmode = step["Number"]
+    if set(step["Properties"]) & set(("Temperature", "MassFlowRate", "NetworkPressure")):
+        # same as importToolsFem.fill_femresult_mechanical
+        res_obj.Time = round(step["Time"], 2)
+    res_obj.Stats = step["Stats"]
+    return res_obj
+
+
+def is_cached(res_obj):
+    return bool(getattr(res_obj, "ResultCache", ""))
+
+
+def has_property(res_obj, prop):
+    """ True if the property has values in the result object or in the cache """
+    if getattr(res_obj, prop):
+        return True
+    if is_cached(res_obj) and prop in CACHE_PROPERTIES:
+        return os.path.isfile(get_field_file(res_obj.ResultCache, res_obj.ResultCacheStep, prop))
+    return False
+
+
+def get_array(res_obj, prop):
+    """ returns the values of a result property as NumPy array
+
+    The array of a cached result object is memory mapped from the cache file,
+    the result object property is not changed.
+    """
+    if is_cached(res_obj) and prop in CACHE_PROPERTIES and not getattr(res_obj, prop):
+        field_file = get_field_file(res_obj.ResultCache, res_obj.ResultCacheStep, prop)
+        if os.path.isfile(field_file):
+            return np.load(field_file, mmap_mode="r")
+    values = np.asarray(getattr(res_obj, prop), dtype=float)
+    if prop in VECTOR_PROPERTIES:
+        values = values.reshape(-1, 3)
+    return values
+
+
+def load_property(res_obj, prop):
+    """ loads a result property of a cached result object from the cache
+
+    The least recently used properties are emptied if more than
+    get_resident_limit() properties are loaded.
+    """
+    if not is_cached(res_obj) or prop not in CACHE_PROPERTIES:
+        return res_obj
+    key = (res_obj.Document.Name, res_obj.Name, prop)
+    if key in _resident:
+        # mark as most recently used
+        del _resident[key]
+    elif not getattr(res_obj, prop):
+        values = get_array(res_obj, prop)
+        if len(values) == 0:
+            # not in the cache
+            return res_obj
+        if prop in VECTOR_PROPERTIES:
+            setattr(res_obj, prop, [FreeCAD.Vector(*v) for v in values.tolist()])
+        else:
+            setattr(res_obj, prop, values.tolist())
+    _resident[key] = res_obj
+    limit = get_resident_limit()
+    while len(_resident) > limit:
+        _unload(*_resident.popitem(last=False))
+    return res_obj
+
+
+def get_property(res_obj, prop):
+    """ returns the values of a result property, loads it from the cache if needed """
+    load_property(res_obj, prop)
+    return getattr(res_obj, prop)
+
+
+def load_all_properties(res_obj):
+    """ loads all result properties of a cached result object and unlinks it from the cache
+
+    For code which reads the result object properties directly and does not
+    know about the cache, as the VTK export and the post pipeline. The
+    properties are not emptied again afterwards.
+    """
+    if not is_cached(res_obj):
+        return res_obj
+    unload_properties(res_obj)
+    for prop in CACHE_PROPERTIES:
+        if getattr(res_obj, prop):
+            continue
+        values = get_array(res_obj, prop)
+        if len(values) == 0:
+            continue
+        if prop in VECTOR_PROPERTIES:
+            setattr(res_obj, prop, [FreeCAD.Vector(*v) for v in values.tolist()])
+        else:
+            setattr(res_obj, prop, values.tolist())
+    res_obj.ResultCache = ""
+    return res_obj
+
+
+def unload_properties(res_obj):
+    """ empties all loaded properties of a cached result object """
+    for key in list(_resident.keys()):
+        if _resident[key] is res_obj:
+            _unload(key, _resident.pop(key))
+
+
+def _unload(key, res_obj):
+    prop = key[2]
+    try:
+        if is_cached(res_obj) and getattr(res_obj, prop):
+            setattr(res_obj, prop, [])
+    except ReferenceError:
+        # the result object was deleted
+        pass
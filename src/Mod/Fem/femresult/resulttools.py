@@ -26,8 +26,9 @@ __url__ = "http://www.freecadweb.org"
 ## \addtogroup FEM
 #  @{
 
+import collections
+
 import numpy as np
-from math import isnan
 
 import FreeCAD
 
@@ -86,7 +87,7 @@ def reset_mesh_color(resultobj):
         if resultobj.Mesh:
             resultobj.Mesh.ViewObject.NodeColor = {}
             resultobj.Mesh.ViewObject.ElementColor = {}
-            node_numbers = resultobj.Mesh.FemMesh.Nodes.keys()
+            node_numbers = list(resultobj.Mesh.FemMesh.Nodes.keys())
             zero_values = [0] * len(node_numbers)
             resultobj.Mesh.ViewObject.setNodeColorByScalars(node_numbers, zero_values)
 
@@ -95,12 +96,37 @@ def show_displacement(resultobj, displacement_factor=0.0):
     if FreeCAD.GuiUp:
         if resultobj.Mesh.ViewObject.Visibility is False:
             resultobj.Mesh.ViewObject.Visibility = True
+        from . import resultcache
         resultobj.Mesh.ViewObject.setNodeDisplacementByVectors(
-            resultobj.NodeNumbers, resultobj.DisplacementVectors
+            resultobj.NodeNumbers, resultcache.get_property(resultobj, "DisplacementVectors")
         )
         resultobj.Mesh.ViewObject.applyDisplacement(displacement_factor)
 
 
+# result type --> result object property, see get_all_stats()
+# U1, U2, U3 are the x, y, z columns of the DisplacementVectors
+RESULT_TYPE_PROPERTIES = {
+    "U1": "DisplacementVectors",
+    "U2": "DisplacementVectors",
+    "U3": "DisplacementVectors",
+    "Uabs": "DisplacementLengths",
+    "Sabs": "vonMises",
+    "MaxPrin": "PrincipalMax",
+    "MidPrin": "PrincipalMed",
+    "MinPrin": "PrincipalMin",
+    "MaxShear": "MaxShear",
+    "Peeq": "Peeq",
+    "Temp": "Temperature",
+    "MFlow": "MassFlowRate",
+    "NPress": "NetworkPressure",
+}
+
+# (document name, object name, result type) --> (signature, field stats)
+# least recently used first, see get_field_stats()
+_field_stats_cache = collections.OrderedDict()
+_FIELD_STATS_CACHE_SIZE = 32
+
+
 def show_result(resultobj, result_type="Sabs", limit=None):
     """Sets mesh color using selected type of results
 
@@ -114,25 +140,21 @@ def show_result(resultobj, result_type="Sabs", limit=None):
         - U1, U2, U3 - deformation
         - Uabs - absolute deformation
         - Sabs - Von Mises stress
+        - all other result types of get_all_stats()
     limit : float
         limit cutoff value. All values over the limit are treated
         as equal to the limit. Useful for filtering out hotspots.
     """
 
     if result_type == "None":
-        reset_mesh_color(resultobj.Mesh)
+        reset_mesh_color(resultobj)
         return
     if resultobj:
-        if result_type == "Sabs":
-            values = resultobj.vonMises
-        elif result_type == "Uabs":
-            values = resultobj.DisplacementLengths
-        # TODO: the result object does have more result types to show, implement them
-        else:
-            match = {"U1": 0, "U2": 1, "U3": 2}
-            d = zip(*resultobj.DisplacementVectors)
-            values = list(d[match[result_type]])
-        show_color_by_scalar_with_cutoff(resultobj, values, limit)
+        show_color_by_scalar_with_cutoff(
+            resultobj,
+            get_result_values(resultobj, result_type),
+            limit
+        )
     else:
         FreeCAD.Console.PrintError("Error, No result object given.\n")
 
@@ -144,7 +166,7 @@ def show_color_by_scalar_with_cutoff(resultobj, values, limit=None):
     ----------
     resultobj : Fem::ResultMechanical
         FreeCAD FEM mechanical result object
-    values : list of floats
+    values : list of floats or numpy.ndarray
         the values to be colored and cutoff
         has to be the same length as resultobj.NodeNumbers
         resultobj.NodeNumbers has to be present in the resultobj
@@ -153,23 +175,88 @@ def show_color_by_scalar_with_cutoff(resultobj, values, limit=None):
         as equal to the limit. Useful for filtering out hotspots.
     """
 
+    filtered_values = np.asarray(values, dtype=float)
     if limit:
-        filtered_values = []
-        for v in values:
-            if v > limit:
-                filtered_values.append(limit)
-            else:
-                filtered_values.append(v)
-    else:
-        filtered_values = values
+        filtered_values = np.minimum(filtered_values, limit)
     if FreeCAD.GuiUp:
         if resultobj.Mesh.ViewObject.Visibility is False:
             resultobj.Mesh.ViewObject.Visibility = True
+        # the colors are calculated by the view provider, it needs Python lists
         resultobj.Mesh.ViewObject.setNodeColorByScalars(
-            resultobj.NodeNumbers, filtered_values
+            list(resultobj.NodeNumbers), filtered_values.tolist()
         )
 
 
+def get_result_values(res_obj, result_type):
+    """Returns the node values of a result type as NumPy array
+
+    Parameters
+    ----------
+    res_obj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    result_type : str
+        type of FEM result, see RESULT_TYPE_PROPERTIES
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (N,), in the order of res_obj.NodeNumbers
+        the values of a result object with result cache are not loaded
+        into the result object, see femresult/resultcache.py
+    """
+
+    from . import resultcache
+    values = resultcache.get_array(res_obj, RESULT_TYPE_PROPERTIES[result_type])
+    if result_type in ("U1", "U2", "U3"):
+        values = values.reshape(-1, 3)[:, int(result_type[1]) - 1]
+    return values
+
+
+def get_field_stats(res_obj, result_type, bins=50):
+    """Returns min, max and histogram of the node values of a result type
+
+    The stats are cached, switching between the result types of a result object
+    reuses them. They are recalculated if the Stats of the result object change,
+    see fill_femresult_stats().
+
+    Parameters
+    ----------
+    res_obj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+    result_type : str
+        type of FEM result, see RESULT_TYPE_PROPERTIES
+    bins : int
+        number of histogram bins
+
+    Returns
+    -------
+    dict
+        "min", "max": float, "histogram": (counts, bin edges) of numpy.histogram
+        None if the result object has no values of the result type
+    """
+
+    key = (res_obj.Document.Name, res_obj.Name, result_type)
+    signature = (tuple(res_obj.Stats), len(res_obj.NodeNumbers), bins)
+    cached = _field_stats_cache.pop(key, None)
+    if cached is None or cached[0] != signature:
+        values = get_result_values(res_obj, result_type)
+        if len(values) == 0:
+            return None
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            finite = np.zeros(1)
+        cached = (signature, {
+            "min": float(finite.min()),
+            "max": float(finite.max()),
+            "histogram": np.histogram(finite, bins=bins),
+        })
+    # most recently used last
+    _field_stats_cache[key] = cached
+    while len(_field_stats_cache) > _FIELD_STATS_CACHE_SIZE:
+        _field_stats_cache.popitem(last=False)
+    return cached[1]
+
+
 def get_stats(res_obj, result_type):
     """Returns minimum and maximum value for provided result type
 
@@ -252,6 +339,23 @@ def get_all_stats(res_obj):
     return stats_dict
 
 
+# result object properties of the Stats list in Stats order
+# the DisplacementVectors have three entries (x, y, z), all other properties one
+STATS_PROPERTIES = (
+    "DisplacementVectors",
+    "DisplacementLengths",
+    "vonMises",
+    "PrincipalMax",
+    "PrincipalMed",
+    "PrincipalMin",
+    "MaxShear",
+    "Peeq",
+    "Temperature",
+    "MassFlowRate",
+    "NetworkPressure",
+)
+
+
 def fill_femresult_stats(res_obj):
     """Fills a FreeCAD FEM mechanical result object with stats data
 
@@ -264,62 +368,10 @@ def fill_femresult_stats(res_obj):
     FreeCAD.Console.PrintLog(
         "Calculate stats list for result obj: " + res_obj.Name + "\n"
     )
-    # set stats values to 0, they may not exist in res_obj
-    x_min = y_min = z_min = x_max = y_max = z_max = 0
-    a_max = a_min = s_max = s_min = 0
-    p1_min = p1_max = p2_min = p2_max = p3_min = p3_max = 0
-    ms_min = ms_max = peeq_min = peeq_max = 0
-    temp_min = temp_max = 0
-    mflow_min = mflow_max = npress_min = npress_max = 0
-
-    if res_obj.DisplacementVectors:
-        x_max, y_max, z_max = map(max, zip(*res_obj.DisplacementVectors))
-        x_min, y_min, z_min = map(min, zip(*res_obj.DisplacementVectors))
-    if res_obj.DisplacementLengths:
-        a_min = min(res_obj.DisplacementLengths)
-        a_max = max(res_obj.DisplacementLengths)
-    if res_obj.vonMises:
-        s_min = min(res_obj.vonMises)
-        s_max = max(res_obj.vonMises)
-    if res_obj.PrincipalMax:
-        p1_min = min(res_obj.PrincipalMax)
-        p1_max = max(res_obj.PrincipalMax)
-    if res_obj.PrincipalMed:
-        p2_min = min(res_obj.PrincipalMed)
-        p2_max = max(res_obj.PrincipalMed)
-    if res_obj.PrincipalMin:
-        p3_min = min(res_obj.PrincipalMin)
-        p3_max = max(res_obj.PrincipalMin)
-    if res_obj.MaxShear:
-        ms_min = min(res_obj.MaxShear)
-        ms_max = max(res_obj.MaxShear)
-    if res_obj.Peeq:
-        peeq_min = min(res_obj.Peeq)
-        peeq_max = max(res_obj.Peeq)
-    if res_obj.Temperature:
-        temp_min = min(res_obj.Temperature)
-        temp_max = max(res_obj.Temperature)
-    if res_obj.MassFlowRate:
-        # DisplacementVectors is empty, no_of_values needs to be set
-        mflow_min = min(res_obj.MassFlowRate)
-        mflow_max = max(res_obj.MassFlowRate)
-    if res_obj.NetworkPressure:
-        npress_min = min(res_obj.NetworkPressure)
-        npress_max = max(res_obj.NetworkPressure)
-
-    res_obj.Stats = [x_min, x_max,
-                     y_min, y_max,
-                     z_min, z_max,
-                     a_min, a_max,
-                     s_min, s_max,
-                     p1_min, p1_max,
-                     p2_min, p2_max,
-                     p3_min, p3_max,
-                     ms_min, ms_max,
-                     peeq_min, peeq_max,
-                     temp_min, temp_max,
-                     mflow_min, mflow_max,
-                     npress_min, npress_max]
+    from . import resultcache
+    res_obj.Stats = calculate_stats(
+        dict((prop, resultcache.get_array(res_obj, prop)) for prop in STATS_PROPERTIES)
+    )
     """
     stat_types = [
         "U1",
@@ -350,25 +402,77 @@ def fill_femresult_stats(res_obj):
     return res_obj
 
 
+def calculate_stats(fields):
+    """Returns the Stats list of the given result fields
+
+    Parameters
+    ----------
+    fields : dict
+        result object property name: values, see STATS_PROPERTIES
+        missing or empty properties get the stats 0, 0
+
+    Returns
+    -------
+    list of float
+        min, max of every property, min, max of x, y and z for DisplacementVectors
+    """
+
+    stats = []
+    for prop in STATS_PROPERTIES:
+        values = np.asarray(fields.get(prop, ()), dtype=float)
+        if prop == "DisplacementVectors":
+            values = values.reshape(-1, 3)
+        else:
+            values = values.reshape(-1, 1)
+        for i in range(values.shape[1]):
+            if len(values):
+                # fmin and fmax ignore NaN
+                stats.extend((
+                    float(np.fmin.reduce(values[:, i])),
+                    float(np.fmax.reduce(values[:, i]))
+                ))
+            else:
+                stats.extend((0, 0))
+    return stats
+
+
 def add_disp_apps(res_obj):
-    res_obj.DisplacementLengths = calculate_disp_abs(res_obj.DisplacementVectors)
+    from . import resultcache
+    res_obj.DisplacementLengths = calculate_disp_abs_array(
+        resultcache.get_array(res_obj, "DisplacementVectors")
+    ).tolist()
     FreeCAD.Console.PrintLog("Added DisplacementLengths.\n")
     return res_obj
 
 
+def get_stress_array(res_obj):
+    """Returns the node stresses of a result object as NumPy array
+
+    Parameters
+    ----------
+    res_obj : Fem::ResultMechanical
+        FreeCAD FEM mechanical result object
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (N, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    """
+
+    # the stresses of a cached result object are read from the cache
+    from . import resultcache
+    return np.column_stack((
+        resultcache.get_array(res_obj, "NodeStressXX"),
+        resultcache.get_array(res_obj, "NodeStressYY"),
+        resultcache.get_array(res_obj, "NodeStressZZ"),
+        resultcache.get_array(res_obj, "NodeStressXY"),
+        resultcache.get_array(res_obj, "NodeStressXZ"),
+        resultcache.get_array(res_obj, "NodeStressYZ")
+    )).reshape(-1, 6)
+
+
 def add_von_mises(res_obj):
-    mstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        mstress.append(calculate_von_mises((Sxx, Syy, Szz, Sxy, Sxz, Syz)))
-    res_obj.vonMises = mstress
+    res_obj.vonMises = calculate_von_mises_array(get_stress_array(res_obj)).tolist()
     FreeCAD.Console.PrintLog("Added von Mises stress.\n")
     return res_obj
 
@@ -378,28 +482,11 @@ def add_principal_stress_std(res_obj):
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for Sxx, Syy, Szz, Sxy, Sxz, Syz in iterator:
-        prin1, prin2, prin3, shear = calculate_principal_stress_std((Sxx, Syy, Szz, Sxy, Sxz, Syz))
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    prin, shear = calculate_principal_stress_std_array(get_stress_array(res_obj))
+    res_obj.PrincipalMax = prin[:, 0].tolist()
+    res_obj.PrincipalMed = prin[:, 1].tolist()
+    res_obj.PrincipalMin = prin[:, 2].tolist()
+    res_obj.MaxShear = shear.tolist()
     FreeCAD.Console.PrintLog("Added standard principal stresses and max shear values.\n")
     return res_obj
 
@@ -463,21 +550,6 @@ def add_principal_stress_reinforced(res_obj):
     # TODO may be use only one container for principal stresses in result object
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&p=416006#p416006
     # but which one is better
-    prinstress1 = []
-    prinstress2 = []
-    prinstress3 = []
-    shearstress = []
-    ps1v = []
-    ps2v = []
-    ps3v = []
-    #
-    # HarryvL: additional arrays to hold reinforcement ratios
-    # and mohr coulomb stress
-    #
-    rhx = []
-    rhy = []
-    rhz = []
-    moc = []
 
     # material parameter
     for obj in res_obj.getParentGroup().Group:
@@ -495,70 +567,45 @@ def add_principal_stress_reinforced(res_obj):
     # print(matrix_cs)
     # print(reinforce_yield)
 
-    iterator = zip(
-        res_obj.NodeStressXX,
-        res_obj.NodeStressYY,
-        res_obj.NodeStressZZ,
-        res_obj.NodeStressXY,
-        res_obj.NodeStressXZ,
-        res_obj.NodeStressYZ
-    )
-    for isv, stress_tensor in enumerate(iterator):
-
-        rhox = 0.
-        rhoy = 0.
-        rhoz = 0.
-        mc = 0.
-
-        if ic[isv] == 1:
-            #
-            # HarryvL: for concrete scxx etc. are affected by
-            # reinforcement (see calculate_rho(stress_tensor)). for all other
-            # materials scxx etc. are the original stresses
-            #
-            rhox, rhoy, rhoz = calculate_rho(
-                stress_tensor,
-                reinforce_yield
-            )
+    stresses = get_stress_array(res_obj)
+    is_concrete = np.asarray(ic[:len(stresses)]) == 1
 
-        prin1, prin2, prin3, shear, psv = calculate_principal_stress_reinforced(
-            stress_tensor
+    prin, shear, psv = calculate_principal_stress_reinforced_array(stresses)
+
+    #
+    # HarryvL: for concrete scxx etc. are affected by
+    # reinforcement (see calculate_rho(stress_tensor)). for all other
+    # materials scxx etc. are the original stresses
+    # reinforcement ratios and mohr coulomb criterion
+    # are only calculated for concrete nodes, all others are 0.0
+    #
+    rho = np.zeros((len(stresses), 3))
+    moc = np.zeros(len(stresses))
+    if np.any(is_concrete):
+        rho[is_concrete] = calculate_rho_array(stresses[is_concrete], reinforce_yield)
+        moc[is_concrete] = calculate_mohr_coulomb_array(
+            prin[is_concrete, 0],
+            prin[is_concrete, 2],
+            matrix_af,
+            matrix_cs
         )
 
-        prinstress1.append(prin1)
-        prinstress2.append(prin2)
-        prinstress3.append(prin3)
-        shearstress.append(shear)
-        ps1v.append(psv[0])
-        ps2v.append(psv[1])
-        ps3v.append(psv[2])
-
-        #
-        # reinforcement ratios and mohr coulomb criterion
-        #
-        rhx.append(rhox)
-        rhy.append(rhoy)
-        rhz.append(rhoz)
-        if ic[isv] == 1:
-            mc = calculate_mohr_coulomb(prin1, prin3, matrix_af, matrix_cs)
-        moc.append(mc)
-
-    res_obj.PrincipalMax = prinstress1
-    res_obj.PrincipalMed = prinstress2
-    res_obj.PrincipalMin = prinstress3
-    res_obj.MaxShear = shearstress
+    res_obj.PrincipalMax = prin[:, 0].tolist()
+    res_obj.PrincipalMed = prin[:, 1].tolist()
+    res_obj.PrincipalMin = prin[:, 2].tolist()
+    res_obj.MaxShear = shear.tolist()
     #
     # HarryvL: additional concrete and principal stress plot
     # results for use in _ViewProviderFemResultMechanical
     #
-    res_obj.ReinforcementRatio_x = rhx
-    res_obj.ReinforcementRatio_y = rhy
-    res_obj.ReinforcementRatio_z = rhz
-    res_obj.MohrCoulomb = moc
+    res_obj.ReinforcementRatio_x = rho[:, 0].tolist()
+    res_obj.ReinforcementRatio_y = rho[:, 1].tolist()
+    res_obj.ReinforcementRatio_z = rho[:, 2].tolist()
+    res_obj.MohrCoulomb = moc.tolist()
 
-    res_obj.PS1Vector = ps1v
-    res_obj.PS2Vector = ps2v
-    res_obj.PS3Vector = ps3v
+    res_obj.PS1Vector = [tuple(v) for v in psv[:, 0].tolist()]
+    res_obj.PS2Vector = [tuple(v) for v in psv[:, 1].tolist()]
+    res_obj.PS3Vector = [tuple(v) for v in psv[:, 2].tolist()]
 
     FreeCAD.Console.PrintLog(
         "Added reinforcement principal stresses and max shear values as well as "
@@ -594,46 +641,109 @@ def compact_result(res_obj):
 
 
 def calculate_von_mises(stress_tensor):
+    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    return calculate_von_mises_array(np.asarray(stress_tensor, dtype=float).reshape(1, 6))[0]
+
+
+def calculate_von_mises_array(stresses):
+    """Returns von Mises stresses for all stress tensors at once
+
+    Parameters
+    ----------
+    stresses : numpy.ndarray
+        shape (N, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (N,)
+    """
+
     # Von mises stress: http://en.wikipedia.org/wiki/Von_Mises_yield_criterion
     # simplification: https://forum.freecadweb.org/viewtopic.php?f=18&t=33974&p=296542#p296542
-    # stress_tensor ... (Sxx, Syy, Szz, Sxy, Sxz, Syz)
-    normal = stress_tensor[:3]
-    shear = stress_tensor[3:]
-    pressure = np.average(normal)
-    return np.sqrt(1.5 * np.linalg.norm(normal - pressure)**2 + 3.0 * np.linalg.norm(shear)**2)
+    normal = stresses[:, :3]
+    shear = stresses[:, 3:]
+    pressure = np.mean(normal, axis=1)
+    return np.sqrt(
+        1.5 * np.sum((normal - pressure[:, np.newaxis])**2, axis=1)
+        + 3.0 * np.sum(shear**2, axis=1)
+    )
+
+
+def _get_stress_matrices(stresses):
+    # (N, 6) stress vectors --> (N, 3, 3) symmetric stress tensors
+    # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
+    s11, s22, s33, s12, s31, s23 = stresses.T
+    return np.stack((
+        np.stack((s11, s12, s31), axis=-1),
+        np.stack((s12, s22, s23), axis=-1),
+        np.stack((s31, s23, s33), axis=-1)
+    ), axis=1)
 
 
 def calculate_principal_stress_std(
     stress_tensor
 ):
+    prin, shear = calculate_principal_stress_std_array(
+        np.asarray(stress_tensor, dtype=float).reshape(1, 6)
+    )
+    return (prin[0, 0], prin[0, 1], prin[0, 2], shear[0])
+
+
+def calculate_principal_stress_std_array(stresses):
+    """Returns principal stresses and max shear for all stress tensors at once
+
+    Parameters
+    ----------
+    stresses : numpy.ndarray
+        shape (N, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        principal stresses shape (N, 3) sorted from max to min, max shear shape (N,)
+    """
 
     # if NaN is inside the array, which can happen on Calculix frd result files return NaN
     # https://forum.freecadweb.org/viewtopic.php?f=22&t=33911&start=10#p284229
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=32649#p274291
-    for s in stress_tensor:
-        if isnan(s) is True:
-            return (float("NaN"), float("NaN"), float("NaN"), float("NaN"))
-
-    s11 = stress_tensor[0]  # Sxx
-    s22 = stress_tensor[1]  # Syy
-    s33 = stress_tensor[2]  # Szz
-    s12 = stress_tensor[3]  # Sxy
-    s31 = stress_tensor[4]  # Sxz
-    s23 = stress_tensor[5]  # Syz
-    sigma = np.array([
-        [s11, s12, s31],
-        [s12, s22, s23],
-        [s31, s23, s33]
-    ])  # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
-
-    eigvals = list(np.linalg.eigvalsh(sigma))
-    eigvals.sort()
-    eigvals.reverse()
-    maxshear = (eigvals[0] - eigvals[2]) / 2.0
-    return (eigvals[0], eigvals[1], eigvals[2], maxshear)
+    has_nan = np.isnan(stresses).any(axis=1)
+    if has_nan.any():
+        stresses = np.where(has_nan[:, np.newaxis], 0.0, stresses)
+
+    # eigvalsh returns the eigenvalues in ascending order
+    eigvals = np.linalg.eigvalsh(_get_stress_matrices(stresses))[:, ::-1]
+    maxshear = (eigvals[:, 0] - eigvals[:, 2]) / 2.0
+
+    eigvals[has_nan] = float("NaN")
+    maxshear[has_nan] = float("NaN")
+    return eigvals, maxshear
 
 
 def calculate_principal_stress_reinforced(stress_tensor):
+    prin, shear, psv = calculate_principal_stress_reinforced_array(
+        np.asarray(stress_tensor, dtype=float).reshape(1, 6)
+    )
+    return (prin[0, 0], prin[0, 1], prin[0, 2], shear[0],
+            tuple([tuple(row) for row in psv[0]]))
+
+
+def calculate_principal_stress_reinforced_array(stresses):
+    """Returns principal stresses, max shear and principal stress vectors
+    for all stress tensors at once
+
+    Parameters
+    ----------
+    stresses : numpy.ndarray
+        shape (N, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        principal stresses shape (N, 3) sorted from max to min, max shear shape (N,),
+        principal stress vectors shape (N, 3, 3), [:, i] is the vector of principal stress i
+    """
+
     #
     #   HarryvL - calculate principal stress vectors and values
     #           - for total stresses use stress_tensor[0], stress_tensor[1], stress_tensor[2]
@@ -642,66 +752,73 @@ def calculate_principal_stress_reinforced(stress_tensor):
     # difference to the original method:
     # https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&start=90#p296539
     #
-
-    s11 = stress_tensor[0]  # Sxx
-    s22 = stress_tensor[1]  # Syy
-    s33 = stress_tensor[2]  # Szz
-    s12 = stress_tensor[3]  # Sxy
-    s31 = stress_tensor[4]  # Sxz
-    s23 = stress_tensor[5]  # Syz
-    sigma = np.array([
-        [s11, s12, s31],
-        [s12, s22, s23],
-        [s31, s23, s33]
-    ])  # https://forum.freecadweb.org/viewtopic.php?f=18&t=24637&start=10#p240408
-
-    eigenvalues, eigenvectors = np.linalg.eig(sigma)
+    eigenvalues, eigenvectors = np.linalg.eig(_get_stress_matrices(stresses))
 
     #
     #   HarryvL: suppress complex eigenvalue and vectors that may occur for
     #   near-zero (numerical noise) stress fields
     #
-
     eigenvalues = eigenvalues.real
     eigenvectors = eigenvectors.real
 
-    eigenvectors[:, 0] = eigenvalues[0] * eigenvectors[:, 0]
-    eigenvectors[:, 1] = eigenvalues[1] * eigenvectors[:, 1]
-    eigenvectors[:, 2] = eigenvalues[2] * eigenvectors[:, 2]
+    # scale the eigenvectors (columns) by their eigenvalues
+    eigenvectors = eigenvectors * eigenvalues[:, np.newaxis, :]
 
-    idx = eigenvalues.argsort()[::-1]
-    eigenvalues = eigenvalues[idx]
-    eigenvectors = eigenvectors[:, idx]
+    idx = eigenvalues.argsort(axis=1)[:, ::-1]
+    eigenvalues = np.take_along_axis(eigenvalues, idx, axis=1)
+    eigenvectors = np.take_along_axis(eigenvectors, idx[:, np.newaxis, :], axis=2)
 
-    maxshear = (eigenvalues[0] - eigenvalues[2]) / 2.0
+    maxshear = (eigenvalues[:, 0] - eigenvalues[:, 2]) / 2.0
 
-    return (eigenvalues[0], eigenvalues[1], eigenvalues[2], maxshear,
-            tuple([tuple(row) for row in eigenvectors.T]))
+    return eigenvalues, maxshear, np.swapaxes(eigenvectors, 1, 2)
 
 
 def calculate_rho(stress_tensor, fy):
+    return tuple(calculate_rho_array(
+        np.asarray(stress_tensor, dtype=float).reshape(1, 6),
+        fy
+    )[0])
+
+
+def calculate_rho_array(stresses, fy):
+    """Returns reinforcement ratios for all stress tensors at once
+
+    Parameters
+    ----------
+    stresses : numpy.ndarray
+        shape (N, 6), columns (Sxx, Syy, Szz, Sxy, Sxz, Syz)
+    fy : float
+        factored yield strength of reinforcement bars
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (N, 3), columns (rhox, rhoy, rhoz)
+    """
 
     #
     #   HarryvL - Calculation of Reinforcement Ratios and
     #   Concrete Stresses according to http://heronjournal.nl/53-4/3.pdf
     #           - See post:
     #             https://forum.freecadweb.org/viewtopic.php?f=18&t=28821
-    #                   fy: factored yield strength of reinforcement bars
     #
 
-    rmin = 1.0e9
-    eqmin = 14
+    n = len(stresses)
+    sxx = stresses[:, 0]
+    syy = stresses[:, 1]
+    szz = stresses[:, 2]
+    sxy = stresses[:, 3]
+    syz = stresses[:, 5]
+    sxz = stresses[:, 4]
 
-    sxx = stress_tensor[0]
-    syy = stress_tensor[1]
-    szz = stress_tensor[2]
-    sxy = stress_tensor[3]
-    syz = stress_tensor[5]
-    sxz = stress_tensor[4]
+    rhox = np.zeros((15, n))
+    rhoy = np.zeros((15, n))
+    rhoz = np.zeros((15, n))
 
-    rhox = np.zeros(15)
-    rhoy = np.zeros(15)
-    rhoz = np.zeros(15)
+    def divide(a, b):
+        # a / b where b is not zero, 0.0 otherwise
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(b != 0., a / np.where(b != 0., b, 1.), 0.)
 
     #    i1=sxx+syy+szz NOT USED
     #    i2=sxx*syy+syy*szz+szz*sxx-sxy**2-sxz**2-syz**2 NOT USED
@@ -709,74 +826,49 @@ def calculate_rho(stress_tensor, fy):
           - syy * sxz**2 - szz * sxy**2)
 
     #    Solution (5)
-    d = (sxx * syy - sxy**2)
-    if d != 0.:
-        rhoz[0] = i3 / d / fy
+    rhoz[0] = divide(i3, sxx * syy - sxy**2) / fy
 
     #    Solution (6)
-    d = (sxx * szz - sxz**2)
-    if d != 0.:
-        rhoy[1] = i3 / d / fy
+    rhoy[1] = divide(i3, sxx * szz - sxz**2) / fy
 
     #    Solution (7)
-    d = (syy * szz - syz**2)
-    if d != 0.:
-        rhox[2] = i3 / d / fy
+    rhox[2] = divide(i3, syy * szz - syz**2) / fy
 
     #    Solution (9)
-    if sxx != 0.:
-        fc = sxz * sxy / sxx - syz
-        fxy = sxy**2 / sxx
-        fxz = sxz**2 / sxx
-
-        #    Solution (9+)
-        rhoy[3] = syy - fxy + fc
-        rhoy[3] /= fy
-        rhoz[3] = szz - fxz + fc
-        rhoz[3] /= fy
-
-        #    Solution (9-)
-        rhoy[4] = syy - fxy - fc
-        rhoy[4] /= fy
-        rhoz[4] = szz - fxz - fc
-        rhoz[4] /= fy
+    has_value = sxx != 0.
+    fc = divide(sxz * sxy, sxx) - syz
+    fxy = divide(sxy**2, sxx)
+    fxz = divide(sxz**2, sxx)
+    #    Solution (9+)
+    rhoy[3] = np.where(has_value, (syy - fxy + fc) / fy, 0.)
+    rhoz[3] = np.where(has_value, (szz - fxz + fc) / fy, 0.)
+    #    Solution (9-)
+    rhoy[4] = np.where(has_value, (syy - fxy - fc) / fy, 0.)
+    rhoz[4] = np.where(has_value, (szz - fxz - fc) / fy, 0.)
 
     #   Solution (10)
-    if syy != 0.:
-        fc = syz * sxy / syy - sxz
-        fxy = sxy**2 / syy
-        fyz = syz**2 / syy
-
-        # Solution (10+)
-        rhox[5] = sxx - fxy + fc
-        rhox[5] /= fy
-        rhoz[5] = szz - fyz + fc
-        rhoz[5] /= fy
-
-        # Solution (10-)vm
-        rhox[6] = sxx - fxy - fc
-
-        rhox[6] /= fy
-        rhoz[6] = szz - fyz - fc
-        rhoz[6] /= fy
+    has_value = syy != 0.
+    fc = divide(syz * sxy, syy) - sxz
+    fxy = divide(sxy**2, syy)
+    fyz = divide(syz**2, syy)
+    # Solution (10+)
+    rhox[5] = np.where(has_value, (sxx - fxy + fc) / fy, 0.)
+    rhoz[5] = np.where(has_value, (szz - fyz + fc) / fy, 0.)
+    # Solution (10-)
+    rhox[6] = np.where(has_value, (sxx - fxy - fc) / fy, 0.)
+    rhoz[6] = np.where(has_value, (szz - fyz - fc) / fy, 0.)
 
     # Solution (11)
-    if szz != 0.:
-        fc = sxz * syz / szz - sxy
-        fxz = sxz**2 / szz
-        fyz = syz**2 / szz
-
-        # Solution (11+)
-        rhox[7] = sxx - fxz + fc
-        rhox[7] /= fy
-        rhoy[7] = syy - fyz + fc
-        rhoy[7] /= fy
-
-        # Solution (11-)
-        rhox[8] = sxx - fxz - fc
-        rhox[8] /= fy
-        rhoy[8] = syy - fyz - fc
-        rhoy[8] /= fy
+    has_value = szz != 0.
+    fc = divide(sxz * syz, szz) - sxy
+    fxz = divide(sxz**2, szz)
+    fyz = divide(syz**2, szz)
+    # Solution (11+)
+    rhox[7] = np.where(has_value, (sxx - fxz + fc) / fy, 0.)
+    rhoy[7] = np.where(has_value, (syy - fyz + fc) / fy, 0.)
+    # Solution (11-)
+    rhox[8] = np.where(has_value, (sxx - fxz - fc) / fy, 0.)
+    rhoy[8] = np.where(has_value, (syy - fyz - fc) / fy, 0.)
 
     # Solution (13)
     rhox[9] = (sxx + sxy + sxz) / fy
@@ -799,44 +891,72 @@ def calculate_rho(stress_tensor, fy):
     rhoz[12] = (szz + sxz - syz) / fy
 
     # Solution (17)
-    if syz != 0.:
-        rhox[13] = (sxx - sxy * sxz / syz) / fy
-    if sxz != 0.:
-        rhoy[13] = (syy - sxy * syz / sxz) / fy
-    if sxy != 0.:
-        rhoz[13] = (szz - sxz * syz / sxy) / fy
-
-    for ir in range(0, rhox.size):
-
-        if rhox[ir] >= -1.e-10 and rhoy[ir] >= -1.e-10 and rhoz[ir] > -1.e-10:
+    rhox[13] = np.where(syz != 0., (sxx - divide(sxy * sxz, syz)) / fy, 0.)
+    rhoy[13] = np.where(sxz != 0., (syy - divide(sxy * syz, sxz)) / fy, 0.)
+    rhoz[13] = np.where(sxy != 0., (szz - divide(sxz * syz, sxy)) / fy, 0.)
+
+    # the first solution with the smallest positive sum of ratios
+    # which results in admissible concrete stresses is used
+    # solution 14 is all zero and the fallback
+    rmin = np.full(n, 1.0e9)
+    eqmin = np.full(n, 14)
+    for ir in range(15):
+
+        # Concrete Stresses
+        scxx = sxx - rhox[ir] * fy
+        scyy = syy - rhoy[ir] * fy
+        sczz = szz - rhoz[ir] * fy
+        ic1 = (scxx + scyy + sczz)
+        ic2 = (scxx * scyy + scyy * sczz + sczz * scxx - sxy**2
+               - sxz**2 - syz**2)
+        ic3 = (scxx * scyy * sczz + 2 * sxy * sxz * syz - scxx * syz**2
+               - scyy * sxz**2 - sczz * sxy**2)
+        rsum = rhox[ir] + rhoy[ir] + rhoz[ir]
+
+        better = (
+            (rhox[ir] >= -1.e-10) & (rhoy[ir] >= -1.e-10) & (rhoz[ir] > -1.e-10)
+            & (ic1 <= 1.e-6) & (ic2 >= -1.e-6) & (ic3 <= 1.0e-6)
+            & (rsum < rmin) & (rsum > 0.)
+        )
+        rmin = np.where(better, rsum, rmin)
+        eqmin = np.where(better, ir, eqmin)
 
-            # Concrete Stresses
-            scxx = sxx - rhox[ir] * fy
-            scyy = syy - rhoy[ir] * fy
-            sczz = szz - rhoz[ir] * fy
-            ic1 = (scxx + scyy + sczz)
-            ic2 = (scxx * scyy + scyy * sczz + sczz * scxx - sxy**2
-                   - sxz**2 - syz**2)
-            ic3 = (scxx * scyy * sczz + 2 * sxy * sxz * syz - scxx * syz**2
-                   - scyy * sxz**2 - sczz * sxy**2)
+    cols = np.arange(n)
+    return np.column_stack((rhox[eqmin, cols], rhoy[eqmin, cols], rhoz[eqmin, cols]))
 
-            if ic1 <= 1.e-6 and ic2 >= -1.e-6 and ic3 <= 1.0e-6:
 
-                rsum = rhox[ir] + rhoy[ir] + rhoz[ir]
+def calculate_mohr_coulomb(prin1, prin3, phi, fck):
+    return calculate_mohr_coulomb_array(
+        np.array([prin1], dtype=float),
+        np.array([prin3], dtype=float),
+        phi,
+        fck
+    )[0]
 
-                if rsum < rmin and rsum > 0.:
-                    rmin = rsum
-                    eqmin = ir
 
-    return rhox[eqmin], rhoy[eqmin], rhoz[eqmin]
+def calculate_mohr_coulomb_array(prin1, prin3, phi, fck):
+    """Returns Mohr Coulomb stresses for all principal stresses at once
 
+    Parameters
+    ----------
+    prin1 : numpy.ndarray
+        max principal stresses, shape (N,)
+    prin3 : numpy.ndarray
+        min principal stresses, shape (N,)
+    phi : float
+        angle of internal friction
+    fck : float
+        factored compressive strength of the matrix material (usually concrete)
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (N,), negative values are set to 0.0
+    """
 
-def calculate_mohr_coulomb(prin1, prin3, phi, fck):
     #
     #   HarryvL - Calculation of Mohr Coulomb yield criterion to judge
     #             concrete curshing and shear failure
-    #                   phi: angle of internal friction
-    #                   fck: factored compressive strength of the matrix material (usually concrete)
     #
 
     coh = fck * (1 - np.sin(phi)) / 2 / np.cos(phi)
@@ -844,14 +964,28 @@ def calculate_mohr_coulomb(prin1, prin3, phi, fck):
     mc_stress = ((prin1 - prin3) + (prin1 + prin3) * np.sin(phi)
                  - 2. * coh * np.cos(phi))
 
-    if mc_stress < 0.:
-        mc_stress = 0.
-
-    return mc_stress
+    return np.where(mc_stress < 0., 0., mc_stress)
 
 
 def calculate_disp_abs(displacements):
     # see https://forum.freecadweb.org/viewtopic.php?f=18&t=33106&start=100#p296657
-    return [np.linalg.norm(nd) for nd in displacements]
+    return calculate_disp_abs_array(displacements).tolist()
+
+
+def calculate_disp_abs_array(displacements):
+    """Returns the lengths of all displacement vectors at once
+
+    Parameters
+    ----------
+    displacements : list of FreeCAD.Vector or numpy.ndarray
+        displacement vectors, shape (N, 3)
+
+    Returns
+    -------
+    numpy.ndarray
+        shape (N,)
+    """
+
+    return np.linalg.norm(np.asarray(displacements, dtype=float).reshape(-1, 3), axis=1)
 
 ##  @}
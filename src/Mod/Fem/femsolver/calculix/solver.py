@@ -210,6 +210,15 @@ def add_attributes(obj, ccx_prefs):
     split = ccx_prefs.GetBool("SplitInputWriter", False)
     obj.SplitInputWriter = split
 
+    obj.addProperty(
+        "App::PropertyBool",
+        "IncrementalInputWriter",
+        "Fem",
+        "Split writing of ccx input file and reuse unchanged files and node sets of the last run"
+    )
+    incremental = ccx_prefs.GetBool("IncrementalInputWriter", False)
+    obj.IncrementalInputWriter = incremental
+
     ccx_default_time_incrementation_control_parameter = {
         # iteration parameter
         "I_0": 4,
@@ -44,7 +44,13 @@ from femtools import femutils
 from femtools import membertools
 
 
-_inputFileName = None
+# input file name of each working directory, the solver jobs of a
+# jobqueue.JobQueue run at the same time in different directories
+_inputFileNames = {}
+
+
+def _getInputFileName(directory):
+    return _inputFileNames.get(directory)
 
 
 class Check(run.Check):
@@ -58,7 +64,6 @@ class Check(run.Check):
 class Prepare(run.Prepare):
 
     def run(self):
-        global _inputFileName
         self.pushStatus("Preparing input files...\n")
         w = writer.FemInputWriterCcx(
             self.analysis,
@@ -73,21 +78,22 @@ class Prepare(run.Prepare):
             self.pushStatus("Write completed!")
         else:
             self.pushStatus("Writing CalculiX input file failed!")
-        _inputFileName = os.path.splitext(os.path.basename(path))[0]
+        _inputFileNames[self.directory] = os.path.splitext(os.path.basename(path))[0]
 
 
 class Solve(run.Solve):
 
     def run(self):
-        if not _inputFileName:
+        if not _getInputFileName(self.directory):
             # TODO do not run solver
             # do not try to read results in a smarter way than an Exception
             raise Exception("Error on writing CalculiX input file.\n")
         self.pushStatus("Executing solver...\n")
         binary = settings.get_binary("Calculix")
         self._process = subprocess.Popen(
-            [binary, "-i", _inputFileName],
+            [binary, "-i", _getInputFileName(self.directory)],
             cwd=self.directory,
+            env=self.environment,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE)
         self.signalAbort.add(self._process.terminate)
@@ -102,7 +108,7 @@ class Solve(run.Solve):
 class Results(run.Results):
 
     def run(self):
-        if not _inputFileName:
+        if not _getInputFileName(self.directory):
             # TODO do not run solver
             # do not try to read results in a smarter way than an Exception
             raise Exception("Error on writing CalculiX input file.\n")
@@ -122,7 +128,7 @@ class Results(run.Results):
 
     def load_results_ccxfrd(self):
         frd_result_file = os.path.join(
-            self.directory, _inputFileName + ".frd")
+            self.directory, _getInputFileName(self.directory) + ".frd")
         if os.path.isfile(frd_result_file):
             result_name_prefix = "CalculiX_" + self.solver.AnalysisType + "_"
             importCcxFrdResults.importFrd(
@@ -133,7 +139,7 @@ class Results(run.Results):
 
     def load_results_ccxdat(self):
         dat_result_file = os.path.join(
-            self.directory, _inputFileName + ".dat")
+            self.directory, _getInputFileName(self.directory) + ".dat")
         if os.path.isfile(dat_result_file):
             mode_frequencies = importCcxDatResults.import_dat(
                 dat_result_file, self.analysis)
@@ -31,6 +31,8 @@ __url__ = "http://www.freecadweb.org"
 
 # import io
 import codecs
+import hashlib
+import json
 import os
 import six
 import sys
@@ -49,6 +51,10 @@ from femtools import geomtools
 # this would lead to support of unit system, force might be retrieved in base writer!
 
 
+# version of the data file of the incremental input writer
+INCREMENTAL_DATA_VERSION = 2
+
+
 # the following text will be at the end of the main calculix input file
 units_information = """***********************************************************
 **  About units:
@@ -100,6 +106,12 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             self.dir_name,
             "{}_inout_nodes.txt".format(self.mesh_name)
         )
+        self.incremental_file = join(
+            self.dir_name,
+            "{}_incremental.json".format(self.mesh_name)
+        )
+        self.incremental = False
+        self.incremental_data = new_incremental_data()
         from femtools import constants
         from FreeCAD import Units
         self.gravity = int(Units.Quantity(constants.gravity()).getValueAs("mm/s^2"))  # 9820 mm/s2
@@ -144,6 +156,14 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             self.split_inpfile = True
         else:
             self.split_inpfile = False
+        # incremental writing reuses the split files and constraint sets of the last run
+        # older solver objects do not have the property
+        if getattr(self.solver_obj, "IncrementalInputWriter", False) is True:
+            self.incremental = True
+            self.split_inpfile = True
+            self.read_incremental_data()
+        else:
+            self.incremental = False
 
         # mesh
         inpfileMain = self.write_mesh(self.split_inpfile)
@@ -218,6 +238,9 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         self.write_footer(inpfileMain)
         inpfileMain.close()
 
+        if self.incremental is True:
+            self.write_incremental_data()
+
     # ********************************************************************************************
     # mesh
     def write_mesh(self, inpfile_split=None):
@@ -229,11 +252,18 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             split_mesh_file_path = join(self.dir_name, file_name_splitt)
 
-            self.femmesh.writeABAQUS(
-                split_mesh_file_path,
-                element_param,
-                group_param
-            )
+            if self.incremental is True:
+                self.write_mesh_incremental(
+                    split_mesh_file_path,
+                    element_param,
+                    group_param
+                )
+            else:
+                self.femmesh.writeABAQUS(
+                    split_mesh_file_path,
+                    element_param,
+                    group_param
+                )
 
             # Check to see if fluid sections are in analysis and use D network element type
             if self.fluidsection_objects:
@@ -264,6 +294,145 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
 
         return inpfile
 
+    # ********************************************************************************************
+    # incremental writing
+    # the content of every split file is hashed, a file is only rewritten if its content changed
+    # the mesh file is only written if the checksum of the mesh has changed
+    # the constraint sets are cached by the mesh checksum and the geometry of the references
+    # all is saved in a json file in the working dir and reused on the next run
+    def read_incremental_data(self):
+        self.incremental_data = new_incremental_data()
+        if not os.path.isfile(self.incremental_file):
+            return
+        try:
+            with open(self.incremental_file, "r") as f:
+                data = json.load(f)
+        except ValueError:
+            FreeCAD.Console.PrintWarning(
+                "Incremental data file {} could not be read, "
+                "all input files will be written.\n".format(self.incremental_file)
+            )
+            return
+        if data.get("Version") == INCREMENTAL_DATA_VERSION:
+            self.incremental_data = data
+
+    def write_incremental_data(self):
+        with open(self.incremental_file, "w") as f:
+            json.dump(self.incremental_data, f)
+
+    def write_mesh_incremental(self, mesh_file_path, element_param, group_param):
+        # the mesh is only exported if its checksum has changed
+        # the checksum is the base of all cached constraint sets
+        mesh_hash = "{}:{}:{}".format(
+            meshtools.get_femmesh_checksum(self.femmesh),
+            element_param,
+            int(group_param)
+        )
+        if mesh_hash != self.incremental_data["Mesh"]:
+            FreeCAD.Console.PrintMessage("Mesh changed, cached constraint sets are not used.\n")
+            self.incremental_data = new_incremental_data()
+            self.incremental_data["Mesh"] = mesh_hash
+        file_name = os.path.basename(mesh_file_path)
+        files = self.incremental_data["Files"]
+        # the mesh file is changed afterwards if fluid sections are used
+        if not self.fluidsection_objects \
+                and files.get(file_name) == mesh_hash \
+                and os.path.isfile(mesh_file_path):
+            FreeCAD.Console.PrintLog("Reuse unchanged {}\n".format(file_name))
+            return
+        self.femmesh.writeABAQUS(mesh_file_path, element_param, group_param)
+        if self.fluidsection_objects:
+            files.pop(file_name, None)
+        else:
+            files[file_name] = mesh_hash
+
+    def write_include_file(self, file_name, write_method):
+        file_path = join(self.dir_name, file_name)
+        if self.incremental is not True:
+            inpfile_splitt = open(file_path, "w")
+            write_method(inpfile_splitt)
+            inpfile_splitt.close()
+            return
+        inpfile_buffer = six.StringIO()
+        write_method(inpfile_buffer)
+        content = inpfile_buffer.getvalue()
+        content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        files = self.incremental_data["Files"]
+        if files.get(file_name) == content_hash and os.path.isfile(file_path):
+            FreeCAD.Console.PrintLog("Reuse unchanged {}\n".format(file_name))
+            return
+        inpfile_splitt = open(file_path, "w")
+        inpfile_splitt.write(content)
+        inpfile_splitt.close()
+        files[file_name] = content_hash
+
+    def get_constraints_sets_incremental(
+        self,
+        get_constraints_method,
+        femobjs,
+        set_keys,
+        conflict_nodes=False
+    ):
+        # the set computation of a constraint type is skipped
+        # if the sets of all its constraint objects are cached
+        if self.incremental is not True:
+            get_constraints_method()
+            return
+        cached_sets = self.incremental_data["Sets"]
+        sets_keys = [
+            self.get_constraint_sets_key(get_constraints_method.__name__, femobj)
+            for femobj in femobjs
+        ]
+        if all(sets_key in cached_sets for sets_key in sets_keys):
+            FreeCAD.Console.PrintMessage(
+                "Reuse cached sets of {}\n".format(get_constraints_method.__name__)
+            )
+            for femobj, sets_key in zip(femobjs, sets_keys):
+                for set_key, set_data in cached_sets[sets_key].items():
+                    if set_key in ("NodesSolid", "NodesFaceEdge"):
+                        set_data = set(set_data)
+                    femobj[set_key] = set_data
+                # needed by constraint plane rotation
+                if conflict_nodes is True:
+                    self.constraint_conflict_nodes += femobj["Nodes"]
+            return
+        get_constraints_method()
+        for femobj, sets_key in zip(femobjs, sets_keys):
+            cached_sets[sets_key] = {}
+            for set_key in set_keys:
+                if set_key not in femobj:
+                    continue
+                set_data = femobj[set_key]
+                if isinstance(set_data, set):
+                    set_data = sorted(set_data)
+                cached_sets[sets_key][set_key] = set_data
+
+    def get_constraint_sets_key(self, get_constraints_method_name, femobj):
+        # the sets depend on the mesh, the geometry of the references
+        # and for fixed constraints on the mixed mesh data
+        constraint_obj = femobj["Object"]
+        references = []
+        for o, elem_tup in constraint_obj.References:
+            for elem in elem_tup:
+                ref_shape = o.Shape.getElement(elem)
+                bb = ref_shape.BoundBox
+                references.append([
+                    o.Name,
+                    elem,
+                    ref_shape.ShapeType,
+                    [round(v, 9) for v in (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)]
+                ])
+        key_data = [
+            get_constraints_method_name,
+            constraint_obj.Name,
+            self.incremental_data["Mesh"],
+            references,
+            bool(self.femmesh.Volumes),
+            len(self.shellthickness_objects),
+            len(self.beamsection_objects)
+        ]
+        return hashlib.sha1(json.dumps(key_data).encode("utf-8")).hexdigest()
+
     # ********************************************************************************************
     # constraints fixed
     def write_node_sets_constraints_fixed(self, f, inpfile_split=None):
@@ -272,7 +441,12 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # write for all analysis types
 
         # get nodes
-        self.get_constraints_fixed_nodes()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_fixed_nodes,
+            self.fixed_objects,
+            ("Nodes", "NodesSolid", "NodesFaceEdge"),
+            conflict_nodes=True
+        )
 
         write_name = "constraints_fixed_node_sets"
         f.write("\n***********************************************************\n")
@@ -283,9 +457,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_node_sets_nodes_constraints_fixed(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(file_name_splitt, self.write_node_sets_nodes_constraints_fixed)
         else:
             self.write_node_sets_nodes_constraints_fixed(f)
 
@@ -359,7 +531,12 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # write for all analysis types
 
         # get nodes
-        self.get_constraints_displacement_nodes()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_displacement_nodes,
+            self.displacement_objects,
+            ("Nodes",),
+            conflict_nodes=True
+        )
 
         write_name = "constraints_displacement_node_sets"
         f.write("\n***********************************************************\n")
@@ -370,9 +547,10 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_node_sets_nodes_constraints_displacement(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(
+                file_name_splitt,
+                self.write_node_sets_nodes_constraints_displacement
+            )
         else:
             self.write_node_sets_nodes_constraints_displacement(f)
 
@@ -437,7 +615,11 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # write for all analysis types
 
         # get nodes
-        self.get_constraints_planerotation_nodes()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_planerotation_nodes,
+            self.planerotation_objects,
+            ("Nodes",)
+        )
 
         write_name = "constraints_planerotation_node_sets"
         f.write("\n***********************************************************\n")
@@ -448,9 +630,10 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_node_sets_nodes_constraints_planerotation(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(
+                file_name_splitt,
+                self.write_node_sets_nodes_constraints_planerotation
+            )
         else:
             self.write_node_sets_nodes_constraints_planerotation(f)
 
@@ -520,7 +703,11 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # write for all analysis types
 
         # get faces
-        self.get_constraints_contact_faces()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_contact_faces,
+            self.contact_objects,
+            ("ContactSlaveFaces", "ContactMasterFaces")
+        )
 
         write_name = "constraints_contact_surface_sets"
         f.write("\n***********************************************************\n")
@@ -531,9 +718,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_surfacefaces_constraints_contact(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(file_name_splitt, self.write_surfacefaces_constraints_contact)
         else:
             self.write_surfacefaces_constraints_contact(f)
 
@@ -590,7 +775,11 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # write for all analysis types
 
         # get faces
-        self.get_constraints_tie_faces()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_tie_faces,
+            self.tie_objects,
+            ("TieSlaveFaces", "TieMasterFaces")
+        )
 
         write_name = "constraints_tie_surface_sets"
         f.write("\n***********************************************************\n")
@@ -601,9 +790,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_surfacefaces_constraints_tie(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(file_name_splitt, self.write_surfacefaces_constraints_tie)
         else:
             self.write_surfacefaces_constraints_tie(f)
 
@@ -660,9 +847,10 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_surfacefaces_constraints_sectionprint(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(
+                file_name_splitt,
+                self.write_surfacefaces_constraints_sectionprint
+            )
         else:
             self.write_surfacefaces_constraints_sectionprint(f)
 
@@ -729,7 +917,11 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
         # write for all analysis types
 
         # get nodes
-        self.get_constraints_transform_nodes()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_transform_nodes,
+            self.transform_objects,
+            ("Nodes",)
+        )
 
         write_name = "constraints_transform_node_sets"
         f.write("\n***********************************************************\n")
@@ -740,9 +932,10 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_node_sets_nodes_constraints_transform(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(
+                file_name_splitt,
+                self.write_node_sets_nodes_constraints_transform
+            )
         else:
             self.write_node_sets_nodes_constraints_transform(f)
 
@@ -804,7 +997,11 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             return
 
         # get nodes
-        self.get_constraints_temperature_nodes()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_temperature_nodes,
+            self.temperature_objects,
+            ("Nodes",)
+        )
 
         write_name = "constraints_temperature_node_sets"
         f.write("\n***********************************************************\n")
@@ -815,9 +1012,10 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_node_sets_nodes_constraints_temperature(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(
+                file_name_splitt,
+                self.write_node_sets_nodes_constraints_temperature
+            )
         else:
             self.write_node_sets_nodes_constraints_temperature(f)
 
@@ -929,9 +1127,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_nodeloads_constraints_force(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(file_name_splitt, self.write_nodeloads_constraints_force)
         else:
             self.write_nodeloads_constraints_force(f)
 
@@ -967,7 +1163,11 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             return
 
         # get the faces and face numbers
-        self.get_constraints_pressure_faces()
+        self.get_constraints_sets_incremental(
+            self.get_constraints_pressure_faces,
+            self.pressure_objects,
+            ("PressureFaces",)
+        )
 
         write_name = "constraints_pressure_element_face_loads"
         f.write("\n***********************************************************\n")
@@ -978,9 +1178,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_faceloads_constraints_pressure(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(file_name_splitt, self.write_faceloads_constraints_pressure)
         else:
             self.write_faceloads_constraints_pressure(f)
 
@@ -1026,9 +1224,7 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
             file_name_splitt = self.mesh_name + "_" + write_name + ".inp"
             f.write("** {}\n".format(write_name.replace("_", " ")))
             f.write("*INCLUDE,INPUT={}\n".format(file_name_splitt))
-            inpfile_splitt = open(join(self.dir_name, file_name_splitt), "w")
-            self.write_faceheatflux_constraints_heatflux(inpfile_splitt)
-            inpfile_splitt.close()
+            self.write_include_file(file_name_splitt, self.write_faceheatflux_constraints_heatflux)
         else:
             self.write_faceheatflux_constraints_heatflux(f)
 
@@ -1931,6 +2127,15 @@ class FemInputWriterCcx(writerbase.FemInputWriter):
 # F .. Fluid
 # S .. Shell,
 # TODO write comment into input file to elset ids and elset attributes
+def new_incremental_data():
+    return {
+        "Version": INCREMENTAL_DATA_VERSION,
+        "Mesh": None,
+        "Files": {},
+        "Sets": {}
+    }
+
+
 def get_ccx_elset_name_standard(names):
     # standard max length = 80
     ccx_elset_name = ""
@@ -114,15 +114,22 @@ class Solve(run.Solve):
             # http://www.elmerfem.org/forum/viewtopic.php?f=2&t=7119
             # https://stackoverflow.com/questions/1506010/how-to-use-export-with-python-on-linux
             # TODO move retrieving the param to solver settings module
+            # the variables are set in the environment of the solver process only,
+            # a job queue passes its own environment to every solver
+            env = dict(self.environment if self.environment is not None else os.environ)
             elparams = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Fem/Elmer")
             elmer_env = elparams.GetBool("SetElmerEnvVariables", False)
-            if elmer_env is True and system() == "Linux" and "ELMER_HOME" not in os.environ:
+            if elmer_env is True and system() == "Linux" and "ELMER_HOME" not in env:
                 solvpath = os.path.split(binary)[0]
                 if os.path.isdir(solvpath):
-                    os.environ["ELMER_HOME"] = solvpath
-                    os.environ["LD_LIBRARY_PATH"] = "$LD_LIBRARY_PATH:{}/modules".format(solvpath)
+                    env["ELMER_HOME"] = solvpath
+                    env["LD_LIBRARY_PATH"] = os.pathsep.join(filter(None, (
+                        env.get("LD_LIBRARY_PATH"),
+                        os.path.join(solvpath, "modules")
+                    )))
             self._process = subprocess.Popen(
                 [binary], cwd=self.directory,
+                env=env,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE)
             self.signalAbort.add(self._process.terminate)
@@ -0,0 +1,324 @@
+# ***************************************************************************
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This file is part of the FreeCAD CAx development system.              *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+""" Run many solver jobs concurrently.
+
+A :class:`JobQueue` executes a list of solver jobs, for example a parameter
+sweep over a thickness or over load cases, with a bounded number of solver
+processes running at the same time. Every job gets its own working directory
+and its own :class:`femsolver.run.Machine`.
+
+The document is not thread safe. Thus the setup of a job, the Check and Prepare
+tasks and the result collection run one job after the other in the queue
+thread. Only the Solve tasks, which run the external solver binaries, run in
+parallel. The cores are split between the running solvers by
+``OMP_NUM_THREADS``.
+
+Example of a sweep over the force of the box analysis::
+
+    from femsolver import jobqueue
+    queue = jobqueue.JobQueue(maxWorkers=2)
+    for force in (10000.0, 20000.0, 40000.0):
+        def setup(job, force=force):
+            doc.FemConstraintForce.Force = force
+        queue.addJob(doc.SolverCalculiX, "force_%d" % force, setup)
+    queue.start()
+    queue.join()
+    for job in queue.jobs:
+        print(job.name, job.state, job.directory, job.results)
+
+Be aware the CalculiX Results task removes the existing result objects of the
+analysis, unless "KeepResultsOnReRun" is set in the FEM general preferences.
+Use a *collect* callable which reads the result files of
+:attr:`Job.directory` to keep the results of all jobs without touching the
+document.
+"""
+
+__title__ = "FreeCAD FEM solver job queue"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+
+## \addtogroup FEM
+#  @{
+
+import multiprocessing
+import os
+import os.path
+import tempfile
+import time
+
+from . import report
+from . import run
+from . import signal
+from . import task
+from femtools import membertools
+
+
+PENDING = 0
+RUNNING = 1
+FINISHED = 2
+FAILED = 3
+ABORTED = 4
+
+
+class Job(object):
+    """ One solver run of a :class:`JobQueue`.
+
+    :param solver: the solver document object
+    :param name: the name of the working directory of the job
+    :param setup:
+        callable ``setup(job)`` which modifies the document before the input
+        files of the job are written, ``None`` for no modification
+    :param collect:
+        callable ``collect(job)`` which returns the results of the job,
+        ``None`` loads the results into the analysis by the Results task of
+        the solver and returns the new result objects
+    """
+
+    def __init__(self, solver, name=None, setup=None, collect=None):
+        self.solver = solver
+        self.name = name if name is not None else solver.Label
+        self.setup = setup
+        self.collect = collect
+        self.directory = None
+        self.machine = None
+        self.state = PENDING
+        self.report = report.Report()
+        self.results = None
+        self.startTime = None
+        self.stopTime = None
+
+    @property
+    def done(self):
+        return self.state in (FINISHED, FAILED, ABORTED)
+
+    @property
+    def time(self):
+        if self.startTime is not None:
+            endTime = (
+                self.stopTime
+                if self.stopTime is not None
+                else time.time())
+            return endTime - self.startTime
+        return None
+
+
+class JobQueue(task.Thread):
+    """ Executes the added jobs with at most *maxWorkers* solvers at a time.
+
+    :param directory:
+        base directory of the job working directories, a new temporary
+        directory is used if ``None``
+    :param maxWorkers:
+        number of solver processes running at the same time, the number of
+        cores if ``None``
+    :param cores:
+        number of cores shared by the running solvers, all cores if ``None``
+    :param target:
+        last state of the solver machines, use ``run.PREPARE`` to write the
+        input files of all jobs only
+    :param testmode: passed to the solver machines
+    """
+
+    def __init__(
+            self, directory=None, maxWorkers=None, cores=None,
+            target=run.RESULTS, testmode=False):
+        super(JobQueue, self).__init__()
+        self.directory = directory
+        self.cores = cores if cores else multiprocessing.cpu_count()
+        self.maxWorkers = maxWorkers if maxWorkers else self.cores
+        self.target = target
+        self.testmode = testmode
+        self.pollInterval = 0.1
+        self.jobs = []
+        # notified with the job as argument if the state of a job changes
+        self.signalJobState = set()
+        self._running = []
+
+        def abortRunning():
+            for job in list(self._running):
+                if job.machine is not None:
+                    job.machine.abort()
+        self.signalAbort.add(abortRunning)
+
+    @property
+    def progress(self):
+        """ Tuple of the number of done jobs and the number of all jobs. """
+        return (len([job for job in self.jobs if job.done]), len(self.jobs))
+
+    def addJob(self, solver, name=None, setup=None, collect=None):
+        job = Job(solver, name, setup, collect)
+        self.jobs.append(job)
+        return job
+
+    def cancelJob(self, job):
+        if job.state == PENDING:
+            job.stopTime = time.time()
+            self._setState(job, ABORTED)
+        elif job.state == RUNNING and job.machine is not None:
+            job.machine.abort()
+
+    def getThreadsPerJob(self, numberOfJobs=None):
+        if numberOfJobs is None:
+            numberOfJobs = len(self.jobs)
+        workers = max(1, min(self.maxWorkers, numberOfJobs))
+        return max(1, self.cores // workers)
+
+    def getEnvironment(self, threads):
+        env = dict(os.environ)
+        env["OMP_NUM_THREADS"] = str(threads)
+        return env
+
+    def run(self):
+        if self.directory is None:
+            self.directory = tempfile.mkdtemp(prefix="fem")
+        elif not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        pending = [job for job in self.jobs if job.state == PENDING]
+        environment = self.getEnvironment(self.getThreadsPerJob(len(pending)))
+        self.pushStatus(
+            "Running {} jobs, {} at a time.\n"
+            .format(len(pending), min(self.maxWorkers, len(pending))))
+        while pending or self._running:
+            for job in [job for job in self._running if not job.machine.running]:
+                self._running.remove(job)
+                self._finishJob(job)
+            while pending and len(self._running) < self.maxWorkers and not self.aborted:
+                job = pending.pop(0)
+                if job.state == PENDING and self._prepareJob(job, environment):
+                    self._running.append(job)
+            if self.aborted:
+                for job in pending:
+                    if job.state == PENDING:
+                        self._stopJob(job, ABORTED)
+                pending = []
+            if self._running:
+                time.sleep(self.pollInterval)
+        if any(job.state == FAILED for job in self.jobs):
+            self.fail()
+
+    def _prepareJob(self, job, environment):
+        job.startTime = time.time()
+        job.directory = self._createJobDirectory(job)
+        self._setState(job, RUNNING)
+        try:
+            if job.setup is not None:
+                job.setup(job)
+                job.solver.Document.recompute()
+            job.machine = job.solver.Proxy.createMachine(
+                job.solver, job.directory, self.testmode)
+        except Exception as e:
+            job.report.error("Setup of job {} failed: {}".format(job.name, e))
+            self._stopJob(job, FAILED)
+            return False
+        job.machine.environment = environment
+        if not self._runMachine(job, min(run.PREPARE, self.target)):
+            return False
+        if self.target < run.SOLVE:
+            self._stopJob(job, FINISHED)
+            return False
+        job.machine.target = run.SOLVE
+        job.machine.start()
+        return True
+
+    def _finishJob(self, job):
+        job.report.extend(job.machine.report)
+        if job.machine.failed:
+            self._stopJob(job, FAILED)
+            return
+        if job.machine.aborted:
+            self._stopJob(job, ABORTED)
+            return
+        try:
+            if job.collect is not None:
+                job.results = job.collect(job)
+            elif self.target >= run.RESULTS:
+                job.results = self._loadResults(job)
+        except Exception as e:
+            job.report.error("Result collection of job {} failed: {}".format(job.name, e))
+            self._stopJob(job, FAILED)
+            return
+        if not job.done:
+            self._stopJob(job, FINISHED)
+
+    def _loadResults(self, job):
+        analysis = job.solver.getParentGroup()
+        before = set(
+            m.Name for m in membertools.get_member(analysis, "Fem::FemResultObject"))
+        if not self._runMachine(job, run.RESULTS):
+            return None
+        return [
+            m for m in membertools.get_member(analysis, "Fem::FemResultObject")
+            if m.Name not in before
+        ]
+
+    def _runMachine(self, job, target):
+        job.machine.target = target
+        job.machine.start()
+        job.machine.join()
+        # the stopping signal is sent by an observer thread after the join, wait for it
+        # before the machine is started again, it would reset the running flag otherwise
+        while job.machine.running:
+            time.sleep(0.01)
+        job.report.extend(job.machine.report)
+        if job.machine.failed:
+            self._stopJob(job, FAILED)
+            return False
+        if job.machine.aborted or self.aborted:
+            self._stopJob(job, ABORTED)
+            return False
+        return True
+
+    def _createJobDirectory(self, job):
+        # a new directory for every job, even for jobs with the same name
+        # or a directory left by a former run of the queue
+        path = os.path.join(self.directory, job.name)
+        postfix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, "%s_%03d" % (job.name, postfix))
+            postfix += 1
+        os.makedirs(path)
+        return path
+
+    def _stopJob(self, job, state):
+        job.stopTime = time.time()
+        self.report.extend(job.report)
+        self._setState(job, state)
+        done, total = self.progress
+        self.pushStatus(
+            "Job {} {} ({}/{}).\n"
+            .format(job.name, _STATE_NAMES[state], done, total))
+
+    def _setState(self, job, state):
+        job.state = state
+        signal.notify(self.signalJobState, job)
+
+
+_STATE_NAMES = {
+    PENDING: "pending",
+    RUNNING: "running",
+    FINISHED: "finished",
+    FAILED: "failed",
+    ABORTED: "aborted",
+}
+
+##  @}
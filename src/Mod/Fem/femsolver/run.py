@@ -311,6 +311,8 @@ class BaseTask(task.Thread):
         self.solver = None
         self.directory = None
         self.testmode = None
+        # environment of the solver process, None inherits os.environ
+        self.environment = None
 
     @property
     def analysis(self):
@@ -380,6 +382,7 @@ class Machine(BaseTask):
             t.solver = self.solver
             t.directory = self.directory
             t.testmode = self.testmode
+            t.environment = self.environment
 
     def _applyPending(self):
         if not self._isReset:
@@ -301,15 +301,10 @@ class FemInputWriter():
             # print(femobj["PressureFaces"])
         """
 
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
+        # the element faces are searched by the mesh topology index
+        # which is built once for the femmesh
         if not self.femelement_table:
             self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
 
         for femobj in self.pressure_objects:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
@@ -317,7 +312,7 @@ class FemInputWriter():
             pressure_faces = meshtools.get_pressure_obj_faces(
                 self.femmesh,
                 self.femelement_table,
-                self.femnodes_ele_table, femobj
+                femobj
             )
             # the data model is for compatibility reason with deprecated version
             # get_pressure_obj_faces_depreciated returns the face ids in a tuple per ref_shape
@@ -328,15 +323,10 @@ class FemInputWriter():
             FreeCAD.Console.PrintLog("{}\n".format(femobj["PressureFaces"]))
 
     def get_constraints_contact_faces(self):
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
+        # the element faces are searched by the mesh topology index
+        # which is built once for the femmesh
         if not self.femelement_table:
             self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
 
         for femobj in self.contact_objects:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
@@ -344,7 +334,7 @@ class FemInputWriter():
             contact_slave_faces, contact_master_faces = meshtools.get_contact_obj_faces(
                 self.femmesh,
                 self.femelement_table,
-                self.femnodes_ele_table, femobj
+                femobj
             )
             # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
             # whereas the ele_face_id might be ccx specific
@@ -361,15 +351,10 @@ class FemInputWriter():
     #                from one side of the geometric face are needed
 
     def get_constraints_tie_faces(self):
-        if not self.femnodes_mesh:
-            self.femnodes_mesh = self.femmesh.Nodes
+        # the element faces are searched by the mesh topology index
+        # which is built once for the femmesh
         if not self.femelement_table:
             self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-        if not self.femnodes_ele_table:
-            self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                self.femnodes_mesh,
-                self.femelement_table
-            )
 
         for femobj in self.tie_objects:
             # femobj --> dict, FreeCAD document object is femobj["Object"]
@@ -377,7 +362,7 @@ class FemInputWriter():
             slave_faces, master_faces = meshtools.get_tie_obj_faces(
                 self.femmesh,
                 self.femelement_table,
-                self.femnodes_ele_table, femobj
+                femobj
             )
             # [ele_id, ele_face_id], [ele_id, ele_face_id], ...]
             # whereas the ele_face_id might be ccx specific
@@ -463,20 +448,13 @@ class FemInputWriter():
             if all_found is False:
                 if not self.femelement_table:
                     self.femelement_table = meshtools.get_femelement_table(self.femmesh)
-                # we're going to use the binary search for get_femelements_by_femnodes()
-                # thus we need the parameter values self.femnodes_ele_table
-                if not self.femnodes_mesh:
-                    self.femnodes_mesh = self.femmesh.Nodes
-                if not self.femnodes_ele_table:
-                    self.femnodes_ele_table = meshtools.get_femnodes_ele_table(
-                        self.femnodes_mesh,
-                        self.femelement_table
-                    )
+                # the elements are searched by the node element adjacency
+                # of the mesh topology index, which is built once for the femmesh
                 control = meshtools.get_femelement_sets(
                     self.femmesh,
                     self.femelement_table,
                     self.material_objects,
-                    self.femnodes_ele_table
+                    use_topology_index=True
                 )
                 # we only need to set it, if it is still True
                 if (self.femelement_count_test is True) and (control is False):
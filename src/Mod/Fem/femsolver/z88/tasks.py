@@ -82,6 +82,7 @@ class Solve(run.Solve):
         self._process = subprocess.Popen(
             [binary, "-t", "-choly"],
             cwd=self.directory,
+            env=self.environment,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE)
         self.signalAbort.add(self._process.terminate)
@@ -94,6 +95,7 @@ class Solve(run.Solve):
         self._process = subprocess.Popen(
             [binary, "-c", "-choly"],
             cwd=self.directory,
+            env=self.environment,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE)
         self.signalAbort.add(self._process.terminate)
@@ -41,6 +41,7 @@ from PySide.QtGui import QApplication
 import FreeCAD
 import FreeCADGui
 
+import femresult.resultcache as resultcache
 import femresult.resulttools as resulttools
 
 
@@ -262,6 +263,14 @@ class _TaskPanel:
     def get_result_stats(self, type_name):
         return resulttools.get_stats(self.result_obj, type_name)
 
+    # the result values of result objects with a result cache
+    # are loaded on first use, see femresult/resultcache.py
+    def has_result_values(self, prop):
+        return resultcache.has_property(self.result_obj, prop)
+
+    def get_result_values(self, prop):
+        return resultcache.get_property(self.result_obj, prop)
+
     def none_selected(self, state):
         FreeCAD.FEM_dialog["results_type"] = "None"
         self.set_result_stats("mm", 0.0, 0.0)
@@ -277,16 +286,16 @@ class _TaskPanel:
     # check if the results len is not 0 on any selected method
 
     def abs_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementLengths) > 0:
-            self.result_selected("Uabs", self.result_obj.DisplacementLengths, "mm")
+        if self.has_result_values("DisplacementLengths"):
+            self.result_selected("Uabs", self.get_result_values("DisplacementLengths"), "mm")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def x_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementVectors) > 0:
+        if self.has_result_values("DisplacementVectors"):
             res_disp_u1 = self.get_scalar_disp_list(
-                self.result_obj.DisplacementVectors, 0
+                self.get_result_values("DisplacementVectors"), 0
             )
             self.result_selected("U1", res_disp_u1, "mm")
         else:
@@ -294,9 +303,9 @@ class _TaskPanel:
             self.none_selected(True)
 
     def y_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementVectors) > 0:
+        if self.has_result_values("DisplacementVectors"):
             res_disp_u2 = self.get_scalar_disp_list(
-                self.result_obj.DisplacementVectors, 1
+                self.get_result_values("DisplacementVectors"), 1
             )
             self.result_selected("U2", res_disp_u2, "mm")
         else:
@@ -304,9 +313,9 @@ class _TaskPanel:
             self.none_selected(True)
 
     def z_displacement_selected(self, state):
-        if len(self.result_obj.DisplacementVectors) > 0:
+        if self.has_result_values("DisplacementVectors"):
             res_disp_u3 = self.get_scalar_disp_list(
-                self.result_obj.DisplacementVectors, 2
+                self.get_result_values("DisplacementVectors"), 2
             )
             self.result_selected("U3", res_disp_u3, "mm")
         else:
@@ -314,57 +323,57 @@ class _TaskPanel:
             self.none_selected(True)
 
     def vm_stress_selected(self, state):
-        if len(self.result_obj.vonMises) > 0:
-            self.result_selected("Sabs", self.result_obj.vonMises, "MPa")
+        if self.has_result_values("vonMises"):
+            self.result_selected("Sabs", self.get_result_values("vonMises"), "MPa")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def max_shear_selected(self, state):
-        if len(self.result_obj.MaxShear) > 0:
-            self.result_selected("MaxShear", self.result_obj.MaxShear, "MPa")
+        if self.has_result_values("MaxShear"):
+            self.result_selected("MaxShear", self.get_result_values("MaxShear"), "MPa")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def max_prin_selected(self, state):
-        if len(self.result_obj.PrincipalMax) > 0:
-            self.result_selected("MaxPrin", self.result_obj.PrincipalMax, "MPa")
+        if self.has_result_values("PrincipalMax"):
+            self.result_selected("MaxPrin", self.get_result_values("PrincipalMax"), "MPa")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def temperature_selected(self, state):
-        if len(self.result_obj.Temperature) > 0:
-            self.result_selected("Temp", self.result_obj.Temperature, "K")
+        if self.has_result_values("Temperature"):
+            self.result_selected("Temp", self.get_result_values("Temperature"), "K")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def massflowrate_selected(self, state):
-        if len(self.result_obj.MassFlowRate) > 0:
-            self.result_selected("MFlow", self.result_obj.MassFlowRate, "kg/s")
+        if self.has_result_values("MassFlowRate"):
+            self.result_selected("MFlow", self.get_result_values("MassFlowRate"), "kg/s")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def networkpressure_selected(self, state):
-        if len(self.result_obj.NetworkPressure) > 0:
-            self.result_selected("NPress", self.result_obj.NetworkPressure, "MPa")
+        if self.has_result_values("NetworkPressure"):
+            self.result_selected("NPress", self.get_result_values("NetworkPressure"), "MPa")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def min_prin_selected(self, state):
-        if len(self.result_obj.PrincipalMin) > 0:
-            self.result_selected("MinPrin", self.result_obj.PrincipalMin, "MPa")
+        if self.has_result_values("PrincipalMin"):
+            self.result_selected("MinPrin", self.get_result_values("PrincipalMin"), "MPa")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
 
     def peeq_selected(self, state):
-        if len(self.result_obj.Peeq) > 0:
-            self.result_selected("Peeq", self.result_obj.Peeq, "")
+        if self.has_result_values("Peeq"):
+            self.result_selected("Peeq", self.get_result_values("Peeq"), "")
         else:
             self.result_widget.rb_none.setChecked(True)
             self.none_selected(True)
@@ -387,32 +396,32 @@ class _TaskPanel:
 
         # Convert existing result values to numpy array
         # scalars
-        P1 = np.array(self.result_obj.PrincipalMax)
-        P2 = np.array(self.result_obj.PrincipalMed)
-        P3 = np.array(self.result_obj.PrincipalMin)
-        vM = np.array(self.result_obj.vonMises)
-        Peeq = np.array(self.result_obj.Peeq)
-        T = np.array(self.result_obj.Temperature)
-        MF = np.array(self.result_obj.MassFlowRate)
-        NP = np.array(self.result_obj.NetworkPressure)
-        sxx = np.array(self.result_obj.NodeStressXX)
-        syy = np.array(self.result_obj.NodeStressYY)
-        szz = np.array(self.result_obj.NodeStressZZ)
-        sxy = np.array(self.result_obj.NodeStressXY)
-        sxz = np.array(self.result_obj.NodeStressXZ)
-        syz = np.array(self.result_obj.NodeStressYZ)
-        exx = np.array(self.result_obj.NodeStrainXX)
-        eyy = np.array(self.result_obj.NodeStrainYY)
-        ezz = np.array(self.result_obj.NodeStrainZZ)
-        exy = np.array(self.result_obj.NodeStrainXY)
-        exz = np.array(self.result_obj.NodeStrainXZ)
-        eyz = np.array(self.result_obj.NodeStrainYZ)
+        P1 = resultcache.get_array(self.result_obj, "PrincipalMax")
+        P2 = resultcache.get_array(self.result_obj, "PrincipalMed")
+        P3 = resultcache.get_array(self.result_obj, "PrincipalMin")
+        vM = resultcache.get_array(self.result_obj, "vonMises")
+        Peeq = resultcache.get_array(self.result_obj, "Peeq")
+        T = resultcache.get_array(self.result_obj, "Temperature")
+        MF = resultcache.get_array(self.result_obj, "MassFlowRate")
+        NP = resultcache.get_array(self.result_obj, "NetworkPressure")
+        sxx = resultcache.get_array(self.result_obj, "NodeStressXX")
+        syy = resultcache.get_array(self.result_obj, "NodeStressYY")
+        szz = resultcache.get_array(self.result_obj, "NodeStressZZ")
+        sxy = resultcache.get_array(self.result_obj, "NodeStressXY")
+        sxz = resultcache.get_array(self.result_obj, "NodeStressXZ")
+        syz = resultcache.get_array(self.result_obj, "NodeStressYZ")
+        exx = resultcache.get_array(self.result_obj, "NodeStrainXX")
+        eyy = resultcache.get_array(self.result_obj, "NodeStrainYY")
+        ezz = resultcache.get_array(self.result_obj, "NodeStrainZZ")
+        exy = resultcache.get_array(self.result_obj, "NodeStrainXY")
+        exz = resultcache.get_array(self.result_obj, "NodeStrainXZ")
+        eyz = resultcache.get_array(self.result_obj, "NodeStrainYZ")
         rx = np.array(self.result_obj.ReinforcementRatio_x)
         ry = np.array(self.result_obj.ReinforcementRatio_y)
         rz = np.array(self.result_obj.ReinforcementRatio_z)
         mc = np.array(self.result_obj.MohrCoulomb)
         # vectors
-        dispvectors = np.array(self.result_obj.DisplacementVectors)
+        dispvectors = resultcache.get_array(self.result_obj, "DisplacementVectors")
         x = np.array(dispvectors[:, 0])
         y = np.array(dispvectors[:, 1])
         z = np.array(dispvectors[:, 2])
@@ -477,10 +486,7 @@ class _TaskPanel:
         del s1x, s1y, s1z, s2x, s2y, s2z, s3x, s3y, s3z
 
     def get_scalar_disp_list(self, vector_list, axis):
-        # list is needed, as zib-object is not subscriptable in py3
-        d = list(zip(*self.result_obj.DisplacementVectors))
-        scalar_list = list(d[axis])
-        return scalar_list
+        return np.asarray(vector_list, dtype=float).reshape(-1, 3)[:, axis].tolist()
 
     def result_selected(self, res_type, res_values, res_unit):
         FreeCAD.FEM_dialog["results_type"] = res_type
@@ -489,7 +495,15 @@ class _TaskPanel:
 
         if len(plt.get_fignums()) > 0:
             plt.close()
-        plt.hist(res_values, bins=50, alpha=0.5, facecolor="blue")
+        # the histogram of a result type is cached, see resulttools.get_field_stats
+        field_stats = resulttools.get_field_stats(self.result_obj, res_type)
+        if field_stats is not None:
+            counts, bin_edges = field_stats["histogram"]
+            plt.hist(
+                bin_edges[:-1], bins=bin_edges, weights=counts, alpha=0.5, facecolor="blue"
+            )
+        else:
+            plt.hist(res_values, bins=50, alpha=0.5, facecolor="blue")
         plt.xlabel(res_unit)
         plt.title("Histogram of {}".format(res_type))
         plt.ylabel("Nodes")
@@ -531,7 +545,7 @@ class _TaskPanel:
         if self.suitable_results:
             self.mesh_obj.ViewObject.setNodeDisplacementByVectors(
                 self.result_obj.NodeNumbers,
-                self.result_obj.DisplacementVectors
+                self.get_result_values("DisplacementVectors")
             )
         self.update_displacement()
         QtGui.QApplication.restoreOverrideCursor()
@@ -579,27 +593,27 @@ class _TaskPanel:
         MassFlowRate        --> rb_massflowrate
         NetworkPressure     --> rb_networkpressure
         Peeq                --> rb_peeq"""
-        if len(self.result_obj.DisplacementLengths) == 0:
+        if not self.has_result_values("DisplacementLengths"):
             self.result_widget.rb_abs_displacement.setEnabled(0)
-        if len(self.result_obj.DisplacementVectors) == 0:
+        if not self.has_result_values("DisplacementVectors"):
             self.result_widget.rb_x_displacement.setEnabled(0)
             self.result_widget.rb_y_displacement.setEnabled(0)
             self.result_widget.rb_z_displacement.setEnabled(0)
-        if len(self.result_obj.Temperature) == 0:
+        if not self.has_result_values("Temperature"):
             self.result_widget.rb_temperature.setEnabled(0)
-        if len(self.result_obj.vonMises) == 0:
+        if not self.has_result_values("vonMises"):
             self.result_widget.rb_vm_stress.setEnabled(0)
-        if len(self.result_obj.PrincipalMax) == 0:
+        if not self.has_result_values("PrincipalMax"):
             self.result_widget.rb_maxprin.setEnabled(0)
-        if len(self.result_obj.PrincipalMin) == 0:
+        if not self.has_result_values("PrincipalMin"):
             self.result_widget.rb_minprin.setEnabled(0)
-        if len(self.result_obj.MaxShear) == 0:
+        if not self.has_result_values("MaxShear"):
             self.result_widget.rb_max_shear_stress.setEnabled(0)
-        if len(self.result_obj.MassFlowRate) == 0:
+        if not self.has_result_values("MassFlowRate"):
             self.result_widget.rb_massflowrate.setEnabled(0)
-        if len(self.result_obj.NetworkPressure) == 0:
+        if not self.has_result_values("NetworkPressure"):
             self.result_widget.rb_networkpressure.setEnabled(0)
-        if len(self.result_obj.Peeq) == 0:
+        if not self.has_result_values("Peeq"):
             self.result_widget.rb_peeq.setEnabled(0)
 
     def update(self):
@@ -663,11 +677,11 @@ def hide_parts_constraints():
 
 def get_displacement_scale_factor(res_obj):
     node_items = res_obj.Mesh.FemMesh.Nodes.items()
-    displacements = res_obj.DisplacementVectors
+    displacements = resultcache.get_array(res_obj, "DisplacementVectors")
     # use standard scale if there are no displacements in result object
     if len(displacements) == 0:
         return 1
-    x_max, y_max, z_max = map(max, zip(*displacements))
+    x_max, y_max, z_max = displacements.max(axis=0).tolist()
     positions = []  # list of node vectors
     for k, v in node_items:
         positions.append(v)
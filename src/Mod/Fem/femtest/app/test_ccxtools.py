@@ -26,6 +26,9 @@ __title__ = "Ccxtools FEM unit tests"
 __author__ = "Bernd Hahnebach"
 __url__ = "http://www.freecadweb.org"
 
+import json
+import os
+import time
 import unittest
 from os.path import join
 
@@ -135,6 +138,60 @@ class TestCcxTools(unittest.TestCase):
             res_obj_name=res_obj_name,
         )
 
+    # ********************************************************************************************
+    def test_box_static_incremental(
+        self
+    ):
+        # set up
+        from femexamples.boxanalysis_static import setup
+        setup(self.document, "ccxtools")
+        base_name = get_namefromdef("test_")
+        analysis_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + base_name)
+        self.document.CalculiXccxTools.IncrementalInputWriter = True
+
+        fea = ccxtools.FemToolsCcx(
+            self.document.Analysis,
+            self.document.CalculiXccxTools,
+            test_mode=True
+        )
+        fea.update_objects()
+        fea.setup_working_dir(analysis_dir)
+        self.assertFalse(fea.check_prerequisites(), "check_prerequisites returned an error")
+
+        # first run writes all files
+        self.assertFalse(fea.write_inp_file(), "First writing failed")
+        inp_files = sorted(
+            f for f in os.listdir(analysis_dir) if f.startswith(self.mesh_name + "_")
+        )
+        self.assertIn(self.mesh_name + "_femesh.inp", inp_files)
+        self.assertIn(self.mesh_name + "_incremental.json", inp_files)
+        mtimes = {f: os.path.getmtime(join(analysis_dir, f)) for f in inp_files}
+        with open(join(analysis_dir, self.mesh_name + ".inp")) as f:
+            main_inp = f.read()
+
+        # second run with unchanged model reuses all split files
+        time.sleep(0.1)
+        self.assertFalse(fea.write_inp_file(), "Second writing failed")
+        for f in inp_files:
+            if f.endswith(".inp"):
+                self.assertEqual(
+                    mtimes[f],
+                    os.path.getmtime(join(analysis_dir, f)),
+                    "Unchanged split file {} was rewritten".format(f)
+                )
+        with open(join(analysis_dir, self.mesh_name + ".inp")) as f:
+            self.assertEqual(main_inp, f.read())
+
+        # the mesh is only exported again if its checksum has changed
+        from femmesh import meshtools
+        with open(join(analysis_dir, self.mesh_name + "_incremental.json")) as f:
+            mesh_hash = json.load(f)["Mesh"]
+        self.assertEqual(
+            mesh_hash.split(":")[0],
+            meshtools.get_femmesh_checksum(self.document.Mesh.FemMesh),
+            "Mesh checksum of the incremental data is unexpected"
+        )
+
     # ********************************************************************************************
     def test_thermomech_flow1D(
         self
@@ -150,6 +150,216 @@ class TestMeshCommon(unittest.TestCase):
             "Edges of Python created seg3 element are unexpected"
         )
 
+    # ********************************************************************************************
+    def test_mesh_topology_index(
+        self
+    ):
+        # two hexa8 volumes sharing the face with the nodes 5, 6, 7, 8
+        femmesh = Fem.FemMesh()
+        for i, z in enumerate((0, 1, 2)):
+            femmesh.addNode(0, 0, z, 4 * i + 1)
+            femmesh.addNode(1, 0, z, 4 * i + 2)
+            femmesh.addNode(1, 1, z, 4 * i + 3)
+            femmesh.addNode(0, 1, z, 4 * i + 4)
+        femmesh.addVolume([1, 2, 3, 4, 5, 6, 7, 8], 1)
+        femmesh.addVolume([5, 6, 7, 8, 9, 10, 11, 12], 2)
+
+        from femmesh import meshtools
+        femelement_table = meshtools.get_femelement_table(femmesh)
+        femnodes_ele_table = meshtools.get_femnodes_ele_table(femmesh.Nodes, femelement_table)
+        index = meshtools.get_mesh_topology_index(femmesh, femelement_table)
+        self.assertIs(
+            index,
+            meshtools.get_mesh_topology_index(femmesh, femelement_table),
+            "Topology index of an unchanged mesh was rebuilt"
+        )
+        for node_set in ([5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 7, 8], [2, 3, 6, 7, 10, 11]):
+            bit_pattern_dict = meshtools.get_bit_pattern_dict(
+                femelement_table,
+                femnodes_ele_table,
+                node_set
+            )
+            self.assertEqual(
+                index.get_ccxelement_faces(node_set),
+                meshtools.get_ccxelement_faces_from_binary_search(bit_pattern_dict),
+                "Element faces of the topology index are unexpected"
+            )
+            self.assertEqual(
+                sorted(index.get_femelements_by_femnodes(node_set)),
+                meshtools.get_femelements_by_femnodes_std(femelement_table, node_set),
+                "Elements of the topology index are unexpected"
+            )
+
+        # the index is found for another FemMesh with the same elements
+        self.assertIs(
+            index,
+            meshtools.get_mesh_topology_index(femmesh.copy()),
+            "Topology index of a copied mesh was rebuilt"
+        )
+        # the element faces are only cached for the last node sets
+        for i in range(meshtools._FACES_CACHE_SIZE + 10):
+            index.get_ccxelement_faces([5, 6, 7, 8, 100 + i])
+        self.assertEqual(
+            len(index._faces_cache),
+            meshtools._FACES_CACHE_SIZE,
+            "Element faces cache of the topology index is not bounded"
+        )
+
+        # a changed mesh gets a new index
+        femmesh.addNode(5, 5, 5, 13)
+        self.assertIsNot(
+            index,
+            meshtools.get_mesh_topology_index(femmesh),
+            "Topology index of a changed mesh was not rebuilt"
+        )
+
+        # a remeshed mesh with the same counts and element ids
+        # but other element nodes gets a new index
+        remeshed = Fem.FemMesh()
+        for node_id, node in femmesh.Nodes.items():
+            remeshed.addNode(node.x, node.y, node.z, node_id)
+        remeshed.addVolume([5, 6, 7, 8, 9, 10, 11, 12], 1)
+        remeshed.addVolume([1, 2, 3, 4, 5, 6, 7, 8], 2)
+        remeshed_index = meshtools.get_mesh_topology_index(remeshed)
+        self.assertIsNot(
+            meshtools.get_mesh_topology_index(femmesh),
+            remeshed_index,
+            "Topology index of a remeshed mesh was not rebuilt"
+        )
+        self.assertEqual(
+            remeshed_index.get_femelements_by_femnodes([1, 2, 3, 4, 5, 6, 7, 8]),
+            [2],
+            "Topology index of a remeshed mesh was not rebuilt"
+        )
+
+    # ********************************************************************************************
+    def test_femmesh2mesh_surface(
+        self
+    ):
+        # two hexa8 volumes sharing the face with the nodes 5, 6, 7, 8
+        femmesh = Fem.FemMesh()
+        for i, z in enumerate((0, 1, 2)):
+            femmesh.addNode(0, 0, z, 4 * i + 1)
+            femmesh.addNode(1, 0, z, 4 * i + 2)
+            femmesh.addNode(1, 1, z, 4 * i + 3)
+            femmesh.addNode(0, 1, z, 4 * i + 4)
+        femmesh.addVolume([1, 2, 3, 4, 5, 6, 7, 8], 1)
+        femmesh.addVolume([5, 6, 7, 8, 9, 10, 11, 12], 2)
+
+        from femmesh import femmesh2mesh
+        surface = femmesh2mesh.get_femmesh_surface(femmesh)
+        self.assertIs(
+            surface,
+            femmesh2mesh.get_femmesh_surface(femmesh),
+            "Surface of an unchanged mesh was rebuilt"
+        )
+        # 10 quad faces on the surface, two triangles each
+        out_mesh = femmesh2mesh.femmesh_2_mesh(femmesh)
+        self.assertEqual(len(out_mesh), 60, "Unexpected number of surface triangle points")
+        # the shared face is not on the surface
+        inner_triangles = [
+            i for i in range(0, 60, 3) if all(p.z == 1.0 for p in out_mesh[i:i + 3])
+        ]
+        self.assertEqual(inner_triangles, [], "Inner face found on the surface")
+        self.assertEqual(max(p.z for p in out_mesh), 2.0, "Unexpected surface points")
+
+        # every access of obj.FemMesh returns a new FemMesh,
+        # the surface is found by the document object
+        mesh_obj = self.document.addObject("Fem::FemMeshObject", "Mesh")
+        mesh_obj.FemMesh = femmesh
+        surface = femmesh2mesh.get_femmesh_surface(mesh_obj.FemMesh, mesh_obj)
+        self.assertIs(
+            surface,
+            femmesh2mesh.get_femmesh_surface(mesh_obj.FemMesh, mesh_obj),
+            "Surface of an unchanged mesh object was rebuilt"
+        )
+
+        # the result displacements are added by node id
+        import ObjectsFem
+        result = ObjectsFem.makeResultMechanical(self.document)
+        result.NodeNumbers = [9, 10, 11, 12]
+        result.DisplacementVectors = [FreeCAD.Vector(0, 0, 0.5)] * 4
+        out_mesh = femmesh2mesh.femmesh_2_mesh(mesh_obj, result)
+        self.assertEqual(len(out_mesh), 60, "Unexpected number of surface triangle points")
+        self.assertEqual(max(p.z for p in out_mesh), 2.5, "Displacements not added")
+        self.assertEqual(min(p.z for p in out_mesh), 0.0, "Nodes without result displaced")
+
+        # a changed mesh of the document object gets a new surface
+        changed = mesh_obj.FemMesh
+        changed.addNode(0, 0, 3, 13)
+        mesh_obj.FemMesh = changed
+        self.assertIsNot(
+            surface,
+            femmesh2mesh.get_femmesh_surface(mesh_obj.FemMesh, mesh_obj),
+            "Surface of a changed mesh object was not rebuilt"
+        )
+
+    # ********************************************************************************************
+    def test_example_mesh_cache(
+        self
+    ):
+        from femexamples.meshes import meshcache
+        from femexamples.meshes.mesh_canticcx_tetra10 import create_elements
+        from femexamples.meshes.mesh_canticcx_tetra10 import create_nodes
+
+        expected = Fem.FemMesh()
+        create_nodes(expected)
+        create_elements(expected)
+
+        cache_dir = testtools.get_fem_test_tmp_dir("mesh_cache")
+        mesh_name = "mesh_canticcx_tetra10"
+        # first call writes the cache file, second call reads it
+        for i in range(2):
+            femmesh = meshcache.create_femmesh(mesh_name, cache_dir)
+            self.assertIsNotNone(
+                meshcache.read_mesh_cache(mesh_name, cache_dir),
+                "Mesh cache file was not written"
+            )
+            self.assertEqual(femmesh.Nodes, expected.Nodes, "Nodes of cached mesh are unexpected")
+            self.assertEqual(
+                [femmesh.getElementNodes(e) for e in femmesh.Volumes],
+                [expected.getElementNodes(e) for e in expected.Volumes],
+                "Volumes of cached mesh are unexpected"
+            )
+
+    # ********************************************************************************************
+    def test_read_inp_include(
+        self
+    ):
+        # nodes and elements in nested include files, an element on two lines
+        inp_dir = testtools.get_fem_test_tmp_dir("mesh_inp_include")
+        inp_files = {
+            "main.inp": "*INCLUDE,INPUT=nodes.inp\n*INCLUDE,INPUT=elements.inp\n*STEP\n",
+            "nodes.inp": "*NODE, NSET=Nall\n1, 0, 0, 0\n2, 1, 0, 0\n3, 0, 1, 0\n",
+            "elements.inp": (
+                "*INCLUDE,INPUT=nodes_2.inp\n"
+                "** tetra4\n"
+                "*ELEMENT, TYPE=C3D4, ELSET=Evolumes\n"
+                "1, 1, 2,\n"
+                "3, 4\n"
+            ),
+            "nodes_2.inp": "*NODE\n4, 0, 0, 1\n",
+        }
+        for file_name, content in inp_files.items():
+            with open(join(inp_dir, file_name), "w") as f:
+                f.write(content)
+
+        from feminout import importInpMesh
+        from feminout import importToolsFem
+        mesh_data = importInpMesh.read_inp_arrays(join(inp_dir, "main.inp"))
+        self.assertEqual(mesh_data["Nodes"][0].tolist(), [1, 2, 3, 4])
+        # CalculiX to FreeCAD node order
+        self.assertEqual(mesh_data["Tetra4Elem"][1].tolist(), [[2, 1, 3, 4]])
+
+        femmesh = importToolsFem.make_femmesh(mesh_data)
+        self.assertEqual(femmesh.NodeCount, 4, "Unexpected node count of read inp mesh")
+        self.assertEqual(femmesh.getElementNodes(1), (2, 1, 3, 4), "Unexpected element nodes")
+        self.assertEqual(
+            importInpMesh.read_inp(join(inp_dir, "main.inp"))["Tetra4Elem"],
+            {1: [2, 1, 3, 4]},
+            "Unexpected element data of read_inp"
+        )
+
     # ********************************************************************************************
     def test_unv_save_load(
         self
@@ -25,6 +25,7 @@ __title__ = "Results FEM unit tests"
 __author__ = "Bernd Hahnebach"
 __url__ = "http://www.freecadweb.org"
 
+import os
 import unittest
 from os.path import join
 
@@ -33,6 +34,9 @@ import FreeCAD
 from . import support_utils as testtools
 from .support_utils import fcc_print
 
+# the benchmarks are only run if this environment variable is set
+BENCHMARK = "FREECAD_BENCHMARKS"
+
 
 class TestResult(unittest.TestCase):
     fcc_print("import TestResult")
@@ -286,6 +290,199 @@ class TestResult(unittest.TestCase):
             "Values of read npressure result data are unexpected"
         )
 
+    # ********************************************************************************************
+    def test_read_frd_stream(
+        self
+    ):
+        # the streaming NumPy reader has to read the same data as read_frd_result
+        from feminout.importCcxFrdResults import read_frd_result as read_frd
+        from feminout.readCcxFrdResults import iter_frd_results
+        from feminout.readCcxFrdResults import read_frd_mesh
+        for frd_name in ("box_static", "thermomech_flow1D"):
+            frd_file = join(
+                testtools.get_fem_test_home_dir(),
+                "calculix",
+                "{}.frd".format(frd_name)
+            )
+            frd_content = read_frd(frd_file)
+            mesh = read_frd_mesh(frd_file)
+            self.assertEqual(
+                mesh["NodeIds"].tolist(),
+                list(frd_content["Nodes"].keys()),
+                "Node ids of streamed frd mesh are unexpected"
+            )
+            self.assertEqual(
+                [FreeCAD.Vector(*c) for c in mesh["NodeCoords"].tolist()],
+                list(frd_content["Nodes"].values()),
+                "Node coordinates of streamed frd mesh are unexpected"
+            )
+            for elem_key, (elem_ids, elem_nodes) in mesh["Elements"].items():
+                self.assertEqual(
+                    dict(zip(elem_ids.tolist(), map(tuple, elem_nodes.tolist()))),
+                    frd_content[elem_key],
+                    "Values of streamed {} data are unexpected".format(elem_key)
+                )
+
+            steps = list(iter_frd_results(frd_file))
+            self.assertEqual(
+                len(steps),
+                len(frd_content["Results"]),
+                "Number of streamed result steps is unexpected"
+            )
+            for step, result_set in zip(steps, frd_content["Results"]):
+                for key, values in result_set.items():
+                    if key in ("number", "time"):
+                        continue
+                    ids, arr = step[key]
+                    self.assertEqual(
+                        ids.tolist(),
+                        list(values.keys()),
+                        "Node ids of streamed {} results are unexpected".format(key)
+                    )
+                    for read_value, expected_value in zip(arr.tolist(), values.values()):
+                        if not isinstance(expected_value, (tuple, FreeCAD.Vector)):
+                            expected_value = (expected_value, )
+                        for a, b in zip(read_value, expected_value):
+                            self.assertAlmostEqual(a, b, places=6)
+
+        # only the last step and only mass flow
+        selected = list(iter_frd_results(frd_file, steps=[12], fields=["mflow"]))
+        self.assertEqual(len(selected), 1, "Step selection of streamed frd is unexpected")
+        self.assertEqual(selected[0]["index"], 12)
+        self.assertIn("mflow", selected[0])
+        self.assertNotIn("npressure", selected[0])
+
+    # ********************************************************************************************
+    def test_result_cache(
+        self
+    ):
+        # a result object with result cache has to give the same values as a filled one
+        import shutil
+        import numpy as np
+        import ObjectsFem
+        from femresult import resultcache
+        from femresult import resulttools
+        from feminout.importCcxFrdResults import read_frd_result
+        from feminout.importCcxFrdResults import read_frd_result_cache
+        from feminout.importToolsFem import fill_femresult_mechanical
+        frd_file = join(
+            testtools.get_fem_test_tmp_dir("result_cache"),
+            "box_static.frd"
+        )
+        shutil.copyfile(
+            join(testtools.get_fem_test_home_dir(), "calculix", "box_static.frd"),
+            frd_file
+        )
+
+        res_filled = ObjectsFem.makeResultMechanical(self.document, "ResultFilled")
+        fill_femresult_mechanical(res_filled, read_frd_result(frd_file)["Results"][0])
+        resulttools.add_disp_apps(res_filled)
+        resulttools.add_von_mises(res_filled)
+        resulttools.add_principal_stress_std(res_filled)
+        resulttools.fill_femresult_stats(res_filled)
+
+        m = read_frd_result_cache(frd_file)
+        self.assertEqual(len(m["Results"]), 1, "Number of cached result steps is unexpected")
+        res_cached = ObjectsFem.makeResultMechanical(self.document, "ResultCached")
+        resultcache.set_result_cache(res_cached, m["ResultCache"], m["ResultCacheIndex"], 0)
+        self.assertEqual(list(res_cached.NodeNumbers), list(res_filled.NodeNumbers))
+        for a, b in zip(res_cached.Stats, res_filled.Stats):
+            self.assertAlmostEqual(a, b, places=6)
+
+        # the values are loaded on first use
+        self.assertEqual(len(res_cached.vonMises), 0)
+        self.assertTrue(resultcache.has_property(res_cached, "vonMises"))
+        for prop in resultcache.CACHE_PROPERTIES:
+            if not getattr(res_filled, prop):
+                continue
+            for a, b in zip(
+                resultcache.get_array(res_cached, prop).ravel(),
+                np.asarray(getattr(res_filled, prop), dtype=float).ravel()
+            ):
+                self.assertAlmostEqual(a, b, places=6)
+            self.assertEqual(
+                len(resultcache.get_property(res_cached, prop)),
+                len(getattr(res_filled, prop)),
+                "Loaded result property {} is unexpected".format(prop)
+            )
+
+        # only the last used properties stay loaded
+        loaded = [
+            prop for prop in resultcache.CACHE_PROPERTIES
+            if len(getattr(res_cached, prop)) > 0
+        ]
+        self.assertEqual(len(loaded), resultcache.get_resident_limit())
+        resultcache.unload_properties(res_cached)
+        self.assertEqual(len(res_cached.DisplacementVectors), 0)
+
+        # the result tools read the unloaded properties from the cache
+        for a, b in zip(
+            resulttools.get_stress_array(res_cached).ravel(),
+            resulttools.get_stress_array(res_filled).ravel()
+        ):
+            self.assertAlmostEqual(a, b, places=6)
+        res_cached.DisplacementLengths = []
+        resulttools.add_disp_apps(res_cached)
+        for a, b in zip(res_cached.DisplacementLengths, res_filled.DisplacementLengths):
+            self.assertAlmostEqual(a, b, places=6)
+
+        # the cache is reused if the frd file is not changed
+        m2 = read_frd_result_cache(frd_file)
+        self.assertEqual(m2["ResultCacheIndex"], m["ResultCacheIndex"])
+
+        # cache unaware code gets all properties loaded and the cache unlinked
+        resultcache.load_all_properties(res_cached)
+        self.assertFalse(resultcache.is_cached(res_cached))
+        self.assertEqual(
+            len(res_cached.DisplacementVectors),
+            len(res_filled.DisplacementVectors),
+            "Loaded DisplacementVectors are unexpected"
+        )
+        self.assertEqual(len(res_cached.vonMises), len(res_filled.vonMises))
+
+    # ********************************************************************************************
+    def test_result_field_stats(
+        self
+    ):
+        import ObjectsFem
+        from femresult import resulttools
+        from feminout.importCcxFrdResults import read_frd_result
+        from feminout.importToolsFem import fill_femresult_mechanical
+        frd_file = join(testtools.get_fem_test_home_dir(), "calculix", "box_static.frd")
+        res_obj = ObjectsFem.makeResultMechanical(self.document, "Result")
+        fill_femresult_mechanical(res_obj, read_frd_result(frd_file)["Results"][0])
+        resulttools.add_disp_apps(res_obj)
+        resulttools.add_von_mises(res_obj)
+        resulttools.add_principal_stress_std(res_obj)
+        resulttools.fill_femresult_stats(res_obj)
+
+        u2 = resulttools.get_result_values(res_obj, "U2")
+        self.assertEqual(
+            u2.tolist(),
+            [v.y for v in res_obj.DisplacementVectors],
+            "Values of result type U2 are unexpected"
+        )
+        for result_type in ("U1", "U3", "Uabs", "Sabs", "MaxPrin", "MinPrin", "MaxShear"):
+            field_stats = resulttools.get_field_stats(res_obj, result_type)
+            minm, maxm = resulttools.get_stats(res_obj, result_type)
+            self.assertAlmostEqual(field_stats["min"], minm, places=6)
+            self.assertAlmostEqual(field_stats["max"], maxm, places=6)
+            self.assertEqual(
+                sum(field_stats["histogram"][0]),
+                len(res_obj.NodeNumbers),
+                "Histogram of result type {} is unexpected".format(result_type)
+            )
+            # switching result types reuses the stats
+            self.assertIs(resulttools.get_field_stats(res_obj, result_type), field_stats)
+        self.assertIsNone(resulttools.get_field_stats(res_obj, "Temp"))
+
+        # the stats are recalculated if the result values change
+        field_stats = resulttools.get_field_stats(res_obj, "Sabs")
+        res_obj.vonMises = [2.0 * v for v in res_obj.vonMises]
+        resulttools.fill_femresult_stats(res_obj)
+        new_field_stats = resulttools.get_field_stats(res_obj, "Sabs")
+        self.assertAlmostEqual(new_field_stats["max"], 2.0 * field_stats["max"], places=6)
+
     # ********************************************************************************************
     def get_stress_values(
         self
@@ -460,3 +657,159 @@ class TestResult(unittest.TestCase):
             expected_dispabs,
             "Calculated displacement abs are not the expected values."
         )
+
+    # ********************************************************************************************
+    def test_stress_batch(
+        self
+    ):
+        # the batch methods are compared with hand calculated values
+        # and with the former per stress tensor formulas
+        import numpy as np
+        from femresult import resulttools as rt
+
+        # uniaxial, hydrostatic, pure shear and a diagonal stress tensor
+        stresses = np.array((
+            (100.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+            (-50.0, -50.0, -50.0, 0.0, 0.0, 0.0),
+            (0.0, 0.0, 0.0, 10.0, 0.0, 0.0),
+            (3.0, -1.0, 2.0, 0.0, 0.0, 0.0),
+            self.get_stress_values()
+        ))
+        expected_mises = (100.0, 0.0, 10.0 * np.sqrt(3.0), np.sqrt(13.0), 283.2082)
+        expected_principal = (
+            (100.0, 0.0, 0.0, 50.0),
+            (-50.0, -50.0, -50.0, 0.0),
+            (10.0, 0.0, -10.0, 10.0),
+            (3.0, 2.0, -1.0, 2.0),
+            (-178.0076, -194.0749, -468.9075, 145.4499)
+        )
+        mises = rt.calculate_von_mises_array(stresses)
+        self.assertTrue(
+            np.allclose(mises, expected_mises, atol=1e-4),
+            "Batch von Mises stresses are not the expected values."
+        )
+        prin, shear = rt.calculate_principal_stress_std_array(stresses)
+        self.assertTrue(
+            np.allclose(np.column_stack((prin, shear)), expected_principal, atol=1e-4),
+            "Batch principal stresses are not the expected values."
+        )
+
+        # random stress tensors, the reference values are calculated
+        # by the former formulas for one stress tensor
+        stresses = np.random.RandomState(42).uniform(-500.0, 500.0, (200, 6))
+        expected_mises = []
+        expected_principal = []
+        for s in stresses:
+            normal = s[:3]
+            pressure = np.average(normal)
+            expected_mises.append(np.sqrt(
+                1.5 * np.linalg.norm(normal - pressure)**2 + 3.0 * np.linalg.norm(s[3:])**2
+            ))
+            sigma = np.array((
+                (s[0], s[3], s[4]),
+                (s[3], s[1], s[5]),
+                (s[4], s[5], s[2])
+            ))
+            eigvals = sorted(np.linalg.eigvalsh(sigma), reverse=True)
+            expected_principal.append(eigvals + [(eigvals[0] - eigvals[2]) / 2.0])
+        self.assertTrue(
+            np.allclose(rt.calculate_von_mises_array(stresses), expected_mises),
+            "Batch von Mises stresses are not the per tensor values."
+        )
+        prin, shear = rt.calculate_principal_stress_std_array(stresses)
+        self.assertTrue(
+            np.allclose(np.column_stack((prin, shear)), expected_principal),
+            "Batch principal stresses are not the per tensor values."
+        )
+
+        # NaN in a stress tensor of a CalculiX result gives NaN principal stresses
+        stresses[0, 2] = float("NaN")
+        prin, shear = rt.calculate_principal_stress_std_array(stresses)
+        self.assertTrue(
+            np.isnan(prin[0]).all() and np.isnan(shear[0]),
+            "Batch principal stresses of a NaN stress tensor are not NaN."
+        )
+        self.assertFalse(
+            np.isnan(prin[1:]).any(),
+            "Batch principal stresses of valid stress tensors are NaN."
+        )
+
+        # the hand calculated cases of test_rho in one batch
+        stresses = np.array((
+            (2.0, -2.0, 5.0, 6.0, -4.0, 2.0),
+            (-3.0, -7.0, 0.0, 6.0, -4.0, 2.0),
+            (-1.0, -7.0, 10.0, 0.0, 0.0, 5.0),
+            (3.0, 0.0, 10.0, 0.0, 5.0, 0.0),
+            (10.0, 7.0, -3.0, 3.0, 1.0, -2.0),
+            (1.0, 0.0, 3.0, 10.0, -8.0, 7.0),
+            (0.0, 0.0, 0.0, 10.0, 8.0, 7.0)
+        ))
+        expected_rho = (
+            (0.02400, 0.00400, 0.01400),
+            (0.00886, 0.00000, 0.00571),
+            (0.00000, 0.00000, 0.02714),
+            (0.01600, 0.00000, 0.03000),
+            (0.02533, 0.02133, 0.00000),
+            (0.02486, 0.01750, 0.01720),
+            (0.03600, 0.03400, 0.03000)
+        )
+        self.assertTrue(
+            np.allclose(rt.calculate_rho_array(stresses, 500), expected_rho, atol=1e-5),
+            "Batch rho are not the expected values."
+        )
+
+    # ********************************************************************************************
+    @unittest.skipUnless(os.environ.get(BENCHMARK), "set {} to time the stresses".format(BENCHMARK))
+    def test_stress_batch_timings(
+        self
+    ):
+        # times the batch methods and a loop over the stress tensors
+        # as the former add_* methods did, with the per stress tensor methods
+        import time
+        import numpy as np
+        from femresult import resulttools as rt
+
+        stresses = np.random.RandomState(42).uniform(-500.0, 500.0, (20000, 6))
+        prin, shear = rt.calculate_principal_stress_std_array(stresses)
+        cases = (
+            (
+                "von Mises",
+                lambda: rt.calculate_von_mises_array(stresses),
+                lambda: [rt.calculate_von_mises(s) for s in stresses]
+            ),
+            (
+                "principal stresses and max shear",
+                lambda: np.column_stack(rt.calculate_principal_stress_std_array(stresses)),
+                lambda: [rt.calculate_principal_stress_std(s) for s in stresses]
+            ),
+            (
+                "rho",
+                lambda: rt.calculate_rho_array(stresses, 500.0),
+                lambda: [rt.calculate_rho(s, 500.0) for s in stresses]
+            ),
+            (
+                "Mohr Coulomb",
+                lambda: rt.calculate_mohr_coulomb_array(prin[:, 0], prin[:, 2], 30.0, 20.0),
+                lambda: [
+                    rt.calculate_mohr_coulomb(p1, p3, 30.0, 20.0)
+                    for p1, p3 in zip(prin[:, 0], prin[:, 2])
+                ]
+            ),
+        )
+        for name, batch, loop in cases:
+            start = time.time()
+            batch_values = batch()
+            batch_time = time.time() - start
+            start = time.time()
+            loop_values = loop()
+            loop_time = time.time() - start
+            fcc_print("{}: {} stress tensors, batch {:.3f} s, loop {:.3f} s".format(
+                name,
+                len(stresses),
+                batch_time,
+                loop_time
+            ))
+            self.assertTrue(
+                np.allclose(batch_values, np.array(loop_values, dtype=float), equal_nan=True),
+                "Batch {} are not the per stress tensor values.".format(name)
+            )
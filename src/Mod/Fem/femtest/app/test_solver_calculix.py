@@ -242,6 +242,88 @@ class TestSolverCalculix(unittest.TestCase):
         setup(self.document, "calculix")
         self.input_file_writing_test(get_namefromdef("test_"))
 
+    # ********************************************************************************************
+    def test_box_static_jobqueue(
+        self
+    ):
+        fcc_print("")
+        from femexamples.boxanalysis_static import setup
+        from femsolver import jobqueue
+        setup(self.document, "calculix")
+        self.document.recompute()
+        working_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + "jobqueue")
+
+        # write the input files of a sweep over the force, do not run the solver
+        queue = jobqueue.JobQueue(
+            working_dir,
+            maxWorkers=2,
+            target=femsolver.run.PREPARE,
+            testmode=True
+        )
+        for force in (10000.0, 20000.0, 40000.0):
+            def setup_force(job, force=force):
+                self.document.FemConstraintForce.Force = force
+            queue.addJob(self.document.SolverCalculiX, "force_%d" % force, setup_force)
+        queue.start()
+        queue.join()
+
+        self.assertEqual(queue.progress, (3, 3))
+        directories = set()
+        inp_contents = set()
+        for job in queue.jobs:
+            self.assertEqual(job.state, jobqueue.FINISHED)
+            directories.add(job.directory)
+            with open(join(job.directory, self.infilename + self.ending)) as inp_file:
+                inp_contents.add(inp_file.read())
+        self.assertEqual(len(directories), 3)
+        self.assertEqual(len(inp_contents), 3)
+
+    # ********************************************************************************************
+    def test_box_static_jobqueue_solve(
+        self
+    ):
+        fcc_print("")
+        import os
+        import shutil
+        from femexamples.boxanalysis_static import setup
+        from femsolver import jobqueue
+        from femsolver import settings
+        setup(self.document, "calculix")
+        self.document.recompute()
+        working_dir = testtools.get_fem_test_tmp_dir(self.pre_dir_name + "jobqueue_solve")
+
+        # run the solver of two jobs with the same name, the results are collected
+        # from the job directories, without ccx binary the Solve task fails
+        queue = jobqueue.JobQueue(
+            working_dir,
+            maxWorkers=2,
+            cores=2,
+            target=femsolver.run.SOLVE,
+            testmode=True
+        )
+
+        def collect(job):
+            return [f for f in os.listdir(job.directory) if f.endswith(".frd")]
+        for i in range(2):
+            queue.addJob(self.document.SolverCalculiX, "box", collect=collect)
+        queue.start()
+        queue.join()
+
+        self.assertEqual(queue.progress, (2, 2))
+        self.assertNotEqual(queue.jobs[0].directory, queue.jobs[1].directory)
+        # get_binary returns None if there is no binary
+        binary = settings.get_binary("Calculix")
+        ccx_present = bool(binary) and shutil.which(binary) is not None
+        self.assertEqual(queue.failed, not ccx_present)
+        for job in queue.jobs:
+            self.assertEqual(job.machine.solve.environment["OMP_NUM_THREADS"], "1")
+            if ccx_present:
+                self.assertEqual(job.state, jobqueue.FINISHED)
+                self.assertEqual(job.results, [self.infilename + ".frd"])
+            else:
+                self.assertEqual(job.state, jobqueue.FAILED)
+                self.assertIsNone(job.results)
+
     # ********************************************************************************************
     def input_file_writing_test(
         self,
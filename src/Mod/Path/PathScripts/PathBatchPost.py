@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path Batch Post Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Post processing of the jobs of many documents without the GUI, on a pool of processes."
+__contributors__ = ""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from datetime import datetime
+
+import FreeCAD
+import Path
+import PathScripts.PathDropCutter as PathDropCutter
+import PathScripts.PathLog as PathLog
+import PathScripts.PathPreferences as PathPreferences
+import PathScripts.PathUtil as PathUtil
+
+from PathScripts.PathPostProcessor import PostProcessor
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+'''
+The ordering and splitting of a job's operations, tool changes and fixtures is
+shared with the Path_Post command, buildPostList(job) returns the lists which
+are posted into one file each when the job splits its output.
+
+Every job is posted with its own post processor and arguments, or the defaults
+of the preferences, into the file of its PostProcessorOutputFile. Documents are
+independent of each other and are posted by a pool of worker processes, each
+worker opens, posts and closes one document at a time:
+
+    results = postDocuments(['a.FCStd', 'b.FCStd'], processes=4)
+    print(report(results))
+
+The post processors keep their state in module globals, every post is done with
+a freshly loaded post processor and the workers don't share any of it. There is
+no parallel post on platforms without fork, the documents are posted in the
+FreeCAD process instead.
+
+From the command line:
+
+    FreeCADCmd -c "import PathScripts.PathBatchPost as B; B.main(['-j', '4', 'a.FCStd', 'b.FCStd'])"
+'''
+
+# output policies of a batch post, there is nobody to ask
+Overwrite = 'Overwrite'
+AppendUniqueID = 'Append Unique ID on conflict'
+
+# output file of jobs if neither the job nor the preferences have one
+DefaultOutputFile = '%D/%d-%j%s.nc'
+
+
+class FixtureObject(object):
+    '''The path selecting a fixture (work coordinate system) of a job in the list of posted objects.'''
+
+    def __init__(self, job, fixture, clearance=None):
+        self.Name = 'Fixture'
+        self.Label = 'Fixture'
+        self.InList = [job]
+        self.Path = Path.Path([Path.Command(fixture)])
+        if clearance is not None:
+            self.Path.addCommands(Path.Command('G0', {'Z': clearance}))
+
+
+def _clearanceHeight(job):
+    return job.Stock.Shape.BoundBox.ZMax + job.SetupSheet.ClearanceHeightOffset.Value
+
+
+def buildPostList(job):
+    '''buildPostList(job) ... returns the lists of fixtures, tool controllers and operations of the job
+    in the order of its OrderOutputBy. Each list is posted into its own file if the job splits its output.'''
+    wcslist = job.Fixtures if hasattr(job, 'Fixtures') else ['G54']
+    orderby = job.OrderOutputBy if hasattr(job, 'OrderOutputBy') else 'Operation'
+    postlist = []
+
+    if orderby == 'Fixture':
+        PathLog.debug("Ordering by Fixture")
+        # Order by fixture means all operations and tool changes will be completed in one
+        # fixture before moving to the next.
+        currTool = None
+        for index, f in enumerate(wcslist):
+            sublist = [FixtureObject(job, f, _clearanceHeight(job) if index != 0 else None)]
+            for obj in job.Operations.Group:
+                tc = PathUtil.toolControllerForOp(obj)
+                if tc is not None and PathUtil.opProperty(obj, 'Active'):
+                    if tc.ToolNumber != currTool:
+                        sublist.append(tc)
+                        PathLog.debug("Appending TC: {}".format(tc.Name))
+                        currTool = tc.ToolNumber
+                sublist.append(obj)
+            postlist.append(sublist)
+
+    elif orderby == 'Tool':
+        PathLog.debug("Ordering by Tool")
+        # Order by tool means tool changes are minimized.
+        # all operations with the current tool are processed in the current
+        # fixture before moving to the next fixture.
+        currTool = None
+        fixturelist = [FixtureObject(job, f, _clearanceHeight(job)) for f in wcslist]
+
+        curlist = []  # list of ops for tool, will repeat for each fixture
+        sublist = []  # list of ops for output splitting
+        for idx, obj in enumerate(job.Operations.Group):
+            active = PathUtil.opProperty(obj, 'Active')
+            tc = PathUtil.toolControllerForOp(obj)
+            if tc is None or tc.ToolNumber == currTool and active:
+                curlist.append(obj)
+            elif tc.ToolNumber != currTool and currTool is None and active:  # first TC
+                sublist.append(tc)
+                curlist.append(obj)
+                currTool = tc.ToolNumber
+            elif tc.ToolNumber != currTool and currTool is not None and active:  # TC
+                for fixture in fixturelist:
+                    sublist.append(fixture)
+                    sublist.extend(curlist)
+                postlist.append(sublist)
+                sublist = [tc]
+                curlist = [obj]
+                currTool = tc.ToolNumber
+
+            if idx == len(job.Operations.Group) - 1:  # Last operation.
+                for fixture in fixturelist:
+                    sublist.append(fixture)
+                    sublist.extend(curlist)
+                postlist.append(sublist)
+
+    elif orderby == 'Operation':
+        PathLog.debug("Ordering by Operation")
+        # Order by operation means ops are done in each fixture in sequence.
+        currTool = None
+        firstFixture = True
+        for obj in job.Operations.Group:
+            if PathUtil.opProperty(obj, 'Active'):
+                sublist = []
+                PathLog.debug("obj: {}".format(obj.Name))
+                for f in wcslist:
+                    sublist.append(FixtureObject(job, f, None if firstFixture else _clearanceHeight(job)))
+                    firstFixture = False
+                    tc = PathUtil.toolControllerForOp(obj)
+                    if tc is not None:
+                        if tc.ToolNumber != currTool:
+                            sublist.append(tc)
+                            currTool = tc.ToolNumber
+                    sublist.append(obj)
+                postlist.append(sublist)
+
+    return postlist
+
+
+def postProcessorName(job):
+    '''postProcessorName(job) ... returns the post processor of the job, or the default post processor
+    of the preferences. Returns None if neither exists.'''
+    post = PathPreferences.defaultPostProcessor()
+    if getattr(job, 'PostProcessor', None):
+        post = job.PostProcessor
+    if post and PostProcessor.exists(post):
+        return post
+    return None
+
+
+def postProcessorArgs(job):
+    '''postProcessorArgs(job) ... returns the post processor arguments of the job. The default arguments
+    of the preferences only apply to jobs without a post processor of their own.'''
+    if getattr(job, 'PostProcessorArgs', None):
+        return job.PostProcessorArgs
+    if getattr(job, 'PostProcessor', None):
+        return ''
+    return PathPreferences.defaultPostProcessorArgs()
+
+
+def expandFileName(job, filename, subpart=None):
+    '''expandFileName(job, filename, subpart=None) ... returns filename with the document directory (%D),
+    the document label (%d), the job label (%j), the macro directory (%M) and the subpart (%s) expanded.
+    Returns None if %D can't be expanded because the document hasn't been saved.'''
+    doc = job.Document
+    if '%D' in filename:
+        D = doc.FileName
+        if not D:
+            FreeCAD.Console.PrintError("Please save document in order to resolve output path!\n")
+            return None
+        # in case the document is in the current working directory
+        D = os.path.dirname(D) or '.'
+        filename = filename.replace('%D', D)
+
+    if '%d' in filename:
+        filename = filename.replace('%d', doc.Label)
+
+    if '%j' in filename:
+        filename = filename.replace('%j', job.Label)
+
+    if '%M' in filename:
+        pref = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Macro")
+        M = pref.GetString("MacroPath", FreeCAD.getUserAppDataDir())
+        filename = filename.replace('%M', M)
+
+    if '%s' in filename:
+        filename = filename.replace('%s', '_' + str(subpart) if subpart is not None else '')
+
+    return filename
+
+
+def uniqueFileName(filename):
+    '''uniqueFileName(filename) ... returns filename, or filename with the next free three digit ID
+    appended if the file exists.'''
+    if not os.path.isfile(filename):
+        return filename
+    fn, ext = os.path.splitext(filename)
+    nr = fn[-3:]
+    n = 1
+    if nr.isdigit():
+        n = int(nr)
+    while os.path.isfile("%s%03d%s" % (fn, n, ext)):
+        n = n + 1
+    return "%s%03d%s" % (fn, n, ext)
+
+
+def outputFileName(job, subpart=None, outputDir=None, policy=Overwrite):
+    '''outputFileName(job, subpart=None, outputDir=None, policy=Overwrite) ... returns the file the job
+    is posted into. A split output without %s in its file name gets the subpart appended to the name,
+    outputDir replaces the directory of the file. Returns None if the file name can't be resolved.'''
+    template = job.PostProcessorOutputFile or PathPreferences.defaultOutputFile()
+    if not template:
+        template = DefaultOutputFile
+    if subpart is not None and '%s' not in template:
+        fn, ext = os.path.splitext(template)
+        template = fn + '%s' + ext
+    filename = expandFileName(job, template, subpart)
+    if filename is None:
+        return None
+    if outputDir:
+        filename = os.path.join(outputDir, os.path.basename(filename))
+    if os.path.isdir(filename) or not os.path.isdir(os.path.dirname(filename) or '.'):
+        FreeCAD.Console.PrintError("Can't post job {} into {}\n".format(job.Label, filename))
+        return None
+    if policy == AppendUniqueID:
+        filename = uniqueFileName(filename)
+    return filename
+
+
+def defaultPolicy():
+    '''defaultPolicy() ... returns the batch output policy for the output policy of the preferences.'''
+    if PathPreferences.defaultOutputPolicy() == AppendUniqueID:
+        return AppendUniqueID
+    return Overwrite
+
+
+class PostResult(object):
+    '''The outcome of posting one job: the files written, the time it took and the error if it failed.'''
+
+    def __init__(self, document, job, post=None):
+        self.document = document
+        self.job = job
+        self.post = post
+        self.files = []
+        self.seconds = 0.0
+        self.error = None
+
+    def succeeded(self):
+        return self.error is None
+
+    def __repr__(self):
+        return "PostResult({}, {}, {}, {:.2f}s{})".format(self.document, self.job, self.files, self.seconds,
+                                                          ", {}".format(self.error) if self.error else '')
+
+
+def postJob(job, outputDir=None, policy=Overwrite):
+    '''postJob(job, outputDir=None, policy=Overwrite) ... posts the job with its post processor and arguments
+    into its output file, or one file per fixture, tool or operation if it splits its output.
+    The post fails if the post processor raises an exception or doesn't write the file.
+    Returns a PostResult.'''
+    start = time.time()
+    result = PostResult(job.Document.FileName or job.Document.Name, job.Label)
+    try:
+        result.post = postProcessorName(job)
+        if result.post is None:
+            result.error = "no post processor"
+            return result
+        args = postProcessorArgs(job)
+        postlist = buildPostList(job)
+        if getattr(job, 'SplitOutput', False):
+            parts = [(slist, subpart) for subpart, slist in enumerate(postlist, 1)]
+        else:
+            parts = [([item for slist in postlist for item in slist], None)]
+
+        for objs, subpart in parts:
+            filename = outputFileName(job, subpart, outputDir, policy)
+            if filename is None:
+                result.error = "unresolved output file"
+                return result
+            PathLog.debug("post: %s(%s, %s)" % (result.post, filename, args))
+            # many post processors return None after writing the file, only the file itself tells
+            # if the post succeeded, an old one is removed so it isn't taken for the new output
+            if os.path.isfile(filename):
+                os.remove(filename)
+            # a fresh module for every post, the post processors keep their settings in globals
+            PostProcessor.load(result.post).export(objs, filename, args)
+            if not os.path.isfile(filename):
+                result.error = "post processor didn't write {}".format(filename)
+                return result
+            result.files.append(filename)
+
+        if hasattr(job, 'LastPostProcessDate'):
+            job.LastPostProcessDate = str(datetime.now())
+        if hasattr(job, 'LastPostProcessOutput'):
+            job.LastPostProcessOutput = result.files[-1] if result.files else ''
+    except Exception as e:  # pylint: disable=broad-except
+        result.error = "{}: {}".format(type(e).__name__, e)
+    finally:
+        result.seconds = time.time() - start
+    return result
+
+
+def jobsOf(doc, labels=None):
+    '''jobsOf(doc, labels=None) ... returns the jobs of the document, only those with the given labels
+    or names if labels is not empty.'''
+    import PathScripts.PathJob as PathJob
+    jobs = [o for o in doc.Objects if hasattr(o, 'Proxy') and isinstance(o.Proxy, PathJob.ObjectJob)]
+    if labels:
+        jobs = [j for j in jobs if j.Label in labels or j.Name in labels]
+    return jobs
+
+
+def postDocument(filename, labels=None, outputDir=None, policy=Overwrite, recompute=False, save=False):
+    '''postDocument(filename, labels=None, outputDir=None, policy=Overwrite, recompute=False, save=False) ...
+    opens the document, posts its jobs and closes it again. Returns the list of PostResult.'''
+    start = time.time()
+    try:
+        doc = FreeCAD.openDocument(filename)
+    except Exception as e:  # pylint: disable=broad-except
+        result = PostResult(filename, None)
+        result.error = "{}: {}".format(type(e).__name__, e)
+        result.seconds = time.time() - start
+        return [result]
+    try:
+        if recompute:
+            doc.recompute()
+        results = [postJob(job, outputDir, policy) for job in jobsOf(doc, labels)]
+        if save and any(r.succeeded() for r in results):
+            doc.save()
+    finally:
+        FreeCAD.closeDocument(doc.Name)
+    return results
+
+
+def _fileSize(filename):
+    return os.path.getsize(filename) if os.path.isfile(filename) else 0
+
+
+def _postDocumentTask(task):
+    return postDocument(*task)
+
+
+def postDocuments(filenames, processes=0, labels=None, outputDir=None, policy=None, recompute=False, save=False):
+    '''postDocuments(filenames, processes=0, labels=None, outputDir=None, policy=None, recompute=False, save=False)
+    ... posts the jobs of all documents on a pool of processes, 0 processes is the number of cores.
+    Returns the list of PostResult in the order of the documents.'''
+    if policy is None:
+        policy = defaultPolicy()
+    if processes < 1:
+        processes = multiprocessing.cpu_count()
+    tasks = [(os.path.abspath(f), labels, outputDir, policy, recompute, save) for f in filenames]
+    processes = min(processes, len(tasks))
+
+    context = PathDropCutter.poolContext() if processes > 1 else None
+    if context is None:
+        results = [_postDocumentTask(task) for task in tasks]
+    else:
+        # the biggest documents first, so a late big one doesn't keep a single worker busy at the end
+        order = sorted(range(len(tasks)), key=lambda i: -_fileSize(tasks[i][0]))
+        pool = context.Pool(processes, maxtasksperchild=1)
+        try:
+            done = pool.map(_postDocumentTask, [tasks[i] for i in order], 1)
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        results = [None] * len(tasks)
+        for i, result in zip(order, done):
+            results[i] = result
+    return [r for result in results for r in result]
+
+
+def report(results, seconds=None):
+    '''report(results, seconds=None) ... returns a table of the post time and the files of every job,
+    and the total time of all jobs. seconds is the elapsed time of the whole batch.'''
+    rows = [('Document', 'Job', 'Post', 'Time', 'Files')]
+    for r in results:
+        rows.append((os.path.basename(r.document), r.job or '', r.post or '', "{:.2f}s".format(r.seconds),
+                     'FAILED: ' + r.error if r.error else ', '.join(r.files)))
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    lines = ['  '.join(c.ljust(w) for c, w in zip(row[:4], widths)) + '  ' + row[4] for row in rows]
+
+    total = sum(r.seconds for r in results)
+    failed = len([r for r in results if r.error])
+    summary = "{} jobs posted, {} failed, {:.2f}s post time".format(len(results) - failed, failed, total)
+    if seconds:
+        summary += " in {:.2f}s elapsed".format(seconds)
+    lines.append(summary)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    '''main(argv=None) ... posts the jobs of the documents given on the command line and prints the report.
+    Returns 0 if all jobs were posted, 1 otherwise.'''
+    parser = argparse.ArgumentParser(prog='PathBatchPost', description='Post process the jobs of FreeCAD documents.')
+    parser.add_argument('documents', nargs='+', help='the documents to post')
+    parser.add_argument('-j', '--processes', type=int, default=0,
+                        help='number of worker processes, 0 is the number of cores (default)')
+    parser.add_argument('--job', action='append', dest='labels', metavar='LABEL',
+                        help='only post the jobs with this label or name, can be given more than once')
+    parser.add_argument('-o', '--output-dir', help='write all files into this directory')
+    parser.add_argument('--unique', action='store_true',
+                        help='append a unique ID to the file names instead of overwriting existing files')
+    parser.add_argument('--recompute', action='store_true', help='recompute the documents before posting')
+    parser.add_argument('--save', action='store_true', help='save the post date and output in the documents')
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    results = postDocuments(args.documents, args.processes, args.labels, args.output_dir,
+                            AppendUniqueID if args.unique else defaultPolicy(), args.recompute, args.save)
+    print(report(results, time.time() - start))
+    return 0 if results and all(r.succeeded() for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
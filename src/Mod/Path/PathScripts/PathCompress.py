@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path Compress Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Douglas-Peucker simplification and arc fitting of dense polylines of feed moves."
+__contributors__ = ""
+
+import math
+import numpy
+
+import Path
+import PathScripts.PathLog as PathLog
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+'''
+The 3D operations produce polylines of thousands of G1 moves, most of them on
+straight lines or on arcs in the XY plane. A polyline, an (n, 3) array of its
+points, is compressed in two stages, each allowed to deviate by half of the
+tolerance:
+
+  1. simplify() removes the points of straight stretches (Ramer-Douglas-Peucker)
+  2. fitArcs() replaces runs of the remaining points by G2/G3 arcs
+
+Every point of the original polyline is within the tolerance of the result.
+An arc is only fit if it is within the tolerance of all chords it replaces,
+its Z may change linearly with the angle (helix).
+
+    for move in compress(points, tolerance):
+        ...  # (x, y, z) of a line or (x, y, z, cx, cy, ccw) of an arc
+
+The commands of an operation are compressed by compressCommands(), runs of G1
+moves with the same feed are compressed, all other commands are kept as they are.
+'''
+
+# the minimum number of points replaced by an arc
+ArcMinPoints = 4
+
+LINEAR = ['G1', 'G01']
+CYCLES = ['G73', 'G81', 'G82', 'G83', 'G84', 'G85', 'G86', 'G87', 'G88', 'G89']
+AXES = ['X', 'Y', 'Z']
+
+
+def pointArray(points):
+    '''pointArray(points) ... returns the (n, 3) array of the points, objects with x, y and z or arrays.'''
+    if isinstance(points, numpy.ndarray):
+        return points.reshape(-1, 3).astype(float)
+    return numpy.array([(p.x, p.y, p.z) for p in points], dtype=float).reshape(-1, 3)
+
+
+def segmentDistances(P, a, b):
+    '''segmentDistances(P, a, b) ... the distances of the points P to the line segment from a to b.'''
+    ab = b - a
+    ap = P - a
+    length2 = ab.dot(ab)
+    if length2 == 0.0:
+        return numpy.sqrt(numpy.einsum('ij,ij->i', ap, ap))
+    t = numpy.clip(ap.dot(ab) / length2, 0.0, 1.0)
+    d = ap - t[:, numpy.newaxis] * ab
+    return numpy.sqrt(numpy.einsum('ij,ij->i', d, d))
+
+
+def simplify(points, tolerance):
+    '''simplify(points, tolerance) ... returns the indices of the points kept by the Ramer-Douglas-Peucker
+    simplification of the polyline. No point is further than tolerance from the simplified polyline.'''
+    P = pointArray(points)
+    count = len(P)
+    keep = numpy.zeros(count, dtype=bool)
+    if count:
+        keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = segmentDistances(P[start + 1:end], P[start], P[end])
+        i = int(numpy.argmax(distances))
+        if distances[i] > tolerance:
+            i += start + 1
+            keep[i] = True
+            stack.append((i, end))
+            stack.append((start, i))
+    return numpy.nonzero(keep)[0]
+
+
+def _circle(a, b, c):
+    '''_circle(a, b, c) ... center x, y of the circle through the points in the XY plane, None if they are collinear.'''
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    d = 2.0 * (bx * cy - by * cx)
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    if abs(d) <= 1e-12 * (b2 + c2):
+        return None
+    return (a[0] + (cy * b2 - by * c2) / d, a[1] + (bx * c2 - cx * b2) / d)
+
+
+def arcError(P, cx, cy, ccw):
+    '''arcError(P, cx, cy, ccw) ... returns the maximum distance of the polyline P to the arc around (cx, cy)
+    from its first to its last point, None if the points don't progress along the arc.
+    The Z of the arc changes linearly with the angle.'''
+    dx = P[:, 0] - cx
+    dy = P[:, 1] - cy
+    theta = numpy.arctan2(dy, dx)
+    steps = numpy.diff(theta)
+    steps = (steps + math.pi) % (2 * math.pi) - math.pi
+    if not ccw:
+        steps = -steps
+    if numpy.any(steps < 0.0):
+        return None
+    phi = numpy.concatenate(([0.0], numpy.cumsum(steps)))
+    sweep = phi[-1]
+    if sweep <= 0.0 or sweep >= 2 * math.pi:
+        return None
+
+    radii = numpy.hypot(dx, dy)
+    r = radii[0]
+    # the chords between the points deviate by their sagitta from the arc
+    chords = numpy.hypot(numpy.diff(P[:, 0]), numpy.diff(P[:, 1]))
+    sagitta = r - numpy.sqrt(numpy.maximum(r * r - chords * chords / 4.0, 0.0))
+    xy = numpy.max(numpy.abs(radii - r)) + numpy.max(sagitta)
+    z = numpy.max(numpy.abs(P[:, 2] - (P[0, 2] + (P[-1, 2] - P[0, 2]) * phi / sweep)))
+    return math.hypot(xy, z)
+
+
+def _fitArc(P, start, end, tolerance):
+    '''_fitArc(P, start, end, tolerance) ... returns (cx, cy, ccw) of the arc through the points start to end
+    within tolerance, None if there is none.'''
+    a, c = P[start], P[end]
+    b = P[(start + end) // 2]
+    center = _circle(a, b, c)
+    if center is None:
+        return None
+    ccw = (b[0] - a[0]) * (c[1] - b[1]) - (b[1] - a[1]) * (c[0] - b[0]) > 0
+    error = arcError(P[start:end + 1], center[0], center[1], ccw)
+    if error is None or error > tolerance:
+        return None
+    return (center[0], center[1], ccw)
+
+
+def fitArcs(points, tolerance, minPoints=None):
+    '''fitArcs(points, tolerance, minPoints=None) ... returns the arcs of the polyline as list of
+    (start, end, cx, cy, ccw), start and end are the indices of the first and last point of the arc.
+    The arcs are fit greedily, each is extended as far as it stays within tolerance of the polyline.
+    An arc spans at least minPoints points, ArcMinPoints by default.'''
+    P = pointArray(points)
+    count = len(P)
+    span = (minPoints or ArcMinPoints) - 1
+    arcs = []
+    start = 0
+    while start + span < count:
+        end = start + span
+        arc = _fitArc(P, start, end, tolerance)
+        if arc is None:
+            start += 1
+            continue
+        # gallop to the first failing end, then bisect between the last fitting and the failing one
+        step = span
+        fail = count
+        while end < count - 1:
+            test = min(end + step, count - 1)
+            fit = _fitArc(P, start, test, tolerance)
+            if fit is None:
+                fail = test
+                break
+            end, arc = test, fit
+            step *= 2
+        while fail - end > 1:
+            test = (end + fail) // 2
+            fit = _fitArc(P, start, test, tolerance)
+            if fit is None:
+                fail = test
+            else:
+                end, arc = test, fit
+        arcs.append((start, end) + arc)
+        start = end
+    return arcs
+
+
+def compress(points, tolerance, arcs=True):
+    '''compress(points, tolerance, arcs=True) ... returns the moves of the compressed polyline starting at its
+    first point, (x, y, z) for a line and (x, y, z, cx, cy, ccw) for an arc.
+    The result is within tolerance of all points, arcs are only fit if arcs is True.'''
+    P = pointArray(points)
+    if len(P) < 2:
+        return []
+    lines = [tuple(p) for p in P[simplify(P, tolerance)[1:]].tolist()]
+    if not arcs:
+        return lines
+
+    # the arcs take half of the tolerance, not worth it if there are none
+    P = P[simplify(P, tolerance / 2.0)]
+    moves = []
+    last = 0
+    for start, end, cx, cy, ccw in fitArcs(P, tolerance / 2.0):
+        moves.extend(tuple(p) for p in P[last + 1:start + 1].tolist())
+        moves.append(tuple(P[end].tolist()) + (float(cx), float(cy), bool(ccw)))
+        last = end
+    moves.extend(tuple(p) for p in P[last + 1:].tolist())
+    if len(moves) < len(lines):
+        return moves
+    return lines
+
+
+def moveCommands(points, tolerance, feed=None, arcs=True):
+    '''moveCommands(points, tolerance, feed=None, arcs=True) ... returns the G1, G2 and G3 commands of the
+    compressed polyline, starting at its first point. See compress().'''
+    P = pointArray(points)
+    commands = []
+    x, y = (P[0][0], P[0][1]) if len(P) else (0.0, 0.0)
+    for move in compress(P, tolerance, arcs):
+        params = {'X': move[0], 'Y': move[1], 'Z': move[2]}
+        if len(move) == 3:
+            name = 'G1'
+        else:
+            name = 'G3' if move[5] else 'G2'
+            params.update({'I': move[3] - x, 'J': move[4] - y})
+        if feed is not None:
+            params['F'] = feed
+        commands.append(Path.Command(name, params))
+        x, y = move[0], move[1]
+    return commands
+
+
+def compressCommands(commands, tolerance, arcs=True):
+    '''compressCommands(commands, tolerance, arcs=True) ... returns the commands with all runs of G1 moves
+    of the same feed replaced by their compressed moves, see compress().
+    A run starts at the end point of the preceding command, all other commands are kept.'''
+    result = []
+    position = [None, None, None]
+    run = []
+    points = []
+    # F is modal, it is set by any command with an F, not only by the runs
+    feed = None
+    runFeed = [None]
+
+    def flush():
+        if len(run) > 1:
+            result.extend(moveCommands(numpy.array(points, dtype=float), tolerance, runFeed[0], arcs))
+        else:
+            result.extend(run)
+        del run[:]
+        del points[:]
+
+    for cmd in commands:
+        params = cmd.Parameters
+        f = params.get('F', feed)
+        if cmd.Name in LINEAR and all(p in ('X', 'Y', 'Z', 'F') for p in params) and None not in position:
+            if run and f != runFeed[0]:
+                flush()
+            if not run:
+                points.append(list(position))
+                runFeed[0] = f
+            feed = f
+            position = [params.get(a, position[i]) for i, a in enumerate(AXES)]
+            run.append(cmd)
+            points.append(list(position))
+            continue
+
+        flush()
+        result.append(cmd)
+        feed = f
+        position = [params.get(a, position[i]) for i, a in enumerate(AXES)]
+        if cmd.Name in CYCLES:
+            # the Z after a cycle depends on the retract mode
+            position[2] = None
+    flush()
+    return result
+
+
+def compressPath(path, tolerance, arcs=True):
+    '''compressPath(path, tolerance, arcs=True) ... returns a new path of the compressed commands of path.'''
+    return Path.Path(compressCommands(path.Commands, tolerance, arcs))
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path Cycle Time Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Estimate of the cycle time, the travel and the plunges of paths, operations and jobs."
+__contributors__ = ""
+
+import collections
+import hashlib
+import math
+import numpy
+
+import PathScripts.PathLog as PathLog
+import PathScripts.PathUtil as PathUtil
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+'''
+The commands of a path are read into a table of their parameters in a single
+walk, distances, speeds and times of all moves are computed on the arrays of
+the table:
+
+    estimate = estimatePath(op.Path, hFeed, vFeed, hRapid, vRapid, limits)
+    print(estimate.time, estimate.cuttingDistance, estimate.plunges)
+
+Feed moves use their F parameter, moves without it and rapid moves the feed
+and rapid rates of the tool controller, limited per axis: the horizontal rate
+for the XY part, the vertical rate for the Z part of the move.
+The speed at the junction of two moves is limited by the angle between them
+(junction deviation) and the acceleration of the machine, every move
+accelerates from and decelerates to the junction speeds. Canned drill cycles
+and dwells stop the machine.
+
+The estimates of the operations are cached by a hash of the G-code of their path, the
+estimate of a job only estimates the operations whose paths changed.
+'''
+
+RAPID = 0
+FEED = 1
+ARC_CW = 2
+ARC_CCW = 3
+CYCLE = 4
+DWELL = 5
+
+KINDS = {'G0': RAPID, 'G00': RAPID, 'G1': FEED, 'G01': FEED,
+         'G2': ARC_CW, 'G02': ARC_CW, 'G3': ARC_CCW, 'G03': ARC_CCW,
+         'G4': DWELL, 'G04': DWELL,
+         'G73': CYCLE, 'G81': CYCLE, 'G82': CYCLE, 'G83': CYCLE, 'G84': CYCLE,
+         'G85': CYCLE, 'G86': CYCLE, 'G87': CYCLE, 'G88': CYCLE, 'G89': CYCLE}
+
+# columns of the command table
+X, Y, Z, I, J, F, R, P, RETRACT_R = range(9)
+
+# op name -> (signature, estimate)
+_cache = {}
+
+
+class MachineLimits(object):
+    '''MachineLimits(acceleration=0.0, junctionDeviation=0.01) ... limits of the machine,
+    the acceleration in mm/s^2, 0 for no limit, and the junction deviation in mm.'''
+
+    def __init__(self, acceleration=0.0, junctionDeviation=0.01):
+        self.acceleration = acceleration
+        self.junctionDeviation = junctionDeviation
+
+    def key(self):
+        return (self.acceleration, self.junctionDeviation)
+
+
+class Estimate(object):
+    '''Estimate(...) ... the cutting and rapid distances in mm, their times and the dwell time in seconds,
+    and the number of plunges of a path.'''
+
+    def __init__(self, cuttingDistance=0.0, rapidDistance=0.0, cuttingTime=0.0, rapidTime=0.0, dwellTime=0.0,
+                 plunges=0):
+        self.cuttingDistance = cuttingDistance
+        self.rapidDistance = rapidDistance
+        self.cuttingTime = cuttingTime
+        self.rapidTime = rapidTime
+        self.dwellTime = dwellTime
+        self.plunges = plunges
+
+    @property
+    def time(self):
+        return self.cuttingTime + self.rapidTime + self.dwellTime
+
+    def __add__(self, other):
+        return Estimate(self.cuttingDistance + other.cuttingDistance,
+                        self.rapidDistance + other.rapidDistance,
+                        self.cuttingTime + other.cuttingTime,
+                        self.rapidTime + other.rapidTime,
+                        self.dwellTime + other.dwellTime,
+                        self.plunges + other.plunges)
+
+    def __repr__(self):
+        return "Estimate(cut={:.2f}mm/{:.1f}s, rapid={:.2f}mm/{:.1f}s, dwell={:.1f}s, plunges={})".format(
+            self.cuttingDistance, self.cuttingTime, self.rapidDistance, self.rapidTime, self.dwellTime,
+            self.plunges)
+
+
+def formatTime(seconds):
+    '''formatTime(seconds) ... returns the time as HH:MM:SS, the hours aren't limited to a day.'''
+    seconds = int(round(seconds))
+    return "{:02d}:{:02d}:{:02d}".format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+
+def commandTable(commands):
+    '''commandTable(commands) ... returns the kinds of the moves, cycles and dwells of the commands and
+    the table of their X, Y, Z, I, J, F, R and P parameters, NaN if not set, and if they retract to R.
+    All other commands are skipped.'''
+    nan = float('nan')
+    kindOf = KINDS.get
+    kinds = []
+    rows = []
+    retractR = 0.0
+    for cmd in commands:
+        name = cmd.Name
+        kind = kindOf(name)
+        if kind is None:
+            if name == 'G98' or name == 'G99':
+                retractR = 1.0 if name == 'G99' else 0.0
+            continue
+        get = cmd.Parameters.get
+        kinds.append(kind)
+        rows.append((get('X', nan), get('Y', nan), get('Z', nan), get('I', 0.0), get('J', 0.0),
+                     get('F', nan), get('R', nan), get('P', 0.0), retractR))
+    return (numpy.array(kinds, dtype=numpy.int8), numpy.array(rows, dtype=float).reshape(-1, 9))
+
+
+def _fill(values):
+    '''_fill(values) ... forward fills the NaN values of every column with the last value set.'''
+    rows = numpy.arange(len(values)).reshape((-1, 1)) if values.ndim > 1 else numpy.arange(len(values))
+    idx = numpy.where(numpy.isnan(values), 0, rows)
+    numpy.maximum.accumulate(idx, axis=0, out=idx)
+    if values.ndim > 1:
+        return values[idx, numpy.arange(values.shape[1])]
+    return values[idx]
+
+
+def _axisSpeed(dxy, dz, hSpeed, vSpeed):
+    '''_axisSpeed(dxy, dz, hSpeed, vSpeed) ... the speed of moves limited to hSpeed in XY and vSpeed in Z.'''
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        t = numpy.maximum(dxy / hSpeed if hSpeed > 0 else dxy * numpy.inf,
+                          numpy.abs(dz) / vSpeed if vSpeed > 0 else numpy.abs(dz) * numpy.inf)
+        return numpy.where(t > 0, numpy.hypot(dxy, dz) / t, max(hSpeed, vSpeed))
+
+
+def moveTimes(lengths, speeds, entry, exit, acceleration):
+    '''moveTimes(lengths, speeds, entry, exit, acceleration) ... the times of moves accelerating from the entry
+    speed to their speed and decelerating to the exit speed. The entry and exit speeds must be reachable.'''
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        if acceleration <= 0:
+            return numpy.where(speeds > 0, lengths / speeds, 0.0)
+        a = float(acceleration)
+        v = speeds
+        accel = (v * v - entry * entry) / (2 * a)
+        decel = (v * v - exit * exit) / (2 * a)
+        cruise = lengths - accel - decel
+        full = (v - entry) / a + (v - exit) / a + cruise / v
+        peak = numpy.sqrt((2 * a * lengths + entry * entry + exit * exit) / 2)
+        short = (peak - entry) / a + (peak - exit) / a
+        return numpy.where(speeds > 0, numpy.where(cruise >= 0, full, short), 0.0)
+
+
+def reachable(limits, gains):
+    '''reachable(limits, gains) ... returns the highest squared speeds at the junctions of moves not exceeding the
+    limits, such that the squared speeds change by at most the gain of the move between two junctions.
+    The gains are 2 * acceleration * length of the moves, there is one junction more than moves.'''
+    # forward: v[i] = min(limit[i], v[i-1] + gain[i-1]) is min over k <= i of limit[k] + gain[k:i].sum()
+    sums = numpy.concatenate(([0.0], numpy.cumsum(gains)))
+    v = numpy.minimum.accumulate(limits - sums) + sums
+    # backward: v[i] = min(v[i], v[i+1] + gain[i])
+    rsums = sums[-1] - sums
+    return (numpy.minimum.accumulate((v - rsums)[::-1]) + rsums[::-1])[::-1]
+
+
+def _tangents(kinds, start, end, center, radius, xyLength, length):
+    '''_tangents(...) ... the unit directions at the start and the end of the moves.'''
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        d = (end - start) / length[:, numpy.newaxis]
+        arcs = (kinds == ARC_CW) | (kinds == ARC_CCW)
+        sign = numpy.where(kinds == ARC_CCW, 1.0, -1.0) * xyLength / length / radius
+        dz = d[:, 2]
+        ts = numpy.column_stack((-(start[:, 1] - center[:, 1]) * sign, (start[:, 0] - center[:, 0]) * sign, dz))
+        te = numpy.column_stack((-(end[:, 1] - center[:, 1]) * sign, (end[:, 0] - center[:, 0]) * sign, dz))
+    arcs = arcs[:, numpy.newaxis]
+    return (numpy.where(arcs, ts, d), numpy.where(arcs, te, d))
+
+
+def tableGeometry(kinds, table):
+    '''tableGeometry(kinds, table) ... returns the start and end points of the rows of the command table, the
+    centers, radii and sweeps of the arcs, and the XY and total lengths of the moves, see commandTable().
+    Arcs are in the XY plane, an arc ending where it starts is a full circle.'''
+    cycle = kinds == CYCLE
+    points = table[:, X:Z + 1].copy()
+    points[kinds == DWELL] = numpy.nan
+    # a cycle ends at R or, without retract to R, at the height it started at
+    points[cycle, 2] = numpy.where(table[cycle, RETRACT_R] > 0, table[cycle, R], numpy.nan)
+    end = _fill(points)
+    start = numpy.vstack((end[:1], end[:-1]))
+    start = numpy.where(numpy.isnan(start), end, start)
+    delta = numpy.nan_to_num(end - start)
+    dxy = numpy.hypot(delta[:, 0], delta[:, 1])
+
+    arcs = (kinds == ARC_CW) | (kinds == ARC_CCW)
+    center = start[:, :2] + table[:, I:J + 1]
+    radius = numpy.hypot(table[:, I], table[:, J])
+    a0 = numpy.arctan2(start[:, 1] - center[:, 1], start[:, 0] - center[:, 0])
+    a1 = numpy.arctan2(end[:, 1] - center[:, 1], end[:, 0] - center[:, 0])
+    sweep = numpy.where(kinds == ARC_CCW, a1 - a0, a0 - a1) % (2 * math.pi)
+    sweep = numpy.where(numpy.isclose(sweep, 0.0) & (dxy < 1e-9), 2 * math.pi, sweep)
+    sweep = numpy.where(arcs, sweep, 0.0)
+    xyLength = numpy.where(arcs, numpy.nan_to_num(radius * sweep), dxy)
+    length = numpy.hypot(xyLength, delta[:, 2])
+    return (start, end, center, radius, sweep, xyLength, length)
+
+
+def _feeds(kinds, table):
+    '''_feeds(kinds, table) ... the modal F of the rows, NaN before the first F, rapid moves don't change it.'''
+    feeds = table[:, F].copy()
+    feeds[(kinds == RAPID) | (feeds <= 0)] = numpy.nan
+    return _fill(feeds)
+
+
+def tableTimes(kinds, table, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None, geometry=None):
+    '''tableTimes(kinds, table, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None, geometry=None) ... returns the times
+    of the moves of the command table, 0 for cycles and dwells. Rapid moves use the feed rates if the rapid rates
+    are 0, geometry is the result of tableGeometry() if it's already known.'''
+    limits = limits or MachineLimits()
+    if hRapid <= 0:
+        hRapid = hFeed
+    if vRapid <= 0:
+        vRapid = vFeed
+    start, end, center, radius, sweep, xyLength, length = geometry or tableGeometry(kinds, table)
+    dz = numpy.nan_to_num(end[:, 2] - start[:, 2])
+
+    rapid = kinds == RAPID
+    arcs = (kinds == ARC_CW) | (kinds == ARC_CCW)
+    feeds = _feeds(kinds, table)
+    speed = numpy.where(rapid, _axisSpeed(xyLength, dz, hRapid, vRapid),
+                        numpy.where(numpy.isnan(feeds), _axisSpeed(xyLength, dz, hFeed, vFeed), feeds))
+
+    # junction speeds between consecutive moves, cycles and dwells stop the machine
+    moves = numpy.nonzero((rapid | (kinds == FEED) | arcs) & (length > 0))[0]
+    entry = numpy.zeros(len(kinds))
+    exit = numpy.zeros(len(kinds))
+    acceleration = limits.acceleration
+    if acceleration > 0 and len(moves) > 1:
+        ts, te = _tangents(kinds, start, end, center, radius, xyLength, length)
+        prv, nxt = moves[:-1], moves[1:]
+        stops = numpy.cumsum((kinds == CYCLE) | (kinds == DWELL))
+        cos = numpy.clip(numpy.einsum('ij,ij->i', te[prv], ts[nxt]), -1.0, 1.0)
+        sinHalf = numpy.sqrt(0.5 * (1.0 + cos))
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            vj = numpy.sqrt(acceleration * limits.junctionDeviation * sinHalf / (1.0 - sinHalf))
+        vj = numpy.where(sinHalf >= 1.0, numpy.inf, numpy.nan_to_num(vj))
+        vj = numpy.minimum.reduce([vj, speed[prv], speed[nxt]])
+        vj[stops[nxt] != stops[prv]] = 0.0
+        v2 = reachable(numpy.concatenate(([0.0], vj * vj, [0.0])), 2 * acceleration * length[moves])
+        entry[moves] = numpy.sqrt(v2[:-1])
+        exit[moves] = numpy.sqrt(v2[1:])
+
+    times = moveTimes(length, speed, entry, exit, acceleration)
+    times[(kinds == CYCLE) | (kinds == DWELL)] = 0.0
+    return times
+
+
+def estimateTable(kinds, table, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None):
+    '''estimateTable(kinds, table, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None) ... returns the Estimate
+    of the command table, see commandTable(). Rapid moves use the feed rates if the rapid rates are 0.'''
+    limits = limits or MachineLimits()
+    estimate = Estimate()
+    if not len(kinds):
+        return estimate
+    if hRapid <= 0:
+        hRapid = hFeed
+    if vRapid <= 0:
+        vRapid = vFeed
+
+    geometry = tableGeometry(kinds, table)
+    start, end, length = geometry[0], geometry[1], geometry[6]
+    times = tableTimes(kinds, table, hFeed, vFeed, hRapid, vRapid, limits, geometry)
+    delta = numpy.nan_to_num(end - start)
+    dxy = numpy.hypot(delta[:, 0], delta[:, 1])
+    dz = delta[:, 2]
+    acceleration = limits.acceleration
+
+    # canned cycles: rapid to XY and down to R, feed to the bottom and rapid retract
+    cycle = kinds == CYCLE
+    if numpy.any(cycle):
+        feeds = _feeds(kinds, table)
+        c = numpy.nonzero(cycle)[0]
+        top = start[c, 2]
+        r = numpy.where(numpy.isnan(table[c, R]), top, table[c, R])
+        bottom = numpy.where(numpy.isnan(table[c, Z]), r, table[c, Z])
+        retract = numpy.nan_to_num(end[c, 2] - bottom)
+        down = numpy.nan_to_num(numpy.maximum(top - r, 0.0))
+        drill = numpy.nan_to_num(numpy.abs(r - bottom))
+        zeros = numpy.zeros(len(c))
+        rapidTimes = moveTimes(dxy[c], numpy.full(len(c), float(hRapid)), zeros, zeros, acceleration) \
+            + moveTimes(down + numpy.abs(retract), numpy.full(len(c), float(vRapid)), zeros, zeros, acceleration)
+        drillSpeed = numpy.where(numpy.isnan(feeds[c]), vFeed, feeds[c])
+        estimate.rapidDistance += float(numpy.sum(dxy[c] + down + numpy.abs(retract)))
+        estimate.rapidTime += float(numpy.sum(rapidTimes))
+        estimate.cuttingDistance += float(numpy.sum(drill))
+        estimate.cuttingTime += float(numpy.sum(moveTimes(drill, drillSpeed, zeros, zeros, acceleration)))
+        estimate.dwellTime += float(numpy.sum(table[c, P]))
+        estimate.plunges += len(c)
+
+    rapid = kinds == RAPID
+    feed = (kinds == FEED) | (kinds == ARC_CW) | (kinds == ARC_CCW)
+    estimate.rapidDistance += float(numpy.sum(length[rapid]))
+    estimate.rapidTime += float(numpy.sum(times[rapid]))
+    estimate.cuttingDistance += float(numpy.sum(length[feed]))
+    estimate.cuttingTime += float(numpy.sum(times[feed]))
+    estimate.dwellTime += float(numpy.sum(table[kinds == DWELL, P]))
+    estimate.plunges += int(numpy.count_nonzero((kinds == FEED) & (dz < 0) & (dxy < 1e-6)))
+    return estimate
+
+
+def estimateCommands(commands, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None):
+    '''estimateCommands(commands, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None) ... returns the Estimate
+    of the commands, the feeds and rapids in mm/s.'''
+    kinds, table = commandTable(commands)
+    return estimateTable(kinds, table, hFeed, vFeed, hRapid, vRapid, limits)
+
+
+def estimatePath(path, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None):
+    '''estimatePath(path, hFeed, vFeed, hRapid=0.0, vRapid=0.0, limits=None) ... returns the Estimate of the path.'''
+    return estimateCommands(path.Commands, hFeed, vFeed, hRapid, vRapid, limits)
+
+
+def machineLimits(job):
+    '''machineLimits(job) ... returns the MachineLimits of the job's SetupSheet.'''
+    sheet = job.SetupSheet if job and hasattr(job, 'SetupSheet') else None
+    if sheet and hasattr(sheet, 'MachineAcceleration'):
+        return MachineLimits(sheet.MachineAcceleration.Value, sheet.JunctionDeviation.Value)
+    return MachineLimits()
+
+
+def toolFeeds(tc):
+    '''toolFeeds(tc) ... returns the horizontal and vertical feeds and rapids of the tool controller.'''
+    if tc is None:
+        return (0.0, 0.0, 0.0, 0.0)
+    return (tc.HorizFeed.Value, tc.VertFeed.Value, tc.HorizRapid.Value, tc.VertRapid.Value)
+
+
+def pathSignature(path):
+    '''pathSignature(path) ... returns a hash of the G-code of the path, it changes with any parameter of any
+    command, e.g. a dwell time or a feed which don't change the geometry of the path.'''
+    return hashlib.sha1(path.toGCode().encode('utf-8')).hexdigest()
+
+
+def estimateOp(op, limits=None):
+    '''estimateOp(op, limits=None) ... returns the Estimate of the path of the operation or dressup with the feeds
+    of its tool controller. The estimate is cached until the path, the feeds or the limits change.'''
+    limits = limits or MachineLimits()
+    feeds = toolFeeds(PathUtil.toolControllerForOp(op))
+    path = op.Path
+    signature = (pathSignature(path), feeds, limits.key())
+    name = (op.Document.Name, op.Name) if hasattr(op, 'Document') else op.Name
+    cached = _cache.get(name)
+    if cached and cached[0] == signature:
+        return cached[1]
+    estimate = estimatePath(path, *feeds, limits=limits)
+    _cache[name] = (signature, estimate)
+    return estimate
+
+
+def estimateJob(job, limits=None):
+    '''estimateJob(job, limits=None) ... returns the Estimate of all active operations of the job with tool
+    controllers, and dictionaries of the estimates by the names of the operations and the tool controllers.'''
+    limits = limits or machineLimits(job)
+    total = Estimate()
+    ops = collections.OrderedDict()
+    tools = collections.OrderedDict()
+    for op in job.Operations.Group:
+        if PathUtil.opProperty(op, 'Active') is False:
+            continue
+        tc = PathUtil.toolControllerForOp(op)
+        if tc is None:
+            continue
+        estimate = estimateOp(op, limits)
+        ops[op.Name] = estimate
+        tools[tc.Name] = tools.get(tc.Name, Estimate()) + estimate
+        total = total + estimate
+    return (total, ops, tools)
+
+
+def clearCache():
+    '''clearCache() ... forgets the estimates of all operations.'''
+    _cache.clear()
@@ -23,7 +23,16 @@
 # ***************************************************************************
 
 import FreeCAD
+import PathScripts.PathGeom as PathGeom
 import PathScripts.PathJob as PathJob
+import collections
+import hashlib
+
+# number of base paths with cached wires
+WireCacheSize = 16
+
+# (G-code hash, start point) -> (wire, rapid), the least recently used first
+_wireCache = collections.OrderedDict()
 
 def selection():
     '''isActive() ... return True if a dressup command is possible.'''
@@ -52,3 +61,21 @@ def toolController(path):
     '''toolController(path) ... return the tool controller from the base op.'''
     return baseOp(path).ToolController
 
+def wireForPath(path, startPoint=FreeCAD.Vector(0, 0, 0)):
+    '''wireForPath(path, startPoint=Vector(0, 0, 0)) ... return PathGeom.wireForPath(path, startPoint) from a cache.
+    The cache is keyed by a hash of the G-code of the path, the dressups of the same base path share
+    its wire and edges and a recompute only rebuilds them if the base path changed.
+    The returned wire and edges must not be modified.'''
+    key = (hashlib.sha1(path.toGCode().encode('utf-8')).hexdigest(), startPoint.x, startPoint.y, startPoint.z)
+    entry = _wireCache.pop(key, None)
+    if entry is None:
+        entry = PathGeom.wireForPath(path, startPoint)
+    _wireCache[key] = entry
+    while len(_wireCache) > WireCacheSize:
+        _wireCache.popitem(last=False)
+    (wire, rapid) = entry
+    return (wire, list(rapid))
+
+def clearWireCache():
+    '''clearWireCache() ... remove all wires from the cache of wireForPath.'''
+    _wireCache.clear()
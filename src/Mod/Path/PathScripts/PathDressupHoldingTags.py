@@ -239,6 +239,57 @@ class Tag:
             Part.show(e)
 
 
+class TagIndex:
+    '''TagIndex(tags) ... spatial index of the bounding boxes of the enabled tags.
+    The boxes are binned into a grid of square cells in the XY plane, the size of the largest box.
+    Edges which are not near any tag can't intersect one and don't need to be processed.'''
+
+    def __init__(self, tags):
+        self.boxes = {}
+        self.cells = {}
+        self.size = 0
+        for i, tag in enumerate(tags):
+            if tag.enabled and tag.solid:
+                bb = tag.solid.BoundBox
+                self.boxes[i] = bb
+                self.size = max(self.size, bb.XLength, bb.YLength)
+        self.size += 2 * PathGeom.Tolerance
+        for i, bb in self.boxes.items():
+            for cell in self._cellsOf(bb):
+                self.cells.setdefault(cell, []).append(i)
+        if self.cells:
+            self.cellMin = (min(c[0] for c in self.cells), min(c[1] for c in self.cells))
+            self.cellMax = (max(c[0] for c in self.cells), max(c[1] for c in self.cells))
+
+    def _cellsOf(self, bb, clip=False):
+        x0 = int(math.floor((bb.XMin - PathGeom.Tolerance) / self.size))
+        x1 = int(math.floor((bb.XMax + PathGeom.Tolerance) / self.size))
+        y0 = int(math.floor((bb.YMin - PathGeom.Tolerance) / self.size))
+        y1 = int(math.floor((bb.YMax + PathGeom.Tolerance) / self.size))
+        if clip:
+            # no need to look at cells outside of the tags' ones
+            x0 = max(x0, self.cellMin[0])
+            x1 = min(x1, self.cellMax[0])
+            y0 = max(y0, self.cellMin[1])
+            y1 = min(y1, self.cellMax[1])
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def tagsNear(self, edge):
+        '''tagsNear(edge) ... returns the indexes of the tags whose bounding box intersects the edge's.'''
+        near = set()
+        if not self.cells:
+            return near
+        bb = edge.BoundBox
+        for cell in self._cellsOf(bb, True):
+            for i in self.cells.get(cell, []):
+                box = self.boxes[i]
+                if (bb.XMin <= box.XMax + PathGeom.Tolerance and box.XMin <= bb.XMax + PathGeom.Tolerance and
+                        bb.YMin <= box.YMax + PathGeom.Tolerance and box.YMin <= bb.YMax + PathGeom.Tolerance and
+                        bb.ZMin <= box.ZMax + PathGeom.Tolerance and box.ZMin <= bb.ZMax + PathGeom.Tolerance):
+                    near.add(i)
+        return near
+
+
 class MapWireToTag:
     def __init__(self, edge, tag, i, segm, maxZ, hSpeed, vSpeed):
         debugEdge(edge, 'MapWireToTag(%.2f, %.2f, %.2f)' % (i.x, i.y, i.z))
@@ -555,7 +606,7 @@ class PathData:
     def __init__(self, obj):
         PathLog.track(obj.Base.Name)
         self.obj = obj
-        self.wire, rapid = PathGeom.wireForPath(obj.Base.Path)
+        self.wire, rapid = PathDressup.wireForPath(obj.Base.Path)
         self.rapid = _RapidEdges(rapid)
         if self.wire:
             self.edges = self.wire.Edges
@@ -858,6 +909,11 @@ class ObjectTagDressup:
         self.mappers = []
         mapper = None
 
+        # only the tags near an edge are intersected with it
+        index = TagIndex(tags)
+        near = set()
+        nearEdge = None
+
         tc = PathDressup.toolController(obj.Base)
         horizFeed = tc.HorizFeed.Value
         vertFeed = tc.VertFeed.Value
@@ -882,13 +938,21 @@ class ObjectTagDressup:
                     edge = None
 
             if edge:
+                if edge is not nearEdge:
+                    near = index.tagsNear(edge)
+                    nearEdge = edge
                 tIndex = (t + lastTag) % len(tags)
                 t += 1
-                i = tags[tIndex].intersects(edge, edge.FirstParameter)
+                i = None
+                if tIndex in near:
+                    i = tags[tIndex].intersects(edge, edge.FirstParameter)
                 if i and self.isValidTagStartIntersection(edge, i):
                     mapper = MapWireToTag(edge, tags[tIndex], i, segm, pathData.maxZ, hSpeed = horizFeed, vSpeed = vertFeed)
                     self.mappers.append(mapper)
                     edge = mapper.tail
+                elif not near:
+                    # the edge is not near any tag
+                    t = len(tags)
 
             if not mapper and t >= len(tags):
                 # gone through all tags, consume edge and move on
@@ -28,7 +28,6 @@ from __future__ import print_function
 import FreeCAD
 import Path
 import PathScripts.PathDressup as PathDressup
-import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
 import math
@@ -109,7 +108,7 @@ class ObjectDressup:
         if obj.Length < 0:
             PathLog.error(translate("Length/Radius positive not Null")+"\n")
             obj.Length = 0.1
-        self.wire, self.rapids = PathGeom.wireForPath(obj.Base.Path)
+        self.wire, self.rapids = PathDressup.wireForPath(obj.Base.Path)
         obj.Path = self.generateLeadInOutCurve(obj)
 
     def getDirectionOfPath(self, obj):
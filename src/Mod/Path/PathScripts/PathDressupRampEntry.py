@@ -124,7 +124,7 @@ class ObjectDressup:
 
         self.angle = obj.Angle
         self.method = obj.Method
-        self.wire, self.rapids = PathGeom.wireForPath(obj.Base.Path)
+        self.wire, self.rapids = PathDressup.wireForPath(obj.Base.Path)
         if self.method in ['RampMethod1', 'RampMethod2', 'RampMethod3']:
             self.outedges = self.generateRamps()
         else:
@@ -198,7 +198,7 @@ class ObjectDressup:
         self.solids = [self.masterSolid.cloneAt(pos) for pos in self.obj.Positions]
         self.tagSolid = Part.Compound(self.solids)
 
-        self.wire, rapid = PathGeom.wireForPath(obj.Base.Path) # pylint: disable=unused-variable
+        self.wire, rapid = PathDressup.wireForPath(obj.Base.Path) # pylint: disable=unused-variable
         self.edges = self.wire.Edges
 
         maxTagZ = minZ + obj.Height.Value
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path Drop Cutter Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "OCL drop cutter scans of line and arc segments on a pool of processes."
+__contributors__ = ""
+
+import array
+import multiprocessing
+import sys
+
+import FreeCAD
+import PathScripts.PathLog as PathLog
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+'''
+The segments of a drop cutter scan are independent of each other, every one is
+scanned by its own ocl.PathDropCutter run. The segments are split into
+consecutive chunks which are scanned by a pool of worker processes, the results
+are merged in the order of the segments. Thus the result does not depend on the
+number of processes.
+
+    dc = DropCutter(stl, cutter, finalDepth, sampleInterval, processCount(job))
+    for points in dc.scanVectors([(x1, y1, x2, y2), (x1, y1, x2, y2, cx, cy, ccw)]):
+        ...
+
+The ocl objects can't be pickled, the worker processes are forked and inherit
+the STL and the cutter of the scan. There is no parallel scan on platforms
+without fork, the segments are scanned in the FreeCAD process instead.
+'''
+
+# chunks per process, more chunks balance the load of the processes
+ChunksPerProcess = 4
+
+# the scan of the worker processes, set while the pool is running
+_scan = None
+
+
+def processCount(job):
+    '''processCount(job) ... returns the number of drop cutter processes of the job's SetupSheet,
+    0 in the SetupSheet is the number of cores.'''
+    count = 1
+    if job and hasattr(job, 'SetupSheet') and hasattr(job.SetupSheet, 'DropCutterProcesses'):
+        count = job.SetupSheet.DropCutterProcesses
+    if count < 1:
+        count = multiprocessing.cpu_count()
+    return count
+
+
+def chunkRanges(count, chunks):
+    '''chunkRanges(count, chunks) ... returns (start, end) of at most chunks consecutive ranges covering count items.'''
+    chunks = max(1, min(count, chunks))
+    size, rest = divmod(count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < rest else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def poolContext():
+    '''poolContext() ... returns the multiprocessing context forking the worker processes,
+    None if the platform can't fork.'''
+    if hasattr(multiprocessing, 'get_context'):
+        if 'fork' in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context('fork')
+        return None
+    # python 2 forks on all platforms but Windows
+    if sys.platform == 'win32':
+        return None
+    return multiprocessing
+
+
+def _rotate(stl, rotation):
+    if rotation:
+        stl.rotate(rotation[0], rotation[1], rotation[2])
+
+
+def _scanRange(scan, start, end):
+    '''_scanRange(scan, start, end) ... the cutter location points of the segments start to end.
+    The rotations of all segments before start are applied to the STL first.'''
+    import ocl
+
+    stl = scan.stl
+    if scan.rotations:
+        for rotation in scan.rotations[:start]:
+            _rotate(stl, rotation)
+
+    pdc = ocl.PathDropCutter()
+    pdc.setSTL(stl)
+    pdc.setCutter(scan.cutter)
+    pdc.setZ(scan.minZ)
+    pdc.setSampling(scan.sampling)
+
+    result = []
+    for i in range(start, end):
+        if scan.rotations and scan.rotations[i]:
+            _rotate(stl, scan.rotations[i])
+            pdc.setSTL(stl)
+        seg = scan.segments[i]
+        path = ocl.Path()
+        if len(seg) == 4:
+            path.append(ocl.Line(ocl.Point(seg[0], seg[1], 0), ocl.Point(seg[2], seg[3], 0)))
+        else:
+            path.append(ocl.Arc(ocl.Point(seg[0], seg[1], 0), ocl.Point(seg[2], seg[3], 0),
+                                ocl.Point(seg[4], seg[5], 0), seg[6]))
+        pdc.setPath(path)
+        pdc.run()
+        points = array.array('d')
+        for p in pdc.getCLPoints():
+            points.extend((p.x, p.y, p.z))
+        result.append(points)
+    return result
+
+
+def _scanChunk(chunk):
+    return _scanRange(_scan, chunk[0], chunk[1])
+
+
+class DropCutter(object):
+    '''DropCutter(stl, cutter, minZ, sampling, processes=1) ... drop cutter scans of an STL.
+    A segment is a line (x1, y1, x2, y2) or an arc (x1, y1, x2, y2, cx, cy, ccw).'''
+
+    def __init__(self, stl, cutter, minZ, sampling, processes=1):
+        self.stl = stl
+        self.cutter = cutter
+        self.minZ = minZ
+        self.sampling = sampling
+        self.processes = processes
+        self.segments = None
+        self.rotations = None
+
+    def scan(self, segments, rotations=None):
+        '''scan(segments, rotations=None) ... returns the cutter location points of every segment,
+        each as array of x, y, z values.
+        If rotations are given the STL is rotated by rotations[i], (x, y, z) in radians or None,
+        before segment i is scanned. The rotations add up and stay applied to the STL.'''
+        self.segments = list(segments)
+        self.rotations = list(rotations) if rotations else None
+        count = len(self.segments)
+        context = poolContext() if self.processes > 1 and count > 1 else None
+        if context is None:
+            result = _scanRange(self, 0, count)
+        else:
+            result = self._scanParallel(context, count)
+            # the STL of this process ends up where a serial scan would leave it
+            if self.rotations:
+                for rotation in self.rotations:
+                    _rotate(self.stl, rotation)
+        self.segments = None
+        self.rotations = None
+        return result
+
+    def scanVectors(self, segments, rotations=None, zOffset=0.0):
+        '''scanVectors(segments, rotations=None, zOffset=0.0) ... returns the cutter location points of every
+        segment as list of FreeCAD.Vector, see scan().'''
+        return [[FreeCAD.Vector(p[i], p[i + 1], p[i + 2] + zOffset) for i in range(0, len(p), 3)]
+                for p in self.scan(segments, rotations)]
+
+    def _scanParallel(self, context, count):
+        global _scan  # pylint: disable=global-statement
+
+        processes = min(self.processes, count)
+        if self.rotations:
+            # every chunk rotates a fresh copy of the STL from the start
+            chunks = chunkRanges(count, processes)
+            maxtasks = 1
+        else:
+            chunks = chunkRanges(count, processes * ChunksPerProcess)
+            maxtasks = None
+        PathLog.debug("drop cutter scan of {} segments in {} chunks by {} processes".format(
+            count, len(chunks), processes))
+
+        _scan = self
+        pool = context.Pool(processes, maxtasksperchild=maxtasks)
+        try:
+            results = pool.map(_scanChunk, chunks, 1)
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            _scan = None
+        return [points for result in results for points in result]
@@ -0,0 +1,524 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path Height Map Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Headless 2.5D stock simulation of paths on a height map."
+__contributors__ = ""
+
+import collections
+import math
+import numpy
+
+import Path
+import PathScripts.PathCycleTime as PathCycleTime
+import PathScripts.PathLog as PathLog
+import PathScripts.PathStlCache as PathStlCache
+import PathScripts.PathUtil as PathUtil
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+'''
+The stock is a height map, a grid of cells holding the height of the material
+above the center of each cell, NaN where there is no stock at all. The tool is
+the lower envelope of its shape, its height above the tip at every radius.
+
+The moves of a path are sampled at the resolution of the grid. At every sample
+the tool lowers all cells within its radius to the height of its envelope, in
+batches of samples on NumPy arrays. The samples of a batch are evaluated in the
+order of the path, so a move only counts as cutting if it removes material not
+already removed by an earlier move:
+
+    sim = simulateJob(job)
+    for name, report in sim.reports.items():
+        print(name, report.airCutTime, report.rapidCollisions)
+    print(sim.maxGouge(), sim.maxRemaining())
+
+Without a display the simulation only needs the App level objects of the job,
+it can run in FreeCADCmd. Its limits are those of 2.5D: undercuts can't be
+represented, arcs are in the XY plane and the pecks of drill cycles are ignored.
+'''
+
+# the maximum number of cell updates evaluated at once
+ChunkSize = 1000000
+
+# the default number of cells along the longer side of the stock
+DefaultCells = 400
+
+# tool types of legacy tools with a conical tip
+ConicalTools = ['Drill', 'CenterDrill', 'CounterSink', 'ChamferMill', 'Engraver']
+
+
+class HeightMap(object):
+    '''HeightMap(xmin, ymin, xmax, ymax, resolution, zmin=0.0, z=None) ... a grid of square cells covering the
+    rectangle, holding the heights of the material above zmin, NaN where there is none.'''
+
+    def __init__(self, xmin, ymin, xmax, ymax, resolution, zmin=0.0, z=None):
+        self.xmin = xmin
+        self.ymin = ymin
+        self.resolution = resolution
+        self.zmin = zmin
+        self.nx = max(1, int(math.ceil((xmax - xmin) / resolution - 1e-9)))
+        self.ny = max(1, int(math.ceil((ymax - ymin) / resolution - 1e-9)))
+        self.heights = numpy.full((self.ny, self.nx), numpy.nan if z is None else float(z))
+
+    def centers(self):
+        '''centers() ... returns the x coordinates of the columns and the y coordinates of the rows.'''
+        return (self.xmin + (numpy.arange(self.nx) + 0.5) * self.resolution,
+                self.ymin + (numpy.arange(self.ny) + 0.5) * self.resolution)
+
+    def cellArea(self):
+        return self.resolution * self.resolution
+
+    def volume(self):
+        '''volume() ... the volume of the material.'''
+        return float(numpy.nansum(self.heights - self.zmin)) * self.cellArea()
+
+
+def rasterize(facets, grid, lowest=False):
+    '''rasterize(facets, grid, lowest=False) ... returns the heights of the highest triangles of the facets above
+    the centers of the cells of grid, or of the lowest if lowest is True, NaN where there is none.
+    The facets are the x, y, z values of the corners of the triangles, see PathStlCache.'''
+    T = numpy.asarray(facets, dtype=float).reshape(-1, 3, 3)
+    res = grid.resolution
+    heights = numpy.full(grid.ny * grid.nx, numpy.inf if lowest else -numpy.inf)
+
+    a, b, c = T[:, 0], T[:, 1], T[:, 2]
+    det = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    # vertical triangles don't cover any area of the grid
+    T = T[numpy.abs(det) > 1e-12]
+    det = det[numpy.abs(det) > 1e-12]
+
+    j0 = numpy.maximum(numpy.ceil((T[:, :, 0].min(axis=1) - grid.xmin) / res - 0.5), 0).astype(int)
+    j1 = numpy.minimum(numpy.floor((T[:, :, 0].max(axis=1) - grid.xmin) / res - 0.5), grid.nx - 1).astype(int)
+    i0 = numpy.maximum(numpy.ceil((T[:, :, 1].min(axis=1) - grid.ymin) / res - 0.5), 0).astype(int)
+    i1 = numpy.minimum(numpy.floor((T[:, :, 1].max(axis=1) - grid.ymin) / res - 0.5), grid.ny - 1).astype(int)
+    width = numpy.maximum(j1 - j0 + 1, 0)
+    counts = width * numpy.maximum(i1 - i0 + 1, 0)
+
+    ends = numpy.cumsum(counts)
+    first = 0
+    while first < len(T):
+        last = max(first + 1, int(numpy.searchsorted(ends, ends[first] - counts[first] + ChunkSize, 'right')))
+        tri = numpy.repeat(numpy.arange(first, last), counts[first:last])
+        k = numpy.arange(len(tri)) - numpy.repeat(ends[first:last] - counts[first:last] - ends[first] + counts[first],
+                                                  counts[first:last])
+        i = i0[tri] + k // width[tri]
+        j = j0[tri] + k % width[tri]
+        px = grid.xmin + (j + 0.5) * res
+        py = grid.ymin + (i + 0.5) * res
+        t = T[tri]
+        apx, apy = px - t[:, 0, 0], py - t[:, 0, 1]
+        wb = (apx * (t[:, 2, 1] - t[:, 0, 1]) - apy * (t[:, 2, 0] - t[:, 0, 0])) / det[tri]
+        wc = ((t[:, 1, 0] - t[:, 0, 0]) * apy - (t[:, 1, 1] - t[:, 0, 1]) * apx) / det[tri]
+        wa = 1.0 - wb - wc
+        inside = (wa >= -1e-9) & (wb >= -1e-9) & (wc >= -1e-9)
+        z = wa * t[:, 0, 2] + wb * t[:, 1, 2] + wc * t[:, 2, 2]
+        flat = (i * grid.nx + j)[inside]
+        if lowest:
+            numpy.minimum.at(heights, flat, z[inside])
+        else:
+            numpy.maximum.at(heights, flat, z[inside])
+        first = last
+
+    heights[numpy.isinf(heights)] = numpy.nan
+    return heights.reshape(grid.ny, grid.nx)
+
+
+def defaultResolution(shape):
+    '''defaultResolution(shape) ... the resolution of DefaultCells cells along the longer side of the shape.'''
+    bb = shape.BoundBox
+    return max(bb.XLength, bb.YLength) / DefaultCells or 1.0
+
+
+def stockHeightMap(shape, resolution):
+    '''stockHeightMap(shape, resolution) ... returns the HeightMap of the top of the stock shape.'''
+    bb = shape.BoundBox
+    hm = HeightMap(bb.XMin, bb.YMin, bb.XMax, bb.YMax, resolution, bb.ZMin)
+    deflection = resolution / 4.0
+    key = ('stock', PathStlCache.shapeSignature(shape), deflection)
+    hm.heights = rasterize(PathStlCache.getFacets(key, lambda: PathStlCache.shapeFacets(shape, deflection)), hm)
+    return hm
+
+
+def modelHeights(shapes, grid):
+    '''modelHeights(shapes, grid) ... returns the heights of the tops of the shapes above the cells of grid,
+    NaN where there is no model.'''
+    heights = numpy.full((grid.ny, grid.nx), numpy.nan)
+    deflection = grid.resolution / 4.0
+    for shape in shapes:
+        key = ('model', PathStlCache.shapeSignature(shape), deflection)
+        facets = PathStlCache.getFacets(key, lambda: PathStlCache.shapeFacets(shape, deflection))
+        heights = numpy.fmax(heights, rasterize(facets, grid))
+    return heights
+
+
+class ToolProfile(object):
+    '''ToolProfile(radii, heights) ... the lower envelope of a tool rotating around Z, the heights above its
+    tip at increasing radii. The tool doesn't reach beyond the last radius.'''
+
+    def __init__(self, radii, heights):
+        self.radii = numpy.asarray(radii, dtype=float)
+        self.heights = numpy.asarray(heights, dtype=float)
+        self.radius = float(self.radii[-1])
+
+    def heightAt(self, r):
+        '''heightAt(r) ... the heights of the envelope at the radii r, inf beyond the tool.'''
+        return numpy.interp(r, self.radii, self.heights, right=numpy.inf)
+
+
+def legacyProfile(toolType, diameter, flatRadius=0.0, cornerRadius=0.0, cuttingEdgeAngle=180.0, samples=64):
+    '''legacyProfile(toolType, diameter, flatRadius=0.0, cornerRadius=0.0, cuttingEdgeAngle=180.0, samples=64) ...
+    returns the ToolProfile of a legacy tool, ball end mills are round, drills, chamfer mills and engravers
+    are cones of the cutting edge angle and all other tools are end mills with a corner radius.'''
+    R = diameter / 2.0
+    r = numpy.linspace(0.0, R, samples)
+    if toolType == 'BallEndMill':
+        h = R - numpy.sqrt(numpy.maximum(R * R - r * r, 0.0))
+    elif toolType in ConicalTools and 0 < cuttingEdgeAngle < 180:
+        h = numpy.maximum(r - flatRadius, 0.0) / math.tan(math.radians(cuttingEdgeAngle) / 2.0)
+    else:
+        cr = min(max(cornerRadius, 0.0), R)
+        d = numpy.maximum(r - (R - cr), 0.0)
+        h = cr - numpy.sqrt(numpy.maximum(cr * cr - d * d, 0.0))
+    return ToolProfile(r, h)
+
+
+def shapeProfile(shape, resolution):
+    '''shapeProfile(shape, resolution) ... returns the ToolProfile of the lowest faces of the tool shape,
+    its axis is Z and its tip the lowest point of the shape.'''
+    bb = shape.BoundBox
+    grid = HeightMap(bb.XMin, bb.YMin, bb.XMax, bb.YMax, resolution)
+    low = rasterize(PathStlCache.shapeFacets(shape, resolution / 2.0), grid, lowest=True) - bb.ZMin
+    X, Y = grid.centers()
+    r = numpy.hypot(*numpy.meshgrid(X, Y))[~numpy.isnan(low)]
+    h = low[~numpy.isnan(low)]
+    if not len(h):
+        return None
+    # the lowest height between two radii is at the inner one for all tools getting wider upwards
+    bins = numpy.floor(r / resolution).astype(int)
+    heights = numpy.full(bins.max() + 1, numpy.inf)
+    numpy.minimum.at(heights, bins, h)
+    radii = numpy.arange(len(heights)) * resolution
+    radii[-1] = r.max()
+    known = ~numpy.isinf(heights)
+    return ToolProfile(radii[known], heights[known])
+
+
+def toolProfile(tool, resolution):
+    '''toolProfile(tool, resolution) ... returns the ToolProfile of a legacy tool or a tool bit, None if the tool
+    has no geometry.'''
+    if tool is None:
+        return None
+    if isinstance(tool, Path.Tool):
+        if tool.Diameter <= 0:
+            return None
+        return legacyProfile(tool.ToolType, tool.Diameter, tool.FlatRadius, tool.CornerRadius,
+                             tool.CuttingEdgeAngle)
+    if not hasattr(tool, 'Shape') or tool.Shape.isNull():
+        return None
+    return shapeProfile(tool.Shape, resolution)
+
+
+class CutReport(object):
+    '''CutReport(...) ... the volume a path removed, the time and distance of feed moves not removing any
+    material and the number of rapid moves into the material.'''
+
+    def __init__(self, removedVolume=0.0, airCutTime=0.0, airCutDistance=0.0, airMoves=0, rapidCollisions=0):
+        self.removedVolume = removedVolume
+        self.airCutTime = airCutTime
+        self.airCutDistance = airCutDistance
+        self.airMoves = airMoves
+        self.rapidCollisions = rapidCollisions
+
+    def __add__(self, other):
+        return CutReport(self.removedVolume + other.removedVolume,
+                         self.airCutTime + other.airCutTime,
+                         self.airCutDistance + other.airCutDistance,
+                         self.airMoves + other.airMoves,
+                         self.rapidCollisions + other.rapidCollisions)
+
+    def __repr__(self):
+        return "CutReport(removed={:.2f}mm^3, air={:.2f}mm/{:.1f}s in {} moves, rapid collisions={})".format(
+            self.removedVolume, self.airCutDistance, self.airCutTime, self.airMoves, self.rapidCollisions)
+
+
+def _segments(kinds, table, geometry):
+    '''_segments(kinds, table, geometry) ... the rows of the moves and cycles of the command table, and the start,
+    end, arc center, start angle and signed sweep of their cuts. A cycle cuts from R to its bottom.
+    Moves to or from a position with a coordinate not set by any earlier command are skipped.'''
+    start, end, center, radius, sweep, xyLength, length = geometry  # pylint: disable=unused-variable
+    moves = (kinds == PathCycleTime.RAPID) | (kinds == PathCycleTime.FEED) \
+        | (kinds == PathCycleTime.ARC_CW) | (kinds == PathCycleTime.ARC_CCW)
+    rows = numpy.nonzero(moves | (kinds == PathCycleTime.CYCLE))[0]
+    s = start[rows].copy()
+    e = end[rows].copy()
+    cycle = kinds[rows] == PathCycleTime.CYCLE
+    if numpy.any(cycle):
+        c = rows[cycle]
+        r = numpy.where(numpy.isnan(table[c, PathCycleTime.R]), start[c, 2], table[c, PathCycleTime.R])
+        s[cycle] = numpy.column_stack((end[c, 0], end[c, 1], r))
+        e[cycle, 2] = numpy.where(numpy.isnan(table[c, PathCycleTime.Z]), r, table[c, PathCycleTime.Z])
+    # where the tool is isn't known, an unknown Z taken for 0 would plunge it into the stock
+    known = ~numpy.any(numpy.isnan(s) | numpy.isnan(e), axis=1)
+    rows, s, e, cycle = rows[known], s[known], e[known], cycle[known]
+    c = center[rows]
+    a0 = numpy.arctan2(s[:, 1] - c[:, 1], s[:, 0] - c[:, 0])
+    signed = numpy.where(kinds[rows] == PathCycleTime.ARC_CCW, sweep[rows], -sweep[rows])
+    xy = numpy.where(cycle, 0.0, xyLength[rows])
+    return (rows, s, e, c, a0, signed, xy)
+
+
+class Simulation(object):
+    '''Simulation(stock, model=None, tolerance=0.01) ... simulates paths cutting the stock HeightMap.
+    model are the heights of the model above the cells of the stock, cells more than tolerance below
+    the model are gouges.'''
+
+    def __init__(self, stock, model=None, tolerance=0.01):
+        self.stock = stock
+        self.initial = stock.heights.copy()
+        self.model = model
+        self.tolerance = tolerance
+        self.top = float(numpy.nanmax(stock.heights)) if numpy.any(~numpy.isnan(stock.heights)) else stock.zmin
+        self.reports = collections.OrderedDict()
+
+    def _kernel(self, radius):
+        '''_kernel(radius) ... the row and column offsets of all cells a tool of radius at any point of a cell
+        can reach.'''
+        res = self.stock.resolution
+        n = int(math.ceil(radius / res)) + 1
+        di, dj = numpy.meshgrid(numpy.arange(-n, n + 1), numpy.arange(-n, n + 1), indexing='ij')
+        near = numpy.hypot(numpy.maximum(numpy.abs(di) - 0.5, 0), numpy.maximum(numpy.abs(dj) - 0.5, 0)) * res
+        keep = near <= radius
+        return (di[keep], dj[keep])
+
+    def _sampleCells(self, points, keys, profile, di, dj):
+        '''_sampleCells(points, keys, profile, di, dj) ... the cells under the tool at the points, the heights of the
+        tool above them and the keys of their points.'''
+        hm = self.stock
+        res = hm.resolution
+        ci = numpy.floor((points[:, 1] - hm.ymin) / res).astype(int)[:, numpy.newaxis] + di
+        cj = numpy.floor((points[:, 0] - hm.xmin) / res).astype(int)[:, numpy.newaxis] + dj
+        r = numpy.hypot(hm.xmin + (cj + 0.5) * res - points[:, 0:1], hm.ymin + (ci + 0.5) * res - points[:, 1:2])
+        values = points[:, 2:3] + profile.heightAt(r)
+        keys = numpy.repeat(keys, len(di)).reshape(values.shape)
+        valid = (ci >= 0) & (ci < hm.ny) & (cj >= 0) & (cj < hm.nx) & (r <= profile.radius)
+        return ((ci * hm.nx + cj)[valid], values[valid], keys[valid])
+
+    def _lineCells(self, start, end, keys, profile):
+        '''_lineCells(start, end, keys, profile) ... the cells under the tool moving horizontally from start to end,
+        the heights of the tool above them and the keys of their moves.'''
+        hm = self.stock
+        res = hm.resolution
+        R = profile.radius
+        j0 = numpy.maximum(numpy.floor((numpy.minimum(start[:, 0], end[:, 0]) - R - hm.xmin) / res), 0).astype(int)
+        j1 = numpy.minimum(numpy.floor((numpy.maximum(start[:, 0], end[:, 0]) + R - hm.xmin) / res), hm.nx - 1)
+        i0 = numpy.maximum(numpy.floor((numpy.minimum(start[:, 1], end[:, 1]) - R - hm.ymin) / res), 0).astype(int)
+        i1 = numpy.minimum(numpy.floor((numpy.maximum(start[:, 1], end[:, 1]) + R - hm.ymin) / res), hm.ny - 1)
+        width = numpy.maximum(j1.astype(int) - j0 + 1, 0)
+        counts = width * numpy.maximum(i1.astype(int) - i0 + 1, 0)
+        line = numpy.repeat(numpy.arange(len(start)), counts)
+        k = numpy.arange(len(line)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+        i = i0[line] + k // width[line]
+        j = j0[line] + k % width[line]
+
+        # distance of the cell centers to the line
+        s, e = start[line], end[line]
+        px = hm.xmin + (j + 0.5) * res - s[:, 0]
+        py = hm.ymin + (i + 0.5) * res - s[:, 1]
+        dx, dy = e[:, 0] - s[:, 0], e[:, 1] - s[:, 1]
+        t = numpy.clip((px * dx + py * dy) / (dx * dx + dy * dy), 0.0, 1.0)
+        r = numpy.hypot(px - t * dx, py - t * dy)
+        valid = r <= R
+        return ((i * hm.nx + j)[valid], (s[:, 2] + profile.heightAt(r))[valid], keys[line][valid])
+
+    def _cutCells(self, flat, values, keys):
+        '''_cutCells(flat, values, keys) ... lowers the cells to the values in the order of their keys,
+        returns the keys which removed material.'''
+        hm = self.stock
+        heights = hm.heights.reshape(-1)
+        values = numpy.maximum(values, hm.zmin)
+        with numpy.errstate(invalid='ignore'):
+            lower = values < heights[flat] - self.tolerance
+        flat, values, keys = flat[lower], values[lower], keys[lower]
+        if not len(flat):
+            return keys
+
+        # a key only cuts material not removed by an earlier key on the same cell
+        order = numpy.lexsort((keys, flat))
+        flat, values, keys = flat[order], values[order], keys[order]
+        first = numpy.concatenate(([True], flat[1:] != flat[:-1]))
+        group = numpy.cumsum(first)
+        shift = float(numpy.ptp(values)) + 1.0
+        earlier = numpy.minimum.accumulate(values - group * shift) + group * shift
+        earlier = numpy.concatenate(([numpy.inf], earlier[:-1]))
+        earlier[first] = numpy.inf
+        cuts = values < numpy.minimum(earlier, heights[flat]) - self.tolerance
+        numpy.minimum.at(heights, flat, values)
+        return keys[cuts]
+
+    def cut(self, commands, profile, feeds=None, limits=None, name=None):
+        '''cut(commands, profile, feeds=None, limits=None, name=None) ... simulates the commands cutting the stock
+        with a tool of the profile and returns their CutReport, which is also stored in reports as name.
+        feeds are the feeds and rapids of the tool controller, see PathCycleTime.toolFeeds().'''
+        report = CutReport()
+        kinds, table = PathCycleTime.commandTable(commands)
+        if profile is None or not len(kinds):
+            if name:
+                self.reports[name] = report
+            return report
+
+        geometry = PathCycleTime.tableGeometry(kinds, table)
+        rows, start, end, center, a0, sweep, xyLength = _segments(kinds, table, geometry)
+        res = self.stock.resolution
+        R = profile.radius
+        di, dj = self._kernel(R)
+        before = self.stock.volume()
+
+        # horizontal lines are cut at once, all other moves are sampled at the resolution
+        samples = numpy.maximum(numpy.ceil(xyLength / res), 1).astype(int)
+        area = (numpy.floor(numpy.abs(end[:, 0] - start[:, 0]) / res + 2 * R / res) + 2) \
+            * (numpy.floor(numpy.abs(end[:, 1] - start[:, 1]) / res + 2 * R / res) + 2)
+        lines = (sweep == 0) & (numpy.abs(end[:, 2] - start[:, 2]) < 1e-9) & (xyLength > 0) \
+            & (area < samples * len(di))
+        # moves above the stock can't cut anything
+        low = numpy.minimum(start[:, 2], end[:, 2]) < self.top
+        counts = numpy.where(low, numpy.where(lines, area, samples * len(di)), 0)
+
+        cutting = numpy.zeros(len(rows), dtype=bool)
+        ends = numpy.cumsum(counts)
+        first = 0
+        while first < len(rows):
+            last = max(first + 1, int(numpy.searchsorted(ends, ends[first] - counts[first] + ChunkSize, 'right')))
+            chunk = numpy.arange(first, last)
+            chunk = chunk[low[chunk]]
+            first = last
+            if not len(chunk):
+                continue
+
+            seg = chunk[lines[chunk]]
+            cells = [self._lineCells(start[seg], end[seg], seg, profile)]
+
+            seg = chunk[~lines[chunk]]
+            seg = numpy.repeat(seg, samples[seg])
+            k = numpy.arange(len(seg)) - numpy.searchsorted(seg, seg)
+            t = (k + 1.0) / samples[seg]
+            s, e = start[seg], end[seg]
+            angle = a0[seg] + t * sweep[seg]
+            radius = numpy.hypot(s[:, 0] - center[seg, 0], s[:, 1] - center[seg, 1])
+            arc = sweep[seg] != 0
+            points = numpy.column_stack((
+                numpy.where(arc, center[seg, 0] + radius * numpy.cos(angle), s[:, 0] + t * (e[:, 0] - s[:, 0])),
+                numpy.where(arc, center[seg, 1] + radius * numpy.sin(angle), s[:, 1] + t * (e[:, 1] - s[:, 1])),
+                s[:, 2] + t * (e[:, 2] - s[:, 2])))
+            cells.append(self._sampleCells(points, seg, profile, di, dj))
+
+            flat, values, keys = [numpy.concatenate(c) for c in zip(*cells)]
+            cutting[self._cutCells(flat, values, keys)] = True
+
+        kind = kinds[rows]
+        feed = (kind == PathCycleTime.FEED) | (kind == PathCycleTime.ARC_CW) | (kind == PathCycleTime.ARC_CCW)
+        air = feed & ~cutting
+        times = PathCycleTime.tableTimes(kinds, table, *(feeds or (0.0, 0.0, 0.0, 0.0)), limits=limits,
+                                         geometry=geometry)
+        report.removedVolume = before - self.stock.volume()
+        report.airCutTime = float(numpy.sum(times[rows[air]]))
+        report.airCutDistance = float(numpy.sum(geometry[6][rows[air]]))
+        report.airMoves = int(numpy.count_nonzero(air & (geometry[6][rows] > 0)))
+        report.rapidCollisions = int(numpy.count_nonzero((kind == PathCycleTime.RAPID) & cutting))
+        if name:
+            self.reports[name] = report
+        return report
+
+    def total(self):
+        '''total() ... the sum of the CutReports of all simulated paths.'''
+        total = CutReport()
+        for report in self.reports.values():
+            total = total + report
+        return total
+
+    def removedVolume(self):
+        '''removedVolume() ... the volume removed from the stock.'''
+        return float(numpy.nansum(self.initial - self.stock.heights)) * self.stock.cellArea()
+
+    def gougeDepths(self):
+        '''gougeDepths() ... the depths of the cells cut more than tolerance below the model, 0 elsewhere.'''
+        if self.model is None:
+            return numpy.zeros_like(self.stock.heights)
+        depth = numpy.nan_to_num(self.model - self.stock.heights)
+        depth[depth <= self.tolerance] = 0.0
+        return depth
+
+    def gougeArea(self):
+        '''gougeArea() ... the area of the cells cut below the model.'''
+        return float(numpy.count_nonzero(self.gougeDepths())) * self.stock.cellArea()
+
+    def maxGouge(self):
+        '''maxGouge() ... the deepest gouge of the model, 0 if there is none.'''
+        return float(numpy.max(self.gougeDepths()))
+
+    def remainingStock(self):
+        '''remainingStock() ... the height of the material remaining above the model, NaN where there is no model.'''
+        if self.model is None:
+            return numpy.full_like(self.stock.heights, numpy.nan)
+        return numpy.maximum(self.stock.heights - self.model, 0.0)
+
+    def remainingVolume(self):
+        '''remainingVolume() ... the volume of the material remaining above the model.'''
+        return float(numpy.nansum(self.remainingStock())) * self.stock.cellArea()
+
+    def maxRemaining(self):
+        '''maxRemaining() ... the thickest material remaining above the model, 0 if there is none.'''
+        remaining = self.remainingStock()
+        if numpy.all(numpy.isnan(remaining)):
+            return 0.0
+        return float(numpy.nanmax(remaining))
+
+
+def simulateJob(job, resolution=None, tolerance=0.01):
+    '''simulateJob(job, resolution=None, tolerance=0.01) ... returns the Simulation of all active operations of the
+    job cutting its stock, with the CutReports of the operations by their names.
+    The default resolution divides the longer side of the stock into DefaultCells cells.'''
+    resolution = resolution or defaultResolution(job.Stock.Shape)
+    stock = stockHeightMap(job.Stock.Shape, resolution)
+    model = modelHeights([m.Shape for m in job.Model.Group], stock)
+    sim = Simulation(stock, model, tolerance)
+    limits = PathCycleTime.machineLimits(job)
+    profiles = {}
+    for op in job.Operations.Group:
+        if PathUtil.opProperty(op, 'Active') is False:
+            continue
+        tc = PathUtil.toolControllerForOp(op)
+        if tc is None:
+            continue
+        if tc.Name not in profiles:
+            profiles[tc.Name] = toolProfile(tc.Tool, resolution)
+            if profiles[tc.Name] is None:
+                PathLog.warning("{}: the tool has no geometry, can't simulate its operations".format(tc.Label))
+        sim.cut(op.Path.Commands, profiles[tc.Name], PathCycleTime.toolFeeds(tc), limits, op.Name)
+    return sim
@@ -23,6 +23,7 @@
 # ***************************************************************************
 
 import FreeCAD
+import PathScripts.PathCycleTime as PathCycleTime
 import PathScripts.PathIconViewProvider as PathIconViewProvider
 import PathScripts.PathLog as PathLog
 import PathScripts.PathPreferences as PathPreferences
@@ -31,7 +32,6 @@ import PathScripts.PathStock as PathStock
 import PathScripts.PathToolController as PathToolController
 import PathScripts.PathUtil as PathUtil
 import json
-import time
 from PathScripts.PathPostProcessor import PostProcessor
 from PySide import QtCore
 
@@ -111,6 +111,7 @@ class ObjectJob:
         obj.addProperty("App::PropertyString", "Description", "Path", QtCore.QT_TRANSLATE_NOOP("PathJob", "An optional description for this job"))
         obj.addProperty("App::PropertyString", "CycleTime", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Job Cycle Time Estimation"))
         obj.setEditorMode('CycleTime', 1)  # read-only
+        self.setupEstimate(obj)
         obj.addProperty("App::PropertyDistance", "GeometryTolerance", "Geometry", QtCore.QT_TRANSLATE_NOOP("PathJob", "For computing Paths; smaller increases accuracy, but slows down computation"))
 
         obj.addProperty("App::PropertyLink", "Stock", "Base", QtCore.QT_TRANSLATE_NOOP("PathJob", "Solid object to be used as stock."))
@@ -169,6 +170,15 @@ class ObjectJob:
                 PathIconViewProvider.Attach(obj.SetupSheet.ViewObject, 'SetupSheet')
         self.setupSheet = obj.SetupSheet.Proxy
 
+    def setupEstimate(self, obj):
+        if not hasattr(obj, 'CuttingDistance'):
+            obj.addProperty("App::PropertyDistance", "CuttingDistance", "Path", QtCore.QT_TRANSLATE_NOOP("PathJob", "Estimated distance of all feed moves"))
+            obj.addProperty("App::PropertyDistance", "RapidDistance", "Path", QtCore.QT_TRANSLATE_NOOP("PathJob", "Estimated distance of all rapid moves"))
+            obj.addProperty("App::PropertyInteger", "PlungeCount", "Path", QtCore.QT_TRANSLATE_NOOP("PathJob", "Number of vertical plunges and drilled holes"))
+            obj.addProperty("App::PropertyStringList", "ToolCycleTimes", "Path", QtCore.QT_TRANSLATE_NOOP("PathJob", "Cycle time estimation of each tool controller"))
+            for prop in ['CuttingDistance', 'RapidDistance', 'PlungeCount', 'ToolCycleTimes']:
+                obj.setEditorMode(prop, 1)  # read-only
+
     def setupBaseModel(self, obj, models=None):
         PathLog.track(obj.Label, models)
         if not hasattr(obj, 'Model'):
@@ -269,6 +279,7 @@ class ObjectJob:
         if not hasattr(obj, 'CycleTime'):
             obj.addProperty("App::PropertyString", "CycleTime", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Operations Cycle Time Estimation"))
             obj.setEditorMode('CycleTime', 1)  # read-only
+        self.setupEstimate(obj)
 
     def onChanged(self, obj, prop):
         if prop == "PostProcessor" and obj.PostProcessor:
@@ -364,32 +375,18 @@ class ObjectJob:
             self.getCycleTime()
 
     def getCycleTime(self):
-        seconds = 0
-
-        if len(self.obj.Operations.Group):
-            for op in self.obj.Operations.Group:
-
-                # Skip inactive operations
-                if PathUtil.opProperty(op, 'Active') is False:
-                    continue
-
-                # Skip operations that don't have a cycletime attribute
-                if PathUtil.opProperty(op, 'CycleTime') is None:
-                    continue
-
-                formattedCycleTime = PathUtil.opProperty(op, 'CycleTime')
-                opCycleTime = 0
-                try:
-                    # Convert the formatted time from HH:MM:SS to just seconds
-                    opCycleTime = sum(x * int(t) for x, t in zip([1, 60, 3600], reversed(formattedCycleTime.split(":"))))
-                except Exception:
-                    continue
-
-                if opCycleTime > 0:
-                    seconds = seconds + opCycleTime
-
-        cycleTimeString = time.strftime("%H:%M:%S", time.gmtime(seconds))
-        self.obj.CycleTime = cycleTimeString
+        '''getCycleTime() ... updates the cycle time, the travel and the plunges of the job from the estimates
+        of its active operations, see PathCycleTime.'''
+        if not hasattr(self.obj, 'Operations'):
+            return
+        total, ops, tools = PathCycleTime.estimateJob(self.obj)  # pylint: disable=unused-variable
+
+        self.obj.CycleTime = PathCycleTime.formatTime(total.time)
+        if hasattr(self.obj, 'CuttingDistance'):
+            self.obj.CuttingDistance = total.cuttingDistance
+            self.obj.RapidDistance = total.rapidDistance
+            self.obj.PlungeCount = total.plunges
+            self.obj.ToolCycleTimes = ["%s: %s" % (tc.Label, PathCycleTime.formatTime(tools[tc.Name].time)) for tc in self.obj.ToolController if tc.Name in tools]
 
     def addOperation(self, op, before=None, removeBefore=False):
         group = self.obj.Operations.Group
@@ -24,14 +24,16 @@
 
 import FreeCAD
 import Path
+import PathScripts.PathCompress as PathCompress
+import PathScripts.PathCycleTime as PathCycleTime
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathLog as PathLog
+import PathScripts.PathPreferences as PathPreferences
 import PathScripts.PathUtil as PathUtil
 import PathScripts.PathUtils as PathUtils
 
 from PathScripts.PathUtils import waiting_effects
 from PySide import QtCore
-import time
 
 # lazily loaded modules
 from lazy_loader.lazy_loader import LazyLoader
@@ -65,6 +67,7 @@ FeatureBasePanels   = 0x0800     # Base
 FeatureLocations    = 0x1000     # Locations
 FeatureCoolant      = 0x2000     # Coolant
 FeatureDiameters    = 0x4000     # Turning Diameters
+FeatureCompress     = 0x8000     # CompressPath, CompressTolerance
 
 FeatureBaseGeometry = FeatureBaseVertexes | FeatureBaseFaces | FeatureBaseEdges | FeatureBasePanels
 
@@ -93,6 +96,7 @@ class ObjectOp(object):
         FeatureLocations     ... Base location support
         FeatureCoolant       ... Support for operation coolant
         FeatureDiameters     ... Support for turning operation diameters 
+        FeatureCompress      ... Support for compressing the generated path
 
     The base class handles all base API and forwards calls to subclasses with
     an op prefix. For instance, an op is not expected to overwrite onChanged(),
@@ -104,6 +108,10 @@ class ObjectOp(object):
     def addBaseProperty(self, obj):
         obj.addProperty("App::PropertyLinkSubListGlobal", "Base", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "The base geometry for this operation"))
 
+    def addCompressProperties(self, obj):
+        obj.addProperty("App::PropertyBool", "CompressPath", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Replace the feed moves of the path by fewer lines and arcs"))
+        obj.addProperty("App::PropertyDistance", "CompressTolerance", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Maximum deviation of the compressed path from the generated path"))
+
     def addOpValues(self, obj, values):
         if 'start' in values:
             obj.addProperty("App::PropertyDistance", "OpStartDepth", "Op Values", QtCore.QT_TRANSLATE_NOOP("PathOp", "Holds the calculated value for the StartDepth"))
@@ -174,6 +182,9 @@ class ObjectOp(object):
         if FeatureDiameters & features:
             obj.addProperty("App::PropertyDistance", "MinDiameter", "Diameter", QtCore.QT_TRANSLATE_NOOP("PathOp", "Lower limit of the turning diameter"))
             obj.addProperty("App::PropertyDistance", "MaxDiameter", "Diameter", QtCore.QT_TRANSLATE_NOOP("PathOp", "Upper limit of the turning diameter."))
+
+        if FeatureCompress & features:
+            self.addCompressProperties(obj)
         
         # members being set later
         self.commandlist = None
@@ -236,6 +247,10 @@ class ObjectOp(object):
         if not hasattr(obj, 'CycleTime'):
             obj.addProperty("App::PropertyString", "CycleTime", "Path", QtCore.QT_TRANSLATE_NOOP("PathOp", "Operations Cycle Time Estimation"))
 
+        if FeatureCompress & features and not hasattr(obj, 'CompressPath'):
+            self.addCompressProperties(obj)
+            obj.CompressTolerance = self.compressTolerance(obj)
+
         self.setEditorModes(obj, features)
         self.opOnDocumentRestored(obj)
 
@@ -365,6 +380,10 @@ class ObjectOp(object):
         if FeatureStartPoint & features:
             obj.UseStartPoint = False
 
+        if FeatureCompress & features:
+            obj.CompressPath = False
+            obj.CompressTolerance = self.compressTolerance(obj)
+
         self.opSetDefaultValues(obj, job)
         return job
 
@@ -383,6 +402,13 @@ class ObjectOp(object):
         self.stock = job.Stock
         return True
 
+    def compressTolerance(self, obj):
+        '''compressTolerance(obj) ... returns the GeometryTolerance of the job, the default tolerance if it is 0.'''
+        job = PathUtils.findParentJob(obj)
+        if job and hasattr(job, 'GeometryTolerance') and job.GeometryTolerance.Value > 0:
+            return job.GeometryTolerance.Value
+        return PathPreferences.defaultGeometryTolerance()
+
     def getJob(self, obj):
         '''getJob(obj) ... return the job this operation is part of.'''
         if not hasattr(self, 'job') or self.job is None:
@@ -524,6 +550,12 @@ class ObjectOp(object):
 
         result = self.opExecute(obj)  # pylint: disable=assignment-from-no-return
 
+        if FeatureCompress & self.opFeatures(obj) and obj.CompressPath:
+            tolerance = obj.CompressTolerance.Value
+            if tolerance <= 0:
+                tolerance = self.compressTolerance(obj)
+            self.commandlist = PathCompress.compressCommands(self.commandlist, tolerance)
+
         path = Path.Path(self.commandlist)
         obj.Path = path
         obj.CycleTime = self.getCycleTimeEstimate(obj)
@@ -550,16 +582,13 @@ class ObjectOp(object):
         if hRapidrate == 0 or vRapidrate == 0:
             PathLog.warning(translate("Path", "Add Tool Controller Rapid Speeds on the SetupSheet for more accurate cycle times."))
 
-        # Get the cycle time in seconds
-        seconds = obj.Path.getCycleTime(hFeedrate, vFeedrate, hRapidrate, vRapidrate)
+        # Get the cycle time in seconds, limited by the acceleration of the machine
+        seconds = PathCycleTime.estimateOp(obj, PathCycleTime.machineLimits(self.job)).time
 
         if not seconds:
             return translate('Path', 'Cycletime Error')
 
-        # Convert the cycle time to a HH:MM:SS format
-        cycleTime = time.strftime("%H:%M:%S", time.gmtime(seconds))
-
-        return cycleTime
+        return PathCycleTime.formatTime(seconds)
 
     def addBase(self, obj, base, sub):
         PathLog.track(obj, base, sub)
@@ -27,11 +27,10 @@ from __future__ import print_function
 
 import FreeCAD
 import FreeCADGui
-import Path
+import PathScripts.PathBatchPost as PathBatchPost
 import PathScripts.PathJob as PathJob
 import PathScripts.PathLog as PathLog
 import PathScripts.PathPreferences as PathPreferences
-import PathScripts.PathUtil as PathUtil
 import PathScripts.PathUtils as PathUtils
 import os
 
@@ -49,14 +48,6 @@ def translate(context, text, disambig=None):
     return QtCore.QCoreApplication.translate(context, text, disambig)
 
 
-class _TempObject:
-    # pylint: disable=no-init
-    Path = None
-    Name = "Fixture"
-    InList = []
-    Label = "Fixture"
-
-
 class DlgSelectPostProcessor:
 
     def __init__(self, parent=None):
@@ -102,39 +93,13 @@ class CommandPathPost:
         path = PathPreferences.defaultOutputFile()
         if job.PostProcessorOutputFile:
             path = job.PostProcessorOutputFile
-        filename = path
-
-        if '%D' in filename:
-            D = FreeCAD.ActiveDocument.FileName
-            if D:
-                D = os.path.dirname(D)
-                # in case the document is in the current working directory
-                if not D:
-                    D = '.'
-            else:
-                FreeCAD.Console.PrintError("Please save document in order to resolve output path!\n")
-                return None
-            filename = filename.replace('%D', D)
-
-        if '%d' in filename:
-            d = FreeCAD.ActiveDocument.Label
-            filename = filename.replace('%d', d)
-
-        if '%j' in filename:
-            j = job.Label
-            filename = filename.replace('%j', j)
-
-        if '%M' in filename:
-            pref = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Macro")
-            M = pref.GetString("MacroPath", FreeCAD.getUserAppDataDir())
-            filename = filename.replace('%M', M)
-
-        if '%s' in filename:
-            if job.SplitOutput:
-                filename = filename.replace('%s', '_'+str(self.subpart))
-                self.subpart += 1
-            else:
-                filename = filename.replace('%s', '')
+        subpart = None
+        if job.SplitOutput:
+            subpart = self.subpart
+            self.subpart += 1
+        filename = PathBatchPost.expandFileName(job, path, subpart)
+        if filename is None:
+            return None
 
         policy = PathPreferences.defaultOutputPolicy()
 
@@ -147,15 +112,8 @@ class CommandPathPost:
         if os.path.isfile(filename) and not openDialog:
             if policy == 'Open File Dialog on conflict':
                 openDialog = True
-            elif policy == 'Append Unique ID on conflict':
-                fn, ext = os.path.splitext(filename)
-                nr = fn[-3:]
-                n = 1
-                if nr.isdigit():
-                    n = int(nr)
-                while os.path.isfile("%s%03d%s" % (fn, n, ext)):
-                    n = n + 1
-                filename = "%s%03d%s" % (fn, n, ext)
+            elif policy == PathBatchPost.AppendUniqueID:
+                filename = PathBatchPost.uniqueFileName(filename)
 
         if openDialog:
             foo = QtGui.QFileDialog.getSaveFileName(QtGui.QApplication.activeWindow(), "Output File", filename)
@@ -195,11 +153,7 @@ class CommandPathPost:
         PathLog.track()
         # check if the user has a project and has set the default post and
         # output filename
-        postArgs = PathPreferences.defaultPostProcessorArgs()
-        if hasattr(job, "PostProcessorArgs") and job.PostProcessorArgs:
-            postArgs = job.PostProcessorArgs
-        elif hasattr(job, "PostProcessor") and job.PostProcessor:
-            postArgs = ''
+        postArgs = PathBatchPost.postProcessorArgs(job)
 
         postname = self.resolvePostProcessor(job)
         filename = '-'
@@ -264,128 +218,8 @@ class CommandPathPost:
 
         # Build up an ordered list of operations and tool changes.
         # Then post-the ordered list
-        if hasattr(job, "Fixtures"):
-            wcslist = job.Fixtures
-        else:
-            wcslist = ['G54']
-
-        if hasattr(job, "OrderOutputBy"):
-            orderby = job.OrderOutputBy
-        else:
-            orderby = "Operation"
-
-        if hasattr(job, "SplitOutput"):
-            split = job.SplitOutput
-        else:
-            split = False
-
-        postlist = []
-
-        if orderby == 'Fixture':
-            PathLog.debug("Ordering by Fixture")
-            # Order by fixture means all operations and tool changes will be completed in one
-            # fixture before moving to the next.
-
-            currTool = None
-            for index, f in enumerate(wcslist):
-                # create an object to serve as the fixture path
-                fobj = _TempObject()
-                c1 = Path.Command(f)
-                fobj.Path = Path.Path([c1])
-                if index != 0:
-                    c2 = Path.Command("G0 Z" + str(job.Stock.Shape.BoundBox.ZMax + job.SetupSheet.ClearanceHeightOffset.Value))
-                    fobj.Path.addCommands(c2)
-                fobj.InList.append(job)
-                sublist = [fobj]
-
-                # Now generate the gcode
-                for obj in job.Operations.Group:
-                    tc = PathUtil.toolControllerForOp(obj)
-                    if tc is not None and PathUtil.opProperty(obj, 'Active'):
-                        if tc.ToolNumber != currTool:
-                            sublist.append(tc)
-                            PathLog.debug("Appending TC: {}".format(tc.Name))
-                            currTool = tc.ToolNumber
-                    sublist.append(obj)
-                postlist.append(sublist)
-
-        elif orderby == 'Tool':
-            PathLog.debug("Ordering by Tool")
-            # Order by tool means tool changes are minimized.
-            # all operations with the current tool are processed in the current
-            # fixture before moving to the next fixture.
-
-            currTool = None
-            fixturelist = []
-            for f in wcslist:
-                # create an object to serve as the fixture path
-                fobj = _TempObject()
-                c1 = Path.Command(f)
-                c2 = Path.Command("G0 Z" + str(job.Stock.Shape.BoundBox.ZMax + job.SetupSheet.ClearanceHeightOffset.Value))
-                fobj.Path = Path.Path([c1, c2])
-                fobj.InList.append(job)
-                fixturelist.append(fobj)
-
-            # Now generate the gcode
-            curlist = []  # list of ops for tool, will repeat for each fixture
-            sublist = []  # list of ops for output splitting
-
-            for idx, obj in enumerate(job.Operations.Group):
-
-                # check if the operation is active
-                active =  PathUtil.opProperty(obj, 'Active')
-
-                tc = PathUtil.toolControllerForOp(obj)
-                if tc is None or tc.ToolNumber == currTool and active:
-                    curlist.append(obj)
-                elif tc.ToolNumber != currTool and currTool is None and active:  # first TC
-                    sublist.append(tc)
-                    curlist.append(obj)
-                    currTool = tc.ToolNumber
-                elif tc.ToolNumber != currTool and currTool is not None and active:  # TC
-                    for fixture in fixturelist:
-                        sublist.append(fixture)
-                        sublist.extend(curlist)
-                    postlist.append(sublist)
-                    sublist = [tc]
-                    curlist = [obj]
-                    currTool = tc.ToolNumber
-
-                if idx == len(job.Operations.Group) - 1:  # Last operation.
-                    for fixture in fixturelist:
-                        sublist.append(fixture)
-                        sublist.extend(curlist)
-                    postlist.append(sublist)
-
-        elif orderby == 'Operation':
-            PathLog.debug("Ordering by Operation")
-            # Order by operation means ops are done in each fixture in
-            # sequence.
-            currTool = None
-            firstFixture = True
-
-            # Now generate the gcode
-            for obj in job.Operations.Group:
-                if PathUtil.opProperty(obj, 'Active'):
-                    sublist = []
-                    PathLog.debug("obj: {}".format(obj.Name))
-                    for f in wcslist:
-                        fobj = _TempObject()
-                        c1 = Path.Command(f)
-                        fobj.Path = Path.Path([c1])
-                        if not firstFixture:
-                            c2 = Path.Command("G0 Z" + str(job.Stock.Shape.BoundBox.ZMax + job.SetupSheet.ClearanceHeightOffset.Value))
-                            fobj.Path.addCommands(c2)
-                        fobj.InList.append(job)
-                        sublist.append(fobj)
-                        firstFixture = False
-                        tc = PathUtil.toolControllerForOp(obj)
-                        if tc is not None:
-                            if tc.ToolNumber != currTool:
-                                sublist.append(tc)
-                                currTool = tc.ToolNumber
-                        sublist.append(obj)
-                    postlist.append(sublist)
+        split = job.SplitOutput if hasattr(job, "SplitOutput") else False
+        postlist = PathBatchPost.buildPostList(job)
 
         fail = True
         rc = '' # pylint: disable=unused-variable
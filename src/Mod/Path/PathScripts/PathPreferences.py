@@ -56,6 +56,9 @@ LibAreaCurveAccuracy    = "LibAreaCurveAccuarcy"
 
 EnableExperimentalFeatures = "EnableExperimentalFeatures"
 
+# Memory budget in MB of the tessellations and STLs kept for OCL based operations
+StlCacheSize = "StlCacheSize"
+
 
 def preferences():
     return FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/Path")
@@ -223,6 +226,9 @@ def setDefaultTaskPanelLayout(style):
 def experimentalFeaturesEnabled():
     return preferences().GetBool(EnableExperimentalFeatures, False)
 
+def stlCacheSize():
+    return preferences().GetInt(StlCacheSize, 512)
+
 def lastPathToolBit():
     return preferences().GetString(LastPathToolBit, pathDefaultToolsPath('Bit'))
     
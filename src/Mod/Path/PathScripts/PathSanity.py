@@ -32,6 +32,7 @@ from PySide import QtCore, QtGui
 import FreeCAD
 import FreeCADGui
 import PathScripts
+import PathScripts.PathCycleTime as PathCycleTime
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtil as PathUtil
 import PathScripts.PathPreferences as PathPreferences
@@ -224,12 +225,16 @@ class CommandPathSanity:
         zMaxLabel = translate("Path_Sanity", "Maximum Z Height")
         cycleTimeLabel = translate("Path_Sanity", "Cycle Time")
         coolantLabel = translate("Path_Sanity", "Coolant")
+        cuttingLabel = translate("Path_Sanity", "Cutting Distance")
+        rapidLabel = translate("Path_Sanity", "Rapid Distance")
+        plungesLabel = translate("Path_Sanity", "Plunges")
         jobTotalLabel = translate("Path_Sanity", "TOTAL JOB")
 
         d = data['runData']
 
         runTable += "|*" + opLabel + "*|*" + zMinLabel + "*|*" + zMaxLabel + \
-            "*|*" + coolantLabel + "*|*" + cycleTimeLabel + "*\n"
+            "*|*" + coolantLabel + "*|*" + cycleTimeLabel + "*|*" + cuttingLabel + \
+            "*|*" + rapidLabel + "*|*" + plungesLabel + "*\n"
 
         for i in d['items']:
             runTable += "|{}".format(i['opName'])
@@ -237,11 +242,17 @@ class CommandPathSanity:
             runTable += "|{}".format(i['maxZ'])
             runTable += "|{}".format(i['coolantMode'])
             runTable += "|{}".format(i['cycleTime'])
+            runTable += "|{}".format(i['cuttingDistance'])
+            runTable += "|{}".format(i['rapidDistance'])
+            runTable += "|{}".format(i['plunges'])
 
-        runTable += "|*" + jobTotalLabel + "* |{} |{} |{}".format(
+        runTable += "|*" + jobTotalLabel + "* |{} |{} | |{} |{} |{} |{}".format(
             d['jobMinZ'],
             d['jobMaxZ'],
-            d['cycletotal'])
+            d['cycletotal'],
+            d['cuttingtotal'],
+            d['rapidtotal'],
+            d['plungetotal'])
 
         # Generate the markup for the Tool Data Section
         toolTables = ""
@@ -547,12 +558,21 @@ class CommandPathSanity:
 
     def __runData(self, obj):
         data = {'cycletotal': '',
+                'cuttingtotal': '',
+                'rapidtotal': '',
+                'plungetotal': '',
                 'jobMinZ': '',
                 'jobMaxZ': '',
                 'jobDescription': '',
                 'items': []}
         try:
             data['cycletotal'] = str(obj.CycleTime)
+            total, estimates, tools = PathCycleTime.estimateJob(obj)  # pylint: disable=unused-variable
+            data['cuttingtotal'] = FreeCAD.Units.Quantity(total.cuttingDistance,
+                    FreeCAD.Units.Length).UserString
+            data['rapidtotal'] = FreeCAD.Units.Quantity(total.rapidDistance,
+                    FreeCAD.Units.Length).UserString
+            data['plungetotal'] = total.plunges
             data['jobMinZ'] = FreeCAD.Units.Quantity(obj.Path.BoundBox.ZMin,
                     FreeCAD.Units.Length).UserString
             data['jobMaxZ'] = FreeCAD.Units.Quantity(obj.Path.BoundBox.ZMax,
@@ -578,6 +598,19 @@ class CommandPathSanity:
                     oplabel = "{} (INACTIVE)".format(oplabel)
                     ctime = 0.0
 
+                estimate = estimates.get(op.Name)
+                if estimate is not None:
+                    ctime = PathCycleTime.formatTime(estimate.time)
+                    cutting = FreeCAD.Units.Quantity(estimate.cuttingDistance,
+                              FreeCAD.Units.Length).UserString
+                    rapid = FreeCAD.Units.Quantity(estimate.rapidDistance,
+                              FreeCAD.Units.Length).UserString
+                    plunges = estimate.plunges
+                else:
+                    cutting = ''
+                    rapid = ''
+                    plunges = ''
+
                 if op.Path.BoundBox.isValid():
                     zmin = FreeCAD.Units.Quantity(op.Path.BoundBox.ZMin,
                               FreeCAD.Units.Length).UserString
@@ -591,6 +624,9 @@ class CommandPathSanity:
                           "minZ": zmin,
                           "maxZ": zmax,
                           "cycleTime": ctime,
+                          "cuttingDistance": cutting,
+                          "rapidDistance": rapid,
+                          "plunges": plunges,
                           "coolantMode": cool}
                 data['items'].append(opdata)
 
@@ -55,8 +55,11 @@ class Template:
     StartDepthExpression = 'StartDepthExpression'
     FinalDepthExpression = 'FinalDepthExpression'
     StepDownExpression = 'StepDownExpression'
+    DropCutterProcesses = 'DropCutterProcesses'
+    MachineAcceleration = 'MachineAcceleration'
+    JunctionDeviation = 'JunctionDeviation'
 
-    All = [HorizRapid, VertRapid, CoolantMode, SafeHeightOffset, SafeHeightExpression, ClearanceHeightOffset, ClearanceHeightExpression, StartDepthExpression, FinalDepthExpression, StepDownExpression]
+    All = [HorizRapid, VertRapid, CoolantMode, SafeHeightOffset, SafeHeightExpression, ClearanceHeightOffset, ClearanceHeightExpression, StartDepthExpression, FinalDepthExpression, StepDownExpression, DropCutterProcesses, MachineAcceleration, JunctionDeviation]
 
 
 def _traverseTemplateAttributes(attrs, codec):
@@ -91,6 +94,11 @@ class SetupSheet:
     DefaultStepDownExpression   = 'OpToolDiameter'
 
     DefaultCoolantModes = ['None', 'Flood', 'Mist'] 
+
+    DefaultDropCutterProcesses = 1
+
+    DefaultMachineAcceleration = '500 mm/s^2'
+    DefaultJunctionDeviation   = '0.01 mm'
    
     def __init__(self, obj):
         self.obj = obj
@@ -109,6 +117,9 @@ class SetupSheet:
         obj.addProperty('App::PropertyString', 'FinalDepthExpression', 'OperationDepths', translate('PathSetupSheet', 'Expression used for FinalDepth of new operations.'))
         obj.addProperty('App::PropertyString', 'StepDownExpression',   'OperationDepths', translate('PathSetupSheet', 'Expression used for StepDown of new operations.'))
 
+        self.addDropCutterProcesses(obj)
+        self.addMachineLimits(obj)
+
         obj.SafeHeightOffset          = self.decodeAttributeString(self.DefaultSafeHeightOffset)
         obj.ClearanceHeightOffset     = self.decodeAttributeString(self.DefaultClearanceHeightOffset)
         obj.SafeHeightExpression      = self.decodeAttributeString(self.DefaultSafeHeightExpression)
@@ -123,6 +134,16 @@ class SetupSheet:
 
         obj.Proxy = self
 
+    def addDropCutterProcesses(self, obj):
+        obj.addProperty('App::PropertyInteger', 'DropCutterProcesses', 'Computation', translate('PathSetupSheet', 'Number of processes scanning the model for 3D Surface and Waterline operations, 0 uses all cores.'))
+        obj.DropCutterProcesses = self.DefaultDropCutterProcesses
+
+    def addMachineLimits(self, obj):
+        obj.addProperty('App::PropertyAcceleration', 'MachineAcceleration', 'Machine', translate('PathSetupSheet', 'Acceleration of the machine used for the cycle time estimate, 0 for none.'))
+        obj.addProperty('App::PropertyLength', 'JunctionDeviation', 'Machine', translate('PathSetupSheet', 'Deviation from the path allowed at the junction of two moves, limits the speed of the machine in corners.'))
+        obj.MachineAcceleration = self.DefaultMachineAcceleration
+        obj.JunctionDeviation = self.DefaultJunctionDeviation
+
     def __getstate__(self):
         return None
 
@@ -175,8 +196,8 @@ class SetupSheet:
                         prop.setupProperty(self.obj, propertyName, propertyGroup, prop.valueFromString(value))
 
 
-    def templateAttributes(self, includeRapids=True, includeCoolantMode=True, includeHeights=True, includeDepths=True, includeOps=None):
-        '''templateAttributes(includeRapids, includeHeights, includeDepths) ... answers a dictionary with the default values.'''
+    def templateAttributes(self, includeRapids=True, includeCoolantMode=True, includeHeights=True, includeDepths=True, includeOps=None, includeComputation=True, includeMachine=True):
+        '''templateAttributes(includeRapids, includeHeights, includeDepths, includeOps, includeComputation, includeMachine) ... answers a dictionary with the default values.'''
         attrs = {}
 
         if includeRapids:
@@ -197,6 +218,13 @@ class SetupSheet:
             attrs[Template.FinalDepthExpression] = self.obj.FinalDepthExpression
             attrs[Template.StepDownExpression]   = self.obj.StepDownExpression
 
+        if includeComputation:
+            attrs[Template.DropCutterProcesses] = self.obj.DropCutterProcesses
+
+        if includeMachine:
+            attrs[Template.MachineAcceleration] = self.obj.MachineAcceleration.UserString
+            attrs[Template.JunctionDeviation]   = self.obj.JunctionDeviation.UserString
+
         if includeOps:
             for opName in includeOps:
                 settings = {}
@@ -279,6 +307,12 @@ class SetupSheet:
             obj.addProperty('App::PropertyEnumeration', 'CoolantMode', 'CoolantMode', translate('PathSetupSheet', 'Default coolant mode.'))
             obj.CoolantMode = self.DefaultCoolantModes
 
+        if not hasattr(obj, 'DropCutterProcesses'):
+            self.addDropCutterProcesses(obj)
+
+        if not hasattr(obj, 'MachineAcceleration'):
+            self.addMachineLimits(obj)
+
 def Create(name = 'SetupSheet'):
     obj = FreeCAD.ActiveDocument.addObject('App::FeaturePython', name)
     obj.Proxy = SetupSheet(obj)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path STL Cache Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Cache of the tessellations and OCL STL surfaces of the 3D Surface and Waterline operations."
+__contributors__ = ""
+
+import array
+import collections
+import hashlib
+
+import PathScripts.PathLog as PathLog
+import PathScripts.PathPreferences as PathPreferences
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+'''
+The model and the safe STL of an OCL based operation only depend on the shapes
+and the tessellation settings, not on feeds, stepover or cut pattern. Thus the
+facets of the tessellation and the ocl.STLSurf built from them are cached by a
+key made of the signatures of the shapes and the settings:
+
+    key = ('model', shapeSignature(model.Shape), obj.LinearDeflection.Value)
+    stl = getSTL(key, lambda: shapeFacets(model.Shape, obj.LinearDeflection.Value), ocl)
+
+The signature of a shape is a hash of its geometry, a changed model gets a new
+key and the entries of the old model are evicted when the cache is full.
+All operations of all jobs share the cache, its size is set by the
+StlCacheSize preference in MB, 0 disables the cache.
+
+An STL of the cache must not be modified, see discard().
+'''
+
+# estimated memory of an ocl.Triangle in an ocl.STLSurf
+STL_TRIANGLE_SIZE = 256
+
+# key -> (value, size in bytes), the least recently used first
+_cache = collections.OrderedDict()
+_size = [0]
+
+
+def _rounded(values):
+    return array.array('d', (float('%.9g' % v) for v in values))
+
+
+def _boundBox(bb):
+    return (bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax)
+
+
+def shapeSignature(shape):
+    '''shapeSignature(shape) ... returns a hash of the geometry of the shape.
+    The hash covers the bound box, the points of all vertexes, the lengths of all edges and the
+    areas and centers of mass of all faces, in the order of the topology. Any change of a vertex
+    changes the hash, even if the edit is symmetric and keeps the area and the moment of the shape.
+    The triangulation stored in the shape is not part of the hash.'''
+    sha = hashlib.sha1()
+    sha.update(_rounded(_boundBox(shape.BoundBox)).tobytes())
+    sha.update(_rounded(c for v in shape.Vertexes for c in (v.X, v.Y, v.Z)).tobytes())
+    sha.update(b';')
+    sha.update(_rounded(e.Length for e in shape.Edges).tobytes())
+    sha.update(b';')
+    values = []
+    for face in shape.Faces:
+        center = face.CenterOfMass
+        values.extend((face.Area, center.x, center.y, center.z))
+    sha.update(_rounded(values).tobytes())
+    return sha.hexdigest()
+
+
+def meshSignature(mesh):
+    '''meshSignature(mesh) ... returns a hash of the points and the facet indices of the mesh.'''
+    points, facets = mesh.Topology
+    sha = hashlib.sha1()
+    sha.update(array.array('d', (c for p in points for c in (p.x, p.y, p.z))).tobytes())
+    sha.update(b';')
+    sha.update(array.array('l', (i for f in facets for i in f)).tobytes())
+    return sha.hexdigest()
+
+
+def shapeFacets(shape, deflection):
+    '''shapeFacets(shape, deflection) ... returns the triangles of the tessellated shape,
+    as array of the x, y, z values of their corners.'''
+    vertices, facetIndices = shape.tessellate(deflection)
+    coords = [(v.x, v.y, v.z) for v in vertices]
+    facets = array.array('d')
+    for f in facetIndices:
+        facets.extend(coords[f[0]])
+        facets.extend(coords[f[1]])
+        facets.extend(coords[f[2]])
+    return facets
+
+
+def meshFacets(mesh):
+    '''meshFacets(mesh) ... returns the triangles of the mesh, as array of the x, y, z values of their corners.'''
+    facets = array.array('d')
+    for tri in mesh.Facets.Points:
+        for v in tri:
+            facets.extend((v[0], v[1], v[2]))
+    return facets
+
+
+def makeSTL(facets, ocl):
+    '''makeSTL(facets, ocl) ... returns a new ocl.STLSurf of the facets.'''
+    stl = ocl.STLSurf()
+    for i in range(0, len(facets), 9):
+        stl.addTriangle(ocl.Triangle(ocl.Point(facets[i], facets[i + 1], facets[i + 2]),
+                                     ocl.Point(facets[i + 3], facets[i + 4], facets[i + 5]),
+                                     ocl.Point(facets[i + 6], facets[i + 7], facets[i + 8])))
+    return stl
+
+
+def cacheSize():
+    '''cacheSize() ... the memory budget of the cache in bytes.'''
+    return PathPreferences.stlCacheSize() * 1024 * 1024
+
+
+def cached(key, make):
+    '''cached(key, make) ... returns the value of key, make() returns (value, size in bytes)
+    if key is not in the cache. The least recently used values are evicted if the cache is full.'''
+    entry = _cache.pop(key, None)
+    if entry is None:
+        entry = make()
+        PathLog.debug("STL cache miss: {}".format(key[0]))
+    else:
+        _size[0] -= entry[1]
+    _cache[key] = entry
+    _size[0] += entry[1]
+    budget = cacheSize()
+    # the value itself is evicted last, if it doesn't fit into the cache at all
+    while _cache and _size[0] > budget:
+        _size[0] -= _cache.popitem(last=False)[1][1]
+    return entry[0]
+
+
+def getFacets(key, makeFacets):
+    '''getFacets(key, makeFacets) ... returns the cached facets of key, makeFacets() creates them if needed.'''
+    def make():
+        facets = makeFacets()
+        return (facets, facets.itemsize * len(facets))
+    return cached(('facets',) + key, make)
+
+
+def getSTL(key, makeFacets, ocl):
+    '''getSTL(key, makeFacets, ocl) ... returns the cached ocl.STLSurf of key.
+    The STL is built from the cached facets of key, makeFacets() creates the facets if needed.'''
+    def make():
+        facets = getFacets(key, makeFacets)
+        return (makeSTL(facets, ocl), STL_TRIANGLE_SIZE * len(facets) // 9)
+    return cached(('stl',) + key, make)
+
+
+def discard(stl):
+    '''discard(stl) ... removes the STL from the cache, the caller may modify it afterwards.
+    The facets stay in the cache, the STL is rebuilt from them on the next use.'''
+    for key in [k for k, (v, s) in _cache.items() if v is stl]:
+        _size[0] -= _cache.pop(key)[1]
+
+
+def clear():
+    '''clear() ... empties the cache.'''
+    _cache.clear()
+    _size[0] = 0
@@ -46,9 +46,12 @@ except ImportError:
     # sys.exit(msg)
 
 import Path
+import PathScripts.PathCompress as PathCompress
+import PathScripts.PathDropCutter as PathDropCutter
 import PathScripts.PathLog as PathLog
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathOp as PathOp
+import PathScripts.PathStlCache as PathStlCache
 import PathScripts.PathSurfaceSupport as PathSurfaceSupport
 import time
 import math
@@ -76,7 +79,8 @@ class ObjectSurface(PathOp.ObjectOp):
         '''opFeatures(obj) ... return all standard features'''
         return PathOp.FeatureTool | PathOp.FeatureDepths \
             | PathOp.FeatureHeights | PathOp.FeatureStepDown \
-            | PathOp.FeatureCoolant | PathOp.FeatureBaseFaces
+            | PathOp.FeatureCoolant | PathOp.FeatureBaseFaces \
+            | PathOp.FeatureCompress
 
     def initOperation(self, obj):
         '''initOperation(obj) ... Initialize the operation by
@@ -557,6 +561,7 @@ class ObjectSurface(PathOp.ObjectOp):
         # Get height offset values for later use
         self.SafeHeightOffset = JOB.SetupSheet.SafeHeightOffset.Value
         self.ClearHeightOffset = JOB.SetupSheet.ClearanceHeightOffset.Value
+        self.dropCutterProcesses = PathDropCutter.processCount(JOB)
 
         # Calculate default depthparams for operation
         self.depthParams = PathUtils.depth_params(obj.ClearanceHeight.Value, obj.SafeHeight.Value, obj.StartDepth.Value, obj.StepDown.Value, 0.0, obj.FinalDepth.Value)
@@ -781,6 +786,8 @@ class ObjectSurface(PathOp.ObjectOp):
         # Prepare PathDropCutter objects with STL data
         pdc = self._planarGetPDC(self.modelSTLs[mdlIdx], depthparams[lenDP - 1], obj.SampleInterval.Value, self.cutter)
         safePDC = self._planarGetPDC(self.safeSTLs[mdlIdx], depthparams[lenDP - 1], obj.SampleInterval.Value, self.cutter)
+        dropCutter = PathDropCutter.DropCutter(self.modelSTLs[mdlIdx], self.cutter, depthparams[lenDP - 1],
+                                               obj.SampleInterval.Value, self.dropCutterProcesses)
 
         profScan = list()
         if obj.ProfileEdges != 'None':
@@ -796,7 +803,7 @@ class ObjectSurface(PathOp.ObjectOp):
                 msg = translate('PathSurface', 'No profile path geometry returned.')
                 PathLog.error(msg)
                 return list()
-            profScan = [self._planarPerformOclScan(obj, pdc, pathOffsetGeom, True)]
+            profScan = [self._planarPerformOclScan(obj, dropCutter, pathOffsetGeom, True)]
 
         geoScan = list()
         if obj.ProfileEdges != 'Only':
@@ -817,9 +824,9 @@ class ObjectSurface(PathOp.ObjectOp):
                     msg = translate('PathSurface', 'No clearing path geometry returned.')
                     PathLog.error(msg)
                     return list()
-                geoScan = [self._planarPerformOclScan(obj, pdc, useGeom, True)]
+                geoScan = [self._planarPerformOclScan(obj, dropCutter, useGeom, True)]
             else:
-                geoScan = self._planarPerformOclScan(obj, pdc, pathGeom, False)
+                geoScan = self._planarPerformOclScan(obj, dropCutter, pathGeom, False)
 
         if obj.ProfileEdges == 'Only':  # ['None', 'Only', 'First', 'Last']
             SCANDATA.extend(profScan)
@@ -894,15 +901,24 @@ class ObjectSurface(PathOp.ObjectOp):
 
         return offsetLists
 
-    def _planarPerformOclScan(self, obj, pdc, pathGeom, offsetPoints=False):
-        '''_planarPerformOclScan(obj, pdc, pathGeom, offsetPoints=False)...
+    def _planarPerformOclScan(self, obj, dropCutter, pathGeom, offsetPoints=False):
+        '''_planarPerformOclScan(obj, dropCutter, pathGeom, offsetPoints=False)...
         Switching function for calling the appropriate path-geometry to OCL points conversion function
-        for the various cut patterns.'''
+        for the various cut patterns. All lines and arcs of the pattern are scanned at once by the
+        PathDropCutter.DropCutter, the scans are then merged back into the pattern in order.'''
         PathLog.debug('_planarPerformOclScan()')
         SCANS = list()
 
         if offsetPoints or obj.CutPattern == 'Offset':
             PNTSET = PathSurfaceSupport.pathGeomToOffsetPointSet(obj, pathGeom)
+            segments = list()
+            for D in PNTSET:
+                for I in D:
+                    if I != 'BRK':
+                        # D format is ((p1, p2), (p3, p4))
+                        (A, B) = I
+                        segments.append(self._planarLineSegment(A, B))
+            scans = iter(dropCutter.scanVectors(segments))
             for D in PNTSET:
                 stpOvr = list()
                 ofst = list()
@@ -912,9 +928,7 @@ class ObjectSurface(PathOp.ObjectOp):
                         stpOvr.append(I)
                         ofst = list()
                     else:
-                        # D format is ((p1, p2), (p3, p4))
-                        (A, B) = I
-                        ofst.extend(self._planarDropCutScan(pdc, A, B))
+                        ofst.extend(next(scans))
                 if len(ofst) > 0:
                     stpOvr.append(ofst)
                 SCANS.extend(stpOvr)
@@ -927,14 +941,20 @@ class ObjectSurface(PathOp.ObjectOp):
             elif obj.CutPattern == 'Spiral':
                 PNTSET = PathSurfaceSupport.pathGeomToSpiralPointSet(obj, pathGeom)
 
+            segments = list()
+            for STEP in PNTSET:
+                for LN in STEP:
+                    if LN != 'BRK':
+                        # D format is ((p1, p2), (p3, p4))
+                        (A, B) = LN
+                        segments.append(self._planarLineSegment(A, B))
+            scans = iter(dropCutter.scanVectors(segments))
             for STEP in PNTSET:
                 for LN in STEP:
                     if LN == 'BRK':
                         stpOvr.append(LN)
                     else:
-                        # D format is ((p1, p2), (p3, p4))
-                        (A, B) = LN
-                        stpOvr.append(self._planarDropCutScan(pdc, A, B))
+                        stpOvr.append(next(scans))
                 SCANS.append(stpOvr)
                 stpOvr = list()
         elif obj.CutPattern in ['Circular', 'CircularZigZag']:
@@ -942,34 +962,40 @@ class ObjectSurface(PathOp.ObjectOp):
             # Each stepover is a list containing arc/loop descriptions, (sp, ep, cp)
             PNTSET = PathSurfaceSupport.pathGeomToCircularPointSet(obj, pathGeom, self.CutClimb, self.toolDiam, self.closedGap, self.gaps, self.tmpCOM)
 
+            segments = list()
+            for (aTyp, dirFlg, ARCS) in PNTSET:
+                cMode = dirFlg == 1
+                for Arc in ARCS:
+                    if Arc != 'BRK':
+                        segments.append(self._planarArcSegment(Arc, cMode))
+            scans = iter(dropCutter.scanVectors(segments))
             for so in range(0, len(PNTSET)):
                 stpOvr = list()
-                erFlg = False
                 (aTyp, dirFlg, ARCS) = PNTSET[so]
 
-                if dirFlg == 1:  # 1
-                    cMode = True
-                else:
-                    cMode = False
-
                 for a in range(0, len(ARCS)):
                     Arc = ARCS[a]
                     if Arc == 'BRK':
                         stpOvr.append('BRK')
                     else:
-                        scan = self._planarCircularDropCutScan(pdc, Arc, cMode)
-                        if scan is False:
-                            erFlg = True
-                        else:
-                            if aTyp == 'L':
-                                scan.append(FreeCAD.Vector(scan[0].x, scan[0].y, scan[0].z))
-                            stpOvr.append(scan)
-                if erFlg is False:
-                    SCANS.append(stpOvr)
+                        scan = next(scans)
+                        if aTyp == 'L':
+                            scan.append(FreeCAD.Vector(scan[0].x, scan[0].y, scan[0].z))
+                        stpOvr.append(scan)
+                SCANS.append(stpOvr)
         # Eif
 
         return SCANS
 
+    def _planarLineSegment(self, A, B):
+        (x1, y1) = A
+        (x2, y2) = B
+        return (x1, y1, x2, y2)
+
+    def _planarArcSegment(self, Arc, cMode):
+        (sp, ep, cp) = Arc
+        return (sp[0], sp[1], ep[0], ep[1], cp[0], cp[1], cMode)
+
     def _planarDropCutScan(self, pdc, A, B):
         (x1, y1) = A
         (x2, y2) = B
@@ -984,23 +1010,6 @@ class ObjectSurface(PathOp.ObjectOp):
         PNTS = [FreeCAD.Vector(p.x, p.y, p.z) for p in CLP]
         return PNTS  # pdc.getCLPoints()
 
-    def _planarCircularDropCutScan(self, pdc, Arc, cMode):
-        path = ocl.Path()  # create an empty path object
-        (sp, ep, cp) = Arc
-
-        # process list of segment tuples (vect, vect)
-        p1 = ocl.Point(sp[0], sp[1], 0)   # start point of arc
-        p2 = ocl.Point(ep[0], ep[1], 0)   # end point of arc
-        C = ocl.Point(cp[0], cp[1], 0)   # center point of arc
-        ao = ocl.Arc(p1, p2, C, cMode)     # arc object
-        path.append(ao)        # add the arc to the path
-        pdc.setPath(path)
-        pdc.run()  # run dropcutter algorithm on path
-        CLP = pdc.getCLPoints()
-
-        # Convert OCL object data to FreeCAD vectors
-        return [FreeCAD.Vector(p.x, p.y, p.z) for p in CLP]
-
     # Main planar scan functions
     def _planarDropCutSingle(self, JOB, obj, pdc, safePDC, depthparams, SCANDATA):
         PathLog.debug('_planarDropCutSingle()')
@@ -1008,10 +1017,6 @@ class ObjectSurface(PathOp.ObjectOp):
         GCODE = [Path.Command('N (Beginning of Single-pass layer.)', {})]
         tolrnc = JOB.GeometryTolerance.Value
         lenSCANDATA = len(SCANDATA)
-        gDIR = ['G3', 'G2']
-
-        if self.CutClimb:
-            gDIR = ['G2', 'G3']
 
         # Set `ProfileEdges` specific trigger indexes
         peIdx = lenSCANDATA  # off by default
@@ -1027,7 +1032,6 @@ class ObjectSurface(PathOp.ObjectOp):
         GCODE.append(Path.Command('G0', {'X': first.x, 'Y': first.y, 'F': self.horizRapid}))
 
         # Cycle through step-over sections (line segments or arcs)
-        odd = True
         lstStpEnd = None
         for so in range(0, lenSCANDATA):
             cmds = list()
@@ -1038,11 +1042,6 @@ class ObjectSurface(PathOp.ObjectOp):
             cmds.append(Path.Command('N (Begin step {}.)'.format(so), {}))
 
             if so > 0:
-                if obj.CutPattern == 'CircularZigZag':
-                    if odd:
-                        odd = False
-                    else:
-                        odd = True
                 cmds.extend(
                     self._stepTransitionCmds(obj, lstStpEnd, first, safePDC,
                                              tolrnc))
@@ -1067,7 +1066,7 @@ class ObjectSurface(PathOp.ObjectOp):
                     if so == peIdx or peIdx == -1:
                         cmds.extend(self._planarSinglepassProcess(obj, prt))
                     elif obj.CutPattern in ['Circular', 'CircularZigZag'] and obj.CircularUseG2G3 is True and lenPrt > 2:
-                        (rtnVal, gcode) = self._arcsToG2G3(prt, lenPrt, odd, gDIR, tolrnc)
+                        (rtnVal, gcode) = self._arcsToG2G3(prt, tolrnc)
                         if rtnVal:
                             cmds.extend(gcode)
                         else:
@@ -1108,10 +1107,6 @@ class ObjectSurface(PathOp.ObjectOp):
         lenDP = len(depthparams)
         prevDepth = depthparams[0]
         lenSCANDATA = len(SCANDATA)
-        gDIR = ['G3', 'G2']
-
-        if self.CutClimb:
-            gDIR = ['G2', 'G3']
 
         # Set `ProfileEdges` specific trigger indexes
         peIdx = lenSCANDATA  # off by default
@@ -1125,7 +1120,6 @@ class ObjectSurface(PathOp.ObjectOp):
         # Process each layer in depthparams
         lastPrvStpLast = None
         for lyr in range(0, lenDP):
-            odd = True  # ZigZag directional switch
             lyrHasCmds = False
             actvSteps = 0
             LYR = list()
@@ -1174,15 +1168,8 @@ class ObjectSurface(PathOp.ObjectOp):
                     first = ADJPRTS[0][0]  # first point of arc/line stepover group
                     last = None
 
-                    # Manage step over transition and CircularZigZag direction
+                    # Manage step over transition
                     if so > 0:
-                        # Control ZigZag direction
-                        if obj.CutPattern == 'CircularZigZag':
-                            if odd is True:
-                                odd = False
-                            else:
-                                odd = True
-                        # Control step over transition
                         if prvStpLast is None:
                             prvStpLast = lastPrvStpLast
                         transCmds.extend(
@@ -1210,7 +1197,7 @@ class ObjectSurface(PathOp.ObjectOp):
                             if so == peIdx or peIdx == -1:
                                 segCmds = self._planarSinglepassProcess(obj, prt)
                             elif obj.CutPattern in ['Circular', 'CircularZigZag'] and obj.CircularUseG2G3 is True and lenPrt > 2:
-                                (rtnVal, gcode) = self._arcsToG2G3(prt, lenPrt, odd, gDIR, tolrnc)
+                                (rtnVal, gcode) = self._arcsToG2G3(prt, tolrnc)
                                 if rtnVal is True:
                                     segCmds = gcode
                                 else:
@@ -1453,60 +1440,16 @@ class ObjectSurface(PathOp.ObjectOp):
 
         return cmds
 
-    def _arcsToG2G3(self, LN, numPts, odd, gDIR, tolrnc):
-        cmds = list()
+    def _arcsToG2G3(self, LN, tolrnc):
+        """Convert the points LN to G1, G2 and G3 commands, the arcs are fit
+        within tolrnc of the points. Returns (False, []) if there is no arc,
+        the direction of the arcs follows the points."""
+        cmds = PathCompress.moveCommands(LN, tolrnc, self.horizFeed)
+        if not [c for c in cmds if c.Name != 'G1']:
+            return (False, [])
         strtPnt = LN[0]
-        endPnt = LN[numPts - 1]
-        strtHght = strtPnt.z
-        coPlanar = True
-        isCircle = False
-        gdi = 0
-        if odd is True:
-            gdi = 1
-
-        # Test if pnt set is circle
-        if abs(strtPnt.x - endPnt.x) < tolrnc:
-            if abs(strtPnt.y - endPnt.y) < tolrnc:
-                if abs(strtPnt.z - endPnt.z) < tolrnc:
-                    isCircle = True
-        isCircle = False
-
-        if isCircle is True:
-            # convert LN to G2/G3 arc, consolidating GCode
-            # https://wiki.shapeoko.com/index.php/G-Code#G2_-_clockwise_arc
-            # https://www.cnccookbook.com/cnc-g-code-arc-circle-g02-g03/
-            # Dividing circle into two arcs allows for G2/G3 on inclined surfaces
-
-            # ijk = self.tmpCOM - strtPnt  # vector from start to center
-            ijk = self.tmpCOM - strtPnt  # vector from start to center
-            xyz = self.tmpCOM.add(ijk)  # end point
-            cmds.append(Path.Command('G1', {'X': strtPnt.x, 'Y': strtPnt.y, 'Z': strtPnt.z, 'F': self.horizFeed}))
-            cmds.append(Path.Command(gDIR[gdi], {'X': xyz.x, 'Y': xyz.y, 'Z': xyz.z,
-                                                'I': ijk.x, 'J': ijk.y, 'K': ijk.z,  # leave same xyz.z height
-                                                'F': self.horizFeed}))
-            cmds.append(Path.Command('G1', {'X': xyz.x, 'Y': xyz.y, 'Z': xyz.z, 'F': self.horizFeed}))
-            ijk = self.tmpCOM - xyz  # vector from start to center
-            rst = strtPnt  # end point
-            cmds.append(Path.Command(gDIR[gdi], {'X': rst.x, 'Y': rst.y, 'Z': rst.z,
-                                                'I': ijk.x, 'J': ijk.y, 'K': ijk.z,  # leave same xyz.z height
-                                                'F': self.horizFeed}))
-            cmds.append(Path.Command('G1', {'X': strtPnt.x, 'Y': strtPnt.y, 'Z': strtPnt.z, 'F': self.horizFeed}))
-        else:
-            for pt in LN:
-                if abs(pt.z - strtHght) > tolrnc:  # test for horizontal coplanar
-                    coPlanar = False
-                    break
-            if coPlanar is True:
-                # ijk = self.tmpCOM - strtPnt
-                ijk = self.tmpCOM.sub(strtPnt)  # vector from start to center
-                xyz = endPnt
-                cmds.append(Path.Command('G1', {'X': strtPnt.x, 'Y': strtPnt.y, 'Z': strtPnt.z, 'F': self.horizFeed}))
-                cmds.append(Path.Command(gDIR[gdi], {'X': xyz.x, 'Y': xyz.y, 'Z': xyz.z,
-                                                    'I': ijk.x, 'J': ijk.y, 'K': ijk.z,  # leave same xyz.z height
-                                                    'F': self.horizFeed}))
-                cmds.append(Path.Command('G1', {'X': endPnt.x, 'Y': endPnt.y, 'Z': endPnt.z, 'F': self.horizFeed}))
-
-        return (coPlanar, cmds)
+        cmds.insert(0, Path.Command('G1', {'X': strtPnt.x, 'Y': strtPnt.y, 'Z': strtPnt.z, 'F': self.horizFeed}))
+        return (True, cmds)
 
     def _planarApplyDepthOffset(self, SCANDATA, DepthOffset):
         PathLog.debug('Applying DepthOffset value: {}'.format(DepthOffset))
@@ -1536,6 +1479,8 @@ class ObjectSurface(PathOp.ObjectOp):
         base = JOB.Model.Group[mdlIdx]
         bb = self.boundBoxes[mdlIdx]
         stl = self.modelSTLs[mdlIdx]
+        # the scans rotate the STL, it must not be used by other operations
+        PathStlCache.discard(stl)
 
         # Rotate model to initial index
         initIdx = obj.CutterTilt + obj.StartIndex
@@ -1758,13 +1703,8 @@ class ObjectSurface(PathOp.ObjectOp):
     def _indexedDropCutScan(self, obj, stl, advances, xmin, ymin, xmax, ymax, layDep, sample):
         cutterOfst = 0.0
         iCnt = 0
-        Lines = []
-        result = None
-
-        pdc = ocl.PathDropCutter()   # create a pdc
-        pdc.setCutter(self.cutter)
-        pdc.setZ(layDep)  # set minimumZ (final / ta9rget depth value)
-        pdc.setSampling(sample)
+        segments = []
+        rotations = []
 
         # if self.useTiltCutter == True:
         if obj.CutterTilt != 0.0:
@@ -1774,55 +1714,47 @@ class ObjectSurface(PathOp.ObjectOp):
         sumAdv = 0.0
         for adv in advances:
             sumAdv += adv
+            rotation = None
             if adv > 0.0:
                 # Rotate STL object using OCL method
                 radsRot = math.radians(adv)
                 if obj.RotationAxis == 'X':
-                    stl.rotate(radsRot, 0.0, 0.0)
+                    rotation = (radsRot, 0.0, 0.0)
                 else:
-                    stl.rotate(0.0, radsRot, 0.0)
-
-            # Set STL after rotation is made
-            pdc.setSTL(stl)
+                    rotation = (0.0, radsRot, 0.0)
+            rotations.append(rotation)
 
             # add Line objects to the path in this loop
             if obj.RotationAxis == 'X':
-                p1 = ocl.Point(xmin, cutterOfst, 0.0)   # start-point of line
-                p2 = ocl.Point(xmax, cutterOfst, 0.0)   # end-point of line
+                p1 = (xmin, cutterOfst)   # start-point of line
+                p2 = (xmax, cutterOfst)   # end-point of line
             else:
-                p1 = ocl.Point(cutterOfst, ymin, 0.0)   # start-point of line
-                p2 = ocl.Point(cutterOfst, ymax, 0.0)   # end-point of line
+                p1 = (cutterOfst, ymin)   # start-point of line
+                p2 = (cutterOfst, ymax)   # end-point of line
 
-            # Create line object
+            # Create line segment
             if obj.RotationAxis == obj.DropCutterDir:  # parallel cut
                 if obj.CutPattern == 'ZigZag':
                     if (iCnt % 2 == 0.0):  # even
-                        lo = ocl.Line(p1, p2)
+                        segments.append(p1 + p2)
                     else:  # odd
-                        lo = ocl.Line(p2, p1)
-                elif obj.CutPattern == 'Line':
+                        segments.append(p2 + p1)
+                else:  # Line
                     if self.CutClimb is True:
-                        lo = ocl.Line(p2, p1)
+                        segments.append(p2 + p1)
                     else:
-                        lo = ocl.Line(p1, p2)
+                        segments.append(p1 + p2)
             else:
-                lo = ocl.Line(p1, p2)   # line-object
-
-            path = ocl.Path()                   # create an empty path object
-            path.append(lo)         # add the line to the path
-            pdc.setPath(path)       # set path
-            pdc.run()               # run drop-cutter on the path
-            result = pdc.getCLPoints()  # request the list of points
-
-            # Convert list of OCL objects to list of Vectors for faster access and Apply depth offset
-            if obj.DepthOffset.Value != 0.0:
-                Lines.append([FreeCAD.Vector(p.x, p.y, p.z + obj.DepthOffset.Value) for p in result])
-            else:
-                Lines.append([FreeCAD.Vector(p.x, p.y, p.z) for p in result])
+                segments.append(p1 + p2)
 
             iCnt += 1
         # End loop
 
+        # Scan the lines, the STL is rotated before each line and left rotated by sumAdv
+        dropCutter = PathDropCutter.DropCutter(stl, self.cutter, layDep, sample, self.dropCutterProcesses)
+        # Convert list of OCL points to list of Vectors for faster access and Apply depth offset
+        Lines = dropCutter.scanVectors(segments, rotations, obj.DepthOffset.Value)
+
         # Rotate STL object back to original position using OCL method
         reset = -1 * math.radians(sumAdv - self.resetTolerance)
         if obj.RotationAxis == 'X':
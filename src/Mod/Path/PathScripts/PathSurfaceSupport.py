@@ -34,8 +34,11 @@ import FreeCAD
 from PySide import QtCore
 import Path
 import PathScripts.PathLog as PathLog
+import PathScripts.PathStlCache as PathStlCache
 import PathScripts.PathUtils as PathUtils
 import math
+import numpy
+import sys
 
 # lazily loaded modules
 from lazy_loader.lazy_loader import LazyLoader
@@ -213,11 +216,10 @@ class PathGeometryGenerator:
             circle = Part.makeCircle(minRad, self.centerOfPattern)
             GeoSet.append(circle)
 
-        for lc in range(1, radialPasses + 1):
-            rad = (lc * self.cutOut)
-            if rad >= minRad:
-                circle = Part.makeCircle(rad, self.centerOfPattern)
-                GeoSet.append(circle)
+        radii = numpy.arange(1, radialPasses + 1) * self.cutOut
+        for rad in radii[radii >= minRad].tolist():
+            circle = Part.makeCircle(rad, self.centerOfPattern)
+            GeoSet.append(circle)
         # Efor
         self.rawGeoList = GeoSet
 
@@ -227,22 +229,15 @@ class PathGeometryGenerator:
     def _Line(self):
         GeoSet = list()
         centRot = FreeCAD.Vector(0.0, 0.0, 0.0)  # Bottom left corner of face/selection/model
-        cAng = math.atan(self.deltaX / self.deltaY)  # BoundaryBox angle
 
         # Create end points for set of lines to intersect with cross-section face
-        pntTuples = list()
-        for lc in range((-1 * (self.halfPasses - 1)), self.halfPasses + 1):
-            x1 = centRot.x - self.halfDiag
-            x2 = centRot.x + self.halfDiag
-            y1 = centRot.y + (lc * self.cutOut)
-            # y2 = y1
-            p1 = FreeCAD.Vector(x1, y1, 0.0)
-            p2 = FreeCAD.Vector(x2, y1, 0.0)
-            pntTuples.append((p1, p2))
+        x1 = centRot.x - self.halfDiag
+        x2 = centRot.x + self.halfDiag
+        Y = centRot.y + numpy.arange(-1 * (self.halfPasses - 1), self.halfPasses + 1) * self.cutOut
 
         # Convert end points to lines
-        for (p1, p2) in pntTuples:
-            line = Part.makeLine(p1, p2)
+        for y1 in Y.tolist():
+            line = Part.makeLine(FreeCAD.Vector(x1, y1, 0.0), FreeCAD.Vector(x2, y1, 0.0))
             GeoSet.append(line)
 
         self.rawGeoList = GeoSet
@@ -252,16 +247,12 @@ class PathGeometryGenerator:
 
     def _Spiral(self):
         GeoSet = list()
-        SEGS = list()
-        draw = True
         loopRadians = 0.0  # Used to keep track of complete loops/cycles
         sumRadians = 0.0
         loopCnt = 0
-        segCnt = 0
         twoPi = 2.0 * math.pi
         maxDist = math.ceil(self.cutOut * self._getRadialPasses())  # self.halfDiag
         move = self.centerOfPattern  # Use to translate the center of the spiral
-        lastPoint = FreeCAD.Vector(0.0, 0.0, 0.0)
 
         # Set tool properties and calculate cutout
         cutOut = self.cutOut / twoPi
@@ -269,57 +260,35 @@ class PathGeometryGenerator:
         stepAng = segLen / ((loopCnt + 1) * self.cutOut)  # math.pi / 18.0  # 10 degrees
         stopRadians = maxDist / cutOut
 
+        # Angles of the spiral points, the step angle shrinks with each loop/cycle
+        angles = list()
+        while True:
+            sumRadians += stepAng  # Increment sumRadians
+            loopRadians += stepAng  # Increment loopRadians
+            angles.append(sumRadians)
+            if loopRadians > twoPi:
+                loopCnt += 1
+                loopRadians -= twoPi
+                stepAng = segLen / ((loopCnt + 1) * self.cutOut)  # adjust stepAng with each loop/cycle
+            if sumRadians > stopRadians:
+                break
+
+        # r = b * radAng with cutOut as 'b', the spiral starts at the origin
+        radAng = numpy.array(angles)
+        X = cutOut * radAng * numpy.cos(radAng)
+        Y = cutOut * radAng * numpy.sin(radAng)
         if self.obj.CutPatternReversed:
-            if self.obj.CutMode == 'Conventional':
-                getPoint = self._makeOppSpiralPnt
-            else:
-                getPoint = self._makeRegSpiralPnt
-
-            while draw:
-                radAng = sumRadians + stepAng
-                p1 = lastPoint
-                p2 = getPoint(move, cutOut, radAng)  # cutOut is 'b' in the equation r = b * radAng
-                sumRadians += stepAng  # Increment sumRadians
-                loopRadians += stepAng  # Increment loopRadians
-                if loopRadians > twoPi:
-                    loopCnt += 1
-                    loopRadians -= twoPi
-                    stepAng = segLen / ((loopCnt + 1) * self.cutOut)  # adjust stepAng with each loop/cycle
-                segCnt += 1
-                lastPoint = p2
-                if sumRadians > stopRadians:
-                    draw = False
-                # Create line and show in Object tree
-                lineSeg = Part.makeLine(p2, p1)
-                SEGS.append(lineSeg)
-            # Ewhile
-            SEGS.reverse()
+            opposite = self.obj.CutMode == 'Conventional'
         else:
-            if self.obj.CutMode == 'Climb':
-                getPoint = self._makeOppSpiralPnt
-            else:
-                getPoint = self._makeRegSpiralPnt
-
-            while draw:
-                radAng = sumRadians + stepAng
-                p1 = lastPoint
-                p2 = getPoint(move, cutOut, radAng)  # cutOut is 'b' in the equation r = b * radAng
-                sumRadians += stepAng  # Increment sumRadians
-                loopRadians += stepAng  # Increment loopRadians
-                if loopRadians > twoPi:
-                    loopCnt += 1
-                    loopRadians -= twoPi
-                    stepAng = segLen / ((loopCnt + 1) * self.cutOut)  # adjust stepAng with each loop/cycle
-                segCnt += 1
-                lastPoint = p2
-                if sumRadians > stopRadians:
-                    draw = False
-                # Create line and show in Object tree
-                lineSeg = Part.makeLine(p1, p2)
-                SEGS.append(lineSeg)
-            # Ewhile
-        # Eif
-        spiral = Part.Wire([ls.Edges[0] for ls in SEGS])
+            opposite = self.obj.CutMode == 'Climb'
+        if opposite:
+            X = -1 * X
+        pnts = [FreeCAD.Vector(0.0, 0.0, 0.0)]
+        pnts.extend(FreeCAD.Vector(x, y, move.z) for (x, y) in zip((X + move.x).tolist(), (Y + move.y).tolist()))
+
+        if self.obj.CutPatternReversed:
+            pnts.reverse()
+        spiral = Part.makePolygon(pnts)
         GeoSet.append(spiral)
 
         self.rawGeoList = GeoSet
@@ -370,16 +339,6 @@ class PathGeometryGenerator:
 
         return radialPasses
 
-    def _makeRegSpiralPnt(self, move, b, radAng):
-        x = b * radAng * math.cos(radAng)
-        y = b * radAng * math.sin(radAng)
-        return FreeCAD.Vector(x, y, 0.0).add(move)
-
-    def _makeOppSpiralPnt(self, move, b, radAng):
-        x = b * radAng * math.cos(radAng)
-        y = b * radAng * math.sin(radAng)
-        return FreeCAD.Vector(-1 * x, y, 0.0).add(move)
-
     def _extractOffsetFaces(self):
         PathLog.debug('_extractOffsetFaces()')
         wires = list()
@@ -1109,9 +1068,37 @@ def _makeSafeSTL(self, JOB, obj, mdlIdx, faceShapes, voidShapes, ocl):
     '''_makeSafeSTL(JOB, obj, mdlIdx, faceShapes, voidShapes)...
     Creates and OCL.stl object with combined data with waste stock,
     model, and avoided faces.  Travel lines can be checked against this
-    STL object to determine minimum travel height to clear stock and model.'''
+    STL object to determine minimum travel height to clear stock and model.
+    The STL is taken from the PathStlCache if the shapes and settings are unchanged.'''
     PathLog.debug('_makeSafeSTL()')
 
+    if self.showDebugObjects:
+        # the debug objects are created with the safe shape only
+        fused = _makeSafeShape(self, JOB, obj, mdlIdx, faceShapes, voidShapes)
+        self.safeSTLs[mdlIdx] = _makeSTL(fused, obj, ocl, useCache=False)
+        return
+
+    Mdl = JOB.Model.Group[mdlIdx]
+    key = ('safe', PathStlCache.shapeSignature(Mdl.Shape), PathStlCache.shapeSignature(JOB.Stock.Shape),
+           obj.BoundBox, obj.LinearDeflection.Value)
+    if obj.BoundBox == 'BaseBoundBox':
+        if obj.BoundaryAdjustment > 0.0:
+            key += (obj.BoundaryAdjustment, tuple(self.depthParams),
+                    tuple(PathStlCache.shapeSignature(f) for f in faceShapes))
+    else:
+        key += (self.cutter.getDiameter(),)
+    if voidShapes:
+        key += (tuple(self.depthParams), tuple(PathStlCache.shapeSignature(v) for v in voidShapes))
+
+    def makeFacets():
+        fused = _makeSafeShape(self, JOB, obj, mdlIdx, faceShapes, voidShapes)
+        return PathStlCache.shapeFacets(fused, obj.LinearDeflection.Value)
+    self.safeSTLs[mdlIdx] = PathStlCache.getSTL(key, makeFacets, ocl)
+
+
+def _makeSafeShape(self, JOB, obj, mdlIdx, faceShapes, voidShapes):
+    '''_makeSafeShape(JOB, obj, mdlIdx, faceShapes, voidShapes)...
+    Returns the compound of the model, the waste stock and the avoided faces for the safe STL.'''
     fuseShapes = list()
     Mdl = JOB.Model.Group[mdlIdx]
     mBB = Mdl.Shape.BoundBox
@@ -1180,35 +1167,69 @@ def _makeSafeSTL(self, JOB, obj, mdlIdx, faceShapes, voidShapes, ocl):
         T.purgeTouched()
         self.tempGroup.addObject(T)
 
-    self.safeSTLs[mdlIdx] = _makeSTL(fused, obj, ocl)
+    return fused
 
 
-def _makeSTL(model, obj, ocl, model_type=None):
+def _makeSTL(model, obj, ocl, model_type=None, useCache=True):
     """Convert a mesh or shape into an OCL STL, using the tessellation
     tolerance specified in obj.LinearDeflection.
+    The STL is taken from the PathStlCache if the model is unchanged,
+    it must not be modified unless useCache is False.
     Returns an ocl.STLSurf()."""
     if model_type == 'M':
-        facets = model.Mesh.Facets.Points
+        mesh = model.Mesh
+        key = ('model', PathStlCache.meshSignature(mesh))
+
+        def makeFacets():
+            return PathStlCache.meshFacets(mesh)
     else:
         if hasattr(model, 'Shape'):
             shape = model.Shape
         else:
             shape = model
-        vertices, facet_indices = shape.tessellate(
-            obj.LinearDeflection.Value)
-        facets = ((vertices[f[0]], vertices[f[1]], vertices[f[2]])
-                  for f in facet_indices)
-    stl = ocl.STLSurf()
-    for tri in facets:
-        v1, v2, v3 = tri
-        t = ocl.Triangle(ocl.Point(v1[0], v1[1], v1[2]),
-                         ocl.Point(v2[0], v2[1], v2[2]),
-                         ocl.Point(v3[0], v3[1], v3[2]))
-        stl.addTriangle(t)
-    return stl
+        deflection = obj.LinearDeflection.Value
+        key = ('model', PathStlCache.shapeSignature(shape), deflection)
+
+        def makeFacets():
+            return PathStlCache.shapeFacets(shape, deflection)
+    if not useCache:
+        return PathStlCache.makeSTL(makeFacets(), ocl)
+    return PathStlCache.getSTL(key, makeFacets, ocl)
 
 
 # Functions to convert path geometry into line/arc segments for OCL input or directly to g-code
+def _edgeEndPoints(edges):
+    '''_edgeEndPoints(edges) ... returns an array with a row (x1, y1, x2, y2) for every edge,
+    the coordinates of its first and last vertex.'''
+    pnts = numpy.empty((len(edges), 4))
+    for i, edg in enumerate(edges):
+        v1 = edg.Vertexes[0]
+        v2 = edg.Vertexes[-1]
+        pnts[i] = (v1.X, v1.Y, v2.X, v2.Y)
+    return pnts
+
+
+def _pointDistances(A, B):
+    '''_pointDistances(A, B) ... returns the distances of the x, y points of the rows of A and B.'''
+    D = A - B
+    return numpy.sqrt(D[:, 0] * D[:, 0] + D[:, 1] * D[:, 1])
+
+
+def _isOnLineSegment(x, y, sx, sy, ex, ey):
+    '''_isOnLineSegment(x, y, sx, sy, ex, ey) ... True if point (x, y) is on the line segment
+    from (sx, sy) to (ex, ey), the same test as FreeCAD.Vector.isOnLineSegment().'''
+    abx = ex - sx
+    aby = ey - sy
+    acx = x - sx
+    acy = y - sy
+    if abs(abx * acy - aby * acx) > sys.float_info.epsilon:
+        return False
+    dot = abx * acx + aby * acy
+    if dot < 0:
+        return False
+    return dot <= abx * abx + aby * aby
+
+
 def pathGeomToLinesPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, gaps):
     '''pathGeomToLinesPointSet(obj, compGeoShp)...
     Convert a compound set of sequential line segments to directionally-oriented collinear groupings.'''
@@ -1218,31 +1239,34 @@ def pathGeomToLinesPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, gaps
     inLine = list()
     chkGap = False
     lnCnt = 0
-    ec = len(compGeoShp.Edges)
     cpa = obj.CutPatternAngle
+    gapThreshold = obj.GapThreshold.Value
+
+    # Gaps between each segment and the previous one: previous end to start, or previous start to end for climb
+    PNTS = _edgeEndPoints(compGeoShp.Edges)
+    if cutClimb is True:
+        GAPS = numpy.abs(toolDiam - _pointDistances(PNTS[:-1, 0:2], PNTS[1:, 2:4])).tolist()
+    else:
+        GAPS = numpy.abs(toolDiam - _pointDistances(PNTS[:-1, 2:4], PNTS[1:, 0:2])).tolist()
+    PNTS = PNTS.tolist()
+    ec = len(PNTS)
 
-    edg0 = compGeoShp.Edges[0]
-    p1 = (edg0.Vertexes[0].X, edg0.Vertexes[0].Y)
-    p2 = (edg0.Vertexes[1].X, edg0.Vertexes[1].Y)
+    (x1, y1, x2, y2) = PNTS[0]
+    p1 = (x1, y1)
+    p2 = (x2, y2)
     if cutClimb is True:
         tup = (p2, p1)
-        lst = FreeCAD.Vector(p1[0], p1[1], 0.0)
     else:
         tup = (p1, p2)
-        lst = FreeCAD.Vector(p2[0], p2[1], 0.0)
     inLine.append(tup)
-    sp = FreeCAD.Vector(p1[0], p1[1], 0.0)  # start point
+    (sx, sy) = p1  # start point
 
     for ei in range(1, ec):
         chkGap = False
-        edg = compGeoShp.Edges[ei]  # Get edge for vertexes
-        v1 = (edg.Vertexes[0].X, edg.Vertexes[0].Y)  # vertex 0
-        v2 = (edg.Vertexes[1].X, edg.Vertexes[1].Y)  # vertex 1
-
-        ep = FreeCAD.Vector(v2[0], v2[1], 0.0)  # end point
-        cp = FreeCAD.Vector(v1[0], v1[1], 0.0)  # check point (first / middle point)
-        # iC = sp.isOnLineSegment(ep, cp)
-        iC = cp.isOnLineSegment(sp, ep)
+        (x1, y1, x2, y2) = PNTS[ei]
+        v1 = (x1, y1)  # vertex 0, check point (first / middle point)
+        v2 = (x2, y2)  # vertex 1, end point
+        iC = _isOnLineSegment(x1, y1, sx, sy, x2, y2)
         if iC is True:
             inLine.append('BRK')
             chkGap = True
@@ -1253,23 +1277,18 @@ def pathGeomToLinesPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, gaps
             lnCnt += 1
             inLine = list()  # reset collinear container
             if cutClimb is True:
-                sp = cp  # FreeCAD.Vector(v1[0], v1[1], 0.0)
+                (sx, sy) = v1
             else:
-                sp = ep
+                (sx, sy) = v2
 
         if cutClimb is True:
             tup = (v2, v1)
-            if chkGap is True:
-                gap = abs(toolDiam - lst.sub(ep).Length)
-            lst = cp
         else:
             tup = (v1, v2)
-            if chkGap is True:
-                gap = abs(toolDiam - lst.sub(cp).Length)
-            lst = ep
 
         if chkGap is True:
-            if gap < obj.GapThreshold.Value:
+            gap = GAPS[ei - 1]
+            if gap < gapThreshold:
                 b = inLine.pop()  # pop off 'BRK' marker
                 (vA, vB) = inLine.pop()  # pop off previous line segment for combining with current
                 tup = (vA, tup[1])
@@ -1320,37 +1339,41 @@ def pathGeomToZigzagPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, gap
     inLine = list()
     lnCnt = 0
     chkGap = False
-    ec = len(compGeoShp.Edges)
     dirFlg = 1
+    gapThreshold = obj.GapThreshold.Value
 
     if cutClimb:
         dirFlg = -1
 
-    edg0 = compGeoShp.Edges[0]
-    p1 = (edg0.Vertexes[0].X, edg0.Vertexes[0].Y)
-    p2 = (edg0.Vertexes[1].X, edg0.Vertexes[1].Y)
+    # Gaps between the start of each segment and the end of the previous one
+    PNTS = _edgeEndPoints(compGeoShp.Edges)
+    LST = PNTS[:-1, 2:4].copy()
+    if dirFlg == -1 and len(LST):
+        LST[0] = PNTS[0, 0:2]
+    GAPS = numpy.abs(toolDiam - _pointDistances(LST, PNTS[1:, 0:2])).tolist()
+    PNTS = PNTS.tolist()
+    ec = len(PNTS)
+
+    (x1, y1, x2, y2) = PNTS[0]
+    p1 = (x1, y1)
+    p2 = (x2, y2)
     if dirFlg == 1:
         tup = (p1, p2)
-        lst = FreeCAD.Vector(p2[0], p2[1], 0.0)
-        sp = FreeCAD.Vector(p1[0], p1[1], 0.0)  # start point
+        (sx, sy) = p1  # start point
     else:
         tup = (p2, p1)
-        lst = FreeCAD.Vector(p1[0], p1[1], 0.0)
-        sp = FreeCAD.Vector(p2[0], p2[1], 0.0)  # start point
+        (sx, sy) = p2  # start point
     inLine.append(tup)
 
     for ei in range(1, ec):
-        edg = compGeoShp.Edges[ei]
-        v1 = (edg.Vertexes[0].X, edg.Vertexes[0].Y)
-        v2 = (edg.Vertexes[1].X, edg.Vertexes[1].Y)
-
-        cp = FreeCAD.Vector(v1[0], v1[1], 0.0)  # check point (start point of segment)
-        ep = FreeCAD.Vector(v2[0], v2[1], 0.0)  # end point
-        iC = cp.isOnLineSegment(sp, ep)
+        (x1, y1, x2, y2) = PNTS[ei]
+        v1 = (x1, y1)  # check point (start point of segment)
+        v2 = (x2, y2)  # end point
+        iC = _isOnLineSegment(x1, y1, sx, sy, x2, y2)
         if iC:
             inLine.append('BRK')
             chkGap = True
-            gap = abs(toolDiam - lst.sub(cp).Length)
+            gap = GAPS[ei - 1]
         else:
             chkGap = False
             if dirFlg == -1:
@@ -1359,16 +1382,15 @@ def pathGeomToZigzagPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, gap
             lnCnt += 1
             dirFlg = -1 * dirFlg  # Change zig to zag
             inLine = list()  # reset collinear container
-            sp = cp  # FreeCAD.Vector(v1[0], v1[1], 0.0)
+            (sx, sy) = v1
 
-        lst = ep
         if dirFlg == 1:
             tup = (v1, v2)
         else:
             tup = (v2, v1)
 
         if chkGap:
-            if gap < obj.GapThreshold.Value:
+            if gap < gapThreshold:
                 b = inLine.pop()  # pop off 'BRK' marker
                 (vA, vB) = inLine.pop()  # pop off previous line segment for combining with current
                 if dirFlg == 1:
@@ -1438,7 +1460,16 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
     segEI = list()
     isSame = False
     sameRad = None
-    ec = len(compGeoShp.Edges)
+    EDGES = compGeoShp.Edges
+    ec = len(EDGES)
+
+    # Vertex coordinates and radius of the first vertex of every edge
+    PNTS = _edgeEndPoints(EDGES)
+    DX = PNTS[:, 0] - COM.x
+    DY = PNTS[:, 1] - COM.y
+    DZ = 0.0 - COM.z
+    RADS = numpy.sqrt(DX * DX + DY * DY + DZ * DZ).tolist()
+    PNTS = PNTS.tolist()
 
     def gapDist(sp, ep):
         X = (ep[0] - sp[0])**2
@@ -1447,19 +1478,16 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
 
     # Separate arc data into Loops and Arcs
     for ei in range(0, ec):
-        edg = compGeoShp.Edges[ei]
-        if edg.Closed is True:
+        if EDGES[ei].Closed is True:
             stpOvrEI.append(('L', ei, False))
         else:
             if isSame is False:
                 segEI.append(ei)
                 isSame = True
-                pnt = FreeCAD.Vector(edg.Vertexes[0].X, edg.Vertexes[0].Y, 0.0)
-                sameRad = pnt.sub(COM).Length
+                sameRad = RADS[ei]
             else:
                 # Check if arc is co-radial to current SEGS
-                pnt = FreeCAD.Vector(edg.Vertexes[0].X, edg.Vertexes[0].Y, 0.0)
-                if abs(sameRad - pnt.sub(COM).Length) > 0.00001:
+                if abs(sameRad - RADS[ei]) > 0.00001:
                     isSame = False
 
                 if isSame is True:
@@ -1470,8 +1498,7 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
                     # Start new list of arc segments
                     segEI = [ei]
                     isSame = True
-                    pnt = FreeCAD.Vector(edg.Vertexes[0].X, edg.Vertexes[0].Y, 0.0)
-                    sameRad = pnt.sub(COM).Length
+                    sameRad = RADS[ei]
     # Process trailing `segEI` data, if available
     if isSame is True:
         stpOvrEI.append(['A', segEI, False])
@@ -1487,21 +1514,21 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
             # Identify startOnAxis and endOnAxis arcs
             for i in range(0, len(EI)):
                 ei = EI[i]  # edge index
-                E = compGeoShp.Edges[ei]  # edge object
-                if abs(COM.y - E.Vertexes[0].Y) < 0.00001:
-                    startOnAxis.append((i, ei, E.Vertexes[0]))
-                elif abs(COM.y - E.Vertexes[1].Y) < 0.00001:
-                    endOnAxis.append((i, ei, E.Vertexes[1]))
+                (x1, y1, x2, y2) = PNTS[ei]  # edge vertexes
+                if abs(COM.y - y1) < 0.00001:
+                    startOnAxis.append((i, ei, x1))
+                elif abs(COM.y - y2) < 0.00001:
+                    endOnAxis.append((i, ei, x2))
 
             # Look for connections between startOnAxis and endOnAxis arcs. Consolidate data when connected
             lenSOA = len(startOnAxis)
             lenEOA = len(endOnAxis)
             if lenSOA > 0 and lenEOA > 0:
                 for soa in range(0, lenSOA):
-                    (iS, eiS, vS) = startOnAxis[soa]
+                    (iS, eiS, xS) = startOnAxis[soa]
                     for eoa in range(0, len(endOnAxis)):
-                        (iE, eiE, vE) = endOnAxis[eoa]
-                        dist = vE.X - vS.X
+                        (iE, eiE, xE) = endOnAxis[eoa]
+                        dist = xE - xS
                         if abs(dist) < 0.00001:  # They connect on axis at same radius
                             SO[2] = (eiE, eiS)
                             break
@@ -1522,24 +1549,22 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
         if SO[0] == 'L':  # L = Loop/Ring/Circle
             # PathLog.debug("SO[0] == 'Loop'")
             lei = SO[1]  # loop Edges index
-            v1 = compGeoShp.Edges[lei].Vertexes[0]
+            (x1, y1) = PNTS[lei][0:2]
 
             # space = obj.SampleInterval.Value / 10.0
             # space = 0.000001
             space = toolDiam * 0.005  # If too small, OCL will fail to scan the loop
 
-            # p1 = FreeCAD.Vector(v1.X, v1.Y, v1.Z)
-            p1 = FreeCAD.Vector(v1.X, v1.Y, 0.0)  # z=0.0 for waterline; z=v1.Z for 3D Surface
-            rad = p1.sub(COM).Length
+            rad = RADS[lei]  # z=0.0 for waterline
             spcRadRatio = space/rad
             if spcRadRatio < 1.0:
                 tolrncAng = math.asin(spcRadRatio)
             else:
                 tolrncAng = 0.99999998 * math.pi
             EX = COM.x + (rad * math.cos(tolrncAng))
-            EY = v1.Y - space  # rad * math.sin(tolrncAng)
+            EY = y1 - space  # rad * math.sin(tolrncAng)
 
-            sp = (v1.X, v1.Y, 0.0)
+            sp = (x1, y1, 0.0)
             ep = (EX, EY, 0.0)
             cp = (COM.x, COM.y, 0.0)
             if dirFlg == 1:
@@ -1557,10 +1582,8 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
 
             if CONN:
                 (iE, iS) = CONN
-                v1 = compGeoShp.Edges[iE].Vertexes[0]
-                v2 = compGeoShp.Edges[iS].Vertexes[1]
-                sp = (v1.X, v1.Y, 0.0)
-                ep = (v2.X, v2.Y, 0.0)
+                sp = (PNTS[iE][0], PNTS[iE][1], 0.0)
+                ep = (PNTS[iS][2], PNTS[iS][3], 0.0)
                 cp = (COM.x, COM.y, 0.0)
                 if dirFlg == 1:
                     arc = (sp, ep, cp)
@@ -1586,10 +1609,9 @@ def pathGeomToCircularPointSet(obj, compGeoShp, cutClimb, toolDiam, closedGap, g
                 if cnt > 0:
                     PRTS.append('BRK')
                     chkGap = True
-                v1 = compGeoShp.Edges[ei].Vertexes[0]
-                v2 = compGeoShp.Edges[ei].Vertexes[1]
-                sp = (v1.X, v1.Y, 0.0)
-                ep = (v2.X, v2.Y, 0.0)
+                (x1, y1, x2, y2) = PNTS[ei]
+                sp = (x1, y1, 0.0)
+                ep = (x2, y2, 0.0)
                 cp = (COM.x, COM.y, 0.0)
                 if dirFlg == 1:
                     arc = (sp, ep, cp)
@@ -1630,43 +1652,23 @@ def pathGeomToSpiralPointSet(obj, compGeoShp):
     '''_pathGeomToSpiralPointSet(obj, compGeoShp)...
     Convert a compound set of sequential line segments to directional, connected groupings.'''
     PathLog.debug('_pathGeomToSpiralPointSet()')
-    # Extract intersection line segments for return value as list()
-    LINES = list()
-    inLine = list()
-    lnCnt = 0
-    ec = len(compGeoShp.Edges)
+    PNTS = _edgeEndPoints(compGeoShp.Edges)
+    ec = len(PNTS)
     start = 2
 
     if obj.CutPatternReversed:
-        edg1 = compGeoShp.Edges[0]  # Skip first edge, as it is the closing edge: center to outer tail
         ec -= 1
         start = 1
-    else:
-        edg1 = compGeoShp.Edges[1]  # Skip first edge, as it is the closing edge: center to outer tail
-    p1 = FreeCAD.Vector(edg1.Vertexes[0].X, edg1.Vertexes[0].Y, 0.0)
-    p2 = FreeCAD.Vector(edg1.Vertexes[1].X, edg1.Vertexes[1].Y, 0.0)
-    tup = ((p1.x, p1.y), (p2.x, p2.y))
-    inLine.append(tup)
+    # Skip first edge, as it is the closing edge: center to outer tail
+    PNTS = PNTS[start - 1:max(ec, start)]
 
-    for ei in range(start, ec):  # Skipped first edge, started with second edge above as edg1
-        edg = compGeoShp.Edges[ei]  # Get edge for vertexes
-        sp = FreeCAD.Vector(edg.Vertexes[0].X, edg.Vertexes[0].Y, 0.0)  # check point (first / middle point)
-        ep = FreeCAD.Vector(edg.Vertexes[1].X, edg.Vertexes[1].Y, 0.0)  # end point
-        tup = ((sp.x, sp.y), (ep.x, ep.y))
+    # A new group starts with every segment not connected to the end of the previous one
+    dist = _pointDistances(PNTS[1:, 0:2], PNTS[:-1, 2:4])
+    BRKS = (numpy.nonzero(dist >= 0.000001)[0] + 1).tolist()
 
-        if sp.sub(p2).Length < 0.000001:
-            inLine.append(tup)
-        else:
-            LINES.append(inLine)  # Save inLine segments
-            lnCnt += 1
-            inLine = list()  # reset container
-            inLine.append(tup)
-        # p1 = sp
-        p2 = ep
-    # Efor
-
-    lnCnt += 1
-    LINES.append(inLine)  # Save inLine segments
+    SEGS = [((x1, y1), (x2, y2)) for (x1, y1, x2, y2) in PNTS.tolist()]
+    LINES = [SEGS[i:j] for (i, j) in zip([0] + BRKS, BRKS + [len(SEGS)])]
+    PathLog.debug('Spiral line count: {}.'.format(len(LINES)))
 
     return LINES
 
@@ -25,6 +25,7 @@
 import FreeCAD
 import Path
 # import PathScripts
+import PathScripts.PathCompress as PathCompress
 import PathScripts.PathJob as PathJob
 import PathScripts.PathGeom as PathGeom
 import math
@@ -654,60 +655,283 @@ def rampPlunge(edge, rampangle, destZ, startZ):
     return rampCmds
 
 
-def sort_jobs(locations, keys, attractors=None):
+class _LocationGrid(object):
+    """ uniform grid over the first two coordinates of the locations of sort_jobs
+        coords: list of coordinate tuples, weights: list of the attractor weights
+        The grid supports removal of locations, it is rebuilt when most of them are removed.
+    """
+
+    def __init__(self, coords, weights, indices=None):
+        self.coords = coords
+        self.weights = weights
+        self.build(list(range(len(coords))) if indices is None else indices)
+
+    def build(self, indices):
+        self.size = len(indices)
+        self.count = len(indices)
+        self.wmin = min(self.weights[i] for i in indices) if indices else 0
+        xs = [self.coords[i][0] for i in indices] or [0]
+        ys = [self.coords[i][1] if len(self.coords[i]) > 1 else 0 for i in indices] or [0]
+        self.x0 = min(xs)
+        self.y0 = min(ys)
+        dx = max(xs) - self.x0
+        dy = max(ys) - self.y0
+        # about two locations per cell, and at most about len(indices) cells along
+        # each side, nearly collinear locations would give tiny cells otherwise
+        n = max(1, len(indices))
+        if dx > 0 and dy > 0:
+            self.cell = max(math.sqrt(2.0 * dx * dy / n), max(dx, dy) / n)
+        else:
+            self.cell = 2.0 * max(dx, dy) / n
+        if self.cell <= 0:
+            self.cell = 1.0
+        self.nx = int(dx / self.cell) + 1
+        self.ny = int(dy / self.cell) + 1
+        self.cells = {}
+        for i in indices:
+            self.cells.setdefault(self.cellOf(self.coords[i]), []).append(i)
+
+    def cellOf(self, c):
+        iy = int(math.floor((c[1] - self.y0) / self.cell)) if len(c) > 1 else 0
+        return (int(math.floor((c[0] - self.x0) / self.cell)), iy)
+
+    def remove(self, i):
+        cell = self.cells[self.cellOf(self.coords[i])]
+        cell.remove(i)
+        self.count -= 1
+        if self.count and self.count * 4 < self.size and self.size > 64:
+            self.build([j for cell in self.cells.values() for j in cell])
+
+    def ring(self, cx, cy, r):
+        """ indices of the locations in the cells at a Chebyshev distance r from (cx, cy) """
+        cells = self.cells
+        for ix in range(max(0, cx - r), min(self.nx - 1, cx + r) + 1):
+            if abs(ix - cx) == r:
+                iys = range(max(0, cy - r), min(self.ny - 1, cy + r) + 1)
+            else:
+                iys = [iy for iy in (cy - r, cy + r) if 0 <= iy < self.ny]
+            for iy in iys:
+                cell = cells.get((ix, iy))
+                if cell:
+                    for i in cell:
+                        yield i
+
+    def rings(self, c):
+        """ generates (lower bound of the square distance, ring indices) from c outwards
+            the search starts at the cell of the grid closest to c if c is outside of it
+        """
+        cx, cy = self.cellOf(c)
+        cx = min(max(cx, 0), self.nx - 1)
+        cy = min(max(cy, 0), self.ny - 1)
+        rmax = max(cx, self.nx - 1 - cx, cy, self.ny - 1 - cy)
+        for r in range(rmax + 1):
+            lb = max(0, r - 1) * self.cell
+            yield lb * lb, self.ring(cx, cy, r)
+
+    def closest(self, c, sqdist, weight=None, slope=None):
+        """ index of the location with the smallest sqdist + weight, the smallest
+            index of equal ones
+            weight, slope: the weight of c and the maximum change of the weight per
+            distance if known, they limit the search to the surroundings of c
+        """
+        best = None
+        bestIndex = None
+        weights = self.weights
+        for lb, indices in self.rings(c):
+            if best is not None:
+                bound = lb + self.wmin
+                if slope is not None:
+                    d = max(math.sqrt(lb), slope / 2.0)
+                    bound = max(bound, d * d - slope * d + weight)
+                # the margin keeps locations of an equal cost despite rounding
+                if bound > best + 1e-9 * (1.0 + abs(best)):
+                    break
+            for i in indices:
+                d = sqdist(i, c) + weights[i]
+                if best is None or d < best or (d == best and i < bestIndex):
+                    best = d
+                    bestIndex = i
+        return bestIndex
+
+    def nearest(self, i, k, sqdist):
+        """ indices of the k locations closest to location i """
+        c = self.coords[i]
+        found = []
+        for lb, indices in self.rings(c):
+            if len(found) >= k and lb > found[k - 1][0]:
+                break
+            found.extend((sqdist(j, c), j) for j in indices if j != i)
+            found.sort()
+        return [j for d, j in found[:k]]
+
+
+def _improve_order(coords, order, grid, time_limit, neighbours=8):
+    """ shortens the travel of the open tour order by 2-opt and or-opt moves
+        within time_limit seconds, the first location is not moved
+    """
+    import time
+    deadline = time.time() + time_limit
+    n = len(order)
+    if n < 4:
+        return order
+
+    def dist(a, b):
+        return math.sqrt(sum((u - v) ** 2 for u, v in zip(coords[a], coords[b])))
+
+    def sqdist(i, c):
+        return sum((u - v) ** 2 for u, v in zip(coords[i], c))
+
+    nearCache = {}
+
+    def near(i):
+        # the neighbour lists are built on first use, they are the expensive part
+        if i not in nearCache:
+            nearCache[i] = grid.nearest(i, neighbours, sqdist)
+        return nearCache[i]
+
+    pos = [0] * len(coords)
+
+    def update(first=0, last=n - 1):
+        for p in range(first, last + 1):
+            pos[order[p]] = p
+
+    def twoOpt(i, j):
+        """ gain of replacing the edges (i, i+1) and (j, j+1) by (i, j) and (i+1, j+1) """
+        a, b, c = order[i], order[i + 1], order[j]
+        gain = dist(a, b) - dist(a, c)
+        if j + 1 < n:
+            d = order[j + 1]
+            gain += dist(c, d) - dist(b, d)
+        return gain
+
+    def orOpt(s, e, k):
+        """ gain and segment of moving order[s:e+1] between k and k+1 """
+        p, x, y = order[s - 1], order[s], order[e]
+        gain = dist(p, x)
+        if e + 1 < n:
+            q = order[e + 1]
+            gain += dist(y, q) - dist(p, q)
+        c = order[k]
+        best = (0, None)
+        if k + 1 < n:
+            d = order[k + 1]
+            base = gain + dist(c, d)
+            for first, second, reverse in ((x, y, False), (y, x, True)):
+                g = base - dist(c, first) - dist(second, d)
+                if g > best[0]:
+                    best = (g, reverse)
+        else:
+            for first, reverse in ((x, False), (y, True)):
+                g = gain - dist(c, first)
+                if g > best[0]:
+                    best = (g, reverse)
+        return best
+
+    eps = 1e-9
+    improved = True
+    while improved and time.time() < deadline:
+        improved = False
+        update()
+        for count, a in enumerate(list(order)):
+            if count % 64 == 0 and time.time() > deadline:
+                break
+            for c in near(a):
+                i, j = sorted((pos[a], pos[c]))
+                if j <= i + 1:
+                    continue
+                # new edge (a, c) between successors or between predecessors
+                for fi, fj in ((i, j), (i - 1, j - 1)):
+                    if fi < 0 or fj <= fi + 1:
+                        continue
+                    if twoOpt(fi, fj) > eps:
+                        order[fi + 1:fj + 1] = order[fi + 1:fj + 1][::-1]
+                        update(fi + 1, fj)
+                        improved = True
+                        break
+                else:
+                    continue
+                break
+            else:
+                # move segments of up to three locations next to a neighbour
+                for length in (1, 2, 3):
+                    s = pos[a]
+                    e = s + length - 1
+                    if s < 1 or e >= n:
+                        break
+                    done = False
+                    for c in near(a):
+                        k = pos[c]
+                        for kk in (k, k - 1):
+                            if kk < 0 or s - 1 <= kk <= e:
+                                continue
+                            g, reverse = orOpt(s, e, kk)
+                            if g > eps:
+                                segment = order[s:e + 1]
+                                if reverse:
+                                    segment.reverse()
+                                if kk > e:
+                                    order[s:kk + 1] = order[e + 1:kk + 1] + segment
+                                    update(s, kk)
+                                else:
+                                    order[kk + 1:e + 1] = segment + order[kk + 1:s]
+                                    update(kk + 1, e)
+                                improved = done = True
+                                break
+                        if done:
+                            break
+                    if done:
+                        break
+    return order
+
+
+def sort_jobs(locations, keys, attractors=None, time_limit=0):
     """ sort holes by the nearest neighbor method
         keys: two-element list of keys for X and Y coordinates. for example ['x','y']
+        attractors: keys of the coordinates which pull the next location towards zero,
+            the X coordinate if not given
+        time_limit: if > 0 the seconds spent on shortening the travel between the
+            sorted locations by 2-opt and or-opt moves, the first location is kept
         originally written by m0n5t3r for PathHelix
+        The locations are kept in a grid, the closest location is searched in the
+        cells around the last one only.
     """
+    if not locations:
+        return []
     if attractors is None:
         attractors = []
-    try:
-        from queue import PriorityQueue
-    except ImportError:
-        from Queue import PriorityQueue
-    from collections import defaultdict
-
     attractors = attractors or [keys[0]]
 
-    def sqdist(a, b):
-        """ square Euclidean distance """
-        d = 0
-        for k in keys:
-            d += (a[k] - b[k]) ** 2
-
-        return d
-
-    def weight(location):
-        w = 0
-
-        for k in attractors:
-            w += abs(location[k])
-
-        return w
-
-    def find_closest(location_list, location, dist):
-        q = PriorityQueue()
+    coords = [tuple(location[k] for k in keys) for location in locations]
+    weights = [sum(abs(location[k]) for k in attractors) for location in locations]
 
-        for i, j in enumerate(location_list):
-            # prevent dictionary comparison by inserting the index
-            q.put((dist(j, location) + weight(j), i, j))
-
-        prio, i, result = q.get()  # pylint: disable=unused-variable
-
-        return result
+    if len(keys) == 2:
+        def sqdist(i, c):
+            """ square Euclidean distance """
+            p = coords[i]
+            return (p[0] - c[0]) ** 2 + (p[1] - c[1]) ** 2
+    else:
+        def sqdist(i, c):
+            """ square Euclidean distance """
+            return sum((u - v) ** 2 for u, v in zip(coords[i], c))
 
-    out = []
-    zero = defaultdict(lambda: 0)
+    # the weight changes at most by slope per distance if the attractors are coordinates
+    slope = math.sqrt(len(attractors)) if all(k in keys for k in attractors) else None
 
-    out.append(find_closest(locations, zero, sqdist))
-    locations.remove(out[-1])
+    grid = _LocationGrid(coords, weights)
+    order = []
+    current = tuple(0 for k in keys)
+    weight = 0
+    for _ in range(len(locations)):
+        closest = grid.closest(current, sqdist, weight, slope)
+        order.append(closest)
+        grid.remove(closest)
+        current = coords[closest]
+        weight = weights[closest]
 
-    while locations:
-        closest = find_closest(locations, out[-1], sqdist)
-        out.append(closest)
-        locations.remove(closest)
+    if time_limit > 0:
+        order = _improve_order(coords, order, _LocationGrid(coords, weights), time_limit)
 
-    return out
+    return [locations[i] for i in order]
 
 
 def guessDepths(objshape, subs=None):
@@ -920,44 +1144,16 @@ def simplify3dLine(line, tolerance=1e-4):
     """Simplify a line defined by a list of App.Vectors, while keeping the
     maximum deviation from the original line within the defined tolerance.
     Implementation of
-    https://en.wikipedia.org/wiki/Ramer%E2%80%93Douglas%E2%80%93Peucker_algorithm"""
-    stack = [(0, len(line) - 1)]
-    results = []
-
-    def processRange(start, end):
-        """Internal worker. Process a range of Vector indices within the
-        line."""
-        if end - start < 2:
-            results.extend(line[start:end])
-            return
-        # Find point with maximum distance
-        maxIndex, maxDistance = 0, 0.0
-        startPoint, endPoint = (line[start], line[end])
-        for i in range(start + 1, end):
-            v = line[i]
-            distance = v.distanceToLineSegment(startPoint, endPoint).Length
-            if distance > maxDistance:
-                maxDistance = distance
-                maxIndex = i
-        if maxDistance > tolerance:
-            # Push second branch first, to be executed last
-            stack.append((maxIndex, end))
-            stack.append((start, maxIndex))
-        else:
-            results.append(line[start])
-
-    while len(stack):
-        processRange(*stack.pop())
-    # Each segment only appended its start point to the final result, so fill in
-    # the last point.
-    results.append(line[-1])
-    return results
+    https://en.wikipedia.org/wiki/Ramer%E2%80%93Douglas%E2%80%93Peucker_algorithm
+    on the array of the points, see PathCompress.simplify()."""
+    return [line[i] for i in PathCompress.simplify(line, tolerance)]
 
 
 def RtoIJ(startpoint, command):
     '''
     This function takes a startpoint and an arc command in radius mode and
-    returns an arc command in IJ mode. Useful for preprocessor scripts
+    returns an arc command in IJ mode. Useful for preprocessor scripts.
+    A negative radius is an arc of more than 180 degrees.
     '''
     if 'R' not in command.Parameters:
         raise ValueError('No R parameter in command')
@@ -968,14 +1164,18 @@ def RtoIJ(startpoint, command):
     radius = command.Parameters['R']
 
     # calculate the IJ
-    # we take a vector between the start and endpoints
-    chord = endpoint.sub(startpoint)
+    # we take a vector between the start and endpoints (we assume the arc is in the XY plane)
+    chord = FreeCAD.Vector(endpoint.x - startpoint.x, endpoint.y - startpoint.y, 0)
+    if chord.Length == 0:
+        raise ValueError('No center of an arc without a chord')
 
-    # Take its perpendicular (we assume the arc is in the XY plane)
+    # Take its perpendicular, the center is right of the chord for CW arcs
     perp = chord.cross(FreeCAD.Vector(0, 0, 1))
+    if (command.Name in ['G3', 'G03']) != (radius < 0):
+        perp = perp.negative()
 
     # use pythagoras to get the perp length
-    plength = math.sqrt(radius**2 - (chord.Length / 2)**2)
+    plength = math.sqrt(max(0, radius**2 - (chord.Length / 2)**2))
     perp.normalize()
     perp.scale(plength, plength, plength)
 
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+from __future__ import print_function
+
+__title__ = "Path Waterline Raster Module"
+__author__ = "FreeCAD Developers"
+__url__ = "http://www.freecadweb.org"
+__doc__ = "Waterline loops of a drop cutter height grid by marching squares."
+__contributors__ = ""
+
+import numpy
+
+'''
+The drop cutter scan of the Waterline operation is a regular grid of cutter
+locations, the scan lines are the rows of the grid. The waterline of a layer is
+the contour of the cutter location heights at the layer depth: inside of it the
+cutter would have to be above the layer depth.
+
+    X, Y, Z = heightGrid(oclScan, numScanLines, pointsPerLine)
+    for depth, loops in zip(depths, waterlineLoops(X, Y, Z, depths, cutClimb)):
+        for loop in loops:
+            ...  # loop is an array of the x, y coordinates of a closed loop
+
+The grid is padded with low points around it, thus material touching the scan
+border is closed by a loop along the border.
+'''
+
+# Segments of the marching squares cells, the corners of the cell are the bits
+# 1: (row, col), 2: (row, col + 1), 4: (row + 1, col + 1), 8: (row + 1, col)
+# and the edges are S: row, N: row + 1, W: col, E: col + 1.
+# Every segment keeps the high corners on its left side.
+_SEGMENTS = {
+    1: [('S', 'W')],
+    2: [('E', 'S')],
+    3: [('E', 'W')],
+    4: [('N', 'E')],
+    6: [('N', 'S')],
+    7: [('N', 'W')],
+    8: [('W', 'N')],
+    9: [('S', 'N')],
+    11: [('E', 'N')],
+    12: [('W', 'E')],
+    13: [('S', 'E')],
+    14: [('W', 'S')],
+}
+# saddle cells, depending on the center being high or low
+_SADDLES = {
+    5: ([('S', 'E'), ('N', 'W')], [('S', 'W'), ('N', 'E')]),
+    10: ([('W', 'S'), ('E', 'N')], [('E', 'S'), ('W', 'N')]),
+}
+
+
+def heightGrid(points, numLines, pointsPerLine, depthOffset=0.0):
+    '''heightGrid(points, numLines, pointsPerLine, depthOffset=0.0) ... returns the X, Y and Z
+    arrays of the scan lines of the drop cutter points, one row per scan line.
+    The points are objects with x, y and z or an array of their coordinates.'''
+    count = numLines * pointsPerLine
+    if isinstance(points, numpy.ndarray):
+        grid = points.reshape(-1, 3)[:count].astype(float)
+    else:
+        grid = numpy.array([(p.x, p.y, p.z) for p in points[:count]], dtype=float)
+    grid = grid.reshape(numLines, pointsPerLine, 3)
+    return grid[:, :, 0], grid[:, :, 1], grid[:, :, 2] + depthOffset
+
+
+def layerMasks(Z, depths):
+    '''layerMasks(Z, depths) ... boolean array of the grid points above every depth.'''
+    return Z[numpy.newaxis, :, :] > numpy.asarray(depths, dtype=float)[:, numpy.newaxis, numpy.newaxis]
+
+
+def waterlineLoops(X, Y, Z, depths, climb=False):
+    '''waterlineLoops(X, Y, Z, depths, climb=False) ... returns a list of loops for every depth.
+    Every loop is a closed array of x, y coordinates, the last point is the first one.
+    The material is on the left side of the loops, on the right side for climb milling.'''
+    low = min(numpy.min(Z), numpy.min(depths)) - 1.0
+    # pad with low points at the coordinates of the border, the loops follow the border
+    Xp = numpy.pad(X, 1, mode='edge')
+    Yp = numpy.pad(Y, 1, mode='edge')
+    Zp = numpy.pad(Z, 1, mode='constant', constant_values=low)
+    return [_layerLoops(Xp, Yp, Zp, high, depth, climb)
+            for depth, high in zip(depths, layerMasks(Zp, depths))]
+
+
+def _crossings(Xp, Yp, Zp, high, depth):
+    '''_crossings(Xp, Yp, Zp, high, depth) ... the coordinates of the depth on all grid edges
+    between a high and a low point, the horizontal edges are numbered first.'''
+    rows, cols = Zp.shape
+    hEdges = rows * (cols - 1)
+    px = numpy.zeros(hEdges + (rows - 1) * cols)
+    py = numpy.zeros(len(px))
+
+    def interpolate(ids, r, c, r2, c2):
+        z0 = Zp[r, c]
+        t = (depth - z0) / (Zp[r2, c2] - z0)
+        px[ids] = Xp[r, c] + t * (Xp[r2, c2] - Xp[r, c])
+        py[ids] = Yp[r, c] + t * (Yp[r2, c2] - Yp[r, c])
+
+    r, c = numpy.nonzero(high[:, :-1] != high[:, 1:])
+    interpolate(r * (cols - 1) + c, r, c, r, c + 1)
+    r, c = numpy.nonzero(high[:-1, :] != high[1:, :])
+    interpolate(hEdges + r * cols + c, r, c, r + 1, c)
+    return px, py
+
+
+def _layerLoops(Xp, Yp, Zp, high, depth, climb):
+    rows, cols = Zp.shape
+    hEdges = rows * (cols - 1)
+    px, py = _crossings(Xp, Yp, Zp, high, depth)
+
+    h = high.astype(numpy.int8)
+    cases = h[:-1, :-1] + 2 * h[:-1, 1:] + 4 * h[1:, 1:] + 8 * h[1:, :-1]
+
+    # the edge following an edge of the contour, -1 for none
+    nxt = numpy.full(len(px), -1, dtype=numpy.int64)
+
+    def link(r, c, segments):
+        edges = {
+            'S': r * (cols - 1) + c,
+            'N': (r + 1) * (cols - 1) + c,
+            'W': hEdges + r * cols + c,
+            'E': hEdges + r * cols + c + 1,
+        }
+        for start, end in segments:
+            nxt[edges[start]] = edges[end]
+
+    for case, segments in _SEGMENTS.items():
+        r, c = numpy.nonzero(cases == case)
+        link(r, c, segments)
+    for case, (highCenter, lowCenter) in _SADDLES.items():
+        r, c = numpy.nonzero(cases == case)
+        center = (Zp[r, c] + Zp[r, c + 1] + Zp[r + 1, c + 1] + Zp[r + 1, c]) / 4.0 > depth
+        link(r[center], c[center], highCenter)
+        link(r[~center], c[~center], lowCenter)
+
+    # follow the contours, starting at the first edge of each in raster order
+    loops = []
+    following = nxt.tolist()
+    for start in numpy.nonzero(nxt >= 0)[0].tolist():
+        if following[start] < 0:
+            continue
+        ids = [start]
+        edge = following[start]
+        following[start] = -1
+        while edge != start and edge >= 0:
+            ids.append(edge)
+            following[edge], edge = -1, following[edge]
+        ids.append(start)
+        loop = numpy.column_stack((px[ids], py[ids]))
+        if climb:
+            loop = loop[::-1]
+        loops.append(loop)
+    return loops
@@ -0,0 +1,533 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+'''
+Common core of the G-code post processors.
+
+A post processor is a GCodeDialect, the settings of the controller, and
+optionally a GCodePost subclass for the few commands the controller handles
+differently. GCodePost generates the program line by line and writes it to
+the output file in chunks, the program is never built as one string unless it
+is shown in the editor or returned to the caller.
+
+A minimal post processor looks like:
+
+    from PathScripts import PostCore
+
+    MACHINE_NAME = "MyMill"
+    UNITS = "G21"
+    ...
+    parser = PostCore.createArgumentParser('mymill')
+    TOOLTIP_ARGS = parser.format_help()
+
+    def export(objectslist, filename, argstring):
+        dialect = PostCore.GCodeDialect.fromGlobals(globals())
+        if not dialect.processArguments(parser, argstring):
+            return None
+        return PostCore.GCodePost(dialect, __name__).export(objectslist, filename)
+'''
+
+from __future__ import print_function
+
+import FreeCAD
+import argparse
+import copy
+import datetime
+import shlex
+
+# Divisors from the FreeCAD internal units (mm, mm/s) to the output units,
+# same as Units.Quantity(value, unit).getValueAs(fmt) but without creating a
+# Quantity for every single value.
+UNIT_DIVISORS = {
+    'mm': 1.0,
+    'in': 25.4,
+    'mm/s': 1.0,
+    'mm/min': 1.0 / 60.0,
+    'in/s': 25.4,
+    'in/min': 25.4 / 60.0,
+}
+
+RAPID_COMMANDS = ['G0', 'G00']
+
+# Module globals of a post processor and the GCodeDialect attribute they set.
+DIALECT_GLOBALS = {
+    'OUTPUT_COMMENTS': 'outputComments',
+    'OUTPUT_HEADER': 'outputHeader',
+    'OUTPUT_LINE_NUMBERS': 'outputLineNumbers',
+    'SHOW_EDITOR': 'showEditor',
+    'MODAL': 'modal',
+    'USE_TLO': 'useTlo',
+    'OUTPUT_DOUBLES': 'outputDoubles',
+    'COMMAND_SPACE': 'commandSpace',
+    'LINENR': 'lineNumberStart',
+    'UNITS': 'units',
+    'UNIT_FORMAT': 'unitFormat',
+    'UNIT_SPEED_FORMAT': 'unitSpeedFormat',
+    'PRECISION': 'precision',
+    'PREAMBLE': 'preamble',
+    'POSTAMBLE': 'postamble',
+    'PRE_OPERATION': 'preOperation',
+    'POST_OPERATION': 'postOperation',
+    'TOOL_CHANGE': 'toolChange',
+}
+
+
+def unitDivisor(unit):
+    '''unitDivisor(unit) ... returns the divisor from the internal unit to unit.'''
+    divisor = UNIT_DIVISORS.get(unit)
+    if divisor is None:
+        divisor = FreeCAD.Units.Quantity('1 ' + unit).Value
+    return divisor
+
+
+class NumberFormat(object):
+    '''Formats values given in FreeCAD internal units in the output unit.
+    The formatted strings are cached, tool paths repeat the same coordinates
+    and feeds over and over.'''
+
+    CacheSize = 65536
+
+    def __init__(self, precision, unit=None):
+        self.divisor = unitDivisor(unit) if unit else 1.0
+        self.spec = '.%df' % int(precision)
+        self.cache = {}
+
+    def __call__(self, value):
+        string = self.cache.get(value)
+        if string is None or not value:
+            # 0.0 and -0.0 are the same key but formatted differently
+            if len(self.cache) >= self.CacheSize:
+                self.cache.clear()
+            string = format(value / self.divisor, self.spec)
+            self.cache[value] = string
+        return string
+
+
+def createArgumentParser(prog):
+    '''createArgumentParser(prog) ... returns the argument parser of the arguments
+    known by GCodeDialect.processArguments().'''
+    # pylint: disable=line-too-long
+    parser = argparse.ArgumentParser(prog=prog, add_help=False)
+    parser.add_argument('--no-header', action='store_true', help='suppress header output')
+    parser.add_argument('--no-comments', action='store_true', help='suppress comment output')
+    parser.add_argument('--line-numbers', action='store_true', help='prefix with line numbers')
+    parser.add_argument('--no-show-editor', action='store_true', help='don\'t pop up editor before writing output')
+    parser.add_argument('--precision', default='3', help='number of digits of precision, default=3')
+    parser.add_argument('--preamble', help='set commands to be issued before the first command, default="G17\nG90"')
+    parser.add_argument('--postamble', help='set commands to be issued after the last command, default="M05\nG17 G90\nM2"')
+    parser.add_argument('--inches', action='store_true', help='Convert output for US imperial mode (G20)')
+    parser.add_argument('--modal', action='store_true', help='Output the Same G-command Name USE NonModal Mode')
+    parser.add_argument('--axis-modal', action='store_true', help='Output the Same Axis Value Mode')
+    parser.add_argument('--no-tlo', action='store_true', help='suppress tool length offset (G43) following tool changes')
+    return parser
+
+
+class GCodeDialect(object):
+    '''Settings of a G-code controller.
+    The class attributes are the defaults, a post processor overrides them with
+    its module globals, see fromGlobals(), and the command line arguments.'''
+
+    outputComments = True
+    outputHeader = True
+    outputLineNumbers = False
+    showEditor = True
+    modal = False           # if true commands are suppressed if the same as previous line.
+    useTlo = True           # if true G43 will be output following tool changes
+    outputDoubles = True    # if false duplicate axis values are suppressed if the same as previous line.
+    commandSpace = ' '
+    trailingSpace = True    # if true every word, including the last one, is followed by commandSpace
+    lineNumberStart = 100
+    lineNumberIncrement = 10
+
+    units = 'G21'
+    unitFormat = 'mm'
+    unitSpeedFormat = 'mm/min'
+    precision = 3
+
+    preamble = ''
+    postamble = ''
+    preOperation = ''
+    postOperation = ''
+    toolChange = ''
+
+    # the order of parameters
+    params = ['X', 'Y', 'Z', 'A', 'B', 'C', 'I', 'J', 'F', 'S', 'T', 'Q', 'R', 'L', 'H', 'D', 'P']
+    intParams = ['T', 'H', 'D', 'S']
+    rapidCommands = RAPID_COMMANDS
+    outputRapidFeed = False
+
+    chunkSize = 1 << 16     # characters written to the file at once
+    editorLimit = 100000    # larger programs are not shown in the editor
+    returnLimit = 1 << 24   # larger programs are only written to the file
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            if not hasattr(self, name):
+                raise AttributeError("GCodeDialect has no setting '%s'" % name)
+            setattr(self, name, value)
+
+    @classmethod
+    def fromGlobals(cls, namespace, **kwargs):
+        '''fromGlobals(namespace, **kwargs) ... returns a dialect with the settings of the
+        customization globals of a post processor module, see DIALECT_GLOBALS.'''
+        settings = {}
+        for name, attr in DIALECT_GLOBALS.items():
+            if name in namespace:
+                settings[attr] = namespace[name]
+        settings.update(kwargs)
+        return cls(**settings)
+
+    def copy(self):
+        return copy.copy(self)
+
+    def setMetric(self, metric):
+        if metric:
+            self.units = 'G21'
+            self.unitFormat = 'mm'
+            self.unitSpeedFormat = 'mm/min'
+        else:
+            self.units = 'G20'
+            self.unitFormat = 'in'
+            self.unitSpeedFormat = 'in/min'
+
+    def processArguments(self, parser, argstring):
+        '''processArguments(parser, argstring) ... applies the arguments to the dialect,
+        returns False if they can't be parsed.'''
+        try:
+            args = parser.parse_args(shlex.split(argstring))
+        except Exception:  # pylint: disable=broad-except
+            return False
+        except SystemExit:
+            return False
+
+        if args.no_header:
+            self.outputHeader = False
+        if args.no_comments:
+            self.outputComments = False
+        if args.line_numbers:
+            self.outputLineNumbers = True
+        if args.no_show_editor:
+            self.showEditor = False
+        print("Show editor = %d" % self.showEditor)
+        self.precision = args.precision
+        if args.preamble is not None:
+            self.preamble = args.preamble
+        if args.postamble is not None:
+            self.postamble = args.postamble
+        if args.inches:
+            self.setMetric(False)
+            self.precision = 4
+        if args.modal:
+            self.modal = True
+        if args.no_tlo:
+            self.useTlo = False
+        if args.axis_modal:
+            self.outputDoubles = False
+        return True
+
+
+class GCodePost(object):
+    '''Generates the G-code of a list of Path objects for a GCodeDialect.
+    All state of a post processing run is kept in the instance, create a new
+    one for every export.'''
+
+    def __init__(self, dialect, name):
+        self.dialect = dialect
+        self.name = name
+        self.lineNumber = dialect.lineNumberStart
+        self.lastCommand = None
+        self.location = {}
+        self.setUnits(dialect.units, dialect.unitFormat, dialect.unitSpeedFormat)
+
+    def setUnits(self, units, unitFormat, unitSpeedFormat):
+        self.units = units
+        self.unitFormat = unitFormat
+        self.unitSpeedFormat = unitSpeedFormat
+        self.formatLength = NumberFormat(self.dialect.precision, unitFormat)
+        self.formatSpeed = NumberFormat(self.dialect.precision, unitSpeedFormat)
+
+    def setMetric(self, metric):
+        if metric:
+            self.setUnits('G21', 'mm', 'mm/min')
+        else:
+            self.setUnits('G20', 'in', 'in/min')
+
+    def linenumber(self):
+        if self.dialect.outputLineNumbers:
+            self.lineNumber += self.dialect.lineNumberIncrement
+            return "N" + str(self.lineNumber) + " "
+        return ""
+
+    def line(self, text):
+        return self.linenumber() + text + "\n"
+
+    def textLines(self, text):
+        for line in text.splitlines(False):
+            yield self.line(line)
+
+    def wordsLine(self, words):
+        if self.dialect.outputLineNumbers:
+            # the line number is a word of its own
+            words = [self.linenumber()] + words
+        space = self.dialect.commandSpace
+        if self.dialect.trailingSpace:
+            return space.join(words) + space + "\n"
+        return space.join(words) + "\n"
+
+    def comment(self, text):
+        if self.dialect.outputComments:
+            yield self.line("(" + text + ")")
+
+    # ********* program *********
+    def lines(self, objectslist):
+        '''lines(objectslist) ... generator of all lines of the program.'''
+        for line in self.headerLines():
+            yield line
+        for obj in objectslist:
+            if self.isActive(obj):
+                for line in self.operationLines(obj):
+                    yield line
+        if self.dialect.outputComments:
+            # the postamble comment never had a line number
+            yield "(begin postamble)\n"
+        for line in self.textLines(self.dialect.postamble):
+            yield line
+
+    def chunks(self, objectslist):
+        '''chunks(objectslist) ... generator of the program in pieces of about chunkSize.'''
+        chunk = []
+        size = 0
+        for line in self.lines(objectslist):
+            chunk.append(line)
+            size += len(line)
+            if size >= self.dialect.chunkSize:
+                yield ''.join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield ''.join(chunk)
+
+    def headerLines(self):
+        if self.dialect.outputHeader:
+            yield self.line("(Exported by FreeCAD)")
+            yield self.line("(Post Processor: " + self.name + ")")
+            yield self.line("(Output Time:" + str(datetime.datetime.now()) + ")")
+        for line in self.comment("begin preamble"):
+            yield line
+        for line in self.textLines(self.dialect.preamble):
+            yield line
+        yield self.line(self.units)
+
+    def isActive(self, obj):
+        if hasattr(obj, 'Active') and not obj.Active:
+            return False
+        if hasattr(obj, 'Base') and hasattr(obj.Base, 'Active') and not obj.Base.Active:
+            return False
+        return True
+
+    def coolantMode(self, obj):
+        if hasattr(obj, "CoolantMode"):
+            return obj.CoolantMode
+        if hasattr(obj, 'Base') and hasattr(obj.Base, "CoolantMode"):
+            return obj.Base.CoolantMode
+        return 'None'
+
+    def operationLines(self, obj):
+        # imported here, PathUtils pulls in the whole workbench
+        from PathScripts import PathUtils
+
+        # fetch machine details
+        job = PathUtils.findParentJob(obj)
+        machine = getattr(job, "MachineName", 'not set')
+        if hasattr(job, "MachineUnits"):
+            self.setMetric(job.MachineUnits == "Metric")
+
+        # do the pre_op
+        for line in self.comment("begin operation: %s" % obj.Label):
+            yield line
+        for line in self.comment("machine: %s, %s" % (machine, self.unitSpeedFormat)):
+            yield line
+        for line in self.textLines(self.dialect.preOperation):
+            yield line
+
+        # turn coolant on if required
+        coolantMode = self.coolantMode(obj)
+        if coolantMode != 'None':
+            for line in self.comment('Coolant On:' + coolantMode):
+                yield line
+        if coolantMode == 'Flood':
+            yield self.line('M8')
+        if coolantMode == 'Mist':
+            yield self.line('M7')
+
+        # process the operation gcode
+        for line in self.pathLines(obj):
+            yield line
+
+        # do the post_op
+        for line in self.comment("finish operation: %s" % obj.Label):
+            yield line
+        for line in self.textLines(self.dialect.postOperation):
+            yield line
+
+        # turn coolant off if required
+        if coolantMode != 'None':
+            for line in self.comment('Coolant Off:' + coolantMode):
+                yield line
+            yield self.line('M9')
+
+    # ********* commands *********
+    def beginPath(self, pathobj):
+        '''beginPath(pathobj) ... resets the modal state before the commands of pathobj.'''
+        self.lastCommand = None
+        self.location = {"X": -1, "Y": -1, "Z": -1, "F": 0.0}
+
+    def pathLines(self, pathobj):
+        '''pathLines(pathobj) ... generator of the lines of the commands of pathobj.'''
+        if hasattr(pathobj, "Group"):  # We have a compound or project.
+            for p in pathobj.Group:
+                for line in self.pathLines(p):
+                    yield line
+            return
+
+        # groups might contain non-path things like stock.
+        if not hasattr(pathobj, "Path"):
+            return
+
+        self.beginPath(pathobj)
+        comments = self.dialect.outputComments
+        for c in pathobj.Path.Commands:
+            name = c.Name
+            if name[0] == '(' and not comments:  # command is a comment
+                continue
+            # Parameters creates a new dict on every access
+            for line in self.commandLines(name, c.Parameters):
+                yield line
+
+    def commandLines(self, name, params):
+        '''commandLines(name, params) ... generator of the lines of one command.'''
+        words = self.commandWords(name, params)
+
+        # Check for Tool Change:
+        if name == 'M6':
+            # stop the spindle
+            yield self.line("M5")
+            for line in self.textLines(self.dialect.toolChange):
+                yield line
+            yield self.wordsLine(words)
+            # add height offset
+            if self.dialect.useTlo:
+                yield self.wordsLine(['G43', 'H' + str(int(params['T']))])
+            return
+
+        if name == "message":
+            words = words[1:]  # remove the command
+
+        if words:
+            yield self.wordsLine(words)
+
+    def commandWords(self, name, params, command=None):
+        '''commandWords(name, params, command=None) ... returns the words of a command and
+        updates the modal state. command is the output name if it differs from name.'''
+        dialect = self.dialect
+        if command is None:
+            command = name
+        words = []
+        # if modal: suppress the command if it is the same as the last one
+        if not (dialect.modal and command == self.lastCommand):
+            words.append(command)
+
+        doubles = dialect.outputDoubles
+        location = self.location
+        for param in dialect.params:
+            value = params.get(param)
+            if value is None:
+                continue
+            if param in dialect.intParams:
+                words.append(param + str(int(value)))
+                continue
+            if not doubles and location.get(param) == value:
+                continue
+            if param == 'F':
+                if name not in dialect.rapidCommands or dialect.outputRapidFeed:
+                    if value > 0.0:
+                        words.append('F' + self.formatSpeed(value))
+            else:
+                words.append(param + self.formatLength(value))
+
+        # store the latest command
+        self.lastCommand = command
+        location.update(params)
+        return words
+
+    # ********* output *********
+    def export(self, objectslist, filename):
+        '''export(objectslist, filename) ... writes the program to filename, '-' for none.
+        Returns the program, or an empty string if it is larger than returnLimit and
+        was only written to the file.'''
+        for obj in objectslist:
+            if not hasattr(obj, "Path"):
+                print("the object " + obj.Name + " is not a path. Please select only path and Compounds.")
+                return None
+
+        print("postprocessing...")
+        dialect = self.dialect
+        showEditor = FreeCAD.GuiUp and dialect.showEditor
+        chunks = []
+        size = 0
+        gfile = None
+        for chunk in self.chunks(objectslist):
+            chunks.append(chunk)
+            size += len(chunk)
+            if showEditor and size > dialect.editorLimit:
+                print("Skipping editor since output is greater than 100kb")
+                showEditor = False
+            if gfile is None and size > dialect.returnLimit and filename != '-' and not showEditor:
+                print("Output is too large to be kept in memory, writing it to %s" % filename)
+                gfile = open(filename, "w")
+            if gfile is not None:
+                gfile.writelines(chunks)
+                chunks = []
+
+        if gfile is not None:
+            gfile.close()
+            print("done postprocessing.")
+            return ''
+
+        final = ''.join(chunks)
+        if showEditor:
+            from PathScripts import PostUtils
+            dia = PostUtils.GCodeEditorDialog()
+            dia.editor.setText(final)
+            result = dia.exec_()
+            if result:
+                final = dia.editor.toPlainText()
+
+        print("done postprocessing.")
+
+        if not filename == '-':
+            with open(filename, "w") as gfile:
+                gfile.write(final)
+
+        return final
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+'''
+Common core of the G-code pre processors.
+
+GCodeReader interprets a G-code program line by line, keeping the modal state
+of the controller: motion mode, units, plane, distance mode, feed rate and the
+parameters of canned cycles. It produces normalized G-code for Path: absolute
+coordinates in FreeCAD internal units (mm, mm/s), one command per line, arcs
+given by a radius converted to I, J, and every motion word explicit.
+
+The input is read as a stream of lines, a file is never read as a whole, and
+the Path of each tool is built from the normalized G-code in one go instead of
+creating its commands one by one:
+
+    for (toolnumber, path) in PreCore.readPaths(filename):
+        ...
+'''
+
+from __future__ import print_function
+
+import FreeCAD
+import Path
+import PathScripts.PathLog as PathLog
+import PathScripts.PathUtils as PathUtils
+import PathScripts.PostCore as PostCore
+import re
+
+PathLog.setLevel(PathLog.Level.INFO, PathLog.thisModule())
+# PathLog.trackModule(PathLog.thisModule())
+
+# words of a line, comments and the rest of a line after a ';'
+WORD = re.compile(r'([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))')
+COMMENT = re.compile(r'\(([^)]*)\)|;(.*)')
+
+AXES = ['X', 'Y', 'Z', 'A', 'B', 'C', 'U', 'V', 'W']
+# words which are a length and need to be converted to mm
+LENGTH_WORDS = ['X', 'Y', 'Z', 'U', 'V', 'W', 'I', 'J', 'K', 'R', 'Q']
+
+MOTION = ['G0', 'G1', 'G2', 'G3']
+CYCLES = ['G73', 'G81', 'G82', 'G83', 'G84', 'G85', 'G86', 'G87', 'G88', 'G89']
+ARCS = ['G2', 'G3']
+
+# modal groups of the G-codes which are part of the state
+PLANE = ['G17', 'G18', 'G19']
+UNITS = ['G20', 'G21']
+DISTANCE = ['G90', 'G91']
+ARC_DISTANCE = ['G90.1', 'G91.1']
+RETRACT = ['G98', 'G99']
+# the parameters of the other codes, which are passed on as they are
+CODE_WORDS = {
+    'G4': ['P'],
+    'G10': ['L', 'P', 'R'] + AXES,
+    'G28': AXES,
+    'G30': AXES,
+    'G41': ['D'],
+    'G42': ['D'],
+    'G43': ['H'],
+    'G53': AXES,
+    'G64': ['P', 'Q'],
+    'G92': AXES,
+}
+
+# the order in which the words of a line are executed, by RS274/NGC
+M_ORDER = ['M3', 'M4', 'M5', 'M7', 'M8', 'M9']
+M_STOP = ['M0', 'M1', 'M2', 'M30', 'M60']
+TOOL_CHANGE = 'M6'
+
+# default number of decimals of the normalized G-code
+PRECISION = 6
+
+
+_codes = {}
+
+
+def code(letter, value):
+    '''code(letter, value) ... the G or M code of the word, without leading zeros: G01 -> G1, G90.1 -> G90.1'''
+    key = letter + value
+    c = _codes.get(key)
+    if c is None:
+        number = float(value)
+        if number == int(number):
+            c = '%s%d' % (letter, int(number))
+        else:
+            c = '%s%s' % (letter, ('%f' % number).rstrip('0'))
+        _codes[key] = c
+    return c
+
+
+def tokenize(line):
+    '''tokenize(line) ... returns (words, comments) of the line.
+    words is a list of (letter, value) tuples in the order of the line, the values are strings.'''
+    comments = []
+
+    def comment(m):
+        comments.append((m.group(1) if m.group(1) is not None else m.group(2)).strip())
+        return ' '
+    if '(' in line or ';' in line:
+        line = COMMENT.sub(comment, line)
+    return (WORD.findall(line.upper()), comments)
+
+
+class GCodeReader(object):
+    '''GCodeReader(comments=False, precision=PRECISION) ... modal interpreter of G-code.
+    Feed the lines to lines() or sections(), the state is kept from one call to the next.
+    If comments is True the comments of the input are kept as Path comments.'''
+
+    def __init__(self, comments=False, precision=PRECISION):
+        self.comments = comments
+        self.precision = precision
+        self.reset()
+
+    def reset(self):
+        '''reset() ... sets the state of a controller after power on.'''
+        self.position = dict((axis, 0.0) for axis in AXES)
+        self.motion = None
+        self.plane = 'G17'
+        self.metric = True
+        self.absolute = True
+        self.arcAbsolute = False
+        self.retract = 'G98'
+        self.feed = None
+        self.speed = None
+        self.tool = None
+        self.toolnumber = 0
+        self.cycle = {}
+        self.cycleZ = None
+        self.warned = set()
+
+    def _warn(self, msg):
+        if msg not in self.warned:
+            self.warned.add(msg)
+            PathLog.warning(msg)
+
+    def _fmt(self, value):
+        s = ('%.*f' % (self.precision, value)).rstrip('0').rstrip('.')
+        if s in ['-0', '']:
+            return '0'
+        return s
+
+    def _line(self, name, params):
+        return ' '.join([name] + ['%s%s' % (k, self._fmt(v)) for (k, v) in params])
+
+    def _target(self, words):
+        '''the absolute target position of the axis words'''
+        target = dict(self.position)
+        for axis in AXES:
+            if axis in words:
+                if self.absolute:
+                    target[axis] = words[axis]
+                else:
+                    target[axis] = self.position[axis] + words[axis]
+        return target
+
+    def _axisParams(self, words, target):
+        return [(axis, target[axis]) for axis in AXES if axis in words]
+
+    def _feedParams(self):
+        if self.feed is None:
+            return []
+        return [('F', self.feed)]
+
+    def _motion(self, name, words):
+        target = self._target(words)
+        params = self._axisParams(words, target)
+        if name in ARCS:
+            params.extend(self._arcParams(name, words, target))
+        if name != 'G0':
+            params.extend(self._feedParams())
+        self.position = target
+        return self._line(name, params)
+
+    def _arcParams(self, name, words, target):
+        if 'R' in words:
+            if self.plane != 'G17':
+                self._warn("Arcs given by R are only converted in the XY plane")
+                return [('R', words['R'])]
+            start = FreeCAD.Vector(self.position['X'], self.position['Y'], self.position['Z'])
+            cmd = Path.Command(name, {'X': target['X'], 'Y': target['Y'], 'Z': target['Z'], 'R': words['R']})
+            try:
+                arc = PathUtils.RtoIJ(start, cmd)
+            except Exception:  # pylint: disable=broad-except
+                self._warn("Arcs given by R without a center are kept as they are")
+                return [('R', words['R'])]
+            return [('I', arc.Parameters['I']), ('J', arc.Parameters['J'])]
+        params = []
+        for (letter, axis) in [('I', 'X'), ('J', 'Y'), ('K', 'Z')]:
+            if letter in words:
+                value = words[letter]
+                if self.arcAbsolute:
+                    value -= self.position[axis]
+                params.append((letter, value))
+        return params
+
+    def _cycle(self, name, words):
+        '''a canned cycle, every hole gets all parameters of the cycle'''
+        if self.cycleZ is None:
+            self.cycleZ = self.position['Z']
+        for letter in ['R', 'Q', 'P', 'Z']:
+            if letter in words:
+                value = words[letter]
+                if not self.absolute and letter == 'R':
+                    value += self.cycleZ
+                elif not self.absolute and letter == 'Z':
+                    value += self.cycle.get('R', self.cycleZ)
+                self.cycle[letter] = value
+        if 'L' in words and words['L'] != 1:
+            self._warn("Repetitions L of canned cycles are not supported")
+        target = dict(self.position)
+        for axis in ['X', 'Y']:
+            if axis in words:
+                target[axis] = words[axis] if self.absolute else self.position[axis] + words[axis]
+        params = [('X', target['X']), ('Y', target['Y'])]
+        params.extend((letter, self.cycle[letter]) for letter in ['Z', 'R', 'Q', 'P'] if letter in self.cycle)
+        params.extend(self._feedParams())
+        # the tool ends up at R, or back at the initial height for G98
+        r = self.cycle.get('R', self.cycleZ)
+        target['Z'] = max(self.cycleZ, r) if self.retract == 'G98' else r
+        self.position = target
+        return self._line(name, params)
+
+    def _setMotion(self, motion):
+        if motion != self.motion:
+            self.cycleZ = None
+            if motion not in CYCLES:
+                self.cycle = {}
+        self.motion = motion
+
+    def line(self, line):
+        '''line(line) ... interprets one line of G-code and returns its normalized G-code lines.
+        A tool change is returned as 'M6 T<toolnumber>'.'''
+        (tokens, comments) = tokenize(line)
+        output = []
+        if self.comments:
+            output.extend('(%s)' % c for c in comments if c)
+
+        gcodes = []
+        mcodes = []
+        words = {}
+        for (letter, value) in tokens:
+            if letter == 'G':
+                gcodes.append(code('G', value))
+            elif letter == 'M':
+                mcodes.append(code('M', value))
+            elif letter == 'N':
+                continue
+            else:
+                words[letter] = float(value)
+
+        # the units and distance mode of the line apply to all of its words
+        for g in gcodes:
+            if g in UNITS:
+                self.metric = g == 'G21'
+            elif g in DISTANCE:
+                self.absolute = g == 'G90'
+            elif g in ARC_DISTANCE:
+                self.arcAbsolute = g == 'G90.1'
+        if not self.metric:
+            for letter in LENGTH_WORDS:
+                if letter in words:
+                    words[letter] *= PostCore.UNIT_DIVISORS['in']
+
+        if 'F' in words:
+            words['F'] *= PostCore.UNIT_DIVISORS['mm/min' if self.metric else 'in/min']
+            self.feed = words['F']
+        if 'S' in words:
+            self.speed = words['S']
+        if 'T' in words:
+            self.tool = int(words['T'])
+
+        if mcodes:
+            if TOOL_CHANGE in mcodes:
+                if self.tool is not None:
+                    self.toolnumber = self.tool
+                output.append(self._line(TOOL_CHANGE, [('T', self.toolnumber)]))
+            for m in [m for m in M_ORDER if m in mcodes]:
+                params = [('S', self.speed)] if m in ['M3', 'M4'] and self.speed is not None else []
+                output.append(self._line(m, params))
+            output.extend(m for m in mcodes if m not in M_ORDER and m not in M_STOP and m != TOOL_CHANGE)
+
+        motion = None
+        for g in gcodes:
+            if g in MOTION or g in CYCLES:
+                motion = g
+            elif g == 'G80':
+                self._setMotion(None)
+                self.cycle = {}
+            elif g in PLANE:
+                if g != self.plane:
+                    self.plane = g
+                    output.append(g)
+            elif g in RETRACT:
+                self.retract = g
+                output.append(g)
+            elif g == 'G93':
+                self._warn("Inverse time feed rate G93 is not supported")
+            elif g in UNITS or g in DISTANCE or g in ARC_DISTANCE or g == 'G94':
+                continue
+            else:
+                # all the other codes are passed on with their parameters, which are not part of a move
+                params = [(k, words.pop(k)) for k in CODE_WORDS.get(g, []) if k in words]
+                output.append(self._line(g, params))
+
+        if motion:
+            self._setMotion(motion)
+        move = any(axis in words for axis in AXES)
+        if motion in ARCS and any(w in words for w in ['I', 'J', 'K']):
+            # a full circle
+            move = True
+        if move and self.motion:
+            if self.motion in CYCLES:
+                output.append(self._cycle(self.motion, words))
+            else:
+                output.append(self._motion(self.motion, words))
+
+        if mcodes:
+            output.extend(m for m in mcodes if m in M_STOP)
+        return output
+
+    def lines(self, lines):
+        '''lines(lines) ... generator of the normalized G-code lines of all lines.'''
+        for line in lines:
+            for out in self.line(line):
+                yield out
+
+    def sections(self, lines):
+        '''sections(lines) ... generator of (toolnumber, lines) of the normalized G-code between tool changes.
+        The tool changes are not part of the sections, empty sections are skipped.'''
+        section = []
+        toolnumber = self.toolnumber
+        for out in self.lines(lines):
+            if out.startswith(TOOL_CHANGE + ' '):
+                if section:
+                    yield (toolnumber, section)
+                section = []
+                toolnumber = self.toolnumber
+            else:
+                section.append(out)
+        if section:
+            yield (toolnumber, section)
+
+
+def pathFor(lines):
+    '''pathFor(lines) ... returns a Path of the normalized G-code lines, parsed all at once.'''
+    return Path.Path('\n'.join(lines))
+
+
+def readPaths(filename, comments=False):
+    '''readPaths(filename, comments=False) ... generator of (toolnumber, Path) of the G-code file,
+    a Path for every section between tool changes.'''
+    reader = GCodeReader(comments)
+    with open(filename) as gfile:
+        for (toolnumber, lines) in reader.sections(gfile):
+            yield (toolnumber, pathFor(lines))
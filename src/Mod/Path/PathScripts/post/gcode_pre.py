@@ -32,8 +32,9 @@ PathCustom objects in the job.  Tool Change commands themselves are not
 preserved. It is up to the user to create and assign appropriate tool
 controllers.
 
-Only gcodes that are supported by Path are imported. Thus things like G43
-are suppressed.
+The gcode is interpreted with its modal state by PreCore.GCodeReader: the
+moves are converted to absolute coordinates in mm and mm/s, arcs given by R
+to I and J, and the axis words of modal moves get their command.
 
 Importing gcode is inherently dangerous because context cannot be safely
 assumed. The user should carefully examine the resulting gcode!
@@ -46,7 +47,7 @@ import os
 import FreeCAD
 import PathScripts.PathUtils as PathUtils
 import PathScripts.PathLog as PathLog
-import re
+import PathScripts.PreCore as PreCore
 import PathScripts.PathCustom as PathCustom
 import PathScripts.PathCustomGui as PathCustomGui
 import PathScripts.PathOpGui as PathOpGui
@@ -84,95 +85,31 @@ def matchToolController(op, toolnumber):
 def insert(filename, docname):
     "called when freecad imports a file"
     PathLog.track(filename)
-    gfile = pythonopen(filename)
-    gcode = gfile.read()
-    gfile.close()
+    reader = PreCore.GCodeReader()
 
-    # Regular expression to match tool changes in the format 'M6 Tn'
-    p = re.compile('[mM]+?\s?0?6\s?T\d*\s')
+    # iterate the gcode sections between tool changes and add customs for each
+    with pythonopen(filename) as gfile:
+        for (toolnumber, gcode) in reader.sections(gfile):
 
-    # split the gcode on tool changes
-    paths = re.split('([mM]+?\s?0?6\s?T\d*\s)', gcode)
+            # Create a custom and viewobject
+            obj = PathCustom.Create("Custom")
+            res = PathOpGui.CommandResources('Custom', PathCustom.Create, PathCustomGui.TaskPanelOpPage, 'Path-Custom', 'Path-Custom', '', '')
+            obj.ViewObject.Proxy = PathOpGui.ViewProvider(obj.ViewObject, res)
+            obj.ViewObject.Proxy.setDeleteObjectsOnReject(False)
 
-    # iterate the gcode sections and add customs for each
-    toolnumber = 0
-
-    for path in paths:
-
-        # if the section is a tool change, extract the tool number
-        m = p.match(path)
-        if m:
-            toolnumber = int(m.group().split('T')[-1])
-            continue
-
-        # Parse the gcode and throw away any empty lists
-        gcode = parse(path)
-        if len(gcode) == 0:
-            continue
-
-        # Create a custom and viewobject
-        obj = PathCustom.Create("Custom")
-        res = PathOpGui.CommandResources('Custom', PathCustom.Create, PathCustomGui.TaskPanelOpPage, 'Path-Custom', 'Path-Custom', '', '')
-        obj.ViewObject.Proxy = PathOpGui.ViewProvider(obj.ViewObject, res)
-        obj.ViewObject.Proxy.setDeleteObjectsOnReject(False)
-
-        # Set the gcode and try to match a tool controller
-        obj.Gcode = gcode
-        obj.ToolController = matchToolController(obj, toolnumber)
+            # Set the gcode and try to match a tool controller
+            obj.Gcode = gcode
+            obj.ToolController = matchToolController(obj, toolnumber)
 
     FreeCAD.ActiveDocument.recompute()
 
 
 def parse(inputstring):
     "parse(inputstring): returns a parsed output string"
-
-    supported = ['G0', 'G00',
-                 'G1', 'G01',
-                 'G2', 'G02',
-                 'G3', 'G03',
-                 'G81', 'G82', 'G83',
-                 'G90', 'G91']
-
-    axis = ["X", "Y", "Z", "A", "B", "C", "U", "V", "W"]
-
     print("preprocessing...")
     PathLog.track(inputstring)
-    # split the input by line
-    lines = inputstring.splitlines()
-    output = []
-    lastcommand = None
-
-    for lin in lines:
-        # remove any leftover trailing and preceding spaces
-        lin = lin.strip()
-
-        # discard empty lines
-        if not lin:
-            continue
-
-        # remove line numbers
-        if lin[0].upper() in ["N"]:
-            lin = lin.split(" ", 1)
-            if len(lin) >= 1:
-                lin = lin[1].strip()
-            else:
-                continue
-
-        # Anything else not a G/M code or an axis move is ignored.
-        if lin[0] not in ["G", "M", "X", "Y", "Z", "A", "B", "C", "U", "V", "W"]:
-            continue
-
-        # if the remaining line is supported, store it
-        currcommand = lin.split()[0]
-
-        if currcommand in supported:
-            output.append(lin)
-            lastcommand = currcommand
-
-        # modal commands have no G or M but have axis moves. append those too.
-        elif currcommand[0] in axis and lastcommand:
-            output.append(lastcommand + " " + lin)
-
+    output = [line for line in PreCore.GCodeReader().lines(inputstring.splitlines())
+              if not line.startswith(PreCore.TOOL_CHANGE + ' ')]
     print("done preprocessing.")
     return output
 
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import PathScripts.PathBatchPost as PathBatchPost
+import PathScripts.PathPreferences as PathPreferences
+import os
+import shutil
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class TestObject(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def op(name, tc, active=True):
+    return TestObject(Name=name, Label=name, ToolController=tc, Active=active)
+
+
+def tc(number):
+    return TestObject(Name="TC{}".format(number), ToolNumber=number)
+
+
+# writes the names of the posted objects and returns None, as many of the post processors do
+StubPost = '''
+def export(objectslist, filename, argstring):
+    if argstring == '--raise':
+        raise ValueError('stub failed')
+    if argstring == '--nofile':
+        return 'G0 X0'
+    with open(filename, 'w') as f:
+        f.write(' '.join(o.Name for o in objectslist))
+    return None
+'''
+
+
+class TestPathBatchPost(PathTestBase):
+
+    def setUp(self):
+        self.t1 = tc(1)
+        self.t2 = tc(2)
+        self.ops = [op('a', self.t1), op('b', self.t1), op('c', self.t2), op('d', self.t2, False), op('e', self.t1)]
+        box = TestObject(ZMax=10)
+        self.job = TestObject(Name='Job', Label='Job', Fixtures=['G54', 'G55'], OrderOutputBy='Operation',
+                              Operations=TestObject(Group=self.ops), SplitOutput=False,
+                              PostProcessorOutputFile='', PostProcessor='', PostProcessorArgs='',
+                              Stock=TestObject(Shape=TestObject(BoundBox=box)),
+                              SetupSheet=TestObject(ClearanceHeightOffset=TestObject(Value=5)),
+                              Document=TestObject(Name='Doc', Label='Part', FileName=''))
+        self.dir = tempfile.mkdtemp()
+        self.defaultFilePath = PathPreferences.defaultFilePath
+        self.jobsOf = PathBatchPost.jobsOf
+
+    def tearDown(self):
+        PathPreferences.defaultFilePath = self.defaultFilePath
+        PathBatchPost.jobsOf = self.jobsOf
+        shutil.rmtree(self.dir)
+
+    def useStubPost(self):
+        '''Installs the stub post processor, the forked workers of the pool inherit it.'''
+        posts = os.path.join(self.dir, 'posts')
+        os.mkdir(posts)
+        with open(os.path.join(posts, 'batchstub_post.py'), 'w') as f:
+            f.write(StubPost)
+        PathPreferences.defaultFilePath = lambda: posts
+        self.job.PostProcessor = 'batchstub'
+        self.job.PostProcessorOutputFile = '%D/%d-%j%s.ngc'
+
+    def names(self, postlist):
+        return [[o.Path.Commands[0].Name if o.Name == 'Fixture' else o.Name for o in slist] for slist in postlist]
+
+    def test00(self):
+        '''Verify the post lists of the output orders.'''
+        postlist = PathBatchPost.buildPostList(self.job)
+        self.assertEqual(self.names(postlist), [['G54', 'TC1', 'a', 'G55', 'a'], ['G54', 'b', 'G55', 'b'],
+                                                ['G54', 'TC2', 'c', 'G55', 'c'], ['G54', 'TC1', 'e', 'G55', 'e']])
+        # only the first fixture doesn't retract to the clearance height
+        self.assertEqual(len(postlist[0][0].Path.Commands), 1)
+        self.assertEqual(len(postlist[0][3].Path.Commands), 2)
+        self.assertRoughly(postlist[0][3].Path.Commands[1].Parameters['Z'], 15)
+        self.assertEqual(postlist[0][0].InList, [self.job])
+
+        self.job.OrderOutputBy = 'Fixture'
+        self.assertEqual(self.names(PathBatchPost.buildPostList(self.job)),
+                         [['G54', 'TC1', 'a', 'b', 'TC2', 'c', 'd', 'TC1', 'e'],
+                          ['G55', 'a', 'b', 'TC2', 'c', 'd', 'TC1', 'e']])
+
+        self.job.OrderOutputBy = 'Tool'
+        self.assertEqual(self.names(PathBatchPost.buildPostList(self.job)),
+                         [['TC1', 'G54', 'a', 'b', 'G55', 'a', 'b'], ['TC2', 'G54', 'c', 'G55', 'c'],
+                          ['TC1', 'G54', 'e', 'G55', 'e']])
+
+    def test01(self):
+        '''Verify the output file names of jobs and their split output.'''
+        self.job.PostProcessorOutputFile = '%D/%d-%j%s.ngc'
+        self.assertTrue(PathBatchPost.expandFileName(self.job, self.job.PostProcessorOutputFile) is None)
+
+        self.job.Document.FileName = os.path.join(self.dir, 'part.FCStd')
+        self.assertEqual(PathBatchPost.outputFileName(self.job), os.path.join(self.dir, 'Part-Job.ngc'))
+        self.assertEqual(PathBatchPost.outputFileName(self.job, 2), os.path.join(self.dir, 'Part-Job_2.ngc'))
+
+        # split output without a place for the subpart
+        self.job.PostProcessorOutputFile = '%D/%j.ngc'
+        self.assertEqual(PathBatchPost.outputFileName(self.job, 3), os.path.join(self.dir, 'Job_3.ngc'))
+        self.assertEqual(PathBatchPost.outputFileName(self.job, outputDir='/x'), None)
+        out = os.path.join(self.dir, 'out')
+        os.mkdir(out)
+        self.assertEqual(PathBatchPost.outputFileName(self.job, outputDir=out), os.path.join(out, 'Job.ngc'))
+
+    def test02(self):
+        '''Verify unique file names and the report of the posts.'''
+        name = os.path.join(self.dir, 'job.ngc')
+        self.assertEqual(PathBatchPost.uniqueFileName(name), name)
+        open(name, 'w').close()
+        self.assertEqual(PathBatchPost.uniqueFileName(name), os.path.join(self.dir, 'job001.ngc'))
+        open(os.path.join(self.dir, 'job001.ngc'), 'w').close()
+        self.assertEqual(PathBatchPost.uniqueFileName(name), os.path.join(self.dir, 'job002.ngc'))
+
+        ok = PathBatchPost.PostResult('/a/part.FCStd', 'Job', 'linuxcnc')
+        ok.files = ['/a/Job.ngc']
+        ok.seconds = 1.5
+        failed = PathBatchPost.PostResult('/a/other.FCStd', 'Job001', 'grbl')
+        failed.error = 'no post processor'
+        failed.seconds = 0.25
+        lines = PathBatchPost.report([ok, failed], 1.0).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[1].startswith('part.FCStd'))
+        self.assertTrue(lines[1].endswith('/a/Job.ngc'))
+        self.assertTrue(lines[2].endswith('FAILED: no post processor'))
+        self.assertEqual(lines[3], '1 jobs posted, 1 failed, 1.75s post time in 1.00s elapsed')
+
+    def test03(self):
+        '''Verify posting a job detects the failed posts from the output file.'''
+        self.useStubPost()
+        self.job.Document.FileName = os.path.join(self.dir, 'part.FCStd')
+        name = os.path.join(self.dir, 'Part-Job.ngc')
+
+        # the stub returns None after writing the file
+        result = PathBatchPost.postJob(self.job)
+        self.assertEqual(result.error, None)
+        self.assertEqual(result.post, 'batchstub')
+        self.assertEqual(result.files, [name])
+        with open(name) as f:
+            self.assertEqual(f.read().split(), ['Fixture', 'TC1', 'a', 'Fixture', 'a', 'Fixture', 'b', 'Fixture', 'b',
+                                                'Fixture', 'TC2', 'c', 'Fixture', 'c', 'Fixture', 'TC1', 'e',
+                                                'Fixture', 'e'])
+
+        self.job.SplitOutput = True
+        result = PathBatchPost.postJob(self.job)
+        self.assertTrue(result.succeeded())
+        self.assertEqual(result.files, [os.path.join(self.dir, 'Part-Job_{}.ngc'.format(i)) for i in range(1, 5)])
+        self.job.SplitOutput = False
+
+        # the old output file isn't taken for the output of a post which doesn't write it
+        self.job.PostProcessorArgs = '--nofile'
+        result = PathBatchPost.postJob(self.job)
+        self.assertFalse(result.succeeded())
+        self.assertEqual(result.error, "post processor didn't write {}".format(name))
+        self.assertFalse(os.path.isfile(name))
+
+        self.job.PostProcessorArgs = '--raise'
+        result = PathBatchPost.postJob(self.job)
+        self.assertEqual(result.error, 'ValueError: stub failed')
+        self.assertEqual(result.files, [])
+
+        self.job.PostProcessor = 'nosuchpost'
+        self.assertEqual(PathBatchPost.postJob(self.job).error, 'no post processor')
+
+    def test04(self):
+        '''Verify posting documents serially and on a pool of processes.'''
+        self.useStubPost()
+        filenames = []
+        for label in ['Part1', 'Part2', 'Part3']:
+            doc = FreeCAD.newDocument(label)
+            filenames.append(os.path.join(self.dir, label + '.FCStd'))
+            doc.saveAs(filenames[-1])
+            FreeCAD.closeDocument(doc.Name)
+
+        def jobsOf(doc, labels=None):
+            # the job of the second document fails
+            self.job.Document = doc
+            self.job.PostProcessorArgs = '--raise' if doc.Label == 'Part2' else ''
+            return [self.job]
+        PathBatchPost.jobsOf = jobsOf
+
+        for processes, suffix in [(1, ''), (2, '001')]:
+            results = PathBatchPost.postDocuments(filenames, processes, policy=PathBatchPost.AppendUniqueID)
+            self.assertEqual([r.document for r in results], filenames)
+            self.assertEqual([r.succeeded() for r in results], [True, False, True])
+            self.assertEqual(results[1].error, 'ValueError: stub failed')
+            for label, result in [('Part1', results[0]), ('Part3', results[2])]:
+                name = os.path.join(self.dir, '{}-Job{}.ngc'.format(label, suffix))
+                self.assertEqual(result.files, [name])
+                self.assertTrue(os.path.isfile(name))
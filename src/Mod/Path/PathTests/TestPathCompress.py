@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Path
+import PathScripts.PathCompress as PathCompress
+import PathScripts.PathUtils as PathUtils
+import math
+import numpy
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def arcPoints(cx, cy, r, a0, a1, z0, z1, count):
+    angles = numpy.linspace(a0, a1, count)
+    return numpy.column_stack((cx + r * numpy.cos(angles), cy + r * numpy.sin(angles),
+                               numpy.linspace(z0, z1, count)))
+
+
+class TestPathCompress(PathTestBase):
+
+    def distances(self, points, start, move):
+        '''The distances of the points to the move from start, an upper bound for helices.'''
+        end = numpy.array(move[:3])
+        if len(move) == 3:
+            return PathCompress.segmentDistances(points, start, end)
+        cx, cy, sign = move[3], move[4], 1 if move[5] else -1
+        a0 = math.atan2(start[1] - cy, start[0] - cx)
+        sweep = (sign * (math.atan2(end[1] - cy, end[0] - cx) - a0)) % (2 * math.pi)
+        r = math.hypot(start[0] - cx, start[1] - cy)
+        u = (sign * (numpy.arctan2(points[:, 1] - cy, points[:, 0] - cx) - a0)) % (2 * math.pi)
+        z = start[2] + (end[2] - start[2]) * u / sweep
+        onArc = numpy.hypot(numpy.hypot(points[:, 0] - cx, points[:, 1] - cy) - r, points[:, 2] - z)
+        ends = numpy.minimum(numpy.linalg.norm(points - start, axis=1), numpy.linalg.norm(points - end, axis=1))
+        return numpy.where(u <= sweep, numpy.minimum(onArc, ends), ends)
+
+    def assertWithin(self, points, moves, tolerance):
+        '''Verify every point is within tolerance of the moves starting at the first point.'''
+        start = points[0]
+        d = numpy.linalg.norm(points - start, axis=1)
+        for move in moves:
+            d = numpy.minimum(d, self.distances(points, start, move))
+            start = numpy.array(move[:3])
+        i = int(numpy.argmax(d))
+        self.assertTrue(d[i] <= tolerance + 1e-9, "{} is {} off".format(points[i], d[i]))
+
+    def test00(self):
+        '''Verify Douglas-Peucker simplification of polylines.'''
+        x = numpy.linspace(0, 10, 101)
+        line = numpy.column_stack((x, 2 * x, -x))
+        self.assertEqual(list(PathCompress.simplify(line, 0.001)), [0, 100])
+
+        zigzag = numpy.column_stack((x, x * 0, numpy.where(numpy.arange(101) % 50 < 25, 0.0, 1.0)))
+        keep = list(PathCompress.simplify(zigzag, 0.001))
+        self.assertEqual(keep, [0, 24, 25, 49, 50, 74, 75, 99, 100])
+
+        numpy.random.seed(7)
+        walk = numpy.cumsum(numpy.random.uniform(-1, 1, (500, 3)), axis=0)
+        keep = PathCompress.simplify(walk, 0.5)
+        self.assertTrue(len(keep) < 500)
+        self.assertWithin(walk, [tuple(p) for p in walk[keep[1:]]], 0.5)
+
+        self.assertEqual(list(PathCompress.simplify(line[:1], 0.1)), [0])
+        self.assertEqual(list(PathCompress.simplify(line[:0], 0.1)), [])
+
+    def test01(self):
+        '''Verify simplify3dLine keeps the vectors of the simplified line.'''
+        line = [FreeCAD.Vector(x, 0, 0) for x in range(10)] + [FreeCAD.Vector(9, y, 0) for y in range(1, 10)]
+        simple = PathUtils.simplify3dLine(line, tolerance=0.01)
+        self.assertEqual(len(simple), 3)
+        self.assertTrue(simple[0] is line[0])
+        self.assertTrue(simple[1] is line[9])
+        self.assertTrue(simple[2] is line[-1])
+
+    def test02(self):
+        '''Verify dense arcs and helices are replaced by G2/G3 arcs within tolerance.'''
+        points = arcPoints(3, -2, 10, 0, 1.5 * math.pi, 0, 0, 3000)
+        moves = PathCompress.compress(points, 0.01)
+        self.assertEqual(len(moves), 1)
+        self.assertRoughly(moves[0][3], 3)
+        self.assertRoughly(moves[0][4], -2)
+        self.assertTrue(moves[0][5])
+        self.assertWithin(points, moves, 0.01)
+
+        helix = arcPoints(0, 0, 5, 0, -1.8 * math.pi, 2, -1, 1000)
+        moves = PathCompress.compress(helix, 0.01)
+        self.assertEqual(len(moves), 1)
+        self.assertFalse(moves[0][5])
+        self.assertRoughly(moves[0][2], -1)
+        self.assertWithin(helix, moves, 0.01)
+
+        # two arcs joined by a line
+        points = numpy.concatenate((arcPoints(0, 0, 5, math.pi, 0, 0, 0, 200),
+                                    numpy.column_stack((numpy.linspace(5, 15, 50), numpy.zeros(50), numpy.zeros(50))),
+                                    arcPoints(20, 0, 5, math.pi, 2 * math.pi, 0, 0, 200)))
+        moves = PathCompress.compress(points, 0.01)
+        self.assertEqual([len(m) for m in moves], [6, 3, 6])
+        self.assertFalse(moves[0][5])
+        self.assertTrue(moves[2][5])
+        self.assertWithin(points, moves, 0.01)
+
+    def test03(self):
+        '''Verify noisy surfaces stay within tolerance.'''
+        numpy.random.seed(3)
+        points = arcPoints(0, 0, 20, 0, math.pi, 0, 0, 2000)
+        points += numpy.random.normal(0, 0.001, points.shape)
+        for tolerance in (0.01, 0.02, 0.1):
+            moves = PathCompress.compress(points, tolerance)
+            self.assertTrue(len(moves) < 100)
+            self.assertWithin(points, moves, tolerance)
+
+        x = numpy.linspace(0, 50, 1000)
+        profile = numpy.column_stack((x, numpy.zeros(1000), numpy.sin(x / 4)))
+        moves = PathCompress.compress(profile, 0.01)
+        self.assertEqual(moves, PathCompress.compress(profile, 0.01, False))
+        self.assertWithin(profile, moves, 0.01)
+
+    def test04(self):
+        '''Verify only runs of G1 moves of the same feed are compressed.'''
+        commands = [Path.Command('(op)'), Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 5})]
+        commands.append(Path.Command('G1', {'Z': 0, 'F': 2}))
+        for x in range(1, 101):
+            commands.append(Path.Command('G1', {'X': x * 0.1, 'Y': 0, 'Z': 0, 'F': 10}))
+        commands.append(Path.Command('G1', {'X': 10, 'Y': 5, 'Z': 0, 'F': 10}))
+        commands.append(Path.Command('G1', {'X': 10, 'Y': 10, 'Z': 0, 'F': 20}))
+        commands.append(Path.Command('G81', {'X': 0, 'Y': 0, 'Z': -1, 'R': 1}))
+        commands.append(Path.Command('G1', {'X': 1, 'Y': 0, 'F': 10}))
+        commands.append(Path.Command('G1', {'X': 2, 'Y': 0, 'F': 10}))
+
+        result = PathCompress.compressCommands(commands, 0.01)
+        self.assertEqual([c.Name for c in result], ['(op)', 'G0', 'G1', 'G1', 'G1', 'G1', 'G81', 'G1', 'G1'])
+        self.assertRoughly(result[3].Parameters['X'], 10)
+        self.assertRoughly(result[3].Parameters['Y'], 0)
+        self.assertRoughly(result[3].Parameters['F'], 10)
+        self.assertRoughly(result[4].Parameters['Y'], 5)
+        self.assertTrue(result[5] is commands[-4])
+        self.assertTrue(result[-1] is commands[-1])
+
+        commands = [Path.Command('G0', {'X': 10, 'Y': 0, 'Z': 0})]
+        for p in arcPoints(0, 0, 10, 0, math.pi, 0, 0, 300)[1:]:
+            commands.append(Path.Command('G1', {'X': p[0], 'Y': p[1], 'Z': p[2], 'F': 5}))
+        result = PathCompress.compressCommands(commands, 0.01)
+        self.assertEqual([c.Name for c in result], ['G0', 'G3'])
+        self.assertRoughly(result[1].Parameters['I'], -10)
+        self.assertRoughly(result[1].Parameters['J'], 0)
+        self.assertRoughly(result[1].Parameters['X'], -10)
+
+    def test05(self):
+        '''Verify the compressed moves get the modal feed of any preceding command.'''
+        commands = [Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 0})]
+        for x in range(1, 11):
+            commands.append(Path.Command('G1', {'X': x, 'Y': 0, 'Z': 0, 'F': 10}))
+        commands.append(Path.Command('G2', {'X': 10, 'Y': -2, 'Z': 0, 'I': 0, 'J': -1, 'F': 30}))
+        for x in range(9, -1, -1):
+            commands.append(Path.Command('G1', {'X': x, 'Y': -2, 'Z': 0}))
+        commands.append(Path.Command('G0', {'Z': 5}))
+        commands.append(Path.Command('G1', {'Z': 0, 'F': 40}))
+        commands.append(Path.Command('G0', {'X': 0, 'Y': -4, 'Z': 0}))
+        for x in range(1, 11):
+            commands.append(Path.Command('G1', {'X': x, 'Y': -4, 'Z': 0}))
+
+        result = PathCompress.compressCommands(commands, 0.01)
+        self.assertEqual([c.Name for c in result], ['G0', 'G1', 'G2', 'G1', 'G0', 'G1', 'G0', 'G1'])
+        self.assertRoughly(result[1].Parameters['F'], 10)
+        self.assertRoughly(result[3].Parameters['X'], 0)
+        self.assertRoughly(result[3].Parameters['F'], 30)
+        self.assertRoughly(result[7].Parameters['X'], 10)
+        self.assertRoughly(result[7].Parameters['F'], 40)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Path
+import PathScripts.PathCycleTime as PathCycleTime
+import math
+import numpy
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def circle(r, count, feed):
+    commands = [Path.Command('G0', {'X': r, 'Y': 0, 'Z': 0})]
+    for a in numpy.linspace(0, 2 * math.pi, count + 1)[1:]:
+        commands.append(Path.Command('G1', {'X': r * math.cos(a), 'Y': r * math.sin(a), 'F': feed}))
+    return commands
+
+
+def drill(dwell, feed):
+    return Path.Path([Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 10}),
+                      Path.Command('G82', {'X': 10, 'Y': 0, 'Z': -3, 'R': 2, 'P': dwell, 'F': feed})])
+
+
+class Quantity(object):
+    def __init__(self, value):
+        self.Value = value
+
+
+class ToolController(object):
+    def __init__(self, name, feed, rapid):
+        self.Name = name
+        self.HorizFeed = self.VertFeed = Quantity(feed)
+        self.HorizRapid = self.VertRapid = Quantity(rapid)
+
+
+class Op(object):
+    def __init__(self, name, tc, path, active=True):
+        self.Name = name
+        self.ToolController = tc
+        self.Path = path
+        self.Active = active
+
+
+class Group(object):
+    def __init__(self, group):
+        self.Group = group
+
+
+class Job(object):
+    def __init__(self, ops):
+        self.Operations = Group(ops)
+
+
+class TestPathCycleTime(PathTestBase):
+
+    def setUp(self):
+        PathCycleTime.clearCache()
+
+    def tearDown(self):
+        PathCycleTime.clearCache()
+
+    def test00(self):
+        '''Verify distances and times of lines without acceleration.'''
+        commands = [Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 10}),
+                    Path.Command('G0', {'Z': 2}),
+                    Path.Command('G1', {'Z': -1, 'F': 1}),
+                    Path.Command('G1', {'X': 30, 'F': 3}),
+                    Path.Command('G1', {'Y': 40}),
+                    Path.Command('(comment)'),
+                    Path.Command('G0', {'Z': 10})]
+        estimate = PathCycleTime.estimateCommands(commands, 10, 2, 100, 50)
+        self.assertRoughly(estimate.cuttingDistance, 73)
+        self.assertRoughly(estimate.cuttingTime, 3.0 + 70.0 / 3)
+        self.assertRoughly(estimate.rapidDistance, 19)
+        self.assertRoughly(estimate.rapidTime, 19.0 / 50)
+        self.assertEqual(estimate.plunges, 1)
+        self.assertRoughly(estimate.time, estimate.cuttingTime + estimate.rapidTime)
+
+        # feeds of the tool controller, limited per axis, rapids at feed without rapid rates
+        commands = [Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 0}),
+                    Path.Command('G1', {'X': 30, 'Y': 40, 'Z': -10}),
+                    Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 0})]
+        estimate = PathCycleTime.estimateCommands(commands, 10, 2)
+        self.assertRoughly(estimate.cuttingTime, 5)
+        self.assertRoughly(estimate.rapidTime, 5)
+        self.assertEqual(estimate.plunges, 0)
+
+    def test01(self):
+        '''Verify arcs and full circles in the XY plane.'''
+        commands = [Path.Command('G0', {'X': 10, 'Y': 0, 'Z': 0}),
+                    Path.Command('G3', {'X': -10, 'Y': 0, 'I': -10, 'J': 0, 'F': 1}),
+                    Path.Command('G2', {'X': -10, 'Y': 0, 'Z': -2, 'I': 10, 'J': 0})]
+        estimate = PathCycleTime.estimateCommands(commands, 10, 10)
+        half = 10 * math.pi
+        full = math.hypot(20 * math.pi, 2)
+        self.assertRoughly(estimate.cuttingDistance, half + full)
+        self.assertRoughly(estimate.cuttingTime, half + full)
+
+    def test02(self):
+        '''Verify canned cycles and dwells.'''
+        commands = [Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 10}),
+                    Path.Command('G98'),
+                    Path.Command('G81', {'X': 10, 'Y': 0, 'Z': -3, 'R': 2, 'F': 1}),
+                    Path.Command('G82', {'X': 20, 'Y': 0, 'Z': -3, 'R': 2, 'P': 1.5}),
+                    Path.Command('G99'),
+                    Path.Command('G83', {'X': 30, 'Y': 0, 'Z': -3, 'R': 2, 'Q': 1}),
+                    Path.Command('G4', {'P': 2})]
+        estimate = PathCycleTime.estimateCommands(commands, 5, 5, 10, 10)
+        self.assertEqual(estimate.plunges, 3)
+        self.assertRoughly(estimate.cuttingDistance, 15)
+        self.assertRoughly(estimate.cuttingTime, 15)
+        self.assertRoughly(estimate.dwellTime, 3.5)
+        # 30 in XY, three times 8 down to R, twice 13 up to the initial Z and 5 up to R
+        self.assertRoughly(estimate.rapidDistance, 30 + 3 * 8 + 2 * 13 + 5)
+        self.assertRoughly(estimate.rapidTime, estimate.rapidDistance / 10)
+
+    def test03(self):
+        '''Verify the acceleration of the machine slows down moves and corners.'''
+        commands = circle(10, 1000, 20)
+        times = [PathCycleTime.estimateCommands(commands, 20, 20, limits=PathCycleTime.MachineLimits(a)).time
+                 for a in (0, 1000, 100, 10)]
+        self.assertRoughly(times[0], math.pi, 0.01)
+        self.assertTrue(times[0] < times[1] < times[2] < times[3])
+
+        # a single line accelerating to half its length and decelerating
+        commands = [Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 0}), Path.Command('G1', {'X': 10, 'F': 100})]
+        estimate = PathCycleTime.estimateCommands(commands, 100, 100, limits=PathCycleTime.MachineLimits(10))
+        self.assertRoughly(estimate.cuttingTime, 2 * math.sqrt(2 * 5.0 / 10))
+
+        # a zigzag stops in every reversal
+        commands = [Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 0})]
+        for i in range(1, 11):
+            commands.append(Path.Command('G1', {'X': 10 * (i % 2), 'Y': i * 0.001, 'F': 20}))
+        estimate = PathCycleTime.estimateCommands(commands, 20, 20, limits=PathCycleTime.MachineLimits(100))
+        self.assertRoughly(estimate.cuttingTime, 10 * (10.0 / 20 + 20.0 / 100), 0.01)
+
+    def test04(self):
+        '''Verify the junction speeds are the highest reachable speeds.'''
+        numpy.random.seed(11)
+        limits = numpy.random.uniform(0, 100, 200)
+        limits[0] = limits[-1] = 0
+        gains = numpy.random.uniform(0, 50, 199)
+        v = PathCycleTime.reachable(limits, gains)
+
+        expected = limits.copy()
+        for i in range(1, len(expected)):
+            expected[i] = min(expected[i], expected[i - 1] + gains[i - 1])
+        for i in range(len(expected) - 2, -1, -1):
+            expected[i] = min(expected[i], expected[i + 1] + gains[i])
+        self.assertTrue(numpy.allclose(v, expected))
+
+    def test05(self):
+        '''Verify estimates add up and times are formatted.'''
+        a = PathCycleTime.Estimate(1, 2, 3, 4, 5, 6)
+        b = a + a
+        self.assertRoughly(b.cuttingDistance, 2)
+        self.assertRoughly(b.time, 24)
+        self.assertEqual(b.plunges, 12)
+
+        self.assertEqual(PathCycleTime.formatTime(0), '00:00:00')
+        self.assertEqual(PathCycleTime.formatTime(3723.4), '01:02:03')
+        self.assertEqual(PathCycleTime.formatTime(90000), '25:00:00')
+        self.assertEqual(PathCycleTime.estimateCommands([], 1, 1).time, 0)
+
+    def test06(self):
+        '''Verify the estimate of an operation is cached until any parameter of its path changes.'''
+        op = Op('Drill', ToolController('TC', 5, 10), drill(1, 1))
+        estimate = PathCycleTime.estimateOp(op)
+        self.assertRoughly(estimate.dwellTime, 1)
+        self.assertRoughly(estimate.cuttingTime, 5)
+        self.assertTrue(PathCycleTime.estimateOp(op) is estimate)
+        op.Path = drill(1, 1)
+        self.assertTrue(PathCycleTime.estimateOp(op) is estimate)
+
+        # neither the dwell time nor the feed change the size, length or bounding box of the path
+        op.Path = drill(3, 1)
+        self.assertRoughly(PathCycleTime.estimateOp(op).dwellTime, 3)
+        op.Path = drill(3, 2)
+        self.assertRoughly(PathCycleTime.estimateOp(op).cuttingTime, 2.5)
+
+        # the feeds of the tool controller and the machine limits
+        op.Path = Path.Path([Path.Command('G0', {'X': 0, 'Y': 0, 'Z': 0}), Path.Command('G1', {'X': 10})])
+        self.assertRoughly(PathCycleTime.estimateOp(op).cuttingTime, 2)
+        op.ToolController = ToolController('TC', 10, 10)
+        self.assertRoughly(PathCycleTime.estimateOp(op).cuttingTime, 1)
+        estimate = PathCycleTime.estimateOp(op, PathCycleTime.MachineLimits(10))
+        self.assertRoughly(estimate.cuttingTime, 2 * math.sqrt(2 * 5.0 / 10))
+
+    def test07(self):
+        '''Verify the estimate of a job adds up its active operations with a tool controller.'''
+        tc1 = ToolController('TC1', 5, 10)
+        tc2 = ToolController('TC2', 10, 10)
+        ops = [Op('Drill', tc1, drill(1, 1)),
+               Op('Drill001', tc1, drill(2, 1)),
+               Op('Drill002', tc2, drill(4, 1)),
+               Op('Inactive', tc2, drill(8, 1), False),
+               Op('Comment', None, drill(16, 1))]
+        total, estimates, tools = PathCycleTime.estimateJob(Job(ops))
+        self.assertEqual(list(estimates), ['Drill', 'Drill001', 'Drill002'])
+        self.assertEqual(list(tools), ['TC1', 'TC2'])
+        self.assertRoughly(total.dwellTime, 7)
+        self.assertRoughly(tools['TC1'].dwellTime, 3)
+        self.assertRoughly(tools['TC2'].dwellTime, 4)
+        self.assertRoughly(total.time, sum(e.time for e in estimates.values()))
+
+        # only the changed operation is estimated again
+        ops[1].Path = drill(5, 1)
+        total, other, tools = PathCycleTime.estimateJob(Job(ops))
+        self.assertTrue(other['Drill'] is estimates['Drill'])
+        self.assertFalse(other['Drill001'] is estimates['Drill001'])
+        self.assertRoughly(total.dwellTime, 10)
@@ -22,11 +22,14 @@
 # *                                                                         *
 # ***************************************************************************
 
+import Part
+import Path
+import PathScripts.PathDressup as PathDressup
 import PathTests.PathTestUtils as PathTestUtils
 import math
 
 from FreeCAD import Vector
-from PathScripts.PathDressupHoldingTags import Tag
+from PathScripts.PathDressupHoldingTags import Tag, TagIndex
 
 class TestHoldingTags(PathTestUtils.PathTestBase):
     """Unit tests for the HoldingTags dressup."""
@@ -70,3 +73,37 @@ class TestHoldingTags(PathTestUtils.PathTestBase):
         print(h)
         self.assertConeAt(tag.solid, Vector(0,0,-h * 0.01), 2.5, 0, h)
 
+    def test05(self):
+        """Verify only the tags near an edge are found."""
+        tags = [Tag(i, x, y, 4, 5, 90, 0, True) for i, (x, y) in enumerate([(0, 0), (10, 0), (10, 10), (50, 50)])]
+        tags[2].enabled = False
+        for tag in tags:
+            tag.createSolidsAt(0, 0)
+        index = TagIndex(tags)
+
+        def edge(x1, y1, x2, y2, z=1):
+            return Part.Edge(Part.LineSegment(Vector(x1, y1, z), Vector(x2, y2, z)))
+
+        self.assertEqual(index.tagsNear(edge(-5, 0, 15, 0)), set([0, 1]))
+        self.assertEqual(index.tagsNear(edge(5, -5, 5, 5)), set())
+        # disabled tags are never near
+        self.assertEqual(index.tagsNear(edge(5, 10, 15, 10)), set())
+        # above the tags
+        self.assertEqual(index.tagsNear(edge(-5, 0, 15, 0, 10)), set())
+        self.assertEqual(index.tagsNear(edge(-100, 51, 100, 51)), set([3]))
+        self.assertEqual(TagIndex([]).tagsNear(edge(0, 0, 1, 1)), set())
+
+    def test06(self):
+        """Verify the wires of the dressups are rebuilt if the base path changes."""
+        PathDressup.clearWireCache()
+        gcode = 'G0 Z5\nG1 X0 Y0 Z0\nG1 X10 Y0 Z0\nG1 X10 Y10 Z0\n'
+        (wire, rapid) = PathDressup.wireForPath(Path.Path(gcode))
+        self.assertEqual(len(wire.Edges), 4)
+        self.assertEqual(len(rapid), 1)
+
+        (wire2, rapid2) = PathDressup.wireForPath(Path.Path(gcode))
+        self.assertTrue(wire2 is wire)
+
+        (wire3, rapid3) = PathDressup.wireForPath(Path.Path(gcode + 'G1 X0 Y10 Z0\n'))
+        self.assertEqual(len(wire3.Edges), 5)
+        PathDressup.clearWireCache()
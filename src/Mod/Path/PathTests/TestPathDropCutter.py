@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathDropCutter as PathDropCutter
+import sys
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class FakeOcl(object):
+    '''Stand in for the ocl module, the drop cutter samples the start and end point of
+    every span at the height of the current rotation of the STL.'''
+
+    class Point(object):
+        def __init__(self, x, y, z):
+            self.x = x
+            self.y = y
+            self.z = z
+
+    class Line(object):
+        def __init__(self, p1, p2):
+            self.points = [p1, p2]
+
+    class Arc(object):
+        def __init__(self, p1, p2, c, ccw):
+            self.points = [p1, c, p2] if ccw else [p2, c, p1]
+
+    class Path(list):
+        pass
+
+    class PathDropCutter(object):
+        def setSTL(self, stl):
+            self.z = stl.angle
+
+        def setCutter(self, cutter):
+            pass
+
+        def setZ(self, z):
+            self.minZ = z
+
+        def setSampling(self, sampling):
+            pass
+
+        def setPath(self, path):
+            self.path = path
+
+        def run(self):
+            self.points = [FakeOcl.Point(p.x, p.y, max(self.minZ, self.z)) for span in self.path for p in span.points]
+
+        def getCLPoints(self):
+            return self.points
+
+
+class FakeSTL(object):
+    def __init__(self):
+        self.angle = 0.0
+
+    def rotate(self, x, y, z):
+        self.angle += x + y + z
+
+
+class TestPathDropCutter(PathTestBase):
+
+    def setUp(self):
+        self.ocl = sys.modules.get('ocl')
+        sys.modules['ocl'] = FakeOcl
+
+    def tearDown(self):
+        if self.ocl is None:
+            del sys.modules['ocl']
+        else:
+            sys.modules['ocl'] = self.ocl
+
+    def scan(self, processes, segments, rotations=None):
+        stl = FakeSTL()
+        dropCutter = PathDropCutter.DropCutter(stl, None, -1.0, 0.1, processes)
+        return (dropCutter.scanVectors(segments, rotations), stl.angle)
+
+    def test00(self):
+        '''Verify the chunks cover all segments in order.'''
+        self.assertEqual(PathDropCutter.chunkRanges(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(PathDropCutter.chunkRanges(2, 4), [(0, 1), (1, 2)])
+        self.assertEqual(PathDropCutter.chunkRanges(0, 4), [(0, 0)])
+        for count in range(1, 30):
+            for chunks in range(1, 8):
+                ranges = PathDropCutter.chunkRanges(count, chunks)
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], count)
+                for (s0, e0), (s1, e1) in zip(ranges, ranges[1:]):
+                    self.assertEqual(e0, s1)
+                    self.assertTrue(e0 > s0)
+
+    def test01(self):
+        '''Verify line and arc scans don't depend on the number of processes.'''
+        segments = []
+        for i in range(57):
+            if i % 3:
+                segments.append((0.0, i * 0.5, 10.0, i * 0.5))
+            else:
+                segments.append((1.0, i, 3.0, i, 2.0, i, i % 2 == 0))
+        (serial, angle) = self.scan(1, segments)
+        self.assertEqual(len(serial), len(segments))
+        self.assertCoincide(serial[1][1], FakeOcl.Point(10.0, 0.5, 0.0))
+        self.assertCoincide(serial[3][0], FakeOcl.Point(3.0, 3.0, 0.0))
+        for processes in (2, 3, 8):
+            (parallel, angle) = self.scan(processes, segments)
+            self.assertEqual(len(parallel), len(serial))
+            for s, p in zip(serial, parallel):
+                self.assertEqual(len(s), len(p))
+                for v0, v1 in zip(s, p):
+                    self.assertCoincide(v0, v1)
+
+    def test02(self):
+        '''Verify the rotations of the STL add up in every chunk.'''
+        segments = [(0.0, 0.0, 0.0, 10.0)] * 20
+        rotations = [None if i % 4 == 0 else (0.0, 0.25, 0.0) for i in range(20)]
+        (serial, angle) = self.scan(1, segments, rotations)
+        self.assertRoughly(angle, 3.75)
+        self.assertRoughly(serial[-1][0].z, 3.75)
+        for processes in (2, 4, 7):
+            (parallel, pangle) = self.scan(processes, segments, rotations)
+            self.assertRoughly(pangle, angle)
+            self.assertEqual([p[0].z for p in parallel], [s[0].z for s in serial])
+
+    def test03(self):
+        '''Verify the number of processes of a job.'''
+        class Sheet(object):
+            DropCutterProcesses = 3
+
+        class Job(object):
+            SetupSheet = Sheet()
+
+        self.assertEqual(PathDropCutter.processCount(None), 1)
+        self.assertEqual(PathDropCutter.processCount(Job()), 3)
+        Sheet.DropCutterProcesses = 0
+        self.assertTrue(PathDropCutter.processCount(Job()) >= 1)
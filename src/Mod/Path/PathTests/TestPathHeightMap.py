@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import Part
+import Path
+import PathScripts.PathHeightMap as PathHeightMap
+import math
+import numpy
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def boxFacets(x0, y0, z0, x1, y1, z1):
+    '''The facets of the top and the bottom of a box.'''
+    return [x0, y0, z1, x1, y0, z1, x1, y1, z1, x0, y0, z1, x1, y1, z1, x0, y1, z1,
+            x0, y0, z0, x1, y1, z0, x1, y0, z0, x0, y0, z0, x0, y1, z0, x1, y1, z0]
+
+
+def move(name, **params):
+    return Path.Command(name, params)
+
+
+class TestPathHeightMap(PathTestBase):
+
+    def stock(self, resolution=0.5):
+        hm = PathHeightMap.HeightMap(0, 0, 100, 50, resolution, 0)
+        hm.heights = PathHeightMap.rasterize(boxFacets(0, 0, 0, 100, 50, 10), hm)
+        return hm
+
+    def test00(self):
+        '''Verify rasterization of the highest and lowest facets.'''
+        hm = self.stock()
+        self.assertEqual(hm.heights.shape, (100, 200))
+        self.assertRoughly(numpy.min(hm.heights), 10)
+        self.assertRoughly(numpy.max(hm.heights), 10)
+        self.assertRoughly(hm.volume(), 50000)
+        self.assertRoughly(numpy.max(PathHeightMap.rasterize(boxFacets(0, 0, 0, 100, 50, 10), hm, True)), 0)
+
+        # a slope only covering half of the grid
+        slope = PathHeightMap.rasterize([0, 0, 0, 100, 0, 10, 100, 50, 10], hm)
+        X, Y = hm.centers()
+        self.assertRoughly(slope[0, 199], X[199] / 10)
+        self.assertTrue(numpy.isnan(slope[99, 0]))
+        self.assertEqual(numpy.count_nonzero(~numpy.isnan(slope)), 100 * 200 // 2)
+
+    def test01(self):
+        '''Verify the profiles of legacy tools and tool shapes.'''
+        r = numpy.array([0, 1, 2, 3, 4])
+        endmill = PathHeightMap.legacyProfile('EndMill', 6)
+        self.assertTrue(numpy.allclose(endmill.heightAt(r)[:4], 0))
+        self.assertTrue(numpy.isinf(endmill.heightAt(r)[4]))
+
+        ball = PathHeightMap.legacyProfile('BallEndMill', 6)
+        self.assertRoughly(ball.heightAt(3), 3)
+        self.assertRoughly(ball.heightAt(0), 0)
+
+        vbit = PathHeightMap.legacyProfile('Engraver', 6, cuttingEdgeAngle=90)
+        self.assertRoughly(vbit.heightAt(2), 2)
+
+        bull = PathHeightMap.legacyProfile('EndMill', 6, cornerRadius=1)
+        self.assertRoughly(bull.heightAt(2), 0)
+        self.assertRoughly(bull.heightAt(3), 1)
+
+        cylinder = PathHeightMap.shapeProfile(Part.makeCylinder(3, 10), 0.1)
+        self.assertTrue(abs(cylinder.radius - 3) < 0.2)
+        self.assertTrue(numpy.allclose(cylinder.heights, 0, atol=0.01))
+
+        cone = PathHeightMap.shapeProfile(Part.makeCone(0, 3, 3), 0.1)
+        self.assertTrue(abs(cone.heightAt(1.5) - 1.5) < 0.15)
+
+    def test02(self):
+        '''Verify a slot removes its volume and cutting it again is an air cut.'''
+        sim = PathHeightMap.Simulation(self.stock())
+        tool = PathHeightMap.legacyProfile('EndMill', 6)
+        commands = [move('G0', X=-5, Y=25, Z=20), move('G0', Z=12), move('G1', Z=7, F=5), move('G1', X=105, F=10),
+                    move('G1', X=-5), move('G0', Z=20)]
+        report = sim.cut(commands, tool, (10, 5, 50, 50), name='slot')
+        self.assertRoughly(report.removedVolume, 100 * 6 * 3)
+        self.assertRoughly(sim.removedVolume(), 100 * 6 * 3)
+        self.assertEqual(report.airMoves, 2)
+        self.assertRoughly(report.airCutDistance, 110 + 5)
+        self.assertRoughly(report.airCutTime, 110.0 / 10 + 5.0 / 5)
+        self.assertEqual(report.rapidCollisions, 0)
+        self.assertTrue(sim.reports['slot'] is report)
+
+        report = sim.cut(commands[:4], tool, (10, 5, 50, 50))
+        self.assertRoughly(report.removedVolume, 0)
+        self.assertEqual(report.airMoves, 2)
+
+        # a rapid move into the stock
+        report = sim.cut([move('G0', X=50, Y=-10, Z=8), move('G0', Y=60)], tool)
+        self.assertEqual(report.rapidCollisions, 1)
+        self.assertRoughly(report.removedVolume, (50 - 6) * 6 * 2)
+
+    def test03(self):
+        '''Verify gouges and remaining stock against the model.'''
+        stock = self.stock()
+        model = PathHeightMap.rasterize(boxFacets(10, 10, 0, 90, 40, 5), stock)
+        sim = PathHeightMap.Simulation(stock, model)
+        self.assertRoughly(sim.maxGouge(), 0)
+        self.assertRoughly(sim.maxRemaining(), 5)
+        self.assertRoughly(sim.remainingVolume(), 80 * 30 * 5)
+
+        tool = PathHeightMap.legacyProfile('EndMill', 6)
+        sim.cut([move('G0', X=50, Y=25, Z=20), move('G1', Z=3, F=5), move('G0', Z=20)], tool)
+        self.assertRoughly(sim.maxGouge(), 2)
+        self.assertTrue(abs(sim.gougeArea() - math.pi * 9) < 1.5)
+
+        # facing the model down to its top leaves nothing and gouges nothing else
+        sim = PathHeightMap.Simulation(self.stock(), model)
+        commands = [move('G0', X=0, Y=0, Z=20)]
+        for y in range(0, 52, 4):
+            commands.append(move('G1', X=0, Y=y, Z=5, F=10))
+            commands.append(move('G1', X=100, Y=y, Z=5))
+        sim.cut(commands, tool)
+        self.assertRoughly(sim.maxRemaining(), 0)
+        self.assertRoughly(sim.maxGouge(), 0)
+
+    def test04(self):
+        '''Verify sampled ramps, arcs and drill cycles.'''
+        stock = self.stock(0.25)
+        sim = PathHeightMap.Simulation(stock)
+        tool = PathHeightMap.legacyProfile('EndMill', 6)
+        sim.cut([move('G0', X=20, Y=25, Z=10), move('G1', X=80, Z=4, F=5)], tool)
+        # the front of the tool is lowest on a ramp
+        X, Y = stock.centers()
+        for j in (120, 200, 304):
+            self.assertTrue(abs(stock.heights[100, j] - (10 - 0.1 * (X[j] + 3 - 20))) < 0.05)
+        self.assertRoughly(stock.heights[100, 328], 4)
+        self.assertRoughly(stock.heights[100, 336], 10)
+
+        sim = PathHeightMap.Simulation(self.stock(0.25))
+        report = sim.cut([move('G0', X=60, Y=25, Z=10), move('G1', Z=8, F=5),
+                          move('G2', X=60, Y=25, I=-10, J=0)], tool)
+        annulus = math.pi * (13 * 13 - 7 * 7) * 2
+        self.assertTrue(abs(report.removedVolume - annulus) < annulus * 0.03)
+
+        sim = PathHeightMap.Simulation(self.stock())
+        report = sim.cut([move('G0', X=0, Y=0, Z=15), move('G98'),
+                          move('G81', X=20, Y=25, Z=6, R=12, F=1), move('G81', X=20, Y=25, Z=6, R=12),
+                          move('G81', X=70, Y=25, Z=6, R=12)], tool)
+        self.assertTrue(abs(report.removedVolume - 2 * math.pi * 9 * 4) < 2 * math.pi * 9 * 4 * 0.05)
+        self.assertEqual(report.airMoves, 0)
+        self.assertEqual(report.rapidCollisions, 0)
+
+    def test05(self):
+        '''Verify moves before the position of the tool is known don't cut.'''
+        sim = PathHeightMap.Simulation(self.stock())
+        tool = PathHeightMap.legacyProfile('EndMill', 6)
+        report = sim.cut([move('G0', X=50, Y=25), move('G0', Z=20), move('G0', X=60)], tool)
+        self.assertRoughly(report.removedVolume, 0)
+        self.assertEqual(report.rapidCollisions, 0)
+
+        # the first known height is the start of the following moves
+        report = sim.cut([move('G0', X=50, Y=25), move('G1', Z=8, F=5), move('G1', X=60)], tool)
+        slot = (math.pi * 9 + 10 * 6) * 2
+        self.assertTrue(abs(report.removedVolume - slot) < slot * 0.03)
+        self.assertEqual(report.airMoves, 0)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Path
+import PathScripts.PostCore as PostCore
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class TestPathPostCore(PathTestBase):
+
+    def setUp(self):
+        self.doc = FreeCAD.newDocument("TestPathPostCore")
+        self.obj = self.doc.addObject("Path::Feature", "Op")
+        self.obj.Path = Path.Path([
+            Path.Command("G0", {"X": 1, "Y": 2, "Z": 5}),
+            Path.Command("G1", {"X": 1, "Y": 2, "Z": -1, "F": 10}),
+            Path.Command("G1", {"X": 25.4, "Y": 2, "Z": -1, "F": 10}),
+            Path.Command("M6", {"T": 2})])
+
+    def tearDown(self):
+        FreeCAD.closeDocument("TestPathPostCore")
+
+    def export(self, **kwargs):
+        dialect = PostCore.GCodeDialect(outputHeader=False, outputComments=False, showEditor=False, **kwargs)
+        return PostCore.GCodePost(dialect, 'test').export([self.obj], '-').splitlines()
+
+    def test00(self):
+        '''Verify number formats convert from internal units.'''
+        self.assertEqual(PostCore.NumberFormat(3, 'mm')(1.23456), '1.235')
+        self.assertEqual(PostCore.NumberFormat(4, 'in')(25.4), '1.0000')
+        self.assertEqual(PostCore.NumberFormat(2, 'mm/min')(10), '600.00')
+        self.assertEqual(PostCore.NumberFormat(2, 'in/min')(25.4), '60.00')
+        fmt = PostCore.NumberFormat(3, 'mm')
+        self.assertEqual(fmt(0.0), '0.000')
+        self.assertEqual(fmt(-0.0), '-0.000')
+
+    def test01(self):
+        '''Verify default output.'''
+        self.assertEqual(self.export(), [
+            'G21',
+            'G0 X1.000 Y2.000 Z5.000 ',
+            'G1 X1.000 Y2.000 Z-1.000 F600.000 ',
+            'G1 X25.400 Y2.000 Z-1.000 F600.000 ',
+            'M5',
+            'M6 T2 ',
+            'G43 H2 '])
+
+    def test02(self):
+        '''Verify modal commands, suppressed doubles and imperial units.'''
+        self.assertEqual(self.export(modal=True, outputDoubles=False, trailingSpace=False, useTlo=False,
+                                     units='G20', unitFormat='in', unitSpeedFormat='in/min', precision=2), [
+            'G20',
+            'G0 X0.04 Y0.08 Z0.20',
+            'G1 Z-0.04 F23.62',
+            'X1.00',
+            'M5',
+            'M6 T2'])
+
+    def test03(self):
+        '''Verify line numbers and that the modal state is not shared between exports.'''
+        lines = self.export(outputLineNumbers=True)
+        self.assertEqual(lines[0], 'N110 G21')
+        self.assertEqual(lines[1], 'N120  G0 X1.000 Y2.000 Z5.000 ')
+        self.assertEqual(self.export(outputLineNumbers=True), lines)
+
+    def test04(self):
+        '''Verify arguments only apply to the dialect they are processed for.'''
+        parser = PostCore.createArgumentParser('test')
+        dialect = PostCore.GCodeDialect()
+        inches = dialect.copy()
+        self.assertTrue(inches.processArguments(parser, '--inches --no-tlo'))
+        self.assertEqual(inches.units, 'G20')
+        self.assertFalse(inches.useTlo)
+        self.assertEqual(dialect.units, 'G21')
+        self.assertTrue(dialect.useTlo)
+        self.assertFalse(dialect.processArguments(parser, '--no-such-argument'))
+
+    def test05(self):
+        '''Verify comments, the postamble comment has no line number.'''
+        dialect = PostCore.GCodeDialect(outputHeader=False, showEditor=False, outputLineNumbers=True,
+                                        preamble='G17 G90', postamble='M2')
+        lines = PostCore.GCodePost(dialect, 'test').export([self.obj], '-').splitlines()
+        self.assertEqual(lines[:3], ['N110 (begin preamble)', 'N120 G17 G90', 'N130 G21'])
+        self.assertEqual(lines[3], 'N140 (begin operation: Op)')
+        self.assertEqual(lines[-2:], ['(begin postamble)', 'N%d M2' % (100 + 10 * (len(lines) - 1))])
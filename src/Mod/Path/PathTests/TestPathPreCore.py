@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import os
+import PathScripts.PreCore as PreCore
+import tempfile
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class TestPathPreCore(PathTestBase):
+
+    def read(self, gcode, reader=None):
+        if reader is None:
+            reader = PreCore.GCodeReader()
+        return list(reader.lines(gcode.splitlines()))
+
+    def test00(self):
+        '''Verify the words and comments of a line.'''
+        self.assertEqual(PreCore.tokenize('n10 g01x1.5 Y-.5 (cut) f100 ; rest'),
+                         ([('N', '10'), ('G', '01'), ('X', '1.5'), ('Y', '-.5'), ('F', '100')], ['cut', 'rest']))
+        self.assertEqual(PreCore.code('G', '00'), 'G0')
+        self.assertEqual(PreCore.code('G', '90.1'), 'G90.1')
+        self.assertEqual(PreCore.code('M', '06'), 'M6')
+
+    def test01(self):
+        '''Verify modal moves, units and distance mode.'''
+        self.assertEqual(self.read('G0 X1 Y2\nZ3\nG1 X2 F600\nY4\n'), [
+            'G0 X1 Y2', 'G0 Z3', 'G1 X2 F10', 'G1 Y4 F10'])
+        self.assertEqual(self.read('G20 G90 G1 X1 F60\nG91 X1 Y-1\nG21 X1\n'), [
+            'G1 X25.4 F25.4', 'G1 X50.8 Y-25.4 F25.4', 'G1 X51.8 F25.4'])
+        # arc centers are relative unless G90.1
+        self.assertEqual(self.read('G0 X1\nG90.1 G2 X3 I2 J0\n'), ['G0 X1', 'G2 X3 I1 J0'])
+
+    def test02(self):
+        '''Verify arcs given by a radius get their center.'''
+        self.assertEqual(self.read('G1 X0 Y0 F60\nG2 X2 Y0 R1\n'), ['G1 X0 Y0 F1', 'G2 X2 Y0 I1 J0 F1'])
+        self.assertEqual(self.read('G1 X0 Y0 F60\nG2 X1 Y1 R1\n'), ['G1 X0 Y0 F1', 'G2 X1 Y1 I1 J0 F1'])
+        self.assertEqual(self.read('G1 X0 Y0 F60\nG3 X1 Y1 R1\n'), ['G1 X0 Y0 F1', 'G3 X1 Y1 I0 J1 F1'])
+        self.assertEqual(self.read('G1 X0 Y0 F60\nG2 X1 Y1 R-1\n'), ['G1 X0 Y0 F1', 'G2 X1 Y1 I0 J1 F1'])
+
+    def test03(self):
+        '''Verify canned cycles repeat with all their parameters.'''
+        self.assertEqual(self.read('G0 Z10\nG99 G81 X1 Y1 Z-2 R2 F60\nX5\nG80\nG0 X0\n'), [
+            'G0 Z10', 'G99', 'G81 X1 Y1 Z-2 R2 F1', 'G81 X5 Y1 Z-2 R2 F1', 'G0 X0'])
+        # incremental R is relative to the initial height, Z to R
+        self.assertEqual(self.read('G0 Z10\nG91 G98 G83 X1 Y1 Z-4 R-8 Q1 F60\n'), [
+            'G0 Z10', 'G98', 'G83 X1 Y1 Z-2 R2 Q1 F1'])
+
+    def test04(self):
+        '''Verify tool changes split the program into sections.'''
+        gcode = 'G0 Z5\nT2 M6\nG54 G43 H2 Z20\nM3 S1000\nG1 X1 F60\nM6 T3\nG1 X2\nM30\n'
+        sections = list(PreCore.GCodeReader().sections(gcode.splitlines()))
+        self.assertEqual(sections, [
+            (0, ['G0 Z5']),
+            (2, ['G54', 'G43 H2', 'G0 Z20', 'M3 S1000', 'G1 X1 F1']),
+            (3, ['G1 X2 F1', 'M30'])])
+
+    def test05(self):
+        '''Verify the Paths of a file.'''
+        (fd, filename) = tempfile.mkstemp(suffix='.ngc')
+        try:
+            with os.fdopen(fd, 'w') as gfile:
+                gfile.write('(test)\nG21 G90\nG0 X1 Y1 Z5\nG1 Z-1 F120\nX10\nM6 T4\nG2 X12 Y1 R1\n')
+            paths = list(PreCore.readPaths(filename))
+        finally:
+            os.remove(filename)
+        self.assertEqual([t for (t, p) in paths], [0, 4])
+        self.assertEqual([c.Name for c in paths[0][1].Commands], ['G0', 'G1', 'G1'])
+        self.assertEqual(paths[0][1].Commands[2].Parameters, {'X': 10.0, 'F': 2.0})
+        self.assertEqual(paths[1][1].Commands[0].Parameters, {'X': 12.0, 'Y': 1.0, 'I': 1.0, 'J': 0.0, 'F': 2.0})
@@ -58,6 +58,9 @@ class TestPathSetupSheet(PathTestBase):
         self.assertEqual(attrs[PathSetupSheet.Template.SafeHeightExpression], 'OpStockZMax+SetupSheet.SafeHeightOffset')
         self.assertEqualLocale(attrs[PathSetupSheet.Template.ClearanceHeightOffset], '5.00 mm')
         self.assertEqual(attrs[PathSetupSheet.Template.ClearanceHeightExpression], 'OpStockZMax+SetupSheet.ClearanceHeightOffset')
+        self.assertEqual(attrs[PathSetupSheet.Template.DropCutterProcesses], 1)
+        self.assertEqualLocale(attrs[PathSetupSheet.Template.MachineAcceleration], '500.00 mm/s^2')
+        self.assertEqualLocale(attrs[PathSetupSheet.Template.JunctionDeviation], '0.01 mm')
 
     def test01(self):
         '''Verify SetupSheet template attributes roundtrip.'''
@@ -72,6 +75,9 @@ class TestPathSetupSheet(PathTestBase):
         o1.StartDepthExpression = 'Alpha'
         o1.FinalDepthExpression = 'Omega'
         o1.StepDownExpression = '1'
+        o1.DropCutterProcesses = 4
+        o1.MachineAcceleration = '250 mm/s^2'
+        o1.JunctionDeviation = '0.05 mm'
 
         o2 = PathSetupSheet.Create()
         self.doc.recompute()
@@ -90,6 +96,9 @@ class TestPathSetupSheet(PathTestBase):
         self.assertEqual(o1.StartDepthExpression, o2.StartDepthExpression)
         self.assertEqual(o1.FinalDepthExpression, o2.FinalDepthExpression)
         self.assertEqual(o1.StepDownExpression, o2.StepDownExpression)
+        self.assertEqual(o1.DropCutterProcesses, o2.DropCutterProcesses)
+        self.assertEqual(o1.MachineAcceleration.UserString, o2.MachineAcceleration.UserString)
+        self.assertEqual(o1.JunctionDeviation.UserString, o2.JunctionDeviation.UserString)
 
     def test02(self):
         '''Verify default value detection logic.'''
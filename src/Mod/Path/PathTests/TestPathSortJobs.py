@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathUtils as PathUtils
+import math
+import os
+import random
+import time
+import unittest
+
+from PathTests.PathTestUtils import PathTestBase
+
+# the benchmarks are only run if this environment variable is set
+BENCHMARK = 'FREECAD_BENCHMARKS'
+
+
+def sort_jobs_reference(locations, keys, attractors=None):
+    '''The brute force nearest neighbour sort sort_jobs has to match.'''
+    attractors = attractors or [keys[0]]
+    locations = list(locations)
+    out = []
+    current = dict((k, 0) for k in keys)
+    while locations:
+        costs = [(sum((loc[k] - current[k]) ** 2 for k in keys) + sum(abs(loc[k]) for k in attractors), i)
+                 for i, loc in enumerate(locations)]
+        current = locations.pop(min(costs)[1])
+        out.append(current)
+    return out
+
+
+def travel(locations):
+    return sum(math.hypot(a['x'] - b['x'], a['y'] - b['y']) for a, b in zip(locations, locations[1:]))
+
+
+def random_field(count, width, height):
+    return [{'x': random.uniform(0, width), 'y': random.uniform(0, height)} for _ in range(count)]
+
+
+def perforated_sheet(columns, rows, pitch):
+    return [{'x': (i % columns) * pitch, 'y': (i // columns) * pitch} for i in range(columns * rows)]
+
+
+class TestPathSortJobs(PathTestBase):
+
+    def setUp(self):
+        random.seed(42)
+
+    def test00(self):
+        '''Verify sort_jobs matches the brute force nearest neighbour sort.'''
+        for count in [1, 2, 3, 10, 100, 500]:
+            locations = random_field(count, 100, 60)
+            self.assertEqual(PathUtils.sort_jobs(list(locations), ['x', 'y']),
+                             sort_jobs_reference(locations, ['x', 'y']))
+
+    def test01(self):
+        '''Verify attractors and equal distances on a hole pattern.'''
+        locations = perforated_sheet(13, 9, 2.5)
+        random.shuffle(locations)
+        for attractors in [None, ['x', 'y'], ['y']]:
+            self.assertEqual(PathUtils.sort_jobs(list(locations), ['x', 'y'], attractors),
+                             sort_jobs_reference(locations, ['x', 'y'], attractors))
+
+    def test02(self):
+        '''Verify the improvement pass keeps the first hole and shortens the travel.'''
+        locations = random_field(400, 100, 60)
+        nearest = PathUtils.sort_jobs(list(locations), ['x', 'y'])
+        improved = PathUtils.sort_jobs(list(locations), ['x', 'y'], time_limit=1)
+        self.assertEqual(improved[0], nearest[0])
+        self.assertEqual(sorted(id(loc) for loc in improved), sorted(id(loc) for loc in locations))
+        self.assertLess(travel(improved), travel(nearest))
+
+    def test03(self):
+        '''Verify nearly collinear holes don't blow up the grid.'''
+        for count in [3, 5, 8, 200]:
+            locations = [{'x': i * 2.0, 'y': 1e-9 * (i % 3)} for i in range(count)]
+            locations[1]['y'] = 1e-6
+            random.shuffle(locations)
+            grid = PathUtils._LocationGrid([(loc['x'], loc['y']) for loc in locations], [0] * count)
+            self.assertLessEqual(grid.nx * grid.ny, 2 * count + 2)
+            self.assertEqual(PathUtils.sort_jobs(list(locations), ['x', 'y']),
+                             sort_jobs_reference(locations, ['x', 'y']))
+
+    def test04(self):
+        '''Verify a bigger perforated sheet and its improvement pass.'''
+        locations = perforated_sheet(30, 20, 2.54)
+        random.shuffle(locations)
+        nearest = PathUtils.sort_jobs(list(locations), ['x', 'y'])
+        self.assertEqual(nearest, sort_jobs_reference(locations, ['x', 'y']))
+        improved = PathUtils.sort_jobs(list(locations), ['x', 'y'], time_limit=0.5)
+        self.assertEqual(sorted(id(loc) for loc in improved), sorted(id(loc) for loc in locations))
+        self.assertLessEqual(travel(improved), travel(nearest))
+
+    @unittest.skipUnless(os.environ.get(BENCHMARK), 'set {} to benchmark sort_jobs'.format(BENCHMARK))
+    def test10(self):
+        '''Benchmark the brute force sort, sort_jobs and its 2-opt improvement on hole fields.'''
+        fields = [('random', random_field(2000, 200, 120)), ('perforated sheet', perforated_sheet(50, 40, 2.54)),
+                  ('random', random_field(20000, 600, 400)), ('perforated sheet', perforated_sheet(200, 100, 2.54))]
+        for name, locations in fields:
+            random.shuffle(locations)
+            timings = []
+            for sort in [sort_jobs_reference, PathUtils.sort_jobs,
+                         lambda locs, keys: PathUtils.sort_jobs(locs, keys, time_limit=2)]:
+                if sort is sort_jobs_reference and len(locations) > 2000:
+                    # quadratic, takes minutes
+                    timings.append(None)
+                    continue
+                begin = time.time()
+                order = sort(list(locations), ['x', 'y'])
+                timings.append((time.time() - begin, travel(order)))
+                self.assertEqual(len(order), len(locations))
+            print("sort_jobs %d holes %s: %s" % (len(locations), name, ', '.join(
+                "%s %.2fs travel %.0f" % (label, t[0], t[1]) for label, t in
+                zip(['brute force', 'grid', 'grid and 2-opt'], timings) if t is not None)))
+            self.assertLessEqual(timings[2][1], timings[1][1])
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Mesh
+import Part
+import PathScripts.PathPreferences as PathPreferences
+import PathScripts.PathStlCache as PathStlCache
+
+from PathTests.PathTestUtils import PathTestBase
+
+MB = 1024 * 1024
+
+
+class FakeOcl(object):
+    '''Stand in for the ocl module, the STL is the list of its triangles.'''
+
+    class STLSurf(list):
+        def addTriangle(self, t):
+            self.append(t)
+
+    @staticmethod
+    def Triangle(p1, p2, p3):
+        return (p1, p2, p3)
+
+    @staticmethod
+    def Point(x, y, z):
+        return (x, y, z)
+
+
+class TestPathStlCache(PathTestBase):
+
+    def setUp(self):
+        self.cacheSize = PathPreferences.preferences().GetInt(PathPreferences.StlCacheSize, -1)
+        PathPreferences.preferences().SetInt(PathPreferences.StlCacheSize, 10)
+        PathStlCache.clear()
+
+    def tearDown(self):
+        PathStlCache.clear()
+        if self.cacheSize < 0:
+            PathPreferences.preferences().RemInt(PathPreferences.StlCacheSize)
+        else:
+            PathPreferences.preferences().SetInt(PathPreferences.StlCacheSize, self.cacheSize)
+
+    def boxWithHole(self, x):
+        box = Part.makeBox(20, 10, 5)
+        return box.cut(Part.makeCylinder(2, 5, FreeCAD.Vector(x, 5, 0)))
+
+    def test00(self):
+        '''Verify the signature of changed shapes.'''
+        a = PathStlCache.shapeSignature(self.boxWithHole(5))
+        self.assertEqual(a, PathStlCache.shapeSignature(self.boxWithHole(5)))
+        # same bound box, area and topology but a different hole position
+        self.assertNotEqual(a, PathStlCache.shapeSignature(self.boxWithHole(15)))
+        self.assertNotEqual(a, PathStlCache.shapeSignature(Part.makeBox(20, 10, 5)))
+        hash(a)
+
+        # mirrored holes moved apart keep the bound box, area, moment and topology
+        def boxWithHoles(d):
+            box = Part.makeBox(20, 10, 5)
+            for x in (10 - d, 10 + d):
+                box = box.cut(Part.makeCylinder(2, 5, FreeCAD.Vector(x, 5, 0)))
+            return box
+        a = PathStlCache.shapeSignature(boxWithHoles(4))
+        self.assertEqual(a, PathStlCache.shapeSignature(boxWithHoles(4)))
+        self.assertNotEqual(a, PathStlCache.shapeSignature(boxWithHoles(5)))
+
+        # the triangulation of the shape is not part of the signature
+        shape = boxWithHoles(4)
+        shape.tessellate(0.1)
+        self.assertEqual(a, PathStlCache.shapeSignature(shape))
+
+    def test01(self):
+        '''Verify the least recently used values are evicted.'''
+        made = []
+
+        def make(name, size):
+            def maker():
+                made.append(name)
+                return (name, size * MB)
+            return maker
+
+        self.assertEqual(PathStlCache.cached(('a',), make('a', 4)), 'a')
+        self.assertEqual(PathStlCache.cached(('b',), make('b', 4)), 'b')
+        self.assertEqual(PathStlCache.cached(('a',), make('a', 4)), 'a')
+        self.assertEqual(made, ['a', 'b'])
+
+        # 'b' is the least recently used
+        PathStlCache.cached(('c',), make('c', 4))
+        PathStlCache.cached(('a',), make('a', 4))
+        PathStlCache.cached(('b',), make('b', 4))
+        self.assertEqual(made, ['a', 'b', 'c', 'b'])
+
+        # too big for the cache, but still returned
+        self.assertEqual(PathStlCache.cached(('d',), make('d', 11)), 'd')
+        PathStlCache.cached(('d',), make('d', 11))
+        self.assertEqual(made, ['a', 'b', 'c', 'b', 'd', 'd'])
+
+    def test02(self):
+        '''Verify STLs are built from the cached facets.'''
+        box = Part.makeBox(10, 10, 10)
+        key = ('model', PathStlCache.shapeSignature(box), 0.1)
+        tessellations = []
+
+        def makeFacets():
+            tessellations.append(key)
+            return PathStlCache.shapeFacets(box, 0.1)
+
+        stl = PathStlCache.getSTL(key, makeFacets, FakeOcl)
+        self.assertEqual(len(stl), 12)
+        for t in stl:
+            for p in t:
+                for v in p:
+                    self.assertTrue(v in (0.0, 10.0))
+        self.assertTrue(PathStlCache.getSTL(key, makeFacets, FakeOcl) is stl)
+
+        # a discarded STL is rebuilt, without a new tessellation
+        PathStlCache.discard(stl)
+        stl2 = PathStlCache.getSTL(key, makeFacets, FakeOcl)
+        self.assertFalse(stl2 is stl)
+        self.assertEqual(stl2, stl)
+        self.assertEqual(len(tessellations), 1)
+
+    def test03(self):
+        '''Verify the signature of changed meshes.'''
+        def mesh(x):
+            return Mesh.Mesh([FreeCAD.Vector(0, 0, 0), FreeCAD.Vector(10, 0, 0), FreeCAD.Vector(x, 10, 0),
+                              FreeCAD.Vector(10, 0, 0), FreeCAD.Vector(10, 10, 0), FreeCAD.Vector(x, 10, 0)])
+        a = PathStlCache.meshSignature(mesh(5))
+        self.assertEqual(a, PathStlCache.meshSignature(mesh(5)))
+        # a moved point, with the same counts
+        self.assertNotEqual(a, PathStlCache.meshSignature(mesh(4)))
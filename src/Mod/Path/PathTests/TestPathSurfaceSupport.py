@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import FreeCAD
+import Part
+import PathScripts.PathSurfaceSupport as PathSurfaceSupport
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+class Quantity(object):
+    def __init__(self, value):
+        self.Value = value
+
+
+class Op(object):
+    '''Stand in for the properties of a 3D Surface or Waterline operation.'''
+
+    def __init__(self, gapThreshold=0.005, reversed=False, angle=0.0):
+        self.GapThreshold = Quantity(gapThreshold)
+        self.CutPatternReversed = reversed
+        self.CutPatternAngle = angle
+
+
+def compound(*segments):
+    return Part.makeCompound([Part.makeLine(FreeCAD.Vector(x1, y1, 0), FreeCAD.Vector(x2, y2, 0))
+                              for (x1, y1, x2, y2) in segments])
+
+
+class TestPathSurfaceSupport(PathTestBase):
+
+    # two collinear segments with a gap of 1, followed by another scan line
+    lines = compound((0, 0, 2, 0), (3, 0, 5, 0), (0, 1, 4, 1))
+
+    def test00(self):
+        '''Verify collinear line segments are grouped with the gaps between them.'''
+        gaps = [50.0, 50.0, 50.0]
+        LINES = PathSurfaceSupport.pathGeomToLinesPointSet(Op(), self.lines, False, 0.5, False, gaps)
+        self.assertEqual(LINES, [[((0, 0), (2, 0)), 'BRK', ((3, 0), (5, 0))], [((0, 1), (4, 1))]])
+        self.assertEqual(gaps, [0.5, 50.0, 50.0])
+
+        # a gap of the tool diameter is closed
+        LINES = PathSurfaceSupport.pathGeomToLinesPointSet(Op(), self.lines, False, 1.0, False, gaps)
+        self.assertEqual(LINES, [[((0, 0), (5, 0))], [((0, 1), (4, 1))]])
+
+        # climb milling reverses the groups
+        LINES = PathSurfaceSupport.pathGeomToLinesPointSet(Op(), self.lines, True, 0.5, False, gaps)
+        self.assertEqual(LINES, [[((5, 0), (3, 0)), 'BRK', ((2, 0), (0, 0))], [((4, 1), (0, 1))]])
+
+    def test01(self):
+        '''Verify the zigzag groups alternate their direction.'''
+        gaps = [50.0, 50.0, 50.0]
+        LINES = PathSurfaceSupport.pathGeomToZigzagPointSet(Op(), self.lines, False, 0.5, False, gaps)
+        self.assertEqual(LINES, [[((0, 0), (2, 0)), 'BRK', ((3, 0), (5, 0))], [((4, 1), (0, 1))]])
+        self.assertEqual(gaps, [0.5, 50.0, 50.0])
+
+        LINES = PathSurfaceSupport.pathGeomToZigzagPointSet(Op(), self.lines, False, 1.0, False, gaps)
+        self.assertEqual(LINES, [[((0, 0), (5, 0))], [((4, 1), (0, 1))]])
+
+    def test02(self):
+        '''Verify connected spiral segments are grouped, skipping the closing edge.'''
+        spiral = compound((0, 0, 9, 9), (0, 0, 1, 0), (1, 0, 1, 1), (2, 2, 3, 3))
+        LINES = PathSurfaceSupport.pathGeomToSpiralPointSet(Op(), spiral)
+        self.assertEqual(LINES, [[((0, 0), (1, 0)), ((1, 0), (1, 1))], [((2, 2), (3, 3))]])
+
+        spiral = compound((0, 0, 1, 0), (1, 0, 1, 1), (2, 2, 3, 3), (3, 3, 9, 9))
+        LINES = PathSurfaceSupport.pathGeomToSpiralPointSet(Op(reversed=True), spiral)
+        self.assertEqual(LINES, [[((0, 0), (1, 0)), ((1, 0), (1, 1))], [((2, 2), (3, 3))]])
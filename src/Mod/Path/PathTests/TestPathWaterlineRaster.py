@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2020 FreeCAD Developers                                 *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2 of     *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+import PathScripts.PathWaterlineRaster as PathWaterlineRaster
+import numpy
+
+from PathTests.PathTestUtils import PathTestBase
+
+
+def signedArea(loop):
+    x, y = loop[:, 0], loop[:, 1]
+    return 0.5 * numpy.sum(x[:-1] * y[1:] - x[1:] * y[:-1])
+
+
+class TestPathWaterlineRaster(PathTestBase):
+
+    def setUp(self):
+        # a cone with a hole in the middle and a top at 5.0 in the middle of the grid
+        self.X, self.Y = numpy.meshgrid(numpy.linspace(0, 10, 101), numpy.linspace(0, 8, 81))
+        radius = numpy.hypot(self.X - 5, self.Y - 4)
+        self.Z = numpy.clip(5 - radius, -1, None)
+        self.Z[radius < 1] = -1
+
+    def radii(self, loop):
+        return numpy.hypot(loop[:, 0] - 5, loop[:, 1] - 4)
+
+    def test00(self):
+        '''Verify the loops of a layer are closed and follow the waterline.'''
+        loops, = PathWaterlineRaster.waterlineLoops(self.X, self.Y, self.Z, [3.0])
+        self.assertEqual(len(loops), 2)
+        outside, hole = loops
+        for loop in loops:
+            self.assertEqual(tuple(loop[0]), tuple(loop[-1]))
+        self.assertRoughly(self.radii(outside).min(), 2.0, 1e-3)
+        self.assertRoughly(self.radii(outside).max(), 2.0, 1e-3)
+        self.assertLess(self.radii(hole).max(), 1.1)
+
+    def test01(self):
+        '''Verify the material is on the left side of the loops, on the right side for climb.'''
+        outside, hole = PathWaterlineRaster.waterlineLoops(self.X, self.Y, self.Z, [3.0])[0]
+        self.assertGreater(signedArea(outside), 0)
+        self.assertLess(signedArea(hole), 0)
+        outside, hole = PathWaterlineRaster.waterlineLoops(self.X, self.Y, self.Z, [3.0], True)[0]
+        self.assertLess(signedArea(outside), 0)
+        self.assertGreater(signedArea(hole), 0)
+        self.assertRoughly(signedArea(outside), -4 * numpy.pi, 0.01)
+
+    def test02(self):
+        '''Verify all layers are extracted and material at the border is closed along it.'''
+        depths = [3.0, 0.0, -0.5, -2.0]
+        layers = PathWaterlineRaster.waterlineLoops(self.X, self.Y, self.Z, depths)
+        self.assertEqual([len(loops) for loops in layers], [2, 2, 2, 1])
+        # the cone is cut by the border of the grid at 0.0
+        self.assertRoughly(self.radii(layers[1][0]).max(), 5.0, 1e-9)
+        # everything is above -2.0, the loop is the border of the grid
+        border = layers[3][0]
+        self.assertRoughly(signedArea(border), 80.0, 1e-9)
+
+    def test03(self):
+        '''Verify the height grid of the scan points.'''
+        class Point(object):
+            def __init__(self, x, y, z):
+                self.x, self.y, self.z = x, y, z
+
+        points = [Point(x, y, z) for x, y, z in zip(self.X.ravel(), self.Y.ravel(), self.Z.ravel())]
+        X, Y, Z = PathWaterlineRaster.heightGrid(points, 81, 101, 0.5)
+        self.assertEqual(Z.shape, (81, 101))
+        self.assertTrue(numpy.array_equal(X, self.X))
+        self.assertTrue(numpy.array_equal(Y, self.Y))
+        self.assertTrue(numpy.array_equal(Z, self.Z + 0.5))
@@ -27,7 +27,12 @@ import TestApp
 from PathTests.TestPathLog   import TestPathLog
 from PathTests.TestPathPreferences  import TestPathPreferences
 from PathTests.TestPathCore  import TestPathCore
+from PathTests.TestPathBatchPost import TestPathBatchPost
+from PathTests.TestPathCompress import TestPathCompress
+from PathTests.TestPathCycleTime import TestPathCycleTime
 #from PathTests.TestPathPost  import PathPostTestCases
+from PathTests.TestPathPostCore  import TestPathPostCore
+from PathTests.TestPathPreCore import TestPathPreCore
 from PathTests.TestPathGeom  import TestPathGeom
 from PathTests.TestPathOpTools  import TestPathOpTools
 from PathTests.TestPathUtil  import TestPathUtil
@@ -40,8 +45,14 @@ from PathTests.TestPathToolBit  import TestPathToolBit
 from PathTests.TestPathTooltable import TestPathTooltable
 from PathTests.TestPathToolController import TestPathToolController
 from PathTests.TestPathSetupSheet import TestPathSetupSheet
+from PathTests.TestPathSortJobs import TestPathSortJobs
+from PathTests.TestPathStlCache import TestPathStlCache
+from PathTests.TestPathSurfaceSupport import TestPathSurfaceSupport
 from PathTests.TestPathDeburr  import TestPathDeburr
 from PathTests.TestPathHelix  import TestPathHelix
+from PathTests.TestPathHeightMap import TestPathHeightMap
+from PathTests.TestPathWaterlineRaster import TestPathWaterlineRaster
+from PathTests.TestPathDropCutter import TestPathDropCutter
 
 # dummy usage to get flake8 and lgtm quiet
 False if TestApp.__name__ else True
@@ -62,4 +73,15 @@ False if TestPathDeburr.__name__ else True
 False if TestPathHelix.__name__ else True
 False if TestPathPreferences.__name__ else True
 False if TestPathToolBit.__name__ else True
+False if TestPathPostCore.__name__ else True
+False if TestPathSortJobs.__name__ else True
+False if TestPathWaterlineRaster.__name__ else True
+False if TestPathDropCutter.__name__ else True
+False if TestPathStlCache.__name__ else True
+False if TestPathSurfaceSupport.__name__ else True
+False if TestPathPreCore.__name__ else True
+False if TestPathCompress.__name__ else True
+False if TestPathCycleTime.__name__ else True
+False if TestPathHeightMap.__name__ else True
+False if TestPathBatchPost.__name__ else True
 